@@ -0,0 +1,112 @@
+"""
+Module dedicated to generating synthetic netCDF files for benchmarking the quality control checks.
+Files are written in blocks of records, so files of several GB can be generated with little memory.
+The data contains a few fill values, values out of bounds and runs of identical values, so the checks
+have something to report.
+
+ Functions:
+- scenario_file_name: get the file name of the netCDF file of a scenario
+- generate_nc: generate a synthetic netCDF file
+- benchmark_config: get the configuration of the checks for a synthetic netCDF file
+"""
+
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+from netCDF4 import Dataset
+
+# number of records written at once
+_BLOCK_RECORDS = 65536
+# the data lies within these bounds, apart from the injected values out of bounds
+LOWER_BOUND = 0
+UPPER_BOUND = 1000
+
+
+def scenario_file_name(records: int, classes: int, dtype: str, compression: bool, variables: int) -> str:
+    """
+    Function to get the file name of the netCDF file of a scenario, which is unique for its parameters
+    :param records: number of records (time steps)
+    :param classes: size of the second dimension, 0 for 1-dimensional variables
+    :param dtype: the netCDF data type of the variables, for example 'f4' or 'i2'
+    :param compression: True to compress the variables with zlib
+    :param variables: number of variables
+    :return: the file name
+    """
+    return f"bench_{records}r_{classes}c_{dtype}_{'zlib' if compression else 'raw'}_{variables}v.nc"
+
+
+def generate_nc(path: Union[str, Path], records: int, classes: int = 0, dtype: str = 'f4',
+                compression: bool = False, variables: int = 1, seed: int = 0) -> Path:
+    """
+    Function to generate a synthetic netCDF file with an unlimited dimension 'time' and variables 'var_<i>'
+    with dimensions (time) or (time, classes)
+    :param path: path to the netCDF file, which is overwritten if it exists
+    :param records: number of records (time steps)
+    :param classes: size of the second dimension. Defaults to 0, for 1-dimensional variables.
+    :param dtype: the netCDF data type of the variables. Defaults to 'f4'.
+    :param compression: True to compress the variables with zlib. Defaults to False.
+    :param variables: number of variables. Defaults to 1.
+    :param seed: seed of the random values. Defaults to 0.
+    :return: the path to the netCDF file
+    """
+    path = Path(path)
+    rng = np.random.default_rng(seed)
+    np_dtype = np.dtype(dtype)
+    fill_value = np.array(-999, dtype=np_dtype).item()
+
+    dimensions = ('time',) if classes == 0 else ('time', 'classes')
+    record_shape = () if classes == 0 else (classes,)
+    chunk_records = max(1, min(records, (1 << 20) // (max(1, classes) * np_dtype.itemsize)))
+
+    with Dataset(path, 'w', format='NETCDF4') as nc_file:
+        nc_file.createDimension('time', None)
+        if classes:
+            nc_file.createDimension('classes', classes)
+
+        nc_vars = [nc_file.createVariable(f"var_{i}", dtype, dimensions, fill_value=fill_value, zlib=compression,
+                                          chunksizes=(chunk_records,) + record_shape)
+                   for i in range(variables)]
+
+        for start in range(0, records, _BLOCK_RECORDS):
+            stop = min(start + _BLOCK_RECORDS, records)
+            for nc_var in nc_vars:
+                values = rng.uniform(LOWER_BOUND, UPPER_BOUND, size=(stop - start,) + record_shape)
+                # some fill values, values out of bounds and a run of identical values per block
+                values[::997] = fill_value
+                values[::1009] = UPPER_BOUND * 2
+                values[:min(100, stop - start)] = UPPER_BOUND / 2
+                nc_var[start:stop] = values.astype(np_dtype)
+
+    return path
+
+
+def benchmark_config(variables: int, classes: int = 0) -> dict:
+    """
+    Function to get the configuration of the checks for a synthetic netCDF file, with all data checks
+    for every variable
+    :param variables: number of variables
+    :param classes: size of the second dimension, 0 for 1-dimensional variables. Defaults to 0.
+    :return: the configuration
+    """
+    dimensions = [0] if classes == 0 else [0, 1]
+
+    return {
+        'dimensions': {'time': {'existence_check': True}},
+        'variables': {
+            f"var_{i}": {
+                'existence_check': True,
+                'emptiness_check': True,
+                'expected_dimensions_check': {
+                    'expected_dimensions': ['time'] if classes == 0 else ['time', 'classes']},
+                'data_points_amount_check': {'minimum': 1},
+                'data_boundaries_check': {'lower_bound': LOWER_BOUND, 'upper_bound': UPPER_BOUND},
+                'consecutive_identical_values_check': {'maximum': 50},
+                'adjacent_values_difference_check': {
+                    'over_which_dimension': dimensions,
+                    'maximum_difference': [UPPER_BOUND] * len(dimensions)}
+            } for i in range(variables)
+        },
+        'global attributes': {},
+        'file size': {}
+    }
@@ -0,0 +1,252 @@
+"""
+Module dedicated to benchmarking the quality control checks on synthetic netCDF files (see generate.py).
+Every check of a QualityControl object and perform_all_checks are timed on the file of every scenario,
+the throughput of the data checks is recorded in data points per second and MB (of uncompressed data) per
+second, and the results are saved to a JSON file. When a baseline is given, checks which became slower by
+more than the tolerance, and by more than an absolute minimum time, are reported as regressions.
+
+Usage:
+    python -m benchmarks.run_benchmarks --scenarios small 2d --repeat 3 --baseline benchmarks/baseline.json
+
+ Functions:
+- benchmark_scenario: time all checks on the file of a single scenario
+- run_benchmarks: time all checks on the files of a list of scenarios
+- compare_to_baseline: find the checks which became slower compared to a baseline
+- main: command line interface
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import netCDF4
+import numpy as np
+
+from benchmarks.generate import generate_nc, benchmark_config, scenario_file_name
+from ncqc.QCnetCDF import QualityControl
+
+# the parameters of the synthetic netCDF file of every scenario, see generate_nc
+SCENARIOS = {
+    'small': {'records': 100_000, 'classes': 0, 'dtype': 'f4', 'compression': False, 'variables': 4},
+    '2d': {'records': 20_000, 'classes': 32, 'dtype': 'f4', 'compression': False, 'variables': 2},
+    'compressed': {'records': 20_000, 'classes': 32, 'dtype': 'f4', 'compression': True, 'variables': 2},
+    'int16': {'records': 20_000, 'classes': 32, 'dtype': 'i2', 'compression': False, 'variables': 2},
+    'many_variables': {'records': 2_000, 'classes': 0, 'dtype': 'f8', 'compression': False, 'variables': 200},
+    'large': {'records': 1_000_000, 'classes': 32, 'dtype': 'f4', 'compression': False, 'variables': 2},
+    'gb': {'records': 2_000_000, 'classes': 64, 'dtype': 'f4', 'compression': True, 'variables': 2}
+}
+DEFAULT_SCENARIOS = ('small', '2d', 'compressed', 'int16', 'many_variables')
+
+CHECKS = ('file_size_check', 'existence_check', 'expected_dimensions_check', 'emptiness_check',
+          'data_points_amount_check', 'data_boundaries_check', 'consecutive_identical_values_check',
+          'adjacent_values_difference_check', 'perform_header_checks', 'perform_all_checks')
+
+# the checks which only read the header of the file, of which no throughput is recorded. The data points amount
+# check of the benchmark configuration counts all data points, which follow from the shape of the variables.
+HEADER_CHECKS = ('file_size_check', 'existence_check', 'expected_dimensions_check', 'data_points_amount_check',
+                 'perform_header_checks')
+
+# a check is repeated until the repetitions took at least this long, so the fastest time of a fast check is stable
+MIN_REPEAT_SECONDS = 0.2
+
+
+def _time_check(nc_path: Path, config: dict, check: str, repeat: int, memory_budget: Optional[int]) -> float:
+    """
+    Function to time a single check, taking the fastest of a number of repetitions. The check is repeated
+    more often if the repetitions, including loading the file, took less than MIN_REPEAT_SECONDS.
+    :param nc_path: path to the netCDF file
+    :param config: the configuration of the checks
+    :param check: name of the method of the QualityControl object
+    :param repeat: the minimum number of repetitions
+    :param memory_budget: see QualityControl
+    :return: the fastest time in seconds
+    """
+    times = []
+    repeat_start = time.perf_counter()
+    while len(times) < repeat or time.perf_counter() - repeat_start < MIN_REPEAT_SECONDS:
+        qc_obj = QualityControl(memory_budget=memory_budget)
+        qc_obj.add_qc_checks_dict(config)
+        qc_obj.load_netcdf(nc_path)
+
+        start = time.perf_counter()
+        getattr(qc_obj, check)()
+        times.append(time.perf_counter() - start)
+
+        qc_obj.nc.close()
+
+    return min(times)
+
+
+def benchmark_scenario(name: str, nc_path: Path, parameters: dict, repeat: int = 3,
+                       memory_budget: Optional[int] = None) -> list[dict]:
+    """
+    Function to time all checks on the file of a single scenario
+    :param name: name of the scenario
+    :param nc_path: path to the netCDF file of the scenario
+    :param parameters: the parameters of the scenario, see SCENARIOS
+    :param repeat: the minimum number of repetitions of every check, of which the fastest is recorded.
+                   Defaults to 3.
+    :param memory_budget: see QualityControl. Defaults to None.
+    :return: list with a result for every check, without a throughput for the checks in HEADER_CHECKS
+    """
+    config = benchmark_config(parameters['variables'], parameters['classes'])
+
+    with netCDF4.Dataset(nc_path) as nc_file:  # pylint: disable=no-member
+        data_points = sum(variable.size for variable in nc_file.variables.values())
+        data_bytes = sum(variable.size * variable.dtype.itemsize for variable in nc_file.variables.values())
+
+    results = []
+    for check in CHECKS:
+        seconds = _time_check(nc_path, config, check, repeat, memory_budget)
+        data_check = check not in HEADER_CHECKS and seconds > 0
+        results.append({
+            'scenario': name,
+            'check': check,
+            'seconds': seconds,
+            'points_per_second': data_points / seconds if data_check else None,
+            'mb_per_second': data_bytes / 1e6 / seconds if data_check else None
+        })
+
+    return results
+
+
+def run_benchmarks(scenarios: list[str], data_dir: Path, repeat: int = 3,
+                   memory_budget: Optional[int] = None) -> dict:
+    """
+    Function to time all checks on the files of a list of scenarios. The file of a scenario is only generated
+    if it does not exist in the data directory yet.
+    :param scenarios: names of the scenarios, see SCENARIOS
+    :param data_dir: the directory of the netCDF files
+    :param repeat: the minimum number of repetitions of every check. Defaults to 3.
+    :param memory_budget: see QualityControl. Defaults to None.
+    :return: dictionary with the environment, the parameters of the scenarios and the results of all checks
+    """
+    data_dir.mkdir(parents=True, exist_ok=True)
+    results = []
+
+    for name in scenarios:
+        parameters = SCENARIOS[name]
+        nc_path = data_dir / scenario_file_name(**parameters)
+        if not nc_path.exists():
+            generate_nc(nc_path, **parameters)
+        results.extend(benchmark_scenario(name, nc_path, parameters, repeat, memory_budget))
+
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'netCDF4': netCDF4.__version__,
+            'platform': platform.platform()
+        },
+        'memory_budget': memory_budget,
+        'scenarios': {name: SCENARIOS[name] for name in scenarios},
+        'results': results
+    }
+
+
+def compare_to_baseline(benchmark: dict, baseline: dict, tolerance: float = 0.25,
+                        min_seconds: float = 0.005) -> list[str]:
+    """
+    Function to find the checks which became slower compared to a baseline, that is of which the throughput
+    (the inverse of the time for the checks in HEADER_CHECKS) dropped by more than the tolerance. A check which
+    became slower by less than min_seconds is not a regression, as the noise of short timings is larger
+    than the tolerance.
+    :param benchmark: the benchmark, see run_benchmarks
+    :param baseline: the baseline, a benchmark saved earlier
+    :param tolerance: the allowed relative drop of the throughput. Defaults to 0.25.
+    :param min_seconds: the minimum time by which a check has to become slower. Defaults to 0.005.
+    :return: list with a message for every regression
+    """
+    baseline_results = {(result['scenario'], result['check']): result for result in baseline['results']}
+    regressions = []
+
+    for result in benchmark['results']:
+        baseline_result = baseline_results.get((result['scenario'], result['check']))
+        if baseline_result is None or not baseline_result['seconds'] or not result['seconds']:
+            continue
+        if result['seconds'] - baseline_result['seconds'] < min_seconds:
+            continue
+
+        ratio = baseline_result['seconds'] / result['seconds']
+        if ratio >= 1 - tolerance:
+            continue
+        if result['points_per_second'] and baseline_result['points_per_second']:
+            regressions.append(f"{result['scenario']}/{result['check']}: {result['points_per_second']:.3g} "
+                               f"points/s, {ratio:.0%} of the baseline ({baseline_result['points_per_second']:.3g} "
+                               f"points/s)")
+        else:
+            regressions.append(f"{result['scenario']}/{result['check']}: {result['seconds'] * 1000:.3g} ms, "
+                               f"{ratio:.0%} of the throughput of the baseline "
+                               f"({baseline_result['seconds'] * 1000:.3g} ms)")
+
+    return regressions
+
+
+def _environment_differs(benchmark: dict, baseline: dict) -> list[str]:
+    """
+    Function to find the versions of Python and the packages which differ between a benchmark and a baseline
+    :param benchmark: the benchmark, see run_benchmarks
+    :param baseline: the baseline, a benchmark saved earlier
+    :return: list with a message for every version which differs
+    """
+    baseline_environment = baseline.get('environment', {})
+    return [f"{name} {baseline_environment.get(name)} in the baseline, {version} in the benchmark"
+            for name, version in benchmark['environment'].items()
+            if name != 'platform' and baseline_environment.get(name) != version]
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Function for the command line interface
+    :param argv: the command line arguments. Defaults to None, which uses sys.argv.
+    :return: the exit code, 1 if there are regressions compared to the baseline
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the quality control checks on synthetic netCDF files')
+    parser.add_argument('--scenarios', nargs='+', default=list(DEFAULT_SCENARIOS), choices=sorted(SCENARIOS))
+    parser.add_argument('--repeat', type=int, default=3, help='the minimum number of repetitions of every check')
+    parser.add_argument('--memory-budget', type=int, default=None)
+    parser.add_argument('--data-dir', type=Path, default=Path(tempfile.gettempdir()) / 'ncqc_benchmarks',
+                        help='directory of the generated netCDF files, which are reused between runs')
+    parser.add_argument('--output', type=Path, default=None, help='JSON file to save the results to')
+    parser.add_argument('--baseline', type=Path, default=None, help='JSON file with the baseline results')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--min-seconds', type=float, default=0.005,
+                        help='the minimum time by which a check has to become slower to be a regression')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='save the results to the baseline instead of comparing them')
+    args = parser.parse_args(argv)
+
+    benchmark = run_benchmarks(args.scenarios, args.data_dir, args.repeat, args.memory_budget)
+
+    for result in benchmark['results']:
+        throughput = f"{result['points_per_second']:12.3g} points/s {result['mb_per_second']:10.1f} MB/s" \
+            if result['points_per_second'] else ''
+        print(f"{result['scenario']:>16} {result['check']:>36} {result['seconds'] * 1000:10.2f} ms {throughput}")
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(benchmark, indent=2), encoding='utf-8')
+
+    if args.baseline is None:
+        return 0
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(benchmark, indent=2), encoding='utf-8')
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+    for difference in _environment_differs(benchmark, baseline):
+        print(f"warning: {difference}, the results may not be comparable")
+
+    regressions = compare_to_baseline(benchmark, baseline, args.tolerance, args.min_seconds)
+    for regression in regressions:
+        print(f"regression: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -22,9 +22,14 @@ When a test fixtures is set as argument for a test function, it automatically ru
 - create_nc_consecutive_identical_values_check: Test fixture for testing max number
   of consecutive values that are the same.
 - create_nc_all_checks: Test fixture for testing perform_all_checks method from QualityControl class
+- create_nc_streaming: Test fixture for testing the data checks when reading variables in slabs
+- create_nc_batch: Test fixture for testing quality control on a directory of netCDF files
+- create_nc_classic: Test fixture for testing the memory mapped reading of NETCDF3 classic files
+- create_nc_multifile: Test fixture for testing quality control of an ordered set of netCDF files as one dataset
 """
 
 import os
+import shutil
 from pathlib import Path
 from typing import List
 from netCDF4 import Dataset
@@ -212,10 +217,18 @@ def create_nc_emptiness_check_mixed():
     longitude = nc_file.createVariable('longitude', 'f4', fill_value=-999.0)
     latitude = nc_file.createVariable('latitude', 'f4', fill_value=-999.0)
     altitude = nc_file.createVariable('altitude', 'f4', fill_value=-999.0)
+    spectrum = nc_file.createVariable('spectrum', 'f4', ('time', 'diameter_classes'), fill_value=-999.0)
 
     # Set variables
     temperature[:] = np.random.uniform(-10, 30, size=100)
 
+    # completely empty time steps and a completely empty diameter class
+    spectrum_values = np.random.uniform(0, 10, size=(100, 32))
+    spectrum_values[10:13, :] = -999.0
+    spectrum_values[20, :] = np.nan
+    spectrum_values[:, 5] = -999.0
+    spectrum[:, :] = spectrum_values
+
     wind_speed[:50] = np.random.uniform(0, 30, size=50)
     wind_speed[50:] = wind_speed.getncattr('_FillValue')
 
@@ -291,6 +304,8 @@ def create_nc_data_points_amount_check():
 
     var_1d[:] = np.random.uniform(low=0, high=100, size=10)
     var_2d[:, :] = np.random.uniform(low=0, high=100, size=(10, 20))
+    # some data points without a valid value
+    var_2d[0, :5] = -999.0
 
     nc_file.close()
 
@@ -424,3 +439,161 @@ def create_nc_all_checks():
     var_2[:] = np.random.uniform(low=10, high=19, size=50)
 
     nc_file.close()
+
+
+@pytest.fixture()
+def create_nc_streaming():
+    """
+    Test fixture for testing the data checks when reading variables in slabs
+    """
+    nc_path = Path(__file__).parent / 'sample_data' / 'test_streaming.nc'
+
+    if os.path.exists(nc_path):
+        os.remove(nc_path)
+
+    nc_file = Dataset(nc_path, 'w', format='NETCDF4')
+
+    nc_file.createDimension('time', None)
+    nc_file.createDimension('classes', 8)
+
+    series = nc_file.createVariable('series', 'f4', ('time',), fill_value=-999.0, chunksizes=(16,))
+    spectrum = nc_file.createVariable('spectrum', 'f4', ('time', 'classes'), fill_value=-999.0,
+                                      chunksizes=(4, 8), zlib=True)
+    station = nc_file.createVariable('station', 'i4', fill_value=-999)
+
+    # runs of identical values crossing chunk boundaries, some fill values and NaN values
+    series_values = np.random.uniform(0, 10, size=200)
+    series_values[10:40] = 5.0
+    series_values[150:200] = 7.0
+    series_values[60:65] = -999.0
+    series_values[90] = np.nan
+    series_values[120] = 12.0
+    series[:] = series_values
+
+    spectrum_values = np.random.uniform(0, 10, size=(200, 8))
+    spectrum_values[50, :] = -999.0
+    spectrum_values[70, 3] = 11.0
+    spectrum[:, :] = spectrum_values
+
+    station.assignValue(42)
+
+    nc_file.close()
+
+
+@pytest.fixture()
+def create_nc_batch():
+    """
+    Test fixture for testing quality control on a directory of netCDF files,
+    of which the file 'file_2.nc' has a value out of bounds
+    """
+    batch_dir = Path(__file__).parent / 'sample_data' / 'batch'
+
+    if os.path.exists(batch_dir):
+        shutil.rmtree(batch_dir)
+    os.makedirs(batch_dir / 'nested')
+
+    for i, nc_path in enumerate([batch_dir / 'file_0.nc', batch_dir / 'file_1.nc', batch_dir / 'nested' / 'file_2.nc']):
+        nc_file = Dataset(nc_path, 'w', format='NETCDF4')
+        nc_file.createDimension('time', 20)
+        temperature = nc_file.createVariable('temperature', 'f4', ('time',), fill_value=-999.0)
+        temperature[:] = np.linspace(0, 10, 20) + 20 * (i == 2)
+        nc_file.close()
+
+    with open(batch_dir / 'notes.txt', 'w', encoding='utf-8') as notes_file:
+        notes_file.write('not a netCDF file')
+
+
+@pytest.fixture(params=['NETCDF3_CLASSIC', 'NETCDF3_64BIT_OFFSET', 'NETCDF3_64BIT_DATA'])
+def create_nc_classic(request):
+    """
+    Test fixture for testing the memory mapped reading of NETCDF3 classic files, for every classic format,
+    with record and fixed variables of several types, fill values, missing values and packed values
+    :param request: the request of the fixture, with the format as parameter
+    :return: path to the netCDF file
+    """
+    nc_path = Path(__file__).parent / 'sample_data' / 'test_classic.nc'
+
+    if os.path.exists(nc_path):
+        os.remove(nc_path)
+
+    nc_file = Dataset(nc_path, 'w', format=request.param)
+    nc_file.title = 'classic test file'
+    nc_file.levels = np.array([1, 2, 3], dtype='i4')
+
+    nc_file.createDimension('time', None)
+    nc_file.createDimension('classes', 3)
+    nc_file.createDimension('label_length', 5)
+
+    series = nc_file.createVariable('series', 'f4', ('time',), fill_value=-999.0)
+    counts = nc_file.createVariable('counts', 'i2', ('time', 'classes'))
+    counts.missing_value = np.int16(-1)
+    packed = nc_file.createVariable('packed', 'i2', ('time',))
+    packed.scale_factor = 0.5
+    packed.add_offset = 10.0
+    flags = nc_file.createVariable('flags', 'i1', ('classes',))
+    profile = nc_file.createVariable('profile', 'f8', ('classes', 'label_length'))
+    label = nc_file.createVariable('label', 'S1', ('label_length',))
+    station = nc_file.createVariable('station', 'i4')
+
+    series_values = np.random.uniform(0, 10, size=50)
+    series_values[10:20] = 5.0
+    series_values[30:33] = -999.0
+    series_values[40] = 12.0
+    series[:] = series_values
+
+    counts_values = np.random.randint(0, 100, size=(50, 3))
+    counts_values[5, 1] = -1
+    counts_values[25, :] = 150
+    counts[:, :] = counts_values
+
+    packed[:] = np.linspace(10, 20, 50)
+    # records 40 to 49 are never written, so they hold the default fill value
+    packed[40:] = np.ma.masked
+
+    flags[:2] = [1, 0]
+    profile[:, :] = np.arange(15).reshape(3, 5)
+    label[:] = np.array(list('abcde'), dtype='S1')
+    station.assignValue(42)
+
+    nc_file.close()
+    return nc_path
+
+
+@pytest.fixture()
+def create_nc_multifile():
+    """
+    Test fixture for testing quality control of an ordered set of netCDF files as one dataset. The records
+    of 'part_0.nc' to 'part_3.nc' (50 records each) together equal the records of 'whole.nc', with a run
+    of identical values and a jump between adjacent values crossing the boundaries between the parts.
+    """
+    multifile_dir = Path(__file__).parent / 'sample_data' / 'multifile'
+
+    if os.path.exists(multifile_dir):
+        shutil.rmtree(multifile_dir)
+    os.makedirs(multifile_dir)
+
+    series_values = 5 + np.sin(np.arange(200) / 10)
+    series_values[46:54] = 3.0
+    series_values[100:] += 4
+    series_values[130:132] = -999.0
+
+    spectrum_values = 5 + np.cos(np.arange(200 * 4) / 40).reshape(200, 4)
+    spectrum_values[150:, 2] -= 3
+
+    parts = [(f'part_{i}.nc', slice(50 * i, 50 * (i + 1))) for i in range(4)] + [('whole.nc', slice(0, 200))]
+    for file_name, records in parts:
+        nc_file = Dataset(multifile_dir / file_name, 'w', format='NETCDF4')
+        nc_file.title = 'multi-file test dataset'
+        nc_file.createDimension('time', None)
+        nc_file.createDimension('classes', 4)
+
+        series = nc_file.createVariable('series', 'f4', ('time',), fill_value=-999.0, chunksizes=(16,))
+        spectrum = nc_file.createVariable('spectrum', 'f4', ('time', 'classes'), fill_value=-999.0,
+                                          chunksizes=(8, 4))
+        station = nc_file.createVariable('station', 'i4', fill_value=-999)
+
+        series[:] = series_values[records]
+        spectrum[:, :] = spectrum_values[records]
+        station.assignValue(42)
+
+        nc_file.close()
@@ -2,17 +2,78 @@
 Module dedicated to the main logic of the netCDF quality control library
 
  Functions:
+- planned: decorator compiling the plan again before a check when the configuration changed
 - yaml2dict: reads a yaml file and returns a dictionary with all the field and values
 """
 
+import functools
+import json
+import threading
+import time
+from concurrent.futures import CancelledError
 from pathlib import Path
-from typing import Union
+from typing import Iterator, Optional, Union
 
 import netCDF4
 import yaml
 import numpy as np
 
+from ncqc.flags import (FLAG_DTYPE, FLAG_MASKS, flag_attributes, EmptinessFlagger, BoundariesFlagger,
+                        IdenticalRunsFlagger, AdjacentDifferencesFlagger, VariableFlagger)
+from ncqc.cache import ResultCache
+from ncqc.classic import CLASSIC_FORMATS, ClassicDataset, is_classic
 from ncqc.log import LoggerQC
+from ncqc.multifile import MultiFileDataset, MultiFileVariable
+from ncqc.checkpoint import Checkpoint, checkpoint_key
+from ncqc.plan import CheckPlan
+from ncqc.profiling import NO_PROFILING, Profiler, profiled
+from ncqc.sampling import SAMPLE_SLAB_BYTES, SAMPLING_METHODS, SampleEstimate, sample_slabs
+from ncqc.sinks import ReportSink
+from ncqc.variable_cache import VariableCache
+from ncqc.kernels import boundaries_violations
+from ncqc.streaming import (iter_slabs, count_slabs, get_slab, chunk_memory_budget, BoundariesAccumulator,
+                            EmptinessAccumulator, PointsAmountAccumulator, IdenticalRunsAccumulator,
+                            AdjacentDifferencesAccumulator)
+
+# number of indices of offending data points shown in the summary of a failed check
+SUMMARY_INDICES = 10
+
+# checks which need to read the data of a variable, in the order they are performed by perform_all_checks
+DATA_CHECKS = (
+    'emptiness_check',
+    'data_points_amount_check',
+    'data_boundaries_check',
+    'consecutive_identical_values_check',
+    'adjacent_values_difference_check'
+)
+
+# execution modes stopping the checks early: at the first error in the file, at the first failing check
+# of every variable, or every check at its first violation
+FAIL_FAST_MODES = ('file', 'variable', 'check')
+# maximum number of bytes read at once from a variable which is not chunked, when failing fast
+FAIL_FAST_SLAB_BYTES = 1024 * 1024
+
+
+
+def planned(method):
+    """
+    Decorator compiling the plan of a QualityControl object again before a check when its configuration
+    changed since the plan was compiled, also when the configuration was changed in place.
+    The plan stays the same while the check runs, including the checks it performs itself.
+    :param method: the method performing the check
+    :return: the method performing the check with an up-to-date plan
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):  # pylint: disable=protected-access
+        if self._plan_depth == 0:
+            self._refresh_plan()
+        self._plan_depth += 1
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._plan_depth -= 1
+
+    return wrapper
 
 
 class QualityControl:
@@ -25,8 +86,27 @@ class QualityControl:
     - qc_checks_vars: checks for the variables (and data) of a netCDF file
     - qc_checks_gl_attr: checks for the global attributes of a netCDF file
     - qc_check_file_size: check for the file size of a netCDF file
+    - plan: the configuration compiled into an immutable plan (see `plan.CheckPlan`), compiled again when checks
+      are added or replaced, or when one of the attributes above is set (changing them in place is not detected)
     - nc: netCDF file to be checked
+    - nc_buffer: the content of the netCDF file if it was loaded from memory, None if it was loaded from a path
     - logger: logger for errors, warnings, info, and creation of reports
+    - max_point_messages: maximum number of errors logged for individual data points per variable and check,
+      any further offending data points are only reported in a summary error
+    - memory_budget: maximum number of bytes to read from a variable at once, None to read variables in full.
+      When set, the data checks stream over each variable in slabs aligned to its chunking
+    - profiler: the profiler measuring the checks (see profiling.py), None when profiling is turned off
+    - cache: the cache of the results of perform_all_checks (see cache.py), None to always perform the checks
+    - fail_fast: None to perform all checks in full, or the execution mode stopping the checks early
+      (see FAIL_FAST_MODES): 'file' stops perform_all_checks at the first error, 'variable' stops reading
+      a variable at its first failing check and 'check' stops every check at its first violation.
+      Variables are then read one chunk at a time, so a failing check stops after its first offending chunk
+    - estimates: the estimated violation rates of the sampled checks since the last report (see sampling.py)
+    - variable_cache: the values of the variables read by the checks, least recently used values are evicted
+      when its budget is exceeded (see variable_cache.py), None to read the variables for every check.
+      It is emptied when a netCDF file is loaded
+    - cancel_event: event which stops the checks in progress with a `concurrent.futures.CancelledError` before
+      the next read of data when it is set from another thread (see aio.py), None if the checks cannot be cancelled
 
      Methods:
     - add_qc_checks_conf: add checks via a config file
@@ -34,6 +114,10 @@ class QualityControl:
     - replace_qc_checks_conf: replace checks via a config file
     - replace_qc_checks_dict: replace checks via a dictionary
     - load_netcdf: load the netcdf file to be checked
+    - load_netcdf_files: load an ordered set of netCDF files to be checked as one dataset along their records
+    - enable_profiling: turn on measuring the time and memory of the checks
+    - disable_profiling: turn off measuring the time and memory of the checks
+    - get_timings: get the timing table of the checks performed since the last report
     - data_boundaries_check: perform a boundary check on the variables of the loaded netCDF file
     - existence_check: perform existence checks on dimensions, variables and global attributes
     - file_size_check: perform a file size check on the loaded netCDF file
@@ -44,20 +128,61 @@ class QualityControl:
       (maximum specified in the configuration file) consecutive values are identical for each variable
       in the NetCDF file.
     - expected_dimensions_check: Method dedicated to checking whether each variable has the expected dimensions
+    - perform_header_checks: Method that performs all checks which only need the header of the netCDF file
     - perform_all_checks: Method that performs all checks
+    - perform_incremental_checks: Method that performs all checks, only reading the records appended since
+      the previous incremental checks
+    - perform_sampled_checks: Method that performs all checks, estimating the violation rates of the data checks
+      from a sample of the chunks of every variable
+    - write_flags: Method that writes per data point quality control flags to a companion netCDF file
     - create_report: Method to create and get a report from the logger
     """
 
-    def __init__(self):
+    def __init__(self, max_point_messages: int = 100, memory_budget: Optional[int] = None,
+                 logger: Optional[LoggerQC] = None, sink: Optional[ReportSink] = None,
+                 cache: Optional[ResultCache] = None, fail_fast: Optional[str] = None,
+                 variable_cache_bytes: Optional[int] = None):
         """
         Constructor for the QualityControl objects
+        :param max_point_messages: maximum number of errors logged for individual data points
+                                   per variable and check. Defaults to 100.
+        :param memory_budget: maximum number of bytes to read from a variable at once. Defaults to None,
+                              which reads every variable in full.
+        :param logger: the logger to use, for example a bounded LoggerQC. Defaults to None, which creates
+                       a LoggerQC keeping all messages and reports.
+        :param sink: sink every created report is written to (see sinks.py), set on the logger.
+                     Defaults to None, which keeps the sink of the logger.
+        :param cache: cache of the results of perform_all_checks, so files which did not change are not
+                      checked again. Defaults to None, which performs the checks every time.
+        :param fail_fast: the execution mode stopping the checks early, one of FAIL_FAST_MODES.
+                          Defaults to None, which performs all checks in full.
+        :param variable_cache_bytes: maximum number of bytes of the values of variables kept in memory, so checks
+                                     performed one after the other read every variable only once.
+                                     Defaults to None, which reads the variables for every check.
         """
+        if fail_fast is not None and fail_fast not in FAIL_FAST_MODES:
+            raise ValueError(f"unknown fail_fast mode '{fail_fast}', expected one of {FAIL_FAST_MODES}")
+
+        self._plan: Optional[CheckPlan] = None
+        self._plan_key: Optional[str] = None
+        self._plan_depth = 0
         self.qc_checks_dims: dict = {}
         self.qc_checks_vars: dict = {}
         self.qc_checks_gl_attrs: dict = {}
         self.qc_check_file_size: dict = {}
         self.nc = None
-        self.logger = LoggerQC()
+        self.nc_buffer: Union[bytes, bytearray, memoryview, None] = None
+        self.logger = logger if logger is not None else LoggerQC()
+        if sink is not None:
+            self.logger.sink = sink
+        self.max_point_messages = max_point_messages
+        self.memory_budget = memory_budget
+        self.profiler: Optional[Profiler] = None
+        self.cache = cache
+        self.fail_fast = fail_fast
+        self.estimates: list[dict] = []
+        self.variable_cache = VariableCache(variable_cache_bytes) if variable_cache_bytes is not None else None
+        self.cancel_event: Optional[threading.Event] = None
 
     def add_qc_checks_conf(self, path_qc_checks_file: Path):
         """
@@ -95,8 +220,32 @@ class QualityControl:
         else:
             new_check_file_size = dict_qc_checks['file size']
             self.qc_check_file_size.update(new_check_file_size)
+        self._refresh_plan()
         return self
 
+    @property
+    def plan(self) -> CheckPlan:
+        """
+        The compiled plan of the configuration, compiled again only when the configuration changed,
+        also when it was changed in place. While a check runs, the plan it started with is kept.
+        :return: the compiled plan
+        """
+        if self._plan_depth == 0:
+            self._refresh_plan()
+        return self._plan
+
+    def _refresh_plan(self):
+        """
+        Method dedicated to compiling the configuration into a plan when it changed since the plan was compiled,
+        detected by comparing a snapshot of the configuration with the one the plan was compiled from
+        """
+        key = json.dumps((self.qc_checks_dims, self.qc_checks_vars, self.qc_checks_gl_attrs,
+                          self.qc_check_file_size), default=str)
+        if self._plan is None or key != self._plan_key:
+            self._plan = CheckPlan.compile(self.qc_checks_dims, self.qc_checks_vars, self.qc_checks_gl_attrs,
+                                           self.qc_check_file_size, DATA_CHECKS)
+            self._plan_key = key
+
     def replace_qc_checks_conf(self, path_qc_checks_file: Path):
         """
         Method dedicated to replacing the current checks with the ones from a config file
@@ -124,15 +273,328 @@ class QualityControl:
         self.add_qc_checks_dict(dict_qc_checks=dict_qc_checks)
         return self
 
-    def load_netcdf(self, nc_file_path: Path):
+    def load_netcdf(self, nc_file_path: Union[Path, bytes, bytearray, memoryview], name: str = 'memory.nc',
+                    memory_map: bool = True):
+        """
+        Method dedicated to loading a netCDF file to be checked with quality control. A netCDF file received
+        in memory (for example from a message queue) is opened as an in-memory dataset, without writing it
+        to a temporary file or copying it. NETCDF3 classic files are read from a memory map (see classic.py),
+        recognized by their magic number.
+        :param nc_file_path: path to the netCDF file, or its content as a bytes-like object
+        :param name: name of a netCDF file loaded from memory, used in the checkpoint key and the variable cache.
+                     Defaults to 'memory.nc'.
+        :param memory_map: True to read NETCDF3 classic files from a memory map, False to read all files
+                           with netCDF4. Defaults to True.
+        :return: self
+        """
+        if isinstance(nc_file_path, (bytes, bytearray, memoryview)):
+            with memoryview(nc_file_path) as buffer:
+                classic = memory_map and buffer[:4].tobytes() in CLASSIC_FORMATS
+            if classic:
+                self.nc = ClassicDataset(nc_file_path, name)
+            else:
+                self.nc = netCDF4.Dataset(name, memory=nc_file_path)  # pylint: disable=no-member
+            self.nc_buffer = nc_file_path
+        else:
+            if memory_map and is_classic(nc_file_path):
+                self.nc = ClassicDataset(nc_file_path)
+            else:
+                self.nc = netCDF4.Dataset(nc_file_path)  # pylint: disable=no-member
+            self.nc_buffer = None
+        if self.variable_cache is not None:
+            self.variable_cache.clear()
+        return self
+
+    def load_netcdf_files(self, nc_file_paths: list[Path], record_dimension: Optional[str] = None,
+                          memory_map: bool = True):
         """
-        Method dedicated to loading a netCDF file to be checked with quality control
-        :param nc_file_path: path to the netCDF file
+        Method dedicated to loading an ordered set of netCDF files, for example a day of 10-minute files, to be
+        checked as one dataset joined along their record dimension (see multifile.py). The records are read
+        from the files slab by slab, so runs of identical values and differences between adjacent values are
+        checked across the boundaries between the files without concatenating the files in memory.
+        Without a memory budget, the record variables are read one file at a time.
+        :param nc_file_paths: the paths to the netCDF files, in the order of their records
+        :param record_dimension: name of the dimension along which the files are joined. Defaults to None,
+                                 which uses the unlimited dimension of the first file.
+        :param memory_map: True to read NETCDF3 classic files from a memory map. Defaults to True.
         :return: self
         """
-        self.nc = netCDF4.Dataset(nc_file_path)  # pylint: disable=no-member
+        self.nc = MultiFileDataset(nc_file_paths, record_dimension, memory_map)
+        self.nc_buffer = None
+        if self.variable_cache is not None:
+            self.variable_cache.clear()
         return self
 
+    def enable_profiling(self, trace_memory: bool = False):
+        """
+        Method dedicated to turning on profiling of the checks. The wall time, CPU time, bytes and data points
+        read and (optionally) the peak memory of every check and variable are measured, and added to the next
+        report under the key 'timings'.
+        :param trace_memory: True to trace the peak memory with tracemalloc, which slows down the checks
+                             considerably. Defaults to False.
+        :return: self
+        """
+        self.disable_profiling()
+        self.profiler = Profiler(trace_memory=trace_memory)
+        return self
+
+    def disable_profiling(self):
+        """
+        Method dedicated to turning off profiling of the checks
+        :return: self
+        """
+        if self.profiler is not None:
+            self.profiler.close()
+            self.profiler = None
+        return self
+
+    def get_timings(self) -> list[dict]:
+        """
+        Method dedicated to getting the timing table of the checks performed since the last report
+        :return: the timing table (see `profiling.Profiler.table`), empty if profiling is turned off
+        """
+        if self.profiler is None:
+            return []
+        return self.profiler.table()
+
+    def _measure(self, check: str, var_name: Optional[str] = None):
+        """
+        Method dedicated to measuring a check on a variable if profiling is turned on
+        :param check: name of the check, or 'read' for reading a variable
+        :param var_name: name of the variable. Defaults to None, for a check on all variables.
+        :return: context manager giving the measurement in progress, or None if profiling is turned off
+        """
+        if self.profiler is None:
+            return NO_PROFILING
+        return self.profiler.measure(check, var_name)
+
+    def _read_var(self, var_name: str, slab: Optional[tuple] = None) -> np.ndarray:
+        """
+        Method dedicated to reading the values of a variable from the loaded netCDF file, or from the variable
+        cache if the same values were read before (the read is only measured when the file is read)
+        :param var_name: name of the variable
+        :param slab: tuple with a slice for every dimension of the variable. Defaults to None, for all values.
+        :return: the (masked) values of the variable, read-only if they are cached
+        :raises concurrent.futures.CancelledError: if the cancel event is set
+        """
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise CancelledError(f"checks cancelled before reading variable '{var_name}'")
+
+        key = None
+        if self.variable_cache is not None:
+            slab_key = None if slab is None else tuple((dim.start, dim.stop, dim.step) for dim in slab)
+            key = (self.nc.filepath(), var_name, slab_key)
+            values = self.variable_cache.get(key)
+            if values is not None:
+                return values
+
+        with self._measure('read', var_name) as measurement:
+            values = self.nc[var_name][:] if slab is None else self.nc[var_name][slab]
+            if measurement is not None:
+                measurement.add_data(values)
+
+        if key is not None:
+            values = self.variable_cache.put(key, values)
+        return values
+
+    def _run_var_checks(self, var_name: str, checks: list[str], loggers: dict,
+                        checkpoint: Optional[Checkpoint] = None) -> dict:
+        """
+        Method dedicated to performing data checks on a single variable of the loaded netCDF file.
+        The variable is read only once for all checks, in slabs if a memory budget is set or if it is joined
+        over multiple files.
+        :param var_name: name of the variable
+        :param checks: the data checks to perform (see DATA_CHECKS)
+        :param loggers: dictionary with the logger to log the results of each check to
+        :param checkpoint: the checkpoint of the incremental checks, only used for variables of which
+                           the first dimension is unlimited. Defaults to None.
+        :return: dictionary with the value returned by each check
+        """
+        data_checks = []
+        for check in checks:
+            if check == 'data_points_amount_check' and \
+                    self._data_points_amount_count(var_name, loggers[check]) == 'all':
+                # the number of data points follows from the shape of the variable, no data has to be read
+                with self._measure(check, var_name):
+                    self._log_data_points_amount_result(var_name, self.nc[var_name].size, loggers[check])
+            else:
+                data_checks.append(check)
+
+        if not data_checks:
+            return {}
+        if checkpoint is not None and self._is_record_var(var_name):
+            return self._stream_var_checks(var_name, data_checks, loggers, checkpoint)
+        if self.memory_budget is not None or self.fail_fast is not None or \
+                isinstance(self.nc[var_name], MultiFileVariable):
+            return self._stream_var_checks(var_name, data_checks, loggers)
+        return self._run_var_checks_in_memory(var_name, data_checks, loggers)
+
+    def _iter_var_slabs(self, var_name: str, memory_budget: Optional[int], first: int = 0) -> Iterator[tuple]:
+        """
+        Method dedicated to iterating over the slabs in which a variable of the loaded netCDF file is read
+        (see streaming.iter_slabs). Without a memory budget, a variable joined over multiple files is read
+        one file at a time instead of in one slab.
+        :param var_name: name of the variable
+        :param memory_budget: the maximum number of bytes for a slab, None to read the variable in one slab
+        :param first: the index along the first axis of the first slab. Defaults to 0.
+        :return: iterator over tuples of slices, one slice per dimension
+        """
+        variable = self.nc[var_name]
+        if memory_budget is None and isinstance(variable, MultiFileVariable):
+            return variable.file_slabs(first)
+        return iter_slabs(variable.shape, variable.chunking(), variable.dtype.itemsize, memory_budget, first=first)
+
+    def _is_record_var(self, var_name: str) -> bool:
+        """
+        Method dedicated to checking whether records are appended to a variable of the loaded netCDF file,
+        that is whether its first dimension is unlimited
+        :param var_name: name of the variable
+        :return: True if the first dimension of the variable is unlimited
+        """
+        dimensions = self.nc[var_name].dimensions
+        return bool(dimensions) and self.nc.dimensions[dimensions[0]].isunlimited()
+
+    def _run_var_checks_in_memory(self, var_name: str, checks: list[str], loggers: dict) -> dict:
+        """
+        Method dedicated to performing data checks on a single variable of the loaded netCDF file
+        by reading it in full, after which all checks are performed on the same array.
+        :param var_name: name of the variable
+        :param checks: the data checks to perform (see DATA_CHECKS)
+        :param loggers: dictionary with the logger to log the results of each check to
+        :return: dictionary with the value returned by each check
+        """
+        var_checks = {
+            'emptiness_check': self._emptiness_check_var,
+            'data_points_amount_check': self._data_points_amount_check_var,
+            'data_boundaries_check': self._data_boundaries_check_var,
+            'consecutive_identical_values_check': self._consecutive_identical_values_check_var,
+            'adjacent_values_difference_check': self._adjacent_values_difference_check_var
+        }
+
+        var_values = self._read_var(var_name)
+
+        results = {}
+        for check in checks:
+            with self._measure(check, var_name):
+                results[check] = var_checks[check](var_name, var_values, loggers[check])
+        return results
+
+    def _stream_var_checks(self, var_name: str, checks: list[str], loggers: dict,
+                           checkpoint: Optional[Checkpoint] = None) -> dict:
+        """
+        Method dedicated to performing data checks on a single variable of the loaded netCDF file
+        by reading it slab by slab, such that no more than memory_budget bytes are read at once.
+        With a checkpoint, the accumulators are restored from the checkpoint, only the records which were not
+        checked yet are read, and the accumulators are stored in the checkpoint again.
+        When failing fast, checks are stopped after the first slab which makes them fail (see fail_fast),
+        and checks stopped before they failed are logged as not completed. The results of checks which failed
+        before the whole variable was read only cover the data read, and are logged as partial.
+        :param var_name: name of the variable
+        :param checks: the data checks to perform (see DATA_CHECKS)
+        :param loggers: dictionary with the logger to log the results of each check to
+        :param checkpoint: the checkpoint of the incremental checks. Defaults to None.
+        :return: dictionary with the value returned by each check
+        """
+        variable = self.nc[var_name]
+        results = {}
+        accumulators = {}
+
+        for check in checks:
+            if check == 'emptiness_check':
+                accumulators[check] = [EmptinessAccumulator(variable.shape)]
+            elif check == 'data_points_amount_check':
+                accumulators[check] = [PointsAmountAccumulator()]
+            elif check == 'data_boundaries_check':
+                accumulators[check] = [BoundariesAccumulator(
+                    self.plan.check_config(var_name, 'data_boundaries_check')['lower_bound'],
+                    self.plan.check_config(var_name, 'data_boundaries_check')['upper_bound'],
+                    max_values=max(self.max_point_messages, SUMMARY_INDICES))]
+            elif check == 'consecutive_identical_values_check':
+                accumulator = self._consecutive_identical_values_accumulator(var_name, variable.shape, loggers[check])
+                accumulators[check] = [accumulator] if accumulator is not None else []
+            else:
+                accumulators[check] = [accumulator for _, accumulator in
+                                       self._adjacent_values_difference_accumulators(var_name, variable.shape,
+                                                                                     loggers[check])]
+
+        first_record = 0
+        if checkpoint is not None:
+            first_record = checkpoint.restore(var_name, accumulators, variable.shape, variable.dtype)
+
+        memory_budget = self.memory_budget
+        if memory_budget is None and self.fail_fast is not None:
+            # one chunk at a time, so a failing check is stopped after reading its first offending chunk
+            memory_budget = chunk_memory_budget(variable.chunking(), variable.dtype.itemsize) or FAIL_FAST_SLAB_BYTES
+
+        # the checks stopped when failing fast, the checks stopped before they failed and the number of data
+        # points each check processed
+        stopped = set()
+        not_completed = set()
+        points_checked = dict.fromkeys(accumulators, 0)
+
+        if any(accumulators.values()):
+            for slab in self._iter_var_slabs(var_name, memory_budget, first=first_record):
+                slab_values = self._read_var(var_name, slab)
+                slab_start = tuple(dim_slice.start for dim_slice in slab)
+                for check, check_accumulators in accumulators.items():
+                    if check in stopped:
+                        continue
+                    with self._measure(check, var_name):
+                        for accumulator in check_accumulators:
+                            accumulator.update(slab_values, slab_start)
+                    points_checked[check] += np.size(slab_values)
+
+                if self.fail_fast is None:
+                    continue
+                failed = {check for check, check_accumulators in accumulators.items()
+                          if check not in stopped and any(accumulator.failed() for accumulator in check_accumulators)}
+                if failed and self.fail_fast != 'check':
+                    stopped = set(accumulators)
+                    not_completed = {check for check, check_accumulators in accumulators.items()
+                                     if check_accumulators and check not in failed}
+                    break
+                stopped |= failed
+                if all(check in stopped for check, check_accumulators in accumulators.items() if check_accumulators):
+                    break
+
+        # the data points of the records which were not checked yet
+        points_to_check = int(np.prod(variable.shape[1:])) * (variable.shape[0] - first_record) \
+            if variable.shape else 1
+
+        if checkpoint is not None and not stopped:
+            # stored before taking the results, as taking the result of the runs ends the runs carried over
+            checkpoint.store(var_name, accumulators, variable.shape, variable.dtype)
+
+        for check, check_accumulators in accumulators.items():
+            if check in not_completed:
+                loggers[check].add_info(f"{check} for variable '{var_name}': NOT COMPLETED "
+                                        f"(fail_fast='{self.fail_fast}')")
+                continue
+            with self._measure(check, var_name):
+                for accumulator in check_accumulators:
+                    if check == 'emptiness_check':
+                        results[check] = self._log_emptiness_result(var_name, variable.dimensions,
+                                                                    accumulator.result(), loggers[check])
+                    elif check == 'data_points_amount_check':
+                        self._log_data_points_amount_result(var_name, accumulator.result()['valid'],
+                                                            loggers[check], valid=True)
+                    elif check == 'data_boundaries_check':
+                        self._log_data_boundaries_result(var_name, accumulator.result(), loggers[check])
+                    elif check == 'consecutive_identical_values_check':
+                        self._log_consecutive_identical_values_result(var_name, accumulator.result(),
+                                                                      loggers[check])
+                    else:
+                        self._log_adjacent_values_difference_result(var_name, accumulator.axis,
+                                                                    accumulator.result(), loggers[check])
+            if check in stopped and check_accumulators and points_checked[check] < points_to_check:
+                loggers[check].add_info("{} for variable '{}': PARTIAL (fail_fast='{}'), the results only cover "
+                                        "{} of {} data points", check, var_name, self.fail_fast,
+                                        points_checked[check], points_to_check, check=check, variable=var_name)
+
+        return results
+
+    @profiled
+    @planned
     def data_boundaries_check(self, all_checks_run: bool = False):
         """
         Method dedicated to checking whether the data for each variable in
@@ -141,7 +603,10 @@ class QualityControl:
         - logs an error to the logger if no netCDF file is loaded
         - logs a warning to the logger if a variable specified to be checked does
           not exist in the netCDF file
-        - logs an error to the logger if a value is out of the specified bounds
+        - logs an error to the logger for each value out of the specified bounds,
+          up to max_point_messages values per variable
+        - logs a summary error to the logger with the number of values out of bounds, the lowest and highest
+          offending value and the indices of the first offending values if not all of them were logged
         - writes a message to the logger whether a boundary check for a variable
           succeeded or failed
 
@@ -154,35 +619,60 @@ class QualityControl:
             self.logger.add_error("data_boundaries_check error: no nc file loaded")
             return self
 
-        vars_to_check = [
-            var_name for var_name, properties in self.qc_checks_vars.items()
-            if 'data_boundaries_check' in properties.keys()
-        ]
+        vars_nc_file = self.nc.variables
 
-        vars_nc_file = list(self.nc.variables.keys())
-
-        for var_name in vars_to_check:
+        for var_name in self.plan.vars_for('data_boundaries_check'):
             if var_name not in vars_nc_file:
                 if not all_checks_run:
                     self.logger.add_warning(f"variable '{var_name}' not in nc file")
                 continue
 
-            lower_bound = self.qc_checks_vars[var_name]['data_boundaries_check']['lower_bound']
-            upper_bound = self.qc_checks_vars[var_name]['data_boundaries_check']['upper_bound']
+            self._run_var_checks(var_name, ['data_boundaries_check'], {'data_boundaries_check': self.logger})
+        return self
 
-            # use np.ravel to flatten the (possibly multidimensional) array into a 1-d array
-            var_values = np.ravel(self.nc[var_name][:])
+    def _data_boundaries_check_var(self, var_name: str, var_values: np.ndarray, logger: LoggerQC):
+        """
+        Method dedicated to performing the boundary check on the values of a single variable
+        :param var_name: name of the variable
+        :param var_values: the values of the variable
+        :param logger: the logger to log the results to
+        """
+        lower_bound = self.plan.check_config(var_name, 'data_boundaries_check')['lower_bound']
+        upper_bound = self.plan.check_config(var_name, 'data_boundaries_check')['upper_bound']
 
-            success = True
-            for val in var_values:
-                if val < lower_bound or val > upper_bound:
-                    success = False
-                    self.logger.add_error(f"boundary check error: '{val}' out of bounds for variable '"
-                                          f"{var_name}' with bounds [{lower_bound},{upper_bound}]")
-
-            self.logger.add_info(f"boundary check for variable '{var_name}': {'SUCCESS' if success else 'FAIL'}")
-        return self
+        # all offending values are found in a single vectorized pass over the (possibly multidimensional) array
+        violations = boundaries_violations(var_values, lower_bound, upper_bound,
+                                           max_values=max(self.max_point_messages, SUMMARY_INDICES))
+        self._log_data_boundaries_result(var_name, violations, logger)
 
+    def _log_data_boundaries_result(self, var_name: str, violations: dict, logger: LoggerQC):
+        """
+        Method dedicated to logging the result of the boundary check for a single variable
+        :param var_name: name of the variable
+        :param violations: the values out of bounds, see `kernels.boundaries_violations`
+        :param logger: the logger to log the result to
+        """
+        lower_bound = self.plan.check_config(var_name, 'data_boundaries_check')['lower_bound']
+        upper_bound = self.plan.check_config(var_name, 'data_boundaries_check')['upper_bound']
+
+        # the messages of single data points are only formatted when the report is created
+        for val, index in zip(violations['values'][:self.max_point_messages], violations['indices']):
+            logger.add_error("boundary check error: '{}' out of bounds for variable '{}' with bounds [{},{}]",
+                             val, var_name, lower_bound, upper_bound,
+                             check='data_boundaries_check', variable=var_name, index=index)
+
+        if violations['count'] > self.max_point_messages:
+            logger.add_error(f"boundary check error: {violations['count']} values out of bounds for "
+                             f"variable '{var_name}' with bounds [{lower_bound},{upper_bound}] "
+                             f"(lowest: {violations['min']}, highest: {violations['max']}, "
+                             f"first indices: {violations['indices'][:SUMMARY_INDICES]})",
+                             check='data_boundaries_check', variable=var_name)
+
+        success = violations['count'] == 0
+        logger.add_info(f"boundary check for variable '{var_name}': {'SUCCESS' if success else 'FAIL'}")
+
+    @profiled
+    @planned
     def existence_check(self):  # pylint: disable=too-many-branches
         """
         Method to perform existence checks on dimensions, variables and global attributes.
@@ -201,15 +691,12 @@ class QualityControl:
         # Dimensions, variables, and global attributes from the netCDF dict
         nc_dimensions = self.nc.dimensions.keys()
         nc_variables = self.nc.variables.keys()
-        nc_global_attributes = self.nc.ncattrs()
+        nc_global_attributes = set(self.nc.ncattrs())
 
         # Dimensions, variables, and global attributes with 'existence_check' True in the config file
-        dims_to_check = [dim for dim, properties in self.qc_checks_dims.items()
-                         if 'existence_check' in properties.keys() and properties['existence_check'] is True]
-        vars_to_check = [var for var, properties in self.qc_checks_vars.items()
-                         if 'existence_check' in properties.keys() and properties['existence_check'] is True]
-        attrs_to_check = [attr for attr, properties in self.qc_checks_gl_attrs.items()
-                          if 'existence_check' in properties.keys() and properties['existence_check'] is True]
+        dims_to_check = self.plan.dims_by_check.get('existence_check', ())
+        vars_to_check = self.plan.vars_for('existence_check')
+        attrs_to_check = self.plan.gl_attrs_by_check.get('existence_check', ())
 
         checked = 0
         exist = 0
@@ -264,8 +751,9 @@ class QualityControl:
 
         return self
 
-    def emptiness_check(self,
-                        all_checks_run: bool = False):  # pylint: disable=too-many-branches, disable=too-many-statements
+    @profiled
+    @planned
+    def emptiness_check(self, all_checks_run: bool = False):
         """
         Method to perform emptiness checks on variables and global attributes.
 
@@ -283,96 +771,126 @@ class QualityControl:
             self.logger.add_error("emptiness_check error: no nc file loaded")
             return self
 
-        vars_nc_file = list(self.nc.variables.keys())
-
-        # Variables and global attributes with 'emptiness_check' True in the config file
-        vars_to_check = [var for var, properties in self.qc_checks_vars.items()
-                         if 'emptiness_check' in properties.keys() and properties['emptiness_check'] is True]
-        attrs_to_check = [attr for attr, properties in self.qc_checks_gl_attrs.items()
-                          if 'emptiness_check' in properties.keys() and properties['emptiness_check'] is True]
+        vars_nc_file = self.nc.variables
 
         checked_vars = 0
         non_empty_vars = 0
 
-        # Loop over all variables in the config file
-        for var in vars_to_check:
+        # Loop over all variables with 'emptiness_check' True in the config file
+        for var in self.plan.vars_for('emptiness_check'):
             if var not in vars_nc_file:
                 if not all_checks_run:
                     self.logger.add_warning(f"variable '{var}' not in nc file")
                 continue
 
             checked_vars += 1
-            var_data = self.nc[var][:]
-
-            checked_vals = 0
-            empty_vals = 0
-            nan_vals = 0
-
-            # Check scalar values (e.g., longitude which just has one value assigned)
-            if var_data.ndim == 0:
-                val = var_data.item()
-                if not val:
-                    self.logger.add_error(error=f'scalar variable "{var}" is empty')
-                elif np.isnan(val):
-                    self.logger.add_error(error=f'scalar variable "{var}" is NaN')
-                else:
-                    non_empty_vars += 1
-            # Loop over all data points for a variable
-            else:
-                for val in var_data:
-                    checked_vals += 1
+            if self._run_var_checks(var, ['emptiness_check'], {'emptiness_check': self.logger})['emptiness_check']:
+                non_empty_vars += 1
 
-                    if not val:
-                        empty_vals += 1
-                    elif np.isnan(val):
-                        nan_vals += 1
+        self._emptiness_check_summary(checked_vars, non_empty_vars, self.logger)
+        self._emptiness_check_gl_attrs(self.logger)
 
-                # Log error if there are empty values
-                if empty_vals > 0:
-                    self.logger.add_error(error=f'variable "{var}" has {empty_vals}/{checked_vals} empty data points')
-
-                # Log error if there are NaN values
-                if nan_vals > 0:
-                    self.logger.add_error(error=f'variable "{var}" has {nan_vals}/{checked_vals} NaN data points')
+        return self
 
-                if empty_vals == 0 and nan_vals == 0:
-                    non_empty_vars += 1
+    def _emptiness_check_var(self, var: str, var_data: np.ndarray, logger: LoggerQC) -> bool:
+        """
+        Method dedicated to performing the emptiness check on the values of a single variable
+        :param var: name of the variable
+        :param var_data: the values of the variable
+        :param logger: the logger to log the results to
+        :return: True if the variable is fully populated, False otherwise
+        """
+        # empty and NaN data points are counted in a single vectorized pass over the (multidimensional) array
+        accumulator = EmptinessAccumulator(var_data.shape)
+        accumulator.update(var_data, (0,) * var_data.ndim)
+        return self._log_emptiness_result(var, self.nc[var].dimensions, accumulator.result(), logger)
 
-        # Log info about how many of the checked variables exist
+    @staticmethod
+    def _log_emptiness_result(var: str, dimensions: tuple, result: dict, logger: LoggerQC) -> bool:
+        """
+        Method dedicated to logging the result of the emptiness check for a single variable.
+        For multidimensional variables, an error is logged for each dimension with indices at which
+        all data points are empty or NaN (for example completely empty time steps).
+        :param var: name of the variable
+        :param dimensions: names of the dimensions of the variable
+        :param result: the number of checked, empty and NaN data points, see `streaming.EmptinessAccumulator`
+        :param logger: the logger to log the result to
+        :return: True if the variable is fully populated, False otherwise
+        """
+        if not dimensions:
+            if result['empty']:
+                logger.add_error(error=f'scalar variable "{var}" is empty', check='emptiness_check', variable=var)
+            elif result['nan']:
+                logger.add_error(error=f'scalar variable "{var}" is NaN', check='emptiness_check', variable=var)
+            return not result['empty'] and not result['nan']
+
+        if result['empty'] > 0:
+            logger.add_error(error=f'variable "{var}" has {result["empty"]}/{result["checked"]} empty data points',
+                             check='emptiness_check', variable=var)
+
+        if result['nan'] > 0:
+            logger.add_error(error=f'variable "{var}" has {result["nan"]}/{result["checked"]} NaN data points',
+                             check='emptiness_check', variable=var)
+
+        for dimension, empty_along in zip(dimensions, result['empty_along']):
+            empty_indices = np.flatnonzero(empty_along)
+            if empty_indices.size > 0:
+                logger.add_error(error=f'variable "{var}" has {empty_indices.size}/{empty_along.size} completely '
+                                       f'empty indices along dimension "{dimension}" (first indices: '
+                                       f'{empty_indices[:SUMMARY_INDICES].tolist()})',
+                                 check='emptiness_check', variable=var)
+
+        return result['empty'] == 0 and result['nan'] == 0
+
+    @staticmethod
+    def _emptiness_check_summary(checked_vars: int, non_empty_vars: int, logger: LoggerQC):
+        """
+        Method dedicated to logging how many of the variables checked for emptiness are fully populated
+        :param checked_vars: number of variables checked for emptiness
+        :param non_empty_vars: number of checked variables which are fully populated
+        :param logger: the logger to log the summary to
+        """
         if checked_vars != 0:
-            self.logger.add_info(msg=f'{non_empty_vars}/{checked_vars} checked variables are fully populated')
+            logger.add_info(msg=f'{non_empty_vars}/{checked_vars} checked variables are fully populated')
         else:
-            self.logger.add_info(msg='no variables were checked for emptiness')
+            logger.add_info(msg='no variables were checked for emptiness')
+
+    def _emptiness_check_gl_attrs(self, logger: LoggerQC):
+        """
+        Method dedicated to performing the emptiness check on the global attributes
+        :param logger: the logger to log the results to
+        """
+        nc_global_attributes = set(self.nc.ncattrs())
 
         checked_attrs = 0
         non_empty_attrs = 0
 
-        # Loop over all global attributes in the config file, log error if it should exist but does not
-        for attr in attrs_to_check:
-            if attr not in self.nc.ncattrs():
+        # Loop over all global attributes with 'emptiness_check' True in the config file
+        for attr in self.plan.gl_attrs_by_check.get('emptiness_check', ()):
+            if attr not in nc_global_attributes:
                 continue
 
             checked_attrs += 1
             if not self.nc.getncattr(attr):
-                self.logger.add_error(error=f'global attribute "{attr}" is empty')
+                logger.add_error(error=f'global attribute "{attr}" is empty')
             else:
                 non_empty_attrs += 1
 
         # Log info about how many of the checked global attributes have values assigned
         if checked_attrs != 0:
-            self.logger.add_info(
+            logger.add_info(
                 msg=f'{non_empty_attrs}/{checked_attrs} checked global attributes have values assigned')
         else:
-            self.logger.add_info(msg='no global attributes were checked for emptiness')
-
-        return self
+            logger.add_info(msg='no global attributes were checked for emptiness')
 
+    @profiled
+    @planned
     def file_size_check(self):
         """
         Method to perform file size checks on the loaded netCDF file
 
         - logs an error if there is no netCDF file loaded
-        - logs an error if the file size is out of the specified bounds
+        - logs an error if the file size is out of the specified bounds, for every file of a multi-file dataset
         - logs an info message stating whether the check is successful or not
 
         :return: self
@@ -381,13 +899,30 @@ class QualityControl:
             self.logger.add_error("file_size_check error: no nc file loaded")
             return self
 
-        if not self.qc_check_file_size:
+        if not self.plan.file_size:
             return self
 
-        lower_bound = self.qc_check_file_size['lower_bound']
-        upper_bound = self.qc_check_file_size['upper_bound']
+        lower_bound = self.plan.file_size['lower_bound']
+        upper_bound = self.plan.file_size['upper_bound']
+
+        if isinstance(self.nc, MultiFileDataset):
+            # the bounds are the bounds of every single file
+            failed = False
+            for nc_file_path in self.nc.filepaths():
+                nc_file_size = Path(nc_file_path).stat().st_size
+                if nc_file_size < lower_bound or nc_file_size > upper_bound:
+                    self.logger.add_error(f"file size check error: size of file '{nc_file_path}' "
+                                          f"({nc_file_size} bytes) is out of bounds for bounds: "
+                                          f"[{lower_bound},{upper_bound}]")
+                    failed = True
+            self.logger.add_info(f"file size check: {'FAIL' if failed else 'SUCCESS'}")
+            return self
 
-        nc_file_size = Path(self.nc.filepath()).stat().st_size
+        if self.nc_buffer is not None:
+            with memoryview(self.nc_buffer) as buffer:
+                nc_file_size = buffer.nbytes
+        else:
+            nc_file_size = Path(self.nc.filepath()).stat().st_size
 
         if nc_file_size < lower_bound or nc_file_size > upper_bound:
             self.logger.add_error(f'file size check error: size of loaded file ({nc_file_size} bytes)'
@@ -398,12 +933,18 @@ class QualityControl:
         self.logger.add_info('file size check: SUCCESS')
         return self
 
+    @profiled
+    @planned
     def data_points_amount_check(self, all_checks_run: bool = False):
         """
         Method to perform amount of data points for each variable check.
         Method checks if the amount of data points is above a given minimum.
+        By default all data points are counted, which only uses the shape of the variable and reads no data.
+        With 'count: valid' in the configuration of a variable, only the data points which are not equal to
+        the fill value are counted, which requires reading (or streaming through) the data.
 
         - logs an error if there is no netCDF file loaded
+        - logs a warning if the count specified for a variable is not 'all' or 'valid'
         - logs an error if the number of data points for a variable is below the specified minimum
         - logs an info message for each variable, stating whether the check is successful or not
 
@@ -416,29 +957,70 @@ class QualityControl:
             self.logger.add_error("data_points_amount_check error: no nc file loaded")
             return self
 
-        vars_to_check = [var for var, properties in self.qc_checks_vars.items()
-                         if 'data_points_amount_check' in properties.keys()]
-
-        vars_nc_file = list(self.nc.variables.keys())
+        vars_nc_file = self.nc.variables
 
-        for var_name in vars_to_check:
+        for var_name in self.plan.vars_for('data_points_amount_check'):
             if var_name not in vars_nc_file:
                 if not all_checks_run:
                     self.logger.add_warning(f"variable '{var_name}' not in nc file")
                 continue
 
-            minimum = self.qc_checks_vars[var_name]['data_points_amount_check']['minimum']
-            var_values_size = self.nc[var_name][:].size  # total number of data points over all dimensions
-
-            if minimum > var_values_size:
-                self.logger.add_error(f"data points amount check error: number of data points ({var_values_size})"
-                                      f" for variable '{var_name}' is below the specified minimum ({minimum})")
-                self.logger.add_info(f"data points amount check for variable '{var_name}': FAIL")
-            else:
-                self.logger.add_info(f"data points amount check for variable '{var_name}': SUCCESS")
+            self._run_var_checks(var_name, ['data_points_amount_check'], {'data_points_amount_check': self.logger})
 
         return self
 
+    def _data_points_amount_check_var(self, var_name: str, var_values: np.ndarray, logger: LoggerQC):
+        """
+        Method dedicated to performing the data points amount check on the values of a single variable,
+        which is only needed when counting the valid data points (see `_data_points_amount_count`)
+        :param var_name: name of the variable
+        :param var_values: the values of the variable
+        :param logger: the logger to log the results to
+        """
+        # number of data points over all dimensions which are not equal to the fill value
+        self._log_data_points_amount_result(var_name, int(np.ma.count(var_values)), logger, valid=True)
+
+    def _data_points_amount_count(self, var_name: str, logger: LoggerQC) -> str:
+        """
+        Method dedicated to getting which data points are counted by the data points amount check of a variable,
+        set through the optional 'count' field in the configuration:
+        - 'all' (default): all data points, taken from the shape of the variable without reading any data
+        - 'valid': the data points which are not equal to the fill value, which requires reading the data
+        Logs a warning and counts all data points if the field has any other value.
+        :param var_name: name of the variable
+        :param logger: the logger to log to
+        :return: 'all' or 'valid'
+        """
+        count = self.plan.check_config(var_name, 'data_points_amount_check').get('count', 'all')
+
+        if count not in ('all', 'valid'):
+            logger.add_warning(f"data_points_amount_check: unknown count '{count}' for variable '{var_name}', "
+                               f"counting all data points")
+            return 'all'
+
+        return count
+
+    def _log_data_points_amount_result(self, var_name: str, var_values_size: int, logger: LoggerQC,
+                                       valid: bool = False):
+        """
+        Method dedicated to logging the result of the data points amount check for a single variable
+        :param var_name: name of the variable
+        :param var_values_size: the number of (valid) data points of the variable
+        :param logger: the logger to log the result to
+        :param valid: True if only the valid data points were counted
+        """
+        minimum = self.plan.check_config(var_name, 'data_points_amount_check')['minimum']
+
+        if minimum > var_values_size:
+            logger.add_error(f"data points amount check error: number of {'valid ' if valid else ''}data points "
+                             f"({var_values_size}) for variable '{var_name}' is below the specified minimum "
+                             f"({minimum})", check='data_points_amount_check', variable=var_name)
+            logger.add_info(f"data points amount check for variable '{var_name}': FAIL")
+        else:
+            logger.add_info(f"data points amount check for variable '{var_name}': SUCCESS")
+
+    @profiled
+    @planned
     def adjacent_values_difference_check(self, all_checks_run: bool = False):
         """
         Method dedicated to checking whether the difference between 2 adjacent
@@ -464,73 +1046,108 @@ class QualityControl:
             self.logger.add_error("adjacent_values_difference_check error: no nc file loaded")
             return self
 
-        # Variables with 'adjacent_values_difference_check' in the config file
-        vars_to_check = [var for var, properties in self.qc_checks_vars.items()
-                         if "adjacent_values_difference_check" in properties.keys()]
+        vars_nc_file = self.nc.variables
 
-        vars_nc_file = list(self.nc.variables.keys())
-
-        # goes through all variables that should be checked
-        for var_name in vars_to_check:
+        for var_name in self.plan.vars_for('adjacent_values_difference_check'):
             # checks if variable is in NetCDF file
             if var_name not in vars_nc_file:
                 if not all_checks_run:
                     self.logger.add_warning(f"variable '{var_name}' not in nc file")
                 continue
 
-            # gets all values of the variable
-            var_values = self.nc[var_name][:]
+            self._run_var_checks(var_name, ['adjacent_values_difference_check'],
+                                 {'adjacent_values_difference_check': self.logger})
 
-            # gets the specified dimensions
-            dimensions = self.qc_checks_vars[var_name]['adjacent_values_difference_check'][
-                'over_which_dimension']
-            # gets the maximum allowed difference for each dimension
-            dimensions_maximum_difference = \
-                self.qc_checks_vars[var_name]['adjacent_values_difference_check']['maximum_difference']
+        return self
 
-            if not dimensions:
-                self.logger.add_warning(f"dimension/s to check not specified")
-                continue
+    def _adjacent_values_difference_check_var(self, var_name: str, var_values: np.ndarray, logger: LoggerQC):
+        """
+        Method dedicated to performing the adjacent values difference check on the values of a single variable
+        :param var_name: name of the variable
+        :param var_values: the values of the variable
+        :param logger: the logger to log the results to
+        """
+        accumulators = self._adjacent_values_difference_accumulators(var_name, var_values.shape, logger)
 
-            # check if maximum difference is specified
-            if not dimensions_maximum_difference:
-                self.logger.add_warning(f"maximum difference/s to check not specified")
-                continue
+        # all differences along a dimension are found in a single vectorized pass over the array
+        for d, accumulator in accumulators:
+            accumulator.update(var_values, (0,) * var_values.ndim)
+            self._log_adjacent_values_difference_result(var_name, d, accumulator.result(), logger)
 
-            # check if variable has as many dimensions as specified
-            if len(var_values.shape) != len(dimensions):
-                self.logger.add_warning(f"variable {var_name} doesn't have {len(dimensions)} dimensions")
+    def _adjacent_values_difference_accumulators(
+            self, var_name: str, shape: tuple, logger: LoggerQC) -> list[tuple[int, AdjacentDifferencesAccumulator]]:
+        """
+        Method dedicated to setting up the adjacent values difference check for a single variable.
+        Logs a warning if the dimensions or maximum differences are not specified, if the variable does not
+        have as many dimensions as specified, or if the maximum difference of a dimension is not specified.
+        :param var_name: name of the variable
+        :param shape: shape of the variable
+        :param logger: the logger to log to
+        :return: list with a tuple (dimension, accumulator) for each dimension to check
+        """
+        # gets the specified dimensions
+        dimensions = self.plan.check_config(var_name, 'adjacent_values_difference_check')['over_which_dimension']
+        # gets the maximum allowed difference for each dimension
+        dimensions_maximum_difference = \
+            self.plan.check_config(var_name, 'adjacent_values_difference_check')['maximum_difference']
+
+        if not dimensions:
+            logger.add_warning("dimension/s to check not specified")
+            return []
+
+        # check if maximum difference is specified
+        if not dimensions_maximum_difference:
+            logger.add_warning("maximum difference/s to check not specified")
+            return []
+
+        # check if variable has as many dimensions as specified
+        if len(shape) != len(dimensions):
+            logger.add_warning(f"variable {var_name} doesn't have {len(dimensions)} dimensions")
+            return []
+
+        accumulators = []
+        for d in dimensions:
+            try:
+                # gets the maximum difference for each dimension
+                maximum_difference = list(dimensions_maximum_difference)[d]
+            except IndexError:
+                logger.add_warning(f"maximum difference not specified for dimension {d}")
                 continue
 
-            for d in dimensions:
-                success = True
-                # calculates the difference between 2 adjacent values
-                difference_array = np.diff(var_values, axis=d)
-                # flattens the array
-                flat_difference_array = difference_array.flatten()
-
-                try:
-                    # gets the maximum difference for each dimension
-                    maximum_difference = list(dimensions_maximum_difference)[d]
-
-                except IndexError:
-                    success = False
-                    self.logger.add_warning(f"maximum difference not specified for dimension {d}")
-                    continue
+            accumulators.append((d, AdjacentDifferencesAccumulator(
+                maximum_difference, shape, d, max_values=max(self.max_point_messages, SUMMARY_INDICES))))
 
-                # goes through flattened array of adjacent differences
-                for i in flat_difference_array:
-                    difference = abs(i)
-                    if difference > maximum_difference:
-                        success = False
-                        self.logger.add_error(
-                            f"difference of '{difference}' exceeds the maximum difference of '{maximum_difference}'")
-
-                self.logger.add_info(f"adjacent_values_difference_check for variable "
-                                     f"'{var_name}' and dimension '{d}': {'SUCCESS' if success else 'FAIL'}")
-
-        return self
+        return accumulators
 
+    def _log_adjacent_values_difference_result(self, var_name: str, d: int, result: dict, logger: LoggerQC):
+        """
+        Method dedicated to logging the result of the adjacent values difference check for a single variable
+        and dimension
+        :param var_name: name of the variable
+        :param d: the dimension along which values are adjacent
+        :param result: the differences larger than the maximum, see `kernels.adjacent_exceedances`
+        :param logger: the logger to log the result to
+        """
+        maximum_difference = list(self.plan.check_config(var_name, 'adjacent_values_difference_check')[
+            'maximum_difference'])[d]
+
+        for difference, index in zip(result['values'][:self.max_point_messages], result['indices']):
+            logger.add_error("difference of '{}' exceeds the maximum difference of '{}'",
+                             difference, maximum_difference,
+                             check='adjacent_values_difference_check', variable=var_name, index=index)
+
+        if result['count'] > self.max_point_messages:
+            logger.add_error(f"{result['count']} differences between adjacent values along dimension '{d}' of "
+                             f"variable '{var_name}' exceed the maximum difference of '{maximum_difference}' "
+                             f"(largest: {result['max']}, first indices: {result['indices'][:SUMMARY_INDICES]})",
+                             check='adjacent_values_difference_check', variable=var_name)
+
+        success = result['count'] == 0
+        logger.add_info(f"adjacent_values_difference_check for variable "
+                        f"'{var_name}' and dimension '{d}': {'SUCCESS' if success else 'FAIL'}")
+
+    @profiled
+    @planned
     def consecutive_identical_values_check(self, all_checks_run: bool = False):
         """
         Method dedicated to checking whether too many (maximum specified in the configuration file)
@@ -553,96 +1170,222 @@ class QualityControl:
             self.logger.add_error("consecutive_identical_values_check error: no nc file loaded")
             return self
 
-        # Variables with 'do_values_change_at_acceptable_rate_check' in the config file
-        vars_to_check = [var for var, properties in self.qc_checks_vars.items()
-                         if 'consecutive_identical_values_check' in properties.keys()]
-
-        vars_nc_file = list(self.nc.variables.keys())
+        vars_nc_file = self.nc.variables
 
-        # iterates through variables that should be checked
-        for var_name in vars_to_check:
+        for var_name in self.plan.vars_for('consecutive_identical_values_check'):
             if var_name not in vars_nc_file:
                 if not all_checks_run:
                     self.logger.add_warning(f"variable '{var_name}' not in nc file")
                 continue
 
-            var_values = self.nc[var_name][:]
+            self._run_var_checks(var_name, ['consecutive_identical_values_check'],
+                                 {'consecutive_identical_values_check': self.logger})
 
-            # get the maximum from configuration file
-            maximum = self.qc_checks_vars[var_name]['consecutive_identical_values_check']['maximum']
+        return self
 
-            # checks if maximum is specified
-            if not maximum:
-                if maximum == 0:
-                    self.logger.add_warning("consecutive_identical_values_check: Maximum is 0")
-                else:
-                    self.logger.add_warning("consecutive_identical_values_check: Maximum not specified")
-                    continue
+    def _consecutive_identical_values_check_var(self, var_name: str, var_values: np.ndarray, logger: LoggerQC):
+        """
+        Method dedicated to performing the consecutive identical values check on the values of a single variable
+        :param var_name: name of the variable
+        :param var_values: the values of the variable
+        :param logger: the logger to log the results to
+        """
+        accumulator = self._consecutive_identical_values_accumulator(var_name, var_values.shape, logger)
+        if accumulator is None:
+            return
+
+        # all runs are found in a single vectorized pass over the array
+        accumulator.update(var_values, (0,) * var_values.ndim)
+        self._log_consecutive_identical_values_result(var_name, accumulator.result(), logger)
+
+    def _consecutive_identical_values_accumulator(self, var_name: str, shape: tuple,
+                                                  logger: LoggerQC) -> Optional[IdenticalRunsAccumulator]:
+        """
+        Method dedicated to setting up the consecutive identical values check for a single variable.
+        Runs are counted along the dimension 'over_which_dimension' (0 if not specified).
+        Logs a warning if the maximum is not specified or 0, logs a warning if the variable does not have the
+        dimension, and logs the check as successful if the variable has no more values along the dimension
+        than the maximum (the check then always succeeds).
+        :param var_name: name of the variable
+        :param shape: shape of the variable
+        :param logger: the logger to log to
+        :return: the accumulator for the runs of the variable, or None if the check does not have to be performed
+        """
+        # get the maximum and dimension from configuration file
+        maximum = self.plan.check_config(var_name, 'consecutive_identical_values_check')['maximum']
+        axis = self.plan.check_config(var_name, 'consecutive_identical_values_check').get(
+            'over_which_dimension', 0)
+
+        # checks if maximum is specified
+        if not maximum:
+            if maximum == 0:
+                logger.add_warning("consecutive_identical_values_check: Maximum is 0")
+            else:
+                logger.add_warning("consecutive_identical_values_check: Maximum not specified")
+                return None
+
+        # checks if the variable has the dimension (scalar variables are treated as a single value)
+        if axis >= max(len(shape), 1):
+            logger.add_warning(f"variable {var_name} doesn't have dimension {axis}")
+            return None
+
+        # checks if the number of values is smaller or equal to the
+        # allowed maximum (check then allways succeeds)
+        if (shape or (1,))[axis] <= maximum:
+            logger.add_info(
+                f"consecutive_identical_values_check for variable '{var_name}': {'SUCCESS'}")
+            return None
 
-            success = True
+        return IdenticalRunsAccumulator(maximum, shape, axis=axis,
+                                        max_runs=max(self.max_point_messages, SUMMARY_INDICES))
+
+    def _log_consecutive_identical_values_result(self, var_name: str, result: dict, logger: LoggerQC):
+        """
+        Method dedicated to logging the result of the consecutive identical values check for a single variable
+        :param var_name: name of the variable
+        :param result: the runs longer than the maximum, see `streaming.IdenticalRunsAccumulator`
+        :param logger: the logger to log the result to
+        """
+        maximum = self.plan.check_config(var_name, 'consecutive_identical_values_check')['maximum']
+
+        for run in result['runs'][:self.max_point_messages]:
+            logger.add_error("{} has {} consecutive identical values {}, which is higher than the threshold of {}",
+                             var_name, run['length'], run['value'], maximum,
+                             check='consecutive_identical_values_check', variable=var_name, index=run['start'])
+
+        if result['count'] > self.max_point_messages:
+            logger.add_error(f"{var_name} has {result['count']} runs of more than {maximum} consecutive identical "
+                             f"values (first starting at indices: "
+                             f"{[run['start'] for run in result['runs'][:SUMMARY_INDICES]]})",
+                             check='consecutive_identical_values_check', variable=var_name)
+
+        success = result['count'] == 0
+        logger.add_info(
+            f"consecutive_identical_values_check for variable '{var_name}': {'SUCCESS' if success else 'FAIL'}")
+
+    @profiled
+    @planned
+    def expected_dimensions_check(self, all_checks_run: bool = False):
+        """
+        Method dedicated to checking whether each variable has the expected dimensions, in the expected order.
+        Only the header of the netCDF file is used, no data is read.
 
-            # checks if the number of values is smaller or equal to the
-            # allowed maximum (check then allways succeeds)
-            if len(var_values) <= maximum:
-                self.logger.add_info(
-                    f"consecutive_identical_values_check for variable '{var_name}': {'SUCCESS'}")
+        - logs an error if no netCDF file is loaded
+        - logs a warning if a variable specified to be checked does not exist in the netCDF file
+        - logs a warning if the expected dimensions of a variable are not specified
+        - logs an error for each variable of which the dimensions differ from the expected dimensions
+        - writes a message to the logger whether the check succeeded or failed for each variable
+
+        :param all_checks_run: True when the method is run through the `perform_all_checks` method, which
+                            runs all checks at once. If the method is run by itself
+                            all_checks_run is False by default.
+        :return: self
+        """
+        if self.nc is None:
+            self.logger.add_error("expected_dimensions_check error: no nc file loaded")
+            return self
+
+        vars_nc_file = self.nc.variables
+
+        for var_name in self.plan.vars_for('expected_dimensions_check'):
+            if var_name not in vars_nc_file:
+                if not all_checks_run:
+                    self.logger.add_warning(f"variable '{var_name}' not in nc file")
+                continue
+
+            expected_dimensions = (self.plan.check_config(var_name, 'expected_dimensions_check') or {}).get(
+                'expected_dimensions')
+            if expected_dimensions is None:
+                self.logger.add_warning(f"expected_dimensions_check: expected dimensions not specified "
+                                        f"for variable '{var_name}'")
                 continue
 
-            # first value to check against
-            value_to_check_against = var_values[0]
-            # counts how many consecutive values there are
-            count_consecutive = 1
-
-            # loops through values
-            for j in range(1, len(var_values)):
-
-                # check if the value is the same as the previous one
-                if var_values[j] == value_to_check_against:
-                    count_consecutive += 1
-                else:
-                    # check if number of consecutive values is more than allowed
-                    if count_consecutive > maximum:
-                        success = False
-                        # logs that there are to many consecutive values
-                        self.logger.add_error(
-                            f"{var_name} has {count_consecutive} consecutive identical values {var_values[j]},"
-                            f" which is higher than the threshold of {maximum}")
-
-                    # sets value to check against to current value
-                    value_to_check_against = var_values[j]
-                    # sets consecutive count to 1
-                    count_consecutive = 1
-
-            # in case all values are the same or values at the end of the array are the same
-            if count_consecutive > maximum:
-                success = False
-                self.logger.add_error(f"{var_name} has {count_consecutive} consecutive identical"
-                                      f" values {var_values[len(var_values) - 1]},"
-                                      f" which is higher than the threshold of {maximum}")
-
-            self.logger.add_info(
-                f"consecutive_identical_values_check for variable '{var_name}': {'SUCCESS' if success else 'FAIL'}")
+            dimensions = list(self.nc[var_name].dimensions)
+            if dimensions != list(expected_dimensions):
+                self.logger.add_error(f"expected dimensions check error: variable '{var_name}' has dimensions "
+                                      f"{dimensions} instead of the expected dimensions {list(expected_dimensions)}",
+                                      check='expected_dimensions_check', variable=var_name)
+                self.logger.add_info(f"expected dimensions check for variable '{var_name}': FAIL")
+            else:
+                self.logger.add_info(f"expected dimensions check for variable '{var_name}': SUCCESS")
 
         return self
 
-    def expected_dimensions_check(self):
+    @profiled
+    @planned
+    def perform_header_checks(self):
         """
-        Method dedicated to checking whether each variable has the expected dimensions
+        Method that performs all checks which only need the header of the netCDF file, without reading
+        (or decompressing) any variable data, in the following order:
+         1. file_size_check
+         2. existence_check
+         3. expected_dimensions_check
+         4. data_points_amount_check, for the variables which count all data points (taken from their shape)
+
+        The data checks which do need the variable data are skipped, and an info message lists them for each
+        variable, so they can be performed later, for example with `perform_all_checks`.
+
+        - logs an error if there is no netCDF file loaded
+        - logs a warning for each variable that is specified in the config file,
+          but does not exist in the currently loaded netCDF file
+
         :return: self
         """
-        self.logger.add_warning("not implemented yet")
+        if self.nc is None:
+            self.logger.add_error("perform_header_checks error: no nc file loaded")
+            return self
+
+        vars_nc_file = self.nc.variables
+
+        for var_name in self.qc_checks_vars.keys():
+            if var_name not in vars_nc_file:
+                self.logger.add_warning(f"variable '{var_name}' not in nc file")
+
+        (self
+         .file_size_check()
+         .existence_check()
+         .expected_dimensions_check(all_checks_run=True)
+         )
+
+        skipped = []
+        for var_name, checks in self._plan_data_checks():
+            if 'data_points_amount_check' in checks and \
+                    self._data_points_amount_count(var_name, self.logger) == 'all':
+                checks.remove('data_points_amount_check')
+                self._log_data_points_amount_result(var_name, self.nc[var_name].size, self.logger)
+
+            if checks:
+                skipped.append((var_name, checks))
+
+        for var_name, checks in skipped:
+            self.logger.add_info(f"header checks: skipped data checks for variable '{var_name}': "
+                                 f"{', '.join(checks)}")
+
         return self
 
+    @profiled
+    @planned
     def perform_all_checks(self):
         """
         Method that performs all checks in the following order:
          1. file_size_check
          2. existence_check
-         3. emptiness_check
-         4. data_points_amount_check
-         5. data_boundaries_check
-         6. consecutive_identical_values_check
-         7. adjacent_values_difference_check
+         3. expected_dimensions_check
+         4. emptiness_check
+         5. data_points_amount_check
+         6. data_boundaries_check
+         7. consecutive_identical_values_check
+         8. adjacent_values_difference_check
+
+        The data checks (4-8) are fused: each variable is read from the netCDF file only once,
+        after which all checks configured for it are performed on the same array.
+
+        With a cache, the results of the checks which do not read data and the results of the data checks
+        of each variable are taken from the cache if the file and their configuration did not change.
+
+        With fail_fast set to 'file', the checks stop at the first error: the data checks are skipped when
+        one of the checks 1-3 logs an error, and the remaining variables are skipped after the data checks of
+        a variable log an error.
 
         - logs an error if there is no netCDF file loaded
         - logs a warning for each variable that is specified in the config file,
@@ -654,32 +1397,475 @@ class QualityControl:
             self.logger.add_error("perform_all_checks error: no nc file loaded")
             return self
 
-        vars_nc_file = list(self.nc.variables.keys())
+        errors = len(self.logger.get_records('error'))
+        if self.cache is None:
+            fingerprint = None
+            self._perform_file_checks()
+        else:
+            fingerprint = self._fingerprint()
+            self._perform_cached_file_checks(fingerprint)
+
+        if self.fail_fast == 'file' and len(self.logger.get_records('error')) > errors:
+            self.logger.add_info("fail fast: data checks of all variables skipped after the first error")
+            return self
+
+        return self._perform_data_checks(fingerprint=fingerprint)
+
+    @profiled
+    @planned
+    def perform_incremental_checks(self, checkpoint_path: Optional[Path] = None):
+        """
+        Method that performs all checks like perform_all_checks, but for variables of which the first dimension
+        is unlimited only reads the records appended since the previous incremental checks. The state of the
+        data checks of these variables is kept in a checkpoint (see checkpoint.py), such that the results are
+        identical to the results of perform_all_checks. All other checks and variables are checked in full.
+
+        - logs an error if there is no netCDF file loaded
+        - logs a warning for each variable that is specified in the config file,
+          but does not exist in the currently loaded netCDF file
+        - logs an error if the netCDF file was loaded from memory and no checkpoint path is given
+        - checks all records if there is no checkpoint, or if it was made with another configuration
+
+        :param checkpoint_path: path to the JSON sidecar file of the checkpoint. Defaults to None, which uses
+                                '<name>.qc_checkpoint.json' next to the loaded netCDF file.
+        :return: self
+        """
+        if self.nc is None:
+            self.logger.add_error("perform_incremental_checks error: no nc file loaded")
+            return self
+
+        if checkpoint_path is None and self.nc_buffer is not None:
+            self.logger.add_error("perform_incremental_checks error: no checkpoint path given "
+                                  "for a netCDF file loaded from memory")
+            return self
+
+        nc_path = Path(self.nc.filepath())
+        if checkpoint_path is None:
+            checkpoint_path = nc_path.with_name(f"{nc_path.name}.qc_checkpoint.json")
+        checkpoint = Checkpoint.load(checkpoint_path,
+                                     checkpoint_key(nc_path.name, self.qc_checks_vars, self.max_point_messages))
+
+        self._perform_file_checks()._perform_data_checks(checkpoint)
+
+        checkpoint.save()
+        return self
+
+    def _fingerprint(self) -> str:
+        """
+        Method dedicated to getting the fingerprint of the loaded netCDF file for the cache, see cache.py
+        :return: the fingerprint of the file, or the fingerprints of all files of a multi-file dataset
+        """
+        if self.nc_buffer is not None:
+            return self.cache.fingerprint(self.nc_buffer)
+        if isinstance(self.nc, MultiFileDataset):
+            return '|'.join(self.cache.fingerprint(nc_file_path) for nc_file_path in self.nc.filepaths())
+        return self.cache.fingerprint(self.nc.filepath())
+
+    def _perform_file_checks(self):
+        """
+        Method dedicated to performing the checks of perform_all_checks which do not read data (1-3),
+        after logging a warning for each variable that is specified in the config file,
+        but does not exist in the currently loaded netCDF file
+        :return: self
+        """
+        vars_nc_file = self.nc.variables
 
         for var_name in self.qc_checks_vars.keys():
             if var_name not in vars_nc_file:
                 self.logger.add_warning(f"variable '{var_name}' not in nc file")
 
-        (self
-         .file_size_check()
-         .existence_check()
-         .emptiness_check(all_checks_run=True)
-         .data_points_amount_check(all_checks_run=True)
-         .data_boundaries_check(all_checks_run=True)
-         .consecutive_identical_values_check(all_checks_run=True)
-         .adjacent_values_difference_check(all_checks_run=True)
-         )
+        return (self
+                .file_size_check()
+                .existence_check()
+                .expected_dimensions_check(all_checks_run=True)
+                )
+
+    def _perform_cached_file_checks(self, fingerprint: str):
+        """
+        Method dedicated to performing the checks of perform_all_checks which do not read data, taking their
+        log records from the cache if the file and the configuration of these checks did not change
+        :param fingerprint: the fingerprint of the loaded netCDF file, see cache.file_fingerprint
+        :return: self
+        """
+        file_checks_config = {var_name: {check: check_config for check, check_config in var_checks.items()
+                                         if check not in DATA_CHECKS}
+                              for var_name, var_checks in self.qc_checks_vars.items()}
+        key = self.cache.key(fingerprint, 'file', self.qc_checks_dims, self.qc_checks_gl_attrs,
+                             self.qc_check_file_size, file_checks_config)
+
+        cached = self.cache.get(key)
+        if cached is None:
+            # log to an empty logger, so only the records of these checks are cached, without any message caps
+            logger, self.logger = self.logger, LoggerQC()
+            try:
+                self._perform_file_checks()
+                records = {'file': self.logger.get_records()}
+            finally:
+                self.logger = logger
+            self.cache.put(key, records)
+        else:
+            records, _ = cached
+
+        for record in records['file']:
+            self.logger.add_record(record)
+        return self
+
+    def _run_cached_var_checks(self, var_name: str, checks: list[str], loggers: dict, fingerprint: str) -> dict:
+        """
+        Method dedicated to performing data checks on a single variable of the loaded netCDF file, taking their
+        log records and results from the cache if the file, the configuration of the variable and the memory budget
+        did not change
+        :param var_name: name of the variable
+        :param checks: the data checks to perform (see DATA_CHECKS)
+        :param loggers: dictionary with the logger to log the results of each check to
+        :param fingerprint: the fingerprint of the loaded netCDF file, see cache.file_fingerprint
+        :return: dictionary with the result of the emptiness check, if it is performed
+        """
+        var_checks = self.qc_checks_vars[var_name]
+        key = self.cache.key(fingerprint, f"variable:{var_name}", {check: var_checks[check] for check in checks},
+                             self.max_point_messages, self.fail_fast, self.memory_budget)
+
+        cached = self.cache.get(key)
+        if cached is None:
+            var_loggers = {check: LoggerQC() for check in checks}
+            results = self._run_var_checks(var_name, checks, var_loggers)
+            records = {check: var_logger.get_records() for check, var_logger in var_loggers.items()}
+            results = {check: result for check, result in results.items() if check == 'emptiness_check'}
+            self.cache.put(key, records, results)
+        else:
+            records, results = cached
+
+        for check, check_records in records.items():
+            for record in check_records:
+                loggers[check].add_record(record)
+        return results
+
+    @profiled
+    @planned
+    def perform_sampled_checks(self, fraction: float = 0.1, method: str = 'stratified', seed: Optional[int] = None,
+                               max_bytes: Optional[int] = None, max_seconds: Optional[float] = None,
+                               confidence: float = 0.95):
+        """
+        Method that performs all checks like perform_all_checks, but only reads a sample of the chunks of every
+        variable for the data checks (see sampling.py). Instead of the exact violations, the estimated rate of
+        data points violating each check is logged with its confidence interval, and the estimates are added to
+        the next report under the key 'estimates'. A check fails if a violation is found in the sample.
+        The budgets are shared by all variables, at least one chunk of every variable is read.
+
+        - logs an error if there is no netCDF file loaded, or if the sampling method is unknown
+        - logs a warning for each variable that is specified in the config file,
+          but does not exist in the currently loaded netCDF file
+        - logs an error with the estimated violation rate of every check failing in the sample
+        - the data points amount check is only estimated if it counts the valid data points
+
+        :param fraction: the fraction of the chunks of every variable to read. Defaults to 0.1.
+        :param method: 'random' for a simple random sample of the chunks, or 'stratified' to read one chunk
+                       at random from every stratum of consecutive chunks. Defaults to 'stratified'.
+        :param seed: the seed of the random sample, for reproducible results. Defaults to None.
+        :param max_bytes: the maximum number of bytes to read from the file. Defaults to None, for no maximum.
+        :param max_seconds: the maximum time to spend reading and checking the sample. Defaults to None,
+                            for no maximum.
+        :param confidence: the confidence level of the intervals. Defaults to 0.95.
+        :return: self
+        """
+        if self.nc is None:
+            self.logger.add_error("perform_sampled_checks error: no nc file loaded")
+            return self
+        if method not in SAMPLING_METHODS:
+            self.logger.add_error(f"perform_sampled_checks error: unknown sampling method '{method}', "
+                                  f"expected one of {SAMPLING_METHODS}")
+            return self
+
+        self._perform_file_checks()
+
+        rng = np.random.default_rng(seed)
+        start_time = time.perf_counter()
+        bytes_read = 0
+        planned = self._plan_data_checks()
+
+        for i, (var_name, checks) in enumerate(planned):
+            # the remaining budgets are divided equally over the remaining variables
+            var_max_bytes = None if max_bytes is None else (max_bytes - bytes_read) / (len(planned) - i)
+            var_deadline = None if max_seconds is None else \
+                time.perf_counter() + (start_time + max_seconds - time.perf_counter()) / (len(planned) - i)
+
+            bytes_read += self._sample_var_checks(var_name, checks, fraction, method, rng, var_max_bytes,
+                                                  var_deadline, confidence)
+
+        self._emptiness_check_gl_attrs(self.logger)
+        return self
+
+    def _sample_var_checks(self, var_name: str, checks: list[str], fraction: float, method: str,
+                           rng: np.random.Generator, max_bytes: Optional[float], deadline: Optional[float],
+                           confidence: float) -> int:
+        """
+        Method dedicated to estimating the violation rates of the data checks of a single variable from a sample
+        of its chunks. Every sampled chunk is flagged on its own (see flags.py), so runs of identical values and
+        adjacent values are only considered within a chunk.
+        :param var_name: name of the variable
+        :param checks: the data checks of the variable
+        :param fraction: the fraction of the chunks to read
+        :param method: the sampling method, see sampling.sample_slabs
+        :param rng: the random generator
+        :param max_bytes: the maximum number of bytes to read, None for no maximum
+        :param deadline: the time (of time.perf_counter) after which no more chunks are read, None for no deadline
+        :param confidence: the confidence level of the intervals
+        :return: the number of bytes read
+        """
+        variable = self.nc[var_name]
+        count_valid = 'data_points_amount_check' in checks and \
+            self._data_points_amount_count(var_name, self.logger) == 'valid'
+        if 'data_points_amount_check' in checks and not count_valid:
+            self._log_data_points_amount_result(var_name, variable.size, self.logger)
+
+        # the checks which would be performed on the whole variable, see _variable_flagger
+        flag_checks = self._variable_flagger(var_name, [check for check in checks if check in FLAG_MASKS]).checks()
+        if not flag_checks and not count_valid:
+            return 0
+
+        memory_budget = chunk_memory_budget(variable.chunking(), variable.dtype.itemsize) or SAMPLE_SLAB_BYTES
+        slab_args = (variable.shape, variable.chunking(), variable.dtype.itemsize, memory_budget)
+
+        violations = dict.fromkeys(FLAG_MASKS, 0)
+        sampled = 0
+        valid = 0
+        bytes_read = 0
+
+        for slab_index in sample_slabs(count_slabs(*slab_args), fraction, method, rng):
+            if sampled and (max_bytes is not None and bytes_read >= max_bytes or
+                            deadline is not None and time.perf_counter() >= deadline):
+                break
+
+            slab_values = self._read_var(var_name, get_slab(*slab_args, slab_index))
+            sampled += np.size(slab_values)
+            bytes_read += np.size(slab_values) * variable.dtype.itemsize
+            valid += int(np.ma.count(slab_values))
+
+            # every chunk is flagged on its own, as the sampled chunks are not adjacent
+            flagger = self._variable_flagger(var_name, flag_checks, np.shape(slab_values))
+            bitmask = flagger.flags(slab_values, (0,) * np.ndim(slab_values))
+            for check in flag_checks:
+                violations[check] += int(np.count_nonzero(bitmask & FLAG_MASKS[check]))
+
+        for check in flag_checks:
+            self._log_sample_estimate(SampleEstimate(var_name, check, violations[check], sampled, variable.size,
+                                                     confidence))
+        if count_valid:
+            self._log_sampled_data_points_amount(SampleEstimate(var_name, 'data_points_amount_check',
+                                                                sampled - valid, sampled, variable.size, confidence))
+        return bytes_read
+
+    def _log_sample_estimate(self, estimate: SampleEstimate):
+        """
+        Method dedicated to logging the estimated violation rate of a data check on a single variable
+        :param estimate: the estimate
+        """
+        lower, upper = estimate.interval()
+        self.estimates.append(estimate.as_dict())
+
+        if estimate.violations:
+            self.logger.add_error(f"{estimate.check} error: estimated {estimate.rate():.3%} of the data points of "
+                                  f"variable '{estimate.variable}' violate the check ({estimate.confidence:.0%} "
+                                  f"confidence interval: {lower:.3%} - {upper:.3%}), {estimate.violations} "
+                                  f"violations in {estimate.sampled} of {estimate.total} data points sampled",
+                                  check=estimate.check, variable=estimate.variable)
+
+        self.logger.add_info(f"{estimate.check} for variable '{estimate.variable}': "
+                             f"{'FAIL' if estimate.violations else 'SUCCESS'} (sampled {estimate.sampled} of "
+                             f"{estimate.total} data points, estimated violation rate {estimate.rate():.3%}, "
+                             f"{estimate.confidence:.0%} confidence interval: {lower:.3%} - {upper:.3%})")
+
+    def _log_sampled_data_points_amount(self, estimate: SampleEstimate):
+        """
+        Method dedicated to logging the estimated number of valid data points of a single variable, of which
+        the violations of the estimate are the data points which are not valid. The check fails if even
+        the upper bound of the estimate is below the minimum, and is uncertain if the interval contains it.
+        :param estimate: the estimate
+        """
+        lower, upper = estimate.interval()
+        self.estimates.append(estimate.as_dict())
+        minimum = self.plan.check_config(estimate.variable, 'data_points_amount_check')['minimum']
+        # the fewest and most valid data points within the confidence interval
+        fewest, most = round(estimate.total * (1 - upper)), round(estimate.total * (1 - lower))
+
+        if most < minimum:
+            result = 'FAIL'
+            self.logger.add_error(f"data points amount check error: estimated number of valid data points "
+                                  f"({fewest} - {most}) for variable '{estimate.variable}' is below the specified "
+                                  f"minimum ({minimum})", check=estimate.check, variable=estimate.variable)
+        elif fewest < minimum:
+            result = 'UNCERTAIN'
+        else:
+            result = 'SUCCESS'
+
+        self.logger.add_info(f"data points amount check for variable '{estimate.variable}': {result} (estimated "
+                             f"{fewest} - {most} valid data points, {estimate.confidence:.0%} confidence interval)")
+
+    def _plan_data_checks(self) -> list[tuple[str, list[str]]]:
+        """
+        Method dedicated to planning which data checks have to be performed on which variable
+        of the loaded netCDF file, so every variable has to be read only once
+        :return: list of tuples with the name of a variable in the netCDF file and the data checks for that
+                 variable, ordered as in DATA_CHECKS
+        """
+        vars_nc_file = self.nc.variables
+
+        return [(var_name, list(checks)) for var_name, checks in self.plan.var_data_checks
+                if var_name in vars_nc_file]
+
+    def _perform_data_checks(self, checkpoint: Optional[Checkpoint] = None, fingerprint: Optional[str] = None):
+        """
+        Method dedicated to performing all data checks (see DATA_CHECKS) in a single pass over the variables
+        of the loaded netCDF file. Each variable is read once and all checks configured for it are run on the
+        same array. The logs of each check are buffered, so they end up in the logger in the same order as
+        when running the checks one after the other.
+        :param checkpoint: the checkpoint of the incremental checks, see perform_incremental_checks.
+                           Defaults to None.
+        :param fingerprint: the fingerprint of the loaded netCDF file to take the results of the variables
+                            from the cache with. Defaults to None, which does not use the cache.
+        :return: self
+        """
+        buffers = {check: self.logger.buffer() for check in DATA_CHECKS}
+
+        checked_vars = 0
+        non_empty_vars = 0
+        planned = self._plan_data_checks()
+        skipped_vars = 0
+
+        for i, (var_name, checks) in enumerate(planned):
+            if fingerprint is None:
+                results = self._run_var_checks(var_name, checks, buffers, checkpoint)
+            else:
+                results = self._run_cached_var_checks(var_name, checks, buffers, fingerprint)
+
+            if 'emptiness_check' in results:
+                checked_vars += 1
+                non_empty_vars += results['emptiness_check']
+
+            if self.fail_fast == 'file' and any(buffer.get_records('error') for buffer in buffers.values()):
+                skipped_vars = len(planned) - i - 1
+                break
+
+        self._emptiness_check_summary(checked_vars, non_empty_vars, buffers['emptiness_check'])
+        self._emptiness_check_gl_attrs(buffers['emptiness_check'])
+
+        for check in DATA_CHECKS:
+            self.logger.merge(buffers[check])
+
+        if skipped_vars:
+            self.logger.add_info(f"fail fast: data checks of {skipped_vars} variables skipped after the first error")
+
+        return self
+
+    def _variable_flagger(self, var_name: str, checks: list[str], shape: Optional[tuple] = None) -> VariableFlagger:
+        """
+        Method dedicated to setting up the flaggers of the data checks of a single variable. Checks which would
+        not be performed because of their configuration (see the checks) do not flag any data points.
+        :param var_name: name of the variable
+        :param checks: the data checks of the variable
+        :param shape: the shape of the values to flag. Defaults to None, for the shape of the variable.
+        :return: the flagger of the variable
+        """
+        if shape is None:
+            shape = self.nc[var_name].shape
+        # problems with the configuration are logged by the checks themselves
+        setup_logger = LoggerQC()
+        flaggers = []
+
+        for check in checks:
+            if check == 'emptiness_check':
+                flaggers.append((check, EmptinessFlagger()))
+            elif check == 'data_boundaries_check':
+                flaggers.append((check, BoundariesFlagger(
+                    self.plan.check_config(var_name, 'data_boundaries_check')['lower_bound'],
+                    self.plan.check_config(var_name, 'data_boundaries_check')['upper_bound'])))
+            elif check == 'consecutive_identical_values_check':
+                accumulator = self._consecutive_identical_values_accumulator(var_name, shape, setup_logger)
+                if accumulator is not None:
+                    flaggers.append((check, IdenticalRunsFlagger(accumulator.maximum, shape, accumulator.axis)))
+            elif check == 'adjacent_values_difference_check':
+                for d, accumulator in self._adjacent_values_difference_accumulators(var_name, shape, setup_logger):
+                    flaggers.append((check, AdjacentDifferencesFlagger(accumulator.maximum, shape, d)))
+
+        return VariableFlagger(flaggers)
+
+    @profiled
+    @planned
+    def write_flags(self, flags_path: Optional[Path] = None):
+        """
+        Method dedicated to writing per data point quality control flags of the loaded netCDF file to a companion
+        netCDF file. For every variable with data checks which flag data points (see flags.py) the companion
+        file gets a variable '<variable>_qc' of type uint8 with the same dimensions, which holds a bitmask with
+        a bit per check, described by the CF attributes flag_masks and flag_meanings. Each variable is read
+        and flagged in a single pass, in slabs if a memory budget is set, and the flags are written slab by slab.
+
+        - logs an error if no netCDF file is loaded
+        - logs an error if the netCDF file was loaded from memory and no path of the companion file is given
+        - writes a message to the logger with the number of flagged variables and the path of the companion file
+
+        :param flags_path: path to the companion netCDF file, which is overwritten if it exists. Defaults to None,
+                           which writes '<name>_qc.nc' next to the loaded netCDF file.
+        :return: self
+        """
+        if self.nc is None:
+            self.logger.add_error("write_flags error: no nc file loaded")
+            return self
+
+        if flags_path is None and self.nc_buffer is not None:
+            self.logger.add_error("write_flags error: no flags path given for a netCDF file loaded from memory")
+            return self
 
+        if flags_path is None:
+            nc_path = Path(self.nc.filepath())
+            flags_path = nc_path.with_name(f"{nc_path.stem}_qc.nc")
+
+        flaggers = {}
+        for var_name, checks in self._plan_data_checks():
+            flagger = self._variable_flagger(var_name, checks)
+            if flagger.flaggers:
+                flaggers[var_name] = flagger
+
+        with netCDF4.Dataset(flags_path, 'w') as flags_nc:  # pylint: disable=no-member
+            for var_name, flagger in flaggers.items():
+                variable = self.nc[var_name]
+
+                for dim_name in variable.dimensions:
+                    if dim_name not in flags_nc.dimensions:
+                        dimension = self.nc.dimensions[dim_name]
+                        flags_nc.createDimension(dim_name, None if dimension.isunlimited() else len(dimension))
+
+                chunking = variable.chunking()
+                flags_var = flags_nc.createVariable(
+                    f"{var_name}_qc", FLAG_DTYPE, variable.dimensions, fill_value=False,
+                    chunksizes=chunking if isinstance(chunking, list) and variable.dimensions else None)
+                flags_var.setncatts({'long_name': f"quality control flags of {var_name}",
+                                     **flag_attributes(flagger.checks())})
+
+                for slab in self._iter_var_slabs(var_name, self.memory_budget):
+                    slab_start = tuple(dim_slice.start for dim_slice in slab)
+                    flags_var[slab] = flagger.flags(self._read_var(var_name, slab), slab_start)
+
+        self.logger.add_info(f"flags of {len(flaggers)} variables written to '{flags_path}'")
         return self
 
     def create_report(self, get_all_reports: bool = False) -> Union[list[dict], dict]:
         """
-        Method to create and get a report from the logger
+        Method to create and get a report from the logger. If profiling is turned on, the timing table of the
+        checks performed since the last report is added to the report under the key 'timings'. The estimates
+        of the sampled checks since the last report are added under the key 'estimates'.
         :param get_all_reports: If marked True, returns a list of all created reports. Defaults to False.
         :return: A list of dictionaries representing all reports if get_all_reports is True,
                  otherwise a single dictionary representing the latest report.
         """
-        self.logger.create_report()
+        extra = {}
+        if self.profiler is not None:
+            extra['timings'] = self.profiler.table()
+            self.profiler.reset()
+        if self.estimates:
+            extra['estimates'] = self.estimates
+            self.estimates = []
+
+        self.logger.create_report(extra=extra)
 
         if get_all_reports:
             return self.logger.get_all_reports()
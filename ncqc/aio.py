@@ -0,0 +1,388 @@
+"""
+Module dedicated to performing quality control from asyncio code, for example in an event-driven ingest service.
+Reading netCDF files and the NumPy work of the checks block, so they run in an executor and the event loop
+stays responsive. AsyncQualityControl offers async counterparts of the methods of a QualityControl object,
+and check_file and check_files check whole files with a bounded number of files in progress.
+
+Cancelling a task awaiting a check sets the cancel event of the QualityControl object, which stops the check
+in the executor before its next read of data. The task only finishes when the check has stopped, so the
+object is never used by two threads at once. Messages logged by a cancelled check stay in its logger.
+Jobs of a ProcessPoolExecutor cannot be stopped once they started: the task is cancelled, but the job
+runs to its end and its report is dropped.
+
+ Thread safety:
+A QualityControl object must only be used by one thread at a time, which AsyncQualityControl ensures with a lock
+per object. The netCDF-C and HDF5 libraries are not thread-safe either, not even for different files, so by
+default the calls running in threads hold NETCDF_LOCK: the event loop stays responsive, but the checks of
+different files do not run in parallel. To check many files in parallel, pass a ProcessPoolExecutor
+to check_file or check_files, which set up a QualityControl object in the worker process for every file.
+
+ Functions:
+- check_file: perform quality control on a single netCDF file in an executor and get its report
+- check_files: perform quality control on netCDF files with bounded concurrency and yield their reports
+
+ Classes:
+- AsyncQualityControl: async counterparts of the methods of a QualityControl object
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import AsyncIterator, Callable, Iterable, Optional, Tuple, Union
+
+from ncqc.QCnetCDF import QualityControl, yaml2dict
+from ncqc.batch import resolve_paths
+
+# lock held by calls running in threads, as the netCDF-C and HDF5 libraries are not thread-safe
+NETCDF_LOCK = threading.Lock()
+
+
+async def _run_cancellable(executor: Optional[Executor], job: Callable,
+                           cancel_event: Optional[threading.Event] = None):
+    """
+    Function to run a job in an executor, stopping it when the awaiting task is cancelled
+    :param executor: the executor, None for the default executor of the event loop
+    :param job: the job, without arguments
+    :param cancel_event: the event stopping the job when it is set. Defaults to None, for a job which is only
+                         cancelled if it did not start yet.
+    :return: the result of the job
+    """
+    future = asyncio.get_running_loop().run_in_executor(executor, job)
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        if cancel_event is None:
+            future.cancel()
+        else:
+            cancel_event.set()
+            # wait until the job stopped, without cancelling it again if this task is cancelled again
+            await asyncio.wait([future])
+        raise
+
+
+class AsyncQualityControl:
+    """
+    Class dedicated to async counterparts of the methods of a QualityControl object, which run in an executor.
+    The configuration is added to the QualityControl object directly, as adding checks does not block.
+    The methods which return the QualityControl object return the AsyncQualityControl object instead.
+
+     Attributes:
+    - qc: the QualityControl object
+    - executor: the executor running the methods, None for the default executor of the event loop.
+      Must run the methods in threads of this process, as the object holds the loaded netCDF file
+    - semaphore: semaphore bounding the number of methods running at once, shared with other objects,
+      None for no bound
+    - serialize: True to hold NETCDF_LOCK while a method runs
+
+     Methods:
+    - load_netcdf: load the netCDF file to be checked
+    - load_netcdf_files: load an ordered set of netCDF files to be checked as one dataset
+    - close: close the loaded netCDF file
+    - data_boundaries_check: perform a boundary check
+    - existence_check: perform existence checks
+    - emptiness_check: perform emptiness checks
+    - file_size_check: perform a file size check
+    - data_points_amount_check: perform a data points amount check
+    - adjacent_values_difference_check: perform an adjacent values difference check
+    - consecutive_identical_values_check: perform a consecutive identical values check
+    - expected_dimensions_check: perform an expected dimensions check
+    - perform_header_checks: perform all checks which only need the header of the netCDF file
+    - perform_all_checks: perform all checks
+    - perform_incremental_checks: perform all checks, only reading the records appended since the previous run
+    - perform_sampled_checks: perform all checks on a sample of the chunks of every variable
+    - write_flags: write per data point quality control flags to a companion netCDF file
+    - create_report: create and get a report from the logger
+    """
+
+    def __init__(self, qc: Optional[QualityControl] = None, executor: Optional[Executor] = None,
+                 semaphore: Optional[asyncio.Semaphore] = None, serialize: bool = True):
+        """
+        Constructor for the AsyncQualityControl objects
+        :param qc: the QualityControl object. Defaults to None, which creates a QualityControl object.
+        :param executor: the executor running the methods in threads. Defaults to None, which uses
+                         the default executor of the event loop.
+        :param semaphore: semaphore bounding the number of methods running at once, for example shared by
+                          all objects of a service. Defaults to None, for no bound.
+        :param serialize: True to hold NETCDF_LOCK while a method runs, see the note on thread safety of aio.py.
+                          Defaults to True.
+        """
+        self.qc = qc if qc is not None else QualityControl()
+        self.qc.cancel_event = threading.Event()
+        self.executor = executor
+        self.semaphore = semaphore
+        self.serialize = serialize
+        # created in the event loop running the methods, as locks are bound to a loop before Python 3.10
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _run(self, method: Callable, args: tuple, kwargs: dict):
+        """
+        Method dedicated to running a method of the QualityControl object in the executor
+        :param method: the method
+        :param args: the positional arguments of the method
+        :param kwargs: the keyword arguments of the method
+        :return: the result of the method
+        """
+        with NETCDF_LOCK if self.serialize else nullcontext():
+            return method(*args, **kwargs)
+
+    async def _call(self, method: Callable, *args, **kwargs):
+        """
+        Method dedicated to awaiting a method of the QualityControl object running in the executor,
+        one method at a time and within the bound of the semaphore
+        :param method: the method
+        :param args: the positional arguments of the method
+        :param kwargs: the keyword arguments of the method
+        :return: the result of the method, self if the method returns the QualityControl object
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self.semaphore is None:
+                result = await self._call_now(method, args, kwargs)
+            else:
+                async with self.semaphore:
+                    result = await self._call_now(method, args, kwargs)
+        return self if result is self.qc else result
+
+    async def _call_now(self, method: Callable, args: tuple, kwargs: dict):
+        """
+        Method dedicated to awaiting a method of the QualityControl object running in the executor
+        :param method: the method
+        :param args: the positional arguments of the method
+        :param kwargs: the keyword arguments of the method
+        :return: the result of the method
+        """
+        self.qc.cancel_event.clear()
+        return await _run_cancellable(self.executor, partial(self._run, method, args, kwargs), self.qc.cancel_event)
+
+    async def load_netcdf(self, *args, **kwargs):
+        """
+        Method dedicated to loading the netCDF file to be checked, see QualityControl.load_netcdf
+        :return: self
+        """
+        return await self._call(self.qc.load_netcdf, *args, **kwargs)
+
+    async def load_netcdf_files(self, *args, **kwargs):
+        """
+        Method dedicated to loading an ordered set of netCDF files, see QualityControl.load_netcdf_files
+        :return: self
+        """
+        return await self._call(self.qc.load_netcdf_files, *args, **kwargs)
+
+    async def close(self):
+        """
+        Method dedicated to closing the loaded netCDF file, if any
+        :return: self
+        """
+        def close_nc():
+            if self.qc.nc is not None:
+                self.qc.nc.close()
+                self.qc.nc = None
+            return self.qc
+
+        return await self._call(close_nc)
+
+    async def data_boundaries_check(self, *args, **kwargs):
+        """
+        Method dedicated to performing a boundary check, see QualityControl.data_boundaries_check
+        :return: self
+        """
+        return await self._call(self.qc.data_boundaries_check, *args, **kwargs)
+
+    async def existence_check(self, *args, **kwargs):
+        """
+        Method dedicated to performing existence checks, see QualityControl.existence_check
+        :return: self
+        """
+        return await self._call(self.qc.existence_check, *args, **kwargs)
+
+    async def emptiness_check(self, *args, **kwargs):
+        """
+        Method dedicated to performing emptiness checks, see QualityControl.emptiness_check
+        :return: self
+        """
+        return await self._call(self.qc.emptiness_check, *args, **kwargs)
+
+    async def file_size_check(self):
+        """
+        Method dedicated to performing a file size check, see QualityControl.file_size_check
+        :return: self
+        """
+        return await self._call(self.qc.file_size_check)
+
+    async def data_points_amount_check(self, *args, **kwargs):
+        """
+        Method dedicated to performing a data points amount check, see QualityControl.data_points_amount_check
+        :return: self
+        """
+        return await self._call(self.qc.data_points_amount_check, *args, **kwargs)
+
+    async def adjacent_values_difference_check(self, *args, **kwargs):
+        """
+        Method dedicated to performing an adjacent values difference check,
+        see QualityControl.adjacent_values_difference_check
+        :return: self
+        """
+        return await self._call(self.qc.adjacent_values_difference_check, *args, **kwargs)
+
+    async def consecutive_identical_values_check(self, *args, **kwargs):
+        """
+        Method dedicated to performing a consecutive identical values check,
+        see QualityControl.consecutive_identical_values_check
+        :return: self
+        """
+        return await self._call(self.qc.consecutive_identical_values_check, *args, **kwargs)
+
+    async def expected_dimensions_check(self, *args, **kwargs):
+        """
+        Method dedicated to performing an expected dimensions check, see QualityControl.expected_dimensions_check
+        :return: self
+        """
+        return await self._call(self.qc.expected_dimensions_check, *args, **kwargs)
+
+    async def perform_header_checks(self):
+        """
+        Method dedicated to performing all checks which only need the header of the netCDF file,
+        see QualityControl.perform_header_checks
+        :return: self
+        """
+        return await self._call(self.qc.perform_header_checks)
+
+    async def perform_all_checks(self):
+        """
+        Method dedicated to performing all checks, see QualityControl.perform_all_checks
+        :return: self
+        """
+        return await self._call(self.qc.perform_all_checks)
+
+    async def perform_incremental_checks(self, *args, **kwargs):
+        """
+        Method dedicated to performing all checks, only reading the records appended since the previous
+        incremental checks, see QualityControl.perform_incremental_checks
+        :return: self
+        """
+        return await self._call(self.qc.perform_incremental_checks, *args, **kwargs)
+
+    async def perform_sampled_checks(self, *args, **kwargs):
+        """
+        Method dedicated to performing all checks on a sample of the chunks of every variable,
+        see QualityControl.perform_sampled_checks
+        :return: self
+        """
+        return await self._call(self.qc.perform_sampled_checks, *args, **kwargs)
+
+    async def write_flags(self, *args, **kwargs):
+        """
+        Method dedicated to writing per data point quality control flags to a companion netCDF file,
+        see QualityControl.write_flags
+        :return: self
+        """
+        return await self._call(self.qc.write_flags, *args, **kwargs)
+
+    async def create_report(self, *args, **kwargs):
+        """
+        Method dedicated to creating and getting a report from the logger, see QualityControl.create_report
+        :return: the report, or a list of all reports
+        """
+        return await self._call(self.qc.create_report, *args, **kwargs)
+
+
+def _check_path(path: str, config: dict, header_only: bool, qc_kwargs: dict, serialize: bool,
+                cancel_event: Optional[threading.Event]) -> dict:
+    """
+    Function to perform quality control on a single netCDF file in an executor
+    :param path: path to the netCDF file
+    :param config: the configuration of the checks
+    :param header_only: True to only perform the checks which need the header of the file
+    :param qc_kwargs: the arguments of the QualityControl object
+    :param serialize: True to hold NETCDF_LOCK while checking the file
+    :param cancel_event: the event stopping the checks when it is set, None if they cannot be cancelled
+    :return: the report of the file
+    """
+    qc_obj = QualityControl(**qc_kwargs)
+    qc_obj.replace_qc_checks_dict(config)
+    qc_obj.cancel_event = cancel_event
+
+    with NETCDF_LOCK if serialize else nullcontext():
+        try:
+            qc_obj.load_netcdf(path)
+        except (OSError, ValueError) as error:
+            qc_obj.logger.add_error(f"aio error: could not load nc file '{path}' ({error})")
+        else:
+            try:
+                if header_only:
+                    qc_obj.perform_header_checks()
+                else:
+                    qc_obj.perform_all_checks()
+            finally:
+                qc_obj.nc.close()
+
+    return qc_obj.create_report()
+
+
+async def check_file(path: Union[str, Path], config: dict, executor: Optional[Executor] = None,
+                     semaphore: Optional[asyncio.Semaphore] = None, header_only: bool = False,
+                     **qc_kwargs) -> dict:
+    """
+    Function to perform quality control on a single netCDF file in an executor and get its report
+    :param path: path to the netCDF file
+    :param config: the configuration of the checks
+    :param executor: the executor, a ProcessPoolExecutor to check files in parallel. Defaults to None,
+                     which uses the default executor of the event loop.
+    :param semaphore: semaphore bounding the number of files checked at once. Defaults to None, for no bound.
+    :param header_only: True to only perform the checks which need the header of the file. Defaults to False.
+    :param qc_kwargs: the arguments of the QualityControl object, for example memory_budget
+    :return: the report of the file
+    """
+    in_process = isinstance(executor, ProcessPoolExecutor)
+    cancel_event = None if in_process else threading.Event()
+    job = partial(_check_path, str(path), config, header_only, qc_kwargs, not in_process, cancel_event)
+
+    if semaphore is None:
+        return await _run_cancellable(executor, job, cancel_event)
+    async with semaphore:
+        return await _run_cancellable(executor, job, cancel_event)
+
+
+async def check_files(files: Union[str, Path, Iterable[Union[str, Path]]], config: Union[dict, str, Path],
+                      max_concurrency: int = 8, executor: Optional[Executor] = None, header_only: bool = False,
+                      **qc_kwargs) -> AsyncIterator[Tuple[Path, dict]]:
+    """
+    Function to perform quality control on netCDF files with at most max_concurrency files in progress,
+    yielding the report of each file as soon as its checks finish. A task is only created for the next file
+    when the checks of another file finish, so a long list of files does not create a task for every file.
+    When the iteration stops early, the checks of the files in progress are cancelled.
+    :param files: the files to check, see batch.resolve_paths
+    :param config: the configuration of the checks, as a dictionary or the path to a yaml file
+    :param max_concurrency: the maximum number of files checked at once. Defaults to 8.
+    :param executor: the executor, a ProcessPoolExecutor to check files in parallel. Defaults to None,
+                     which uses the default executor of the event loop.
+    :param header_only: True to only perform the checks which need the header of the files. Defaults to False.
+    :param qc_kwargs: the arguments of the QualityControl objects, for example memory_budget
+    :return: async iterator over tuples with the path and the report of each file, in the order the checks finish
+    """
+    if not isinstance(config, dict):
+        config = yaml2dict(Path(config))
+
+    async def check(path: Path) -> Tuple[Path, dict]:
+        return path, await check_file(path, config, executor, None, header_only, **qc_kwargs)
+
+    # the files are checked by at most max_concurrency tasks, of which a task is created when another finishes
+    paths = iter(resolve_paths(files))
+    in_flight = {asyncio.ensure_future(check(path)) for path in islice(paths, max_concurrency)}
+    try:
+        while in_flight:
+            done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                for next_path in islice(paths, 1):
+                    in_flight.add(asyncio.ensure_future(check(next_path)))
+                yield task.result()
+    finally:
+        for task in in_flight:
+            task.cancel()
+        await asyncio.gather(*in_flight, return_exceptions=True)
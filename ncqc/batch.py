@@ -0,0 +1,157 @@
+"""
+Module dedicated to performing quality control on many netCDF files in parallel.
+The files are spread over a pool of worker processes, each of which sets up a single QualityControl
+object with the configuration once and reuses it for every file it checks. With a result cache
+(see cache.py), files which did not change since an earlier batch run are not checked again. Reports are yielded as soon
+as the check of a file finishes, so they do not arrive in the order of the files. They can also be written
+to a report sink (see sinks.py) by the main process.
+
+ Functions:
+- resolve_paths: get the paths of the netCDF files to check from a list, glob pattern or directory
+- run_batch: perform quality control on netCDF files in parallel and yield the report of each file
+"""
+
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+from ncqc.QCnetCDF import QualityControl, yaml2dict
+from ncqc.cache import ResultCache
+from ncqc.log import LoggerQC
+from ncqc.sinks import ReportSink
+
+# number of files submitted to the pool per worker ahead of the files being checked
+_FILES_IN_FLIGHT_PER_WORKER = 4
+
+# the QualityControl object of a worker process and the messages logged while setting it up, set by _init_worker
+_worker_qc: Optional[QualityControl] = None
+_worker_setup_logger = LoggerQC()
+_worker_header_only = False
+
+
+def resolve_paths(files: Union[str, Path, Iterable[Union[str, Path]]], pattern: str = '*.nc') -> list[Path]:
+    """
+    Function to get the paths of the netCDF files to check
+    :param files: a directory (all files matching the pattern in it and its subdirectories are checked),
+                  a glob pattern, the path to a single file, or a list of paths
+    :param pattern: the pattern of the file names to check in a directory. Defaults to '*.nc'.
+    :return: the sorted list of paths
+    """
+    if isinstance(files, (str, Path)):
+        path = Path(files)
+        if path.is_dir():
+            return sorted(file for file in path.rglob(pattern) if file.is_file())
+        if glob.has_magic(str(files)):
+            return sorted(Path(file) for file in glob.glob(str(files), recursive=True))
+        return [path]
+
+    return [Path(file) for file in files]
+
+
+def _init_worker(config: dict, header_only: bool, max_point_messages: int, memory_budget: Optional[int],
+                 cache_path: Optional[str] = None, fail_fast: Optional[str] = None):
+    """
+    Function to set up the QualityControl object of a worker process
+    :param config: the configuration of the checks
+    :param header_only: True to only perform the checks which need the header of the files
+    :param max_point_messages: see QualityControl
+    :param memory_budget: see QualityControl
+    :param cache_path: path to the database of the result cache shared by all workers. Defaults to None.
+    :param fail_fast: see QualityControl. Defaults to None.
+    """
+    global _worker_qc, _worker_setup_logger, _worker_header_only  # pylint: disable=global-statement
+    cache = ResultCache(cache_path) if cache_path is not None else None
+    _worker_qc = QualityControl(max_point_messages=max_point_messages, memory_budget=memory_budget, cache=cache,
+                                fail_fast=fail_fast)
+    _worker_qc.replace_qc_checks_dict(config)
+    # problems with the configuration are added to the report of every file
+    _worker_setup_logger = _worker_qc.logger
+    _worker_qc.logger = LoggerQC()
+    _worker_header_only = header_only
+
+
+def _check_file(path: str) -> dict:
+    """
+    Function to perform quality control on a single netCDF file in a worker process
+    :param path: path to the netCDF file
+    :return: the report of the file
+    """
+    qc_obj = _worker_qc
+    qc_obj.logger.merge(_worker_setup_logger)
+
+    try:
+        qc_obj.load_netcdf(path)
+    except (OSError, ValueError) as error:
+        qc_obj.logger.add_error(f"batch error: could not load nc file '{path}' ({error})")
+    else:
+        try:
+            if _worker_header_only:
+                qc_obj.perform_header_checks()
+            else:
+                qc_obj.perform_all_checks()
+        except Exception as error:  # pylint: disable=broad-except
+            # a single broken file should not stop the checks of all other files
+            qc_obj.logger.add_error(f"batch error: checks of nc file '{path}' stopped ({error!r})")
+        finally:
+            qc_obj.nc.close()
+            qc_obj.nc = None
+
+    report = qc_obj.create_report()
+    # the reports of earlier files are not needed by the worker anymore
+    qc_obj.logger.reports.clear()
+    return report
+
+
+def run_batch(config: Union[dict, str, Path], files: Union[str, Path, Iterable[Union[str, Path]]],
+              workers: Optional[int] = None, header_only: bool = False, max_point_messages: int = 100,
+              memory_budget: Optional[int] = None, sink: Optional[ReportSink] = None,
+              cache_path: Optional[Union[str, Path]] = None,
+              fail_fast: Optional[str] = None) -> Iterator[Tuple[Path, dict]]:
+    """
+    Function to perform quality control on netCDF files in parallel, using a pool of worker processes.
+    Only a limited number of files is handed to the pool at once, so the number of files may be very large.
+    :param config: the configuration of the checks, as a dictionary or the path to a yaml file
+    :param files: the files to check, see resolve_paths
+    :param workers: the number of worker processes. Defaults to None, which uses the number of CPUs.
+    :param header_only: True to only perform the checks which need the header of the files
+                        (see QualityControl.perform_header_checks). Defaults to False.
+    :param max_point_messages: see QualityControl. Defaults to 100.
+    :param memory_budget: see QualityControl. Defaults to None.
+    :param sink: sink the report of each file is written to, with the path of the file under the key 'file'.
+                 The sink is flushed when all files are checked, but not closed. Defaults to None.
+    :param cache_path: path to the database of a result cache (see cache.ResultCache), so files which did not
+                       change since they were checked with the same configuration are not checked again.
+                       Defaults to None, which checks every file.
+    :param fail_fast: the execution mode stopping the checks of a file early, for example 'file' to only find out
+                      whether each file passes (see QualityControl). Defaults to None.
+    :return: iterator over tuples with the path and the report of each file, in the order the checks finish
+    """
+    if not isinstance(config, dict):
+        config = yaml2dict(Path(config))
+
+    workers = workers or os.cpu_count() or 1
+    paths = iter(resolve_paths(files))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(config, header_only, max_point_messages, memory_budget,
+                                       None if cache_path is None else str(cache_path), fail_fast)) as executor:
+        in_flight = {executor.submit(_check_file, str(path)): path
+                     for path in islice(paths, workers * _FILES_IN_FLIGHT_PER_WORKER)}
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                path = in_flight.pop(future)
+                for next_path in islice(paths, 1):
+                    in_flight[executor.submit(_check_file, str(next_path))] = next_path
+                report = future.result()
+                if sink is not None:
+                    sink.write(dict(report, file=str(path)))
+                yield path, report
+
+    if sink is not None:
+        sink.flush()
@@ -0,0 +1,237 @@
+"""
+Module dedicated to caching the results of quality control checks on local disk, so files which did not
+change since they were checked are not read again. Results are cached per unit: the checks of a file which
+do not read data, and the data checks of every variable. The key of a unit combines the fingerprint of the
+file (its path, size and modification time, or a hash of its content) with a hash of the configuration
+of the unit, so changing the configuration of a single variable only invalidates the results of that variable.
+
+The cache is a SQLite database. When it grows beyond its maximum number of entries or bytes, the least
+recently used entries are evicted first.
+
+ Functions:
+- file_fingerprint: get the fingerprint of a file
+
+ Classes:
+- ResultCache: the cache of the log records and results of the checks
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from ncqc.checkpoint import encode_state, decode_state
+from ncqc.log import LogRecord
+
+# version of the cached results, entries of other versions are never used
+CACHE_VERSION = 1
+# default maximum size of all cached entries together
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# number of bytes read at once when hashing the content of a file
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_fingerprint(path: Union[str, Path, bytes, bytearray, memoryview], content_hash: bool = False) -> str:
+    """
+    Function to get the fingerprint of a file, which changes when the file changes
+    :param path: path to the file, or the content of a file in memory, which is always hashed
+    :param content_hash: True to hash the content of the file, which is slower but also recognizes a file
+                         which was copied, moved or touched without changing it. Defaults to False, which uses
+                         the absolute path, size and modification time of the file.
+    :return: the fingerprint
+    """
+    if isinstance(path, (bytes, bytearray, memoryview)):
+        return f"blake2b:{hashlib.blake2b(path).hexdigest()}"
+
+    if not content_hash:
+        stat = os.stat(path)
+        return f"{Path(path).resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    digest = hashlib.blake2b()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(_HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return f"blake2b:{digest.hexdigest()}"
+
+
+def _encode_records(records: dict) -> dict:
+    """
+    Function to encode the log records of a unit as JSON
+    :param records: dictionary with a list of log records for every group (for example every check)
+    :return: the encoded records
+    """
+    return {group: [[record.severity, record.template, encode_state(record.args), record.check, record.variable,
+                     encode_state(record.index)] for record in group_records]
+            for group, group_records in records.items()}
+
+
+def _decode_records(records: dict) -> dict:
+    """
+    Function to decode the log records of a unit encoded with _encode_records
+    :param records: the encoded records
+    :return: dictionary with a list of log records for every group
+    """
+    return {group: [LogRecord(severity, template, decode_state(args), check, variable, decode_state(index))
+                    for severity, template, args, check, variable, index in group_records]
+            for group, group_records in records.items()}
+
+
+class ResultCache:
+    """
+    Class dedicated to caching the log records and results of the checks of files in a SQLite database,
+    evicting the least recently used entries when the cache is full
+
+     Attributes:
+    - path: path to the SQLite database
+    - max_entries: maximum number of entries, None for no maximum
+    - max_bytes: maximum size of all entries together, None for no maximum
+    - content_hash: True to fingerprint files by a hash of their content, see file_fingerprint
+    - hits: number of entries found since the cache was opened
+    - misses: number of entries not found since the cache was opened
+
+     Methods:
+    - fingerprint: get the fingerprint of a file
+    - key: get the key of the results of a unit of checks
+    - get: get the log records and results of a key
+    - put: add the log records and results of a key, evicting the least recently used entries if needed
+    - clear: remove all entries
+    - close: close the database
+    """
+
+    def __init__(self, path: Union[str, Path], max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = DEFAULT_MAX_BYTES, content_hash: bool = False):
+        """
+        Constructor for the ResultCache objects
+        :param path: path to the SQLite database, created if it does not exist
+        :param max_entries: maximum number of entries. Defaults to None, for no maximum.
+        :param max_bytes: maximum size of all entries together. Defaults to DEFAULT_MAX_BYTES (256 MiB),
+                          None for no maximum.
+        :param content_hash: True to fingerprint files by a hash of their content. Defaults to False.
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.content_hash = content_hash
+        self.hits = 0
+        self.misses = 0
+        # several processes of a batch run may use the same cache, so wait for each other's writes
+        self._connection = sqlite3.connect(str(self.path), timeout=30)
+        with self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT, size INTEGER, '
+                'last_used INTEGER)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)')
+
+    def __enter__(self) -> 'ResultCache':
+        """
+        Method dedicated to using the cache as a context manager
+        :return: self
+        """
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Method dedicated to closing the cache at the end of a with statement
+        :param exc_info: information about an exception raised in the with statement, if any
+        """
+        self.close()
+
+    def __len__(self) -> int:
+        """
+        Method dedicated to getting the number of entries
+        :return: the number of entries
+        """
+        return self._connection.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def fingerprint(self, path: Union[str, Path, bytes, bytearray, memoryview]) -> str:
+        """
+        Method dedicated to getting the fingerprint of a file, see file_fingerprint
+        :param path: path to the file, or the content of a file in memory
+        :return: the fingerprint
+        """
+        return file_fingerprint(path, self.content_hash)
+
+    @staticmethod
+    def key(fingerprint: str, unit: str, *config) -> str:
+        """
+        Method dedicated to getting the key of the results of a unit of checks on a file
+        :param fingerprint: the fingerprint of the file
+        :param unit: name of the unit, for example the name of a variable
+        :param config: everything the results of the unit depend on apart from the file
+        :return: the key
+        """
+        return hashlib.sha256(json.dumps((CACHE_VERSION, fingerprint, unit, config), sort_keys=True,
+                                         default=str).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[dict, dict]]:
+        """
+        Method dedicated to getting the log records and results of a key, marking the entry as recently used
+        :param key: the key, see the key method
+        :return: tuple with the log records and the results, None if the key is not in the cache
+        """
+        row = self._connection.execute('SELECT value FROM entries WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        with self._connection:
+            self._connection.execute('UPDATE entries SET last_used = ? WHERE key = ?', (time.time_ns(), key))
+
+        value = json.loads(row[0])
+        return _decode_records(value['records']), decode_state(value['results'])
+
+    def put(self, key: str, records: dict, results: Optional[dict] = None):
+        """
+        Method dedicated to adding the log records and results of a key, evicting the least recently used
+        entries if the cache is full
+        :param key: the key, see the key method
+        :param records: dictionary with a list of log records for every group (for example every check)
+        :param results: dictionary with the results of the checks. Defaults to None, for no results.
+        """
+        value = json.dumps({'records': _encode_records(records), 'results': encode_state(results or {})})
+
+        with self._connection:
+            self._connection.execute('INSERT OR REPLACE INTO entries (key, value, size, last_used) '
+                                     'VALUES (?, ?, ?, ?)', (key, value, len(value), time.time_ns()))
+            self._evict()
+
+    def _evict(self):
+        """
+        Method dedicated to removing the least recently used entries until the cache is within its maximum
+        number of entries and bytes
+        """
+        if self.max_entries is not None:
+            self._connection.execute('DELETE FROM entries WHERE key IN (SELECT key FROM entries '
+                                     'ORDER BY last_used DESC LIMIT -1 OFFSET ?)', (self.max_entries,))
+
+        if self.max_bytes is not None:
+            total = self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            evicted = []
+            for key, size in self._connection.execute('SELECT key, size FROM entries ORDER BY last_used'):
+                if total <= self.max_bytes:
+                    break
+                evicted.append((key,))
+                total -= size
+            self._connection.executemany('DELETE FROM entries WHERE key = ?', evicted)
+
+    def clear(self):
+        """
+        Method dedicated to removing all entries
+        """
+        with self._connection:
+            self._connection.execute('DELETE FROM entries')
+
+    def close(self):
+        """
+        Method dedicated to closing the database
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,180 @@
+"""
+Module dedicated to checkpoints for incremental quality control of netCDF files to which records are appended
+along the unlimited dimension. For every variable with data checks a checkpoint keeps the number of records
+checked and the state of the accumulators of its checks (see streaming.py), such as the run of identical
+values at the end of every line and the last value for adjacent differences. A later run restores the
+accumulators and only reads the new records, after which the accumulated results equal the results of
+checking the whole file again.
+
+The checkpoint is saved as a small JSON sidecar file. It is only valid for the configuration of the checks
+it was made with, and it assumes records are only appended: records which are already checked are not
+read again, even if they changed.
+
+ Functions:
+- checkpoint_key: get the key of the configuration a checkpoint is valid for
+- encode_state: encode (a part of) the state of an accumulator as JSON
+- decode_state: decode (a part of) the state of an accumulator encoded with encode_state
+
+ Classes:
+- Checkpoint: the checked records and accumulator states of the variables of a netCDF file
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
+CHECKPOINT_VERSION = 1
+
+
+def checkpoint_key(*config) -> str:
+    """
+    Function to get the key of the configuration a checkpoint is valid for
+    :param config: everything the results of the checks depend on apart from the data, such as the
+                   configuration of the variables and the maximum number of messages per data point
+    :return: the key
+    """
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def encode_state(value):
+    """
+    Function to encode (a part of) the state of an accumulator as JSON, keeping the types of NumPy arrays and
+    scalars and of tuples, so the decoded state gives exactly the same results
+    :param value: the value to encode
+    :return: the encoded value
+    """
+    if isinstance(value, np.ndarray):
+        return {'__ndarray__': value.tolist(), 'dtype': value.dtype.str, 'shape': list(value.shape)}
+    if isinstance(value, np.generic):
+        return {'__scalar__': value.item(), 'dtype': value.dtype.str}
+    if isinstance(value, tuple):
+        return {'__tuple__': [encode_state(item) for item in value]}
+    if isinstance(value, list):
+        return [encode_state(item) for item in value]
+    if isinstance(value, dict):
+        return {'__dict__': [[key, encode_state(item)] for key, item in value.items()]}
+    return value
+
+
+def decode_state(value):
+    """
+    Function to decode (a part of) the state of an accumulator encoded with encode_state
+    :param value: the encoded value
+    :return: the decoded value
+    """
+    if isinstance(value, list):
+        return [decode_state(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if '__ndarray__' in value:
+        return np.array(value['__ndarray__'], dtype=np.dtype(value['dtype'])).reshape(value['shape'])
+    if '__scalar__' in value:
+        return np.dtype(value['dtype']).type(value['__scalar__'])
+    if '__tuple__' in value:
+        return tuple(decode_state(item) for item in value['__tuple__'])
+    return {key: decode_state(item) for key, item in value['__dict__']}
+
+
+class Checkpoint:
+    """
+    Class dedicated to the checked records and accumulator states of the variables of a netCDF file
+
+     Attributes:
+    - path: path to the JSON sidecar file
+    - key: the key of the configuration the checkpoint is valid for, see checkpoint_key
+    - variables: for every variable the number of checked records, the shape of a record, the data type
+      and the encoded states of the accumulators of each check
+
+     Methods:
+    - load: load a checkpoint from its sidecar file, if it is valid for the configuration
+    - restore: restore the accumulators of a variable
+    - store: store the accumulators of a variable
+    - save: save the checkpoint to its sidecar file
+    """
+
+    def __init__(self, path: Union[str, Path], key: str):
+        """
+        Constructor for the Checkpoint objects, which creates an empty checkpoint
+        :param path: path to the JSON sidecar file
+        :param key: the key of the configuration the checkpoint is valid for
+        """
+        self.path = Path(path)
+        self.key = key
+        self.variables = {}
+
+    @classmethod
+    def load(cls, path: Union[str, Path], key: str) -> 'Checkpoint':
+        """
+        Method dedicated to loading a checkpoint from its sidecar file. The checkpoint is empty if the file
+        does not exist, cannot be read, or was made with another configuration.
+        :param path: path to the JSON sidecar file
+        :param key: the key of the configuration the checkpoint has to be valid for
+        :return: the checkpoint
+        """
+        checkpoint = cls(path, key)
+
+        try:
+            with open(checkpoint.path, encoding='utf-8') as file:
+                stored = json.load(file)
+        except (OSError, ValueError):
+            return checkpoint
+
+        if isinstance(stored, dict) and stored.get('version') == CHECKPOINT_VERSION and stored.get('key') == key:
+            checkpoint.variables = stored.get('variables', {})
+        return checkpoint
+
+    def restore(self, var_name: str, accumulators: dict, shape: tuple, dtype: np.dtype) -> int:
+        """
+        Method dedicated to restoring the accumulators of a variable, resized to the current number of records.
+        Nothing is restored if the variable has no checkpoint, if its records changed shape or type, if it has
+        less records than were checked, or if the checkpoint has other accumulators.
+        :param var_name: name of the variable
+        :param accumulators: dictionary with a list of accumulators for every check, restored in place
+        :param shape: the current shape of the variable
+        :param dtype: the data type of the variable
+        :return: the number of records which are already checked, 0 if nothing was restored
+        """
+        stored = self.variables.get(var_name)
+        if stored is None or stored['record_shape'] != list(shape[1:]) or stored['dtype'] != np.dtype(dtype).str \
+                or stored['records'] > shape[0] \
+                or {check: len(check_accumulators) for check, check_accumulators in accumulators.items()} \
+                != {check: len(states) for check, states in stored['states'].items()}:
+            return 0
+
+        for check, check_accumulators in accumulators.items():
+            for accumulator, state in zip(check_accumulators, stored['states'][check]):
+                vars(accumulator).update(decode_state(state))
+                if hasattr(accumulator, 'resize'):
+                    accumulator.resize(shape)
+
+        return stored['records']
+
+    def store(self, var_name: str, accumulators: dict, shape: tuple, dtype: np.dtype):
+        """
+        Method dedicated to storing the accumulators of a variable, before their results are taken
+        :param var_name: name of the variable
+        :param accumulators: dictionary with a list of accumulators for every check
+        :param shape: the shape of the variable, of which all records are checked
+        :param dtype: the data type of the variable
+        """
+        self.variables[var_name] = {
+            'records': shape[0],
+            'record_shape': list(shape[1:]),
+            'dtype': np.dtype(dtype).str,
+            'states': {check: [encode_state(vars(accumulator)) for accumulator in check_accumulators]
+                       for check, check_accumulators in accumulators.items()}
+        }
+
+    def save(self):
+        """
+        Method dedicated to saving the checkpoint to its sidecar file. The file is replaced at once,
+        so an interrupted save never leaves a broken checkpoint.
+        """
+        temporary_path = self.path.with_name(f"{self.path.name}.tmp")
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump({'version': CHECKPOINT_VERSION, 'key': self.key, 'variables': self.variables}, file)
+        os.replace(temporary_path, self.path)
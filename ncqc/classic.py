@@ -0,0 +1,507 @@
+"""
+Module dedicated to reading NETCDF3 classic files (CDF-1, CDF-2 and CDF-5) from a memory map. The data of
+these files is not compressed, so after parsing the header every variable is exposed as a view on the memory
+mapped file. Reading a slab of a variable then takes the page-cached bytes of the file as they are, without
+decoding them into a copy. Values are big-endian, as stored in the file.
+
+The dataset mimics the part of the interface of `netCDF4.Dataset` used by the quality control checks, and
+masks and unpacks values like netCDF4: values equal to the _FillValue (or the default fill value of the type)
+or a missing_value, or outside valid_min, valid_max or valid_range, are masked, and scale_factor and add_offset
+are applied. Unpacked variables are no longer views, as unpacking computes new values.
+
+ Functions:
+- is_classic: check whether a file is a NETCDF3 classic file
+
+ Classes:
+- ClassicDimension: a dimension of a NETCDF3 classic file
+- ClassicVariable: a variable of a NETCDF3 classic file, read from the memory map
+- ClassicDataset: a NETCDF3 classic file opened as a memory map
+"""
+
+import struct
+from pathlib import Path
+from typing import Union
+
+import netCDF4
+import numpy as np
+
+# magic numbers of the classic formats, with the name of the format given by netCDF4
+CLASSIC_FORMATS = {
+    b'CDF\x01': 'NETCDF3_CLASSIC',
+    b'CDF\x02': 'NETCDF3_64BIT_OFFSET',
+    b'CDF\x05': 'NETCDF3_64BIT_DATA'
+}
+
+# tags of the lists in the header
+_NC_DIMENSION = 10
+_NC_VARIABLE = 11
+_NC_ATTRIBUTE = 12
+
+# big-endian data types of the nc_type numbers
+_NC_TYPES = {
+    1: np.dtype('i1'), 2: np.dtype('S1'), 3: np.dtype('>i2'), 4: np.dtype('>i4'), 5: np.dtype('>f4'),
+    6: np.dtype('>f8'), 7: np.dtype('u1'), 8: np.dtype('>u2'), 9: np.dtype('>u4'), 10: np.dtype('>i8'),
+    11: np.dtype('>u8')
+}
+
+# number of records of a file which was streamed, for every version of the format (64 bits in CDF-5),
+# the actual number of records is computed from the size of the file
+_STREAMING = {1: 0xFFFFFFFF, 2: 0xFFFFFFFF, 5: 0xFFFFFFFFFFFFFFFF}
+
+
+def is_classic(path: Union[str, Path]) -> bool:
+    """
+    Function to check whether a file is a NETCDF3 classic file, by its magic number
+    :param path: path to the file
+    :return: True if the file is a NETCDF3 classic file, False otherwise or if the file cannot be read
+    """
+    try:
+        with open(path, 'rb') as file:
+            return file.read(4) in CLASSIC_FORMATS
+    except OSError:
+        return False
+
+
+class _HeaderReader:
+    """
+    Class dedicated to reading the header of a NETCDF3 classic file, following the format specification
+
+     Attributes:
+    - version: the version of the format, 1, 2 or 5
+    - offset: the position of the next value to read
+
+     Methods:
+    - read: read a big-endian value
+    - size: read a number of elements, dimension length or size
+    - name: read a padded name
+    - values: read the padded values of an attribute
+    - attributes: read a list of attributes
+    """
+
+    def __init__(self, buffer, version: int):
+        """
+        Constructor for the _HeaderReader objects
+        :param buffer: the content of the file
+        :param version: the version of the format, 1, 2 or 5
+        """
+        self._buffer = buffer
+        self.version = version
+        self.offset = 4
+
+    def read(self, fmt: str):
+        """
+        Method dedicated to reading a big-endian value
+        :param fmt: the struct format of the value
+        :return: the value
+        """
+        value, = struct.unpack_from(f">{fmt}", self._buffer, self.offset)
+        self.offset += struct.calcsize(fmt)
+        return value
+
+    def size(self) -> int:
+        """
+        Method dedicated to reading a number of elements, a dimension length or a variable size,
+        which are 64 bits in CDF-5
+        :return: the number
+        """
+        return self.read('Q' if self.version == 5 else 'I')
+
+    def name(self) -> str:
+        """
+        Method dedicated to reading a name padded to 4 bytes
+        :return: the name
+        """
+        length = self.size()
+        name = bytes(self._buffer[self.offset:self.offset + length]).decode('utf-8')
+        self.offset += -(-length // 4) * 4
+        return name
+
+    def values(self, dtype: np.dtype, count: int) -> np.ndarray:
+        """
+        Method dedicated to reading the values of an attribute, padded to 4 bytes
+        :param dtype: the data type of the values
+        :param count: the number of values
+        :return: the values, in native byte order
+        """
+        values = np.frombuffer(self._buffer, dtype=dtype, count=count, offset=self.offset)
+        self.offset += -(-count * dtype.itemsize // 4) * 4
+        return values.astype(dtype.newbyteorder('='))
+
+    def attributes(self) -> dict:
+        """
+        Method dedicated to reading a list of attributes. Like netCDF4 text is decoded to a string,
+        a single number becomes a scalar and several numbers an array.
+        :return: dictionary with the value of every attribute
+        """
+        tag = self.read('I')
+        count = self.size()
+        if tag not in (_NC_ATTRIBUTE, 0):
+            raise ValueError(f"invalid NETCDF3 header: expected a list of attributes at byte {self.offset}")
+
+        attributes = {}
+        for _ in range(count):
+            name = self.name()
+            dtype = _NC_TYPES[self.read('I')]
+            values = self.values(dtype, self.size())
+            if dtype.kind == 'S':
+                attributes[name] = values.tobytes().decode('utf-8')
+            else:
+                attributes[name] = values[0] if len(values) == 1 else values
+        return attributes
+
+
+class ClassicDimension:
+    """
+    Class dedicated to a dimension of a NETCDF3 classic file
+
+     Attributes:
+    - name: name of the dimension
+    - size: length of the dimension, the number of records for the record dimension
+
+     Methods:
+    - isunlimited: check whether the dimension is the record dimension
+    """
+
+    def __init__(self, name: str, size: int, unlimited: bool):
+        """
+        Constructor for the ClassicDimension objects
+        :param name: name of the dimension
+        :param size: length of the dimension
+        :param unlimited: True for the record dimension
+        """
+        self.name = name
+        self.size = size
+        self._unlimited = unlimited
+
+    def __len__(self) -> int:
+        """
+        Method dedicated to getting the length of the dimension
+        :return: the length of the dimension
+        """
+        return self.size
+
+    def isunlimited(self) -> bool:
+        """
+        Method dedicated to checking whether the dimension is the record (unlimited) dimension
+        :return: True for the record dimension
+        """
+        return self._unlimited
+
+
+class ClassicVariable:
+    """
+    Class dedicated to a variable of a NETCDF3 classic file, of which the values are read from the memory map
+
+     Attributes:
+    - name: name of the variable
+    - dimensions: tuple with the names of the dimensions of the variable
+    - shape: shape of the variable
+    - size: number of values of the variable
+    - ndim: number of dimensions of the variable
+    - dtype: data type of the variable, in native byte order like netCDF4
+    - file_dtype: big-endian data type of the variable as stored in the file, the data type of the values read,
+      as these are views on the memory map
+    - begin: offset of the (first record of the) values of the variable in the file
+
+     Methods:
+    - ncattrs: get the names of the attributes of the variable
+    - getncattr: get the value of an attribute of the variable
+    - chunking: get the chunking of the variable, None as classic files are not chunked
+    - is_record: check whether the variable is a record variable
+    - view: get the unmasked values of the variable as a view on the memory map
+    """
+
+    def __init__(self, dataset: 'ClassicDataset', name: str, dimensions: tuple, attributes: dict,
+                 dtype: np.dtype, begin: int):
+        """
+        Constructor for the ClassicVariable objects
+        :param dataset: the dataset of the variable
+        :param name: name of the variable
+        :param dimensions: tuple with the names of the dimensions of the variable
+        :param attributes: dictionary with the attributes of the variable
+        :param dtype: big-endian data type of the variable
+        :param begin: offset of the (first record of the) values of the variable in the file
+        """
+        self._dataset = dataset
+        self.name = name
+        self.dimensions = dimensions
+        self._attributes = attributes
+        self.file_dtype = dtype
+        self.dtype = dtype.newbyteorder('=')
+        self.begin = begin
+
+    @property
+    def shape(self) -> tuple:
+        """
+        Property dedicated to the shape of the variable
+        :return: the length of every dimension of the variable
+        """
+        return tuple(len(self._dataset.dimensions[dim_name]) for dim_name in self.dimensions)
+
+    @property
+    def size(self) -> int:
+        """
+        Property dedicated to the number of values of the variable
+        :return: the number of values
+        """
+        return int(np.prod(self.shape))
+
+    @property
+    def ndim(self) -> int:
+        """
+        Property dedicated to the number of dimensions of the variable
+        :return: the number of dimensions
+        """
+        return len(self.dimensions)
+
+    def ncattrs(self) -> list[str]:
+        """
+        Method dedicated to getting the names of the attributes of the variable
+        :return: list with the names of the attributes
+        """
+        return list(self._attributes)
+
+    def getncattr(self, name: str):
+        """
+        Method dedicated to getting the value of an attribute of the variable
+        :param name: name of the attribute
+        :return: the value of the attribute
+        """
+        return self._attributes[name]
+
+    @staticmethod
+    def chunking():
+        """
+        Method dedicated to getting the chunking of the variable, like netCDF4 for classic files
+        :return: None, as classic files are not chunked
+        """
+        return None
+
+    def is_record(self) -> bool:
+        """
+        Method dedicated to checking whether the variable is a record variable
+        :return: True if the first dimension of the variable is the record dimension
+        """
+        return bool(self.dimensions) and self._dataset.dimensions[self.dimensions[0]].isunlimited()
+
+    def view(self) -> np.ndarray:
+        """
+        Method dedicated to getting the unmasked values of the variable as a view on the memory map.
+        The records of record variables are interleaved with the records of the other record variables,
+        so the view strides over the records.
+        :return: read-only, big-endian view on the values of the variable
+        """
+        shape = self.shape
+        strides = [self.file_dtype.itemsize] * len(shape)
+        for axis in range(len(shape) - 2, -1, -1):
+            strides[axis] = strides[axis + 1] * shape[axis + 1]
+        if self.is_record():
+            strides[0] = self._dataset.record_size
+        return np.ndarray(shape, dtype=self.file_dtype, buffer=self._dataset.buffer, offset=self.begin,
+                          strides=tuple(strides))
+
+    def _mask(self, values: np.ndarray) -> np.ndarray:
+        """
+        Method dedicated to getting the mask of values of the variable, like netCDF4
+        :param values: the values
+        :return: boolean array which is True where the values are fill values, missing or not valid
+        """
+        mask = np.zeros(values.shape, dtype=bool)
+        fill_value = self._attributes.get('_FillValue', netCDF4.default_fillvals.get(self.dtype.str[1:]))
+        for missing in [fill_value] + list(np.atleast_1d(self._attributes.get('missing_value', []))):
+            if missing is None:
+                continue
+            if self.dtype.kind == 'f' and np.isnan(missing):
+                mask |= np.isnan(values)
+            else:
+                mask |= values == np.array(missing, dtype=self.dtype)
+
+        valid_min, valid_max = self._attributes.get('valid_range', (None, None))
+        valid_min = self._attributes.get('valid_min', valid_min)
+        valid_max = self._attributes.get('valid_max', valid_max)
+        if valid_min is not None:
+            mask |= values < valid_min
+        if valid_max is not None:
+            mask |= values > valid_max
+        return mask
+
+    def __getitem__(self, key) -> np.ma.MaskedArray:
+        """
+        Method dedicated to reading values of the variable, masked and unpacked like netCDF4.
+        Unlike netCDF4 the values of unpacked variables are big-endian (file_dtype) instead of native (dtype),
+        as they are not copied from the memory map.
+        :param key: the index, for example a tuple with a slice for every dimension
+        :return: the masked values, a big-endian view on the memory map unless the variable is packed
+        """
+        values = self.view()[key]
+        if self.dtype.kind == 'S':
+            return np.ma.masked_array(values)
+
+        mask = self._mask(values)
+        if 'scale_factor' in self._attributes or 'add_offset' in self._attributes:
+            values = values * self._attributes.get('scale_factor', 1) + self._attributes.get('add_offset', 0)
+
+        if mask.any():
+            return np.ma.masked_array(values, mask=mask, fill_value=self._attributes.get('_FillValue'))
+        return np.ma.masked_array(values)
+
+
+class ClassicDataset:
+    """
+    Class dedicated to a NETCDF3 classic file opened as a memory map, with the part of the interface of
+    `netCDF4.Dataset` used by the quality control checks
+
+     Attributes:
+    - file_format: the format of the file, for example 'NETCDF3_CLASSIC'
+    - data_model: the data model of the file, equal to the format
+    - dimensions: dictionary with the dimensions of the file
+    - variables: dictionary with the variables of the file
+    - buffer: the memory map (or the bytes-like object) holding the file
+    - record_size: number of bytes of a record of all record variables together
+
+     Methods:
+    - filepath: get the path of the file
+    - ncattrs: get the names of the global attributes
+    - getncattr: get the value of a global attribute
+    - isopen: check whether the dataset is open
+    - close: close the dataset
+    """
+
+    def __init__(self, source: Union[str, Path, bytes, bytearray, memoryview], name: str = 'memory.nc'):
+        """
+        Constructor for the ClassicDataset objects, which parses the header of the file
+        :param source: path to the file, which is memory mapped, or its content as a bytes-like object
+        :param name: name of a file given as a bytes-like object. Defaults to 'memory.nc'.
+        """
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self.buffer = np.frombuffer(source, dtype=np.uint8)
+            self._path = name
+        else:
+            self.buffer = np.memmap(source, dtype=np.uint8, mode='r')
+            self._path = str(source)
+
+        magic = self.buffer[:4].tobytes()
+        if magic not in CLASSIC_FORMATS:
+            raise ValueError(f"'{self._path}' is not a NETCDF3 classic file")
+        self.file_format = CLASSIC_FORMATS[magic]
+        self.data_model = self.file_format
+
+        reader = _HeaderReader(self.buffer, magic[3])
+        records = reader.size()
+        self.dimensions = self._read_dimensions(reader, records)
+        self._attributes = reader.attributes()
+        self.variables = self._read_variables(reader)
+
+        record_variables = [variable for variable in self.variables.values() if variable.is_record()]
+        self.record_size = sum(self._vsizes[variable.name] for variable in record_variables)
+        if len(record_variables) == 1:
+            # a single record variable is not padded
+            variable = record_variables[0]
+            self.record_size = int(np.prod(variable.shape[1:])) * variable.dtype.itemsize
+
+        if records == _STREAMING[reader.version]:
+            record_dimension = next(dim for dim in self.dimensions.values() if dim.isunlimited())
+            first = min((variable.begin for variable in record_variables), default=len(self.buffer))
+            record_dimension.size = (len(self.buffer) - first) // self.record_size if self.record_size else 0
+
+    @staticmethod
+    def _read_dimensions(reader: _HeaderReader, records: int) -> dict:
+        """
+        Method dedicated to reading the list of dimensions of the header
+        :param reader: the reader of the header
+        :param records: the number of records
+        :return: dictionary with the dimensions
+        """
+        tag = reader.read('I')
+        count = reader.size()
+        if tag not in (_NC_DIMENSION, 0):
+            raise ValueError(f"invalid NETCDF3 header: expected a list of dimensions at byte {reader.offset}")
+
+        dimensions = {}
+        for _ in range(count):
+            name = reader.name()
+            length = reader.size()
+            dimensions[name] = ClassicDimension(name, records if length == 0 else length, length == 0)
+        return dimensions
+
+    def _read_variables(self, reader: _HeaderReader) -> dict:
+        """
+        Method dedicated to reading the list of variables of the header
+        :param reader: the reader of the header
+        :return: dictionary with the variables
+        """
+        tag = reader.read('I')
+        count = reader.size()
+        if tag not in (_NC_VARIABLE, 0):
+            raise ValueError(f"invalid NETCDF3 header: expected a list of variables at byte {reader.offset}")
+
+        dimension_names = list(self.dimensions)
+        self._vsizes = {}
+        variables = {}
+        for _ in range(count):
+            name = reader.name()
+            dimensions = tuple(dimension_names[reader.size()] for _ in range(reader.size()))
+            attributes = reader.attributes()
+            dtype = _NC_TYPES[reader.read('I')]
+            self._vsizes[name] = reader.size()
+            begin = reader.read('I' if reader.version == 1 else 'Q')
+            variables[name] = ClassicVariable(self, name, dimensions, attributes, dtype, begin)
+        return variables
+
+    def __getitem__(self, name: str) -> ClassicVariable:
+        """
+        Method dedicated to getting a variable of the file
+        :param name: name of the variable
+        :return: the variable
+        """
+        return self.variables[name]
+
+    def __enter__(self):
+        """
+        Method dedicated to using the dataset as a context manager
+        :return: the dataset
+        """
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Method dedicated to closing the dataset at the end of a with statement
+        :param exc_info: the exception raised in the with statement, if any
+        """
+        self.close()
+
+    def filepath(self) -> str:
+        """
+        Method dedicated to getting the path of the file
+        :return: the path of the file, or the name of a file given as a bytes-like object
+        """
+        return self._path
+
+    def ncattrs(self) -> list[str]:
+        """
+        Method dedicated to getting the names of the global attributes
+        :return: list with the names of the global attributes
+        """
+        return list(self._attributes)
+
+    def getncattr(self, name: str):
+        """
+        Method dedicated to getting the value of a global attribute
+        :param name: name of the global attribute
+        :return: the value of the global attribute
+        """
+        return self._attributes[name]
+
+    def isopen(self) -> bool:
+        """
+        Method dedicated to checking whether the dataset is open
+        :return: True if the dataset is open
+        """
+        return self.buffer is not None
+
+    def close(self):
+        """
+        Method dedicated to closing the dataset. The memory map is closed when the last array viewing it
+        is no longer used.
+        """
+        self.buffer = None
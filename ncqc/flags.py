@@ -0,0 +1,289 @@
+"""
+Module dedicated to per data point quality control flags. Every data check which can flag single data points
+has a flagger, which turns a slab of a variable into a boolean array with the same shape which is True at
+the flagged data points. The flags of all checks of a variable are combined into a bitmask following the
+CF conventions for flag_masks and flag_meanings, one bit per check.
+
+Flags only depend on the values read so far, so a variable can be flagged slab by slab in a single pass:
+for consecutive identical values the values from the (maximum + 1)th value of a run onwards are flagged,
+for adjacent values the value which differs too much from the previous value along the dimension is flagged.
+
+ Functions:
+- flag_attributes: get the CF attributes of a flag variable for a set of checks
+
+ Classes:
+- EmptinessFlagger: flags empty and NaN data points
+- BoundariesFlagger: flags data points out of bounds
+- IdenticalRunsFlagger: flags data points continuing a run of too many consecutive identical values
+- AdjacentDifferencesFlagger: flags data points differing too much from the previous data point
+- VariableFlagger: combines the flags of all checks of a variable into a bitmask
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from ncqc.kernels import boundaries_mask, missing_mask, absolute_difference
+
+# the bit and the CF flag meaning of each check which flags data points
+FLAG_MASKS = {
+    'emptiness_check': 1,
+    'data_boundaries_check': 2,
+    'consecutive_identical_values_check': 4,
+    'adjacent_values_difference_check': 8
+}
+FLAG_MEANINGS = {
+    'emptiness_check': 'empty',
+    'data_boundaries_check': 'out_of_bounds',
+    'consecutive_identical_values_check': 'too_many_consecutive_identical_values',
+    'adjacent_values_difference_check': 'adjacent_values_difference_too_large'
+}
+FLAG_DTYPE = np.uint8
+
+
+def flag_attributes(checks: list[str]) -> dict:
+    """
+    Function to get the CF attributes of a flag variable for a set of checks
+    :param checks: the checks of which the variable holds the flags
+    :return: dictionary with the flag_masks and flag_meanings attributes
+    """
+    checks = [check for check in FLAG_MASKS if check in checks]
+    return {
+        'flag_masks': np.array([FLAG_MASKS[check] for check in checks], dtype=FLAG_DTYPE),
+        'flag_meanings': ' '.join(FLAG_MEANINGS[check] for check in checks)
+    }
+
+
+def _lines(array: np.ndarray, axis: int) -> np.ndarray:
+    """
+    Function to get the lines of an array along an axis as the rows of a 2-dimensional array
+    :param array: the array
+    :param axis: the axis
+    :return: the 2-dimensional array, the lines numbered in C order over the other axes
+    """
+    array = np.moveaxis(np.atleast_1d(array), axis, -1)
+    return array.reshape(-1, array.shape[-1])
+
+
+def _unlines(lines: np.ndarray, shape: Tuple[int, ...], axis: int) -> np.ndarray:
+    """
+    Function to get back an array with the given shape from its lines along an axis, see _lines
+    :param lines: the 2-dimensional array of lines
+    :param shape: the shape of the array
+    :param axis: the axis
+    :return: the array
+    """
+    moved = np.moveaxis(np.empty(tuple(shape) or (1,), dtype=bool), axis, -1).shape
+    return np.moveaxis(lines.reshape(moved), -1, axis).reshape(shape)
+
+
+class EmptinessFlagger:
+    """
+    Class dedicated to flagging empty (masked) and NaN data points
+
+     Methods:
+    - flags: get the flags of a slab
+    """
+
+    def flags(self, values: np.ndarray, start: Tuple[int, ...]) -> np.ndarray:  # pylint: disable=unused-argument
+        """
+        Method dedicated to getting the flags of a slab
+        :param values: the values of the slab
+        :param start: the index of the first data point of the slab in the variable
+        :return: boolean array which is True at the flagged data points
+        """
+        return missing_mask(values)
+
+
+class BoundariesFlagger:
+    """
+    Class dedicated to flagging data points out of bounds
+
+     Methods:
+    - flags: get the flags of a slab
+    """
+
+    def __init__(self, lower_bound, upper_bound):
+        """
+        Constructor for the BoundariesFlagger objects
+        :param lower_bound: the lowest allowed value
+        :param upper_bound: the highest allowed value
+        """
+        self.lower_bound = lower_bound
+        self.upper_bound = upper_bound
+
+    def flags(self, values: np.ndarray, start: Tuple[int, ...]) -> np.ndarray:  # pylint: disable=unused-argument
+        """
+        Method dedicated to getting the flags of a slab
+        :param values: the values of the slab
+        :param start: the index of the first data point of the slab in the variable
+        :return: boolean array which is True at the flagged data points
+        """
+        return boundaries_mask(values, self.lower_bound, self.upper_bound)
+
+
+class IdenticalRunsFlagger:
+    """
+    Class dedicated to flagging data points continuing a run of more than maximum consecutive identical values
+    along one of the axes of a variable. For every line along the axis the run at the end of a slab is carried
+    over to the next slab. Masked and NaN values never belong to a run.
+
+     Methods:
+    - flags: get the flags of a slab
+    """
+
+    def __init__(self, maximum: int, shape: Tuple[int, ...], axis: int = 0):
+        """
+        Constructor for the IdenticalRunsFlagger objects
+        :param maximum: the maximum allowed number of consecutive identical values
+        :param shape: the shape of the variable
+        :param axis: the axis along which runs are counted. Defaults to 0.
+        """
+        self.maximum = maximum
+        self.axis = axis
+
+        # the length and value of the run at the end of every line processed so far
+        shape = tuple(shape) or (1,)
+        self._lines_shape = shape[:axis] + shape[axis + 1:]
+        self._carry_length = np.zeros(self._lines_shape, dtype=np.int64)
+        self._carry_value = None
+
+    def flags(self, values: np.ndarray, start: Tuple[int, ...]) -> np.ndarray:
+        """
+        Method dedicated to getting the flags of a slab
+        :param values: the values of the slab
+        :param start: the index of the first data point of the slab in the variable
+        :return: boolean array which is True at the flagged data points
+        """
+        shape = np.shape(values)
+        data = _lines(np.ma.getdata(values), self.axis)
+        mask = _lines(np.ma.getmaskarray(values), self.axis)
+        if data.size == 0:
+            return np.zeros(shape, dtype=bool)
+
+        start = tuple(start) or (0,)
+        slab_shape = tuple(shape) or (1,)
+        region = tuple(slice(i, i + n) for i, n in zip(start[:self.axis] + start[self.axis + 1:],
+                                                       slab_shape[:self.axis] + slab_shape[self.axis + 1:]))
+        if self._carry_value is None:
+            self._carry_value = np.zeros(self._lines_shape, dtype=data.dtype)
+        carry_length = self._carry_length[region].reshape(-1)
+        carry_value = self._carry_value[region].reshape(-1)
+
+        # a value continues the run of the previous value if both are identical and not masked
+        continues = np.zeros(data.shape, dtype=bool)
+        np.equal(data[:, 1:], data[:, :-1], out=continues[:, 1:])
+        continues[:, 1:] &= ~mask[:, :-1]
+        continues[:, 0] = (carry_length > 0) & (data[:, 0] == carry_value)
+        continues &= ~mask
+
+        # the length of the run up to every value: its distance to the start of the run
+        positions = np.arange(data.shape[1])
+        run_start = np.maximum.accumulate(np.where(continues, -1, positions), axis=1)
+        length = np.where(run_start < 0, positions + 1 + carry_length[:, np.newaxis], positions - run_start + 1)
+        length[mask] = 0
+
+        self._carry_length[region] = length[:, -1].reshape(self._carry_length[region].shape)
+        self._carry_value[region] = data[:, -1].reshape(self._carry_value[region].shape)
+
+        return _unlines(length > self.maximum, shape, self.axis)
+
+
+class AdjacentDifferencesFlagger:
+    """
+    Class dedicated to flagging data points which differ more than a maximum from the previous data point along
+    one of the axes of a variable. For every line along the axis the last value of a slab is carried over to
+    the next slab. Differences with masked values are never flagged.
+
+     Methods:
+    - flags: get the flags of a slab
+    """
+
+    def __init__(self, maximum, shape: Tuple[int, ...], axis: int):
+        """
+        Constructor for the AdjacentDifferencesFlagger objects
+        :param maximum: the maximum allowed absolute difference
+        :param shape: the shape of the variable
+        :param axis: the axis along which values are adjacent
+        """
+        self.maximum = maximum
+        self.axis = axis
+
+        # the last value of every line processed so far
+        self._lines_shape = tuple(shape[:axis]) + tuple(shape[axis + 1:])
+        self._previous = None
+        self._previous_missing = np.ones(self._lines_shape, dtype=bool)
+
+    def flags(self, values: np.ndarray, start: Tuple[int, ...]) -> np.ndarray:
+        """
+        Method dedicated to getting the flags of a slab
+        :param values: the values of the slab
+        :param start: the index of the first data point of the slab in the variable
+        :return: boolean array which is True at the flagged data points
+        """
+        shape = np.shape(values)
+        data = _lines(np.ma.getdata(values), self.axis)
+        mask = _lines(np.ma.getmaskarray(values), self.axis)
+        if data.size == 0:
+            return np.zeros(shape, dtype=bool)
+
+        region = tuple(slice(i, i + n) for i, n in zip(start[:self.axis] + start[self.axis + 1:],
+                                                       shape[:self.axis] + shape[self.axis + 1:]))
+        if self._previous is None:
+            self._previous = np.zeros(self._lines_shape, dtype=data.dtype)
+
+        # every value is compared with the value before it, the first values with the carried over values
+        previous = np.empty_like(data)
+        previous[:, 1:] = data[:, :-1]
+        previous[:, 0] = self._previous[region].reshape(-1)
+        previous_mask = np.empty_like(mask)
+        previous_mask[:, 1:] = mask[:, :-1]
+        previous_mask[:, 0] = self._previous_missing[region].reshape(-1)
+
+        flags = np.greater(absolute_difference(data, previous), self.maximum)
+        flags &= ~mask & ~previous_mask
+
+        self._previous[region] = data[:, -1].reshape(self._previous[region].shape)
+        self._previous_missing[region] = mask[:, -1].reshape(self._previous_missing[region].shape)
+
+        return _unlines(flags, shape, self.axis)
+
+
+class VariableFlagger:
+    """
+    Class dedicated to combining the flags of all checks of a variable into a bitmask
+
+     Attributes:
+    - flaggers: list with a tuple (check, flagger) for every flagger of the variable
+
+     Methods:
+    - checks: get the checks which flag the variable
+    - flags: get the bitmask of a slab
+    """
+
+    def __init__(self, flaggers: list):
+        """
+        Constructor for the VariableFlagger objects
+        :param flaggers: list with a tuple (check, flagger) for every flagger of the variable,
+                         a check can have multiple flaggers (for example one per dimension)
+        """
+        self.flaggers = flaggers
+
+    def checks(self) -> list[str]:
+        """
+        Method dedicated to getting the checks which flag the variable
+        :return: the checks, in the order of their bits
+        """
+        return [check for check in FLAG_MASKS if any(check == flagger_check for flagger_check, _ in self.flaggers)]
+
+    def flags(self, values: np.ndarray, start: Tuple[int, ...]) -> np.ndarray:
+        """
+        Method dedicated to getting the bitmask of a slab
+        :param values: the values of the slab
+        :param start: the index of the first data point of the slab in the variable
+        :return: array of FLAG_DTYPE with the shape of the slab
+        """
+        bitmask = np.zeros(np.shape(values), dtype=FLAG_DTYPE)
+        for check, flagger in self.flaggers:
+            bitmask[flagger.flags(values, start)] |= FLAG_MASKS[check]
+        return bitmask
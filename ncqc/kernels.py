@@ -0,0 +1,288 @@
+"""
+Module dedicated to the vectorized NumPy kernels behind the quality control checks.
+The kernels work on (masked) arrays and return plain dictionaries with the results,
+formatting those results into log messages is left to the QualityControl class.
+
+ Functions:
+- first_true_indices: get the N-dimensional indices of the first n True values of a boolean array
+- boundaries_mask: get a boolean array which is True where the values of an array fall outside of the given bounds
+- boundaries_violations: find all values of an array which fall outside of the given bounds
+- missing_mask: get a boolean array which is True where the values of an array are empty or NaN
+- emptiness_counts: count the empty and NaN values of an array and find its completely empty indices per axis
+- line_runs: find the runs of consecutive identical values along an axis of an array
+- absolute_difference: get the absolute difference between two arrays without overflow for unsigned integers
+- adjacent_exceedances: find all adjacent values along an axis of an array which differ more than a maximum
+- exceedances_summary: summarize the differences which exceed a maximum
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+# number of elements scanned at once when looking for the first True values of a mask
+_SCAN_BLOCK_SIZE = 1 << 16
+
+
+def first_true_indices(mask: np.ndarray, n: int) -> List[Tuple[int, ...]]:
+    """
+    Function to get the N-dimensional indices of the first n True values of a boolean array,
+    in C order. The array is scanned in blocks so memory use does not depend on the number
+    of True values.
+    :param mask: the boolean array to scan
+    :param n: the maximum number of indices to return
+    :return: list of index tuples, one entry per dimension of the array
+    """
+    if n <= 0 or mask.size == 0:
+        return []
+
+    flat_mask = np.ravel(mask)
+    flat_indices = []
+
+    for start in range(0, flat_mask.size, _SCAN_BLOCK_SIZE):
+        hits = np.flatnonzero(flat_mask[start:start + _SCAN_BLOCK_SIZE])
+        flat_indices.extend((hits[:n - len(flat_indices)] + start).tolist())
+        if len(flat_indices) >= n:
+            break
+
+    if not flat_indices:
+        return []
+
+    if mask.ndim == 0:
+        return [()]
+
+    return [tuple(int(i) for i in index) for index in zip(*np.unravel_index(flat_indices, mask.shape))]
+
+
+def _dtype_extremes(dtype: np.dtype) -> Tuple:
+    """
+    Function to get the lowest and highest representable value of a numeric dtype
+    :param dtype: the dtype
+    :return: tuple (lowest, highest)
+    """
+    if np.issubdtype(dtype, np.integer):
+        info = np.iinfo(dtype)
+        return info.min, info.max
+    return -np.inf, np.inf
+
+
+def boundaries_mask(values: np.ndarray, lower_bound, upper_bound) -> np.ndarray:
+    """
+    Function to get a boolean array which is True where the values of a (possibly masked) array fall outside
+    of the given bounds. Masked values and NaN values are never considered to be out of bounds.
+    :param values: the array to check
+    :param lower_bound: the lowest allowed value
+    :param upper_bound: the highest allowed value
+    :return: the boolean array, with the shape of the values
+    """
+    data = np.ma.getdata(values)
+    mask = np.ma.getmask(values)
+
+    violations = np.less(data, lower_bound)
+    violations |= np.greater(data, upper_bound)
+    if mask is not np.ma.nomask:
+        violations &= ~mask
+    return violations
+
+
+def boundaries_violations(values: np.ndarray, lower_bound, upper_bound, max_values: int) -> dict:
+    """
+    Function to find all values of a (possibly masked and multidimensional) array which fall outside
+    of the given bounds. Masked values and NaN values are never considered to be out of bounds.
+    :param values: the array to check
+    :param lower_bound: the lowest allowed value
+    :param upper_bound: the highest allowed value
+    :param max_values: the maximum number of offending values and indices to return
+    :return: dictionary with:
+        - count: number of values out of bounds
+        - min: lowest offending value (None if there are none)
+        - max: highest offending value (None if there are none)
+        - values: the first max_values offending values in C order
+        - indices: the indices of those values
+    """
+    data = np.ma.getdata(values)
+    violations = boundaries_mask(values, lower_bound, upper_bound)
+
+    count = int(np.count_nonzero(violations))
+    if count == 0:
+        return {'count': 0, 'min': None, 'max': None, 'values': [], 'indices': []}
+
+    lowest, highest = _dtype_extremes(data.dtype)
+    indices = first_true_indices(violations, max_values)
+
+    return {
+        'count': count,
+        'min': np.min(data, where=violations, initial=highest),
+        'max': np.max(data, where=violations, initial=lowest),
+        'values': [data[index] for index in indices],
+        'indices': indices
+    }
+
+
+def missing_mask(values: np.ndarray) -> np.ndarray:
+    """
+    Function to get a boolean array which is True where the values of a (possibly masked) array
+    are empty (masked) or NaN
+    :param values: the array to check
+    :return: the boolean array, with the shape of the values
+    """
+    data = np.ma.getdata(values)
+    missing = np.ma.getmaskarray(values)
+
+    if np.issubdtype(data.dtype, np.floating):
+        missing = missing | np.isnan(data)
+    return missing
+
+
+def emptiness_counts(values: np.ndarray) -> dict:
+    """
+    Function to count the empty (masked) and NaN values of a (possibly masked and multidimensional) array,
+    and to find for every axis of a multidimensional array the indices at which all values are empty or NaN
+    (for example completely empty time steps).
+    :param values: the array to check
+    :return: dictionary with:
+        - checked: number of values
+        - empty: number of masked values
+        - nan: number of NaN values which are not masked
+        - empty_along: for every axis a boolean array which is True at the indices along the axis at which
+          all values are empty or NaN (an empty list for arrays with less than 2 dimensions)
+    """
+    data = np.ma.getdata(values)
+    missing = np.ma.getmaskarray(values)
+    empty = int(np.ma.count_masked(values))
+    nan = 0
+
+    if np.issubdtype(data.dtype, np.floating):
+        nan_values = np.isnan(data)
+        nan_values &= ~missing
+        nan = int(np.count_nonzero(nan_values))
+        if nan:
+            missing = missing | nan_values
+
+    empty_along = []
+    if data.ndim >= 2:
+        axes = tuple(range(data.ndim))
+        empty_along = [np.all(missing, axis=axes[:axis] + axes[axis + 1:]) for axis in axes]
+
+    return {'checked': data.size, 'empty': empty, 'nan': nan, 'empty_along': empty_along}
+
+
+def line_runs(values: np.ndarray, axis: int = 0) -> dict:
+    """
+    Function to find the runs of consecutive identical values along an axis of a (possibly masked) array.
+    The array is split into lines along the axis, every line starts with a new run and a new run starts
+    wherever the value changes. Masked values and NaN values each form a run of their own.
+    :param values: the array
+    :param axis: the axis along which runs are found
+    :return: dictionary with:
+        - lines_shape: the shape of the array without the axis, the lines are numbered in C order over this shape
+        - line: the line of each run
+        - start: the index along the axis at which each run starts
+        - length: the length of each run
+        - masked: whether each run consists of a masked value
+        - value: the value of each run
+    """
+    data = np.moveaxis(np.atleast_1d(np.ma.getdata(values)), axis, -1)
+    mask = np.moveaxis(np.atleast_1d(np.ma.getmaskarray(values)), axis, -1)
+    lines_shape = data.shape[:-1]
+    line_length = data.shape[-1]
+
+    if data.size == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return {'lines_shape': lines_shape, 'line': empty, 'start': empty, 'length': empty,
+                'masked': np.zeros(0, dtype=bool), 'value': np.zeros(0, dtype=data.dtype)}
+
+    data = data.reshape(-1, line_length)
+    mask = mask.reshape(-1, line_length)
+
+    # change points: the first value of every line, every changed value and every value next to a masked value
+    run_starts = np.ones(data.shape, dtype=bool)
+    np.not_equal(data[:, 1:], data[:, :-1], out=run_starts[:, 1:])
+    run_starts[:, 1:] |= mask[:, 1:]
+    run_starts[:, 1:] |= mask[:, :-1]
+
+    flat_starts = np.flatnonzero(run_starts)
+    line, start = np.divmod(flat_starts, line_length)
+
+    return {
+        'lines_shape': lines_shape,
+        'line': line,
+        'start': start,
+        'length': np.diff(np.append(flat_starts, data.size)),
+        'masked': mask.ravel()[flat_starts],
+        'value': data.ravel()[flat_starts]
+    }
+
+
+def absolute_difference(upper: np.ndarray, lower: np.ndarray) -> np.ndarray:
+    """
+    Function to get the absolute difference between two arrays, allocating only the array of differences.
+    Unsigned integers are subtracted from the largest value, so the difference cannot wrap around.
+    :param upper: the first array
+    :param lower: the second array
+    :return: the absolute differences
+    """
+    if np.issubdtype(upper.dtype, np.unsignedinteger):
+        difference = np.asarray(np.maximum(upper, lower))
+        difference -= np.minimum(upper, lower)
+        return difference
+
+    difference = np.asarray(np.subtract(upper, lower))
+    return np.abs(difference, out=difference)
+
+
+def adjacent_exceedances(values: np.ndarray, axis: int, maximum, max_values: int) -> dict:
+    """
+    Function to find all pairs of adjacent values along an axis of a (possibly masked and multidimensional)
+    array of which the absolute difference is larger than the maximum. Pairs with a masked value and NaN
+    differences are never considered to exceed the maximum.
+    :param values: the array to check
+    :param axis: the axis along which values are adjacent
+    :param maximum: the maximum allowed absolute difference
+    :param max_values: the maximum number of offending differences and indices to return
+    :return: dictionary with:
+        - count: number of differences larger than the maximum
+        - max: largest offending difference (None if there are none)
+        - values: the first max_values offending differences in C order
+        - indices: the indices of the first value of the pairs with those differences
+    """
+    data = np.ma.getdata(values)
+    mask = np.ma.getmask(values)
+
+    if data.ndim == 0 or data.shape[axis] < 2:
+        return {'count': 0, 'max': None, 'values': [], 'indices': []}
+
+    upper = [slice(None)] * data.ndim
+    lower = [slice(None)] * data.ndim
+    upper[axis] = slice(1, None)
+    lower[axis] = slice(None, -1)
+    upper, lower = tuple(upper), tuple(lower)
+
+    difference = absolute_difference(data[upper], data[lower])
+    exceedances = np.greater(difference, maximum)
+    if mask is not np.ma.nomask:
+        exceedances &= ~mask[upper]
+        exceedances &= ~mask[lower]
+
+    return exceedances_summary(difference, exceedances, max_values)
+
+
+def exceedances_summary(difference: np.ndarray, exceedances: np.ndarray, max_values: int) -> dict:
+    """
+    Function to summarize the (absolute) differences which exceed a maximum
+    :param difference: the absolute differences
+    :param exceedances: boolean array, True where the difference exceeds the maximum
+    :param max_values: the maximum number of offending differences and indices to return
+    :return: see adjacent_exceedances
+    """
+    count = int(np.count_nonzero(exceedances))
+    if count == 0:
+        return {'count': 0, 'max': None, 'values': [], 'indices': []}
+
+    indices = first_true_indices(exceedances, max_values)
+
+    return {
+        'count': count,
+        'max': np.max(difference, where=exceedances, initial=_dtype_extremes(difference.dtype)[0]),
+        'values': [difference[index] for index in indices],
+        'indices': indices
+    }
@@ -1,7 +1,209 @@
 """
 Module dedicated to the implementation of the logger for the netCDF quality control library
+
+ Classes:
+- LogRecord: a single structured error, warning or message, rendered to text only when needed
+- RecordList: the text of the records of a severity, as a list which writes through to the logger
+- LoggerQC: the logger collecting the records and creating the reports
 """
+from collections import Counter, deque
+from collections.abc import MutableSequence
 from datetime import date, datetime
+from typing import Optional, Tuple
+
+from ncqc.sinks import ReportSink
+
+SEVERITIES = ('error', 'warning', 'info')
+
+# the number of reports kept by a logger with a sink and without max_reports, as the sink keeps all reports
+SINK_MAX_REPORTS = 1
+
+
+class LogRecord:
+    """
+    Class dedicated to a single structured error, warning or message. The record stores the template of
+    the message and its values, the text is only formatted (with `str.format`) when it is first rendered.
+
+     Attributes:
+    - severity: 'error', 'warning' or 'info'
+    - template: the message, with a `{}` field for each of the args if there are any
+    - args: the values of the message, for example the value out of bounds
+    - check: the check which logged the record, if any
+    - variable: the variable the record is about, if any
+    - index: the index of the data point the record is about, if any
+
+     Methods:
+    - key: get the key of the record, identical for records with an identical message
+    - render: get the text of the record
+    - as_dict: get the record as a dictionary, for exporting
+    """
+
+    __slots__ = ('severity', 'template', 'args', 'check', 'variable', 'index', '_text')
+
+    def __init__(self, severity: str, template: str, args: tuple = (), check: Optional[str] = None,
+                 variable: Optional[str] = None, index: Optional[Tuple[int, ...]] = None):
+        """
+        Constructor for the LogRecord objects
+        :param severity: 'error', 'warning' or 'info'
+        :param template: the message, with a `{}` field for each of the args if there are any
+        :param args: the values of the message. Defaults to no values, the template is then the message itself.
+        :param check: the check which logged the record. Defaults to None.
+        :param variable: the variable the record is about. Defaults to None.
+        :param index: the index of the data point the record is about. Defaults to None.
+        """
+        self.severity = severity
+        self.template = template
+        self.args = args
+        self.check = check
+        self.variable = variable
+        self.index = index
+        self._text = None
+
+    def __repr__(self) -> str:
+        """
+        Method dedicated to getting a representation of the record for debugging
+        :return: the representation
+        """
+        return f"LogRecord({self.severity!r}, {self.render()!r}, check={self.check!r}, variable={self.variable!r})"
+
+    def key(self) -> tuple:
+        """
+        Method dedicated to getting the key of the record, identical for records with an identical message
+        :return: the key
+        """
+        return self.severity, self.template, self.args
+
+    def render(self) -> str:
+        """
+        Method dedicated to getting the text of the record, which is formatted once
+        :return: the text
+        """
+        if not self.args:
+            return self.template
+        if self._text is None:
+            self._text = self.template.format(*self.args)
+        return self._text
+
+    def as_dict(self) -> dict:
+        """
+        Method dedicated to getting the record as a dictionary, with the values of the message converted to
+        python types, for exporting
+        :return: the record as a dictionary
+        """
+        return {
+            'severity': self.severity,
+            'check': self.check,
+            'variable': self.variable,
+            'message': self.render(),
+            'values': [arg.item() if hasattr(arg, 'item') else arg for arg in self.args],
+            'index': None if self.index is None else [int(i) for i in self.index]
+        }
+
+
+class RecordList(MutableSequence):
+    """
+    Class dedicated to the text of the records of a severity of the report being created, as a list.
+    Reading renders the records, changing the list changes the records of the logger: added text becomes
+    a record without a check or variable, subject to the message caps and deduplication of the logger.
+
+     Methods:
+    - insert: insert the text of a record, the other list methods (append, extend, remove, ...) follow from it
+    """
+
+    __hash__ = None
+
+    def __init__(self, logger: 'LoggerQC', severity: str):
+        """
+        Constructor for the RecordList objects
+        :param logger: the logger of the records
+        :param severity: 'error', 'warning' or 'info'
+        """
+        self._logger = logger
+        self._severity = severity
+
+    @property
+    def _records(self) -> list[LogRecord]:
+        """
+        The records of the severity of the report being created
+        :return: the records
+        """
+        return self._logger._records[self._severity]  # pylint: disable=protected-access
+
+    def __getitem__(self, index):
+        """
+        Method dedicated to getting the text of a record, or a list with the text of a slice of the records
+        :param index: the index or slice
+        :return: the text
+        """
+        if isinstance(index, slice):
+            return [record.render() for record in self._records[index]]
+        return self._records[index].render()
+
+    def __setitem__(self, index, value):
+        """
+        Method dedicated to replacing a record, or a slice of the records, by records with the given text
+        :param index: the index or slice
+        :param value: the text, or an iterable with the texts for a slice
+        """
+        if isinstance(index, slice):
+            self._records[index] = [LogRecord(self._severity, text) for text in value]
+        else:
+            self._records[index] = LogRecord(self._severity, value)
+
+    def __delitem__(self, index):
+        """
+        Method dedicated to removing a record, or a slice of the records
+        :param index: the index or slice
+        """
+        del self._records[index]
+
+    def __len__(self) -> int:
+        """
+        Method dedicated to getting the number of records
+        :return: the number of records
+        """
+        return len(self._records)
+
+    def insert(self, index: int, value: str):
+        """
+        Method dedicated to inserting a record with the given text, if the logger accepts it
+        :param index: the index to insert the record at
+        :param value: the text
+        """
+        self._logger._insert_record(index, LogRecord(self._severity, value))  # pylint: disable=protected-access
+
+    def __eq__(self, other) -> bool:
+        """
+        Method dedicated to comparing the text of the records with a list
+        :param other: a list or RecordList
+        :return: True if the texts are equal
+        """
+        if not isinstance(other, (list, RecordList)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __add__(self, other) -> list[str]:
+        """
+        Method dedicated to concatenating the text of the records with a list
+        :param other: the list
+        :return: a new list
+        """
+        return list(self) + list(other)
+
+    def __radd__(self, other) -> list[str]:
+        """
+        Method dedicated to concatenating a list with the text of the records
+        :param other: the list
+        :return: a new list
+        """
+        return list(other) + list(self)
+
+    def __repr__(self) -> str:
+        """
+        Method dedicated to getting a representation of the text of the records
+        :return: the representation
+        """
+        return repr(list(self))
 
 
 class LoggerQC:
@@ -9,69 +211,353 @@ class LoggerQC:
     Class dedicated to logging errors, warnings, info, and creating
     reports for the netCDF quality control library
 
+    Messages are stored as structured records (see LogRecord), their text is only formatted when the
+    errors, warnings or info are accessed, or when a report is created. The errors, warnings and info are
+    lists of text (see RecordList) which write through to the records, so appending to them logs a message.
+
+    By default every message is kept and all reports are kept. To bound the memory use of a long-running
+    process, the logger can cap the number of errors and warnings per check and per variable (messages
+    logged with a check and variable, any further messages are counted and summarized in a warning in the
+    report), deduplicate identical messages (counting their occurrences) and keep only the latest reports.
+    With a sink (see sinks.py) every report is also written to a file as soon as it is created, and only the
+    latest SINK_MAX_REPORTS reports are kept in memory unless max_reports is set.
+
      Attributes:
-    - reports: list of created reports
-    - errors: list of logged errors for the report being created
-    - warnings: list of logged warnings for the report being created
-    - info: list of messages for the report being created
+    - reports: created reports, at most max_reports, or SINK_MAX_REPORTS with a sink and without max_reports
+      (the oldest reports are evicted first)
+    - errors: list of the text of the logged errors for the report being created
+    - warnings: list of the text of the logged warnings for the report being created
+    - info: list of the text of the messages for the report being created
+    - max_reports: maximum number of reports kept, None to keep all reports (without a sink)
+    - max_messages_per_check: maximum number of errors and warnings per check in a report, None for no maximum
+    - max_messages_per_variable: maximum number of errors and warnings per variable in a report,
+      None for no maximum
+    - deduplicate: True to log identical errors and warnings only once, with the number of occurrences
+    - sink: sink every created report is written to, None to only keep the reports in memory
 
      Methods:
     - add_error: method to add an error
     - add_warning: method to add info
     - add_info: method to add a message
+    - add_record: method to add an existing record, for example taken from a cache
+    - merge: method to add all errors, warnings and info of another logger
+    - buffer: method to get a logger which buffers messages to be merged into this logger later
+    - get_records: method to get the records of the report being created
     - create_report: method to create a report
     - get_latest_report: method to get the latest report
     - get_all_reports: method to get all reports
     """
 
-    def __init__(self):
+    def __init__(self, max_reports: Optional[int] = None, max_messages_per_check: Optional[int] = None,
+                 max_messages_per_variable: Optional[int] = None, deduplicate: bool = False,
+                 sink: Optional[ReportSink] = None):
         """
         Constructor for the logger object
+        :param max_reports: maximum number of reports kept. Defaults to None, which keeps all reports,
+                            or the latest SINK_MAX_REPORTS reports if there is a sink.
+        :param max_messages_per_check: maximum number of errors and warnings logged per check in a report.
+                                       Defaults to None, which logs all messages.
+        :param max_messages_per_variable: maximum number of errors and warnings logged per variable in a report.
+                                          Defaults to None, which logs all messages.
+        :param deduplicate: True to log identical errors and warnings only once. Defaults to False.
+        :param sink: sink every created report is written to, for example a JsonLinesSink. Defaults to None.
+        """
+        self.max_reports = max_reports
+        self.max_messages_per_check = max_messages_per_check
+        self.max_messages_per_variable = max_messages_per_variable
+        self.deduplicate = deduplicate
+        self._sink = sink
+        self.reports = deque()
+        self._records = {severity: [] for severity in SEVERITIES}
+
+        # state of the report being created, shared with the buffers of this logger
+        self._occurrences = {}
+        self._check_counts = Counter()
+        self._variable_counts = Counter()
+        self._suppressed = Counter()
+
+    @property
+    def reports(self) -> deque:
+        """
+        The created reports, at most max_reports, or SINK_MAX_REPORTS with a sink and without max_reports
+        :return: the reports
+        """
+        return self._reports
+
+    @reports.setter
+    def reports(self, reports):
+        """
+        Method dedicated to replacing the created reports
+        :param reports: the new reports, of which only the latest are kept
+        """
+        max_reports = SINK_MAX_REPORTS if self.max_reports is None and self._sink is not None else self.max_reports
+        self._reports = deque(reports, maxlen=max_reports)
+
+    @property
+    def sink(self) -> Optional[ReportSink]:
+        """
+        The sink every created report is written to, None to only keep the reports in memory
+        :return: the sink
+        """
+        return self._sink
+
+    @sink.setter
+    def sink(self, sink: Optional[ReportSink]):
+        """
+        Method dedicated to replacing the sink, which changes the number of reports kept
+        :param sink: the new sink
+        """
+        self._sink = sink
+        self.reports = self._reports
+
+    @property
+    def errors(self) -> RecordList:
+        """
+        The text of the logged errors for the report being created, as a list which writes through to the logger
+        :return: the errors
+        """
+        return RecordList(self, 'error')
+
+    @errors.setter
+    def errors(self, errors: list[str]):
+        """
+        Method dedicated to replacing the logged errors for the report being created
+        :param errors: the new errors
+        """
+        self._replace_records('error', errors)
+
+    @property
+    def warnings(self) -> RecordList:
+        """
+        The text of the logged warnings for the report being created, as a list which writes through to the logger
+        :return: the warnings
+        """
+        return RecordList(self, 'warning')
+
+    @warnings.setter
+    def warnings(self, warnings: list[str]):
+        """
+        Method dedicated to replacing the logged warnings for the report being created
+        :param warnings: the new warnings
+        """
+        self._replace_records('warning', warnings)
+
+    @property
+    def info(self) -> RecordList:
+        """
+        The text of the logged messages for the report being created, as a list which writes through to the logger
+        :return: the messages
+        """
+        return RecordList(self, 'info')
+
+    @info.setter
+    def info(self, info: list[str]):
+        """
+        Method dedicated to replacing the logged messages for the report being created
+        :param info: the new messages
         """
-        self.reports: list[dict] = []
-        self.errors = []
-        self.warnings = []
-        self.info = []
+        self._replace_records('info', info)
 
-    def add_error(self, error: str):
+    def _replace_records(self, severity: str, texts: list[str]):
+        """
+        Method dedicated to replacing the records of a severity by records with the given text
+        :param severity: 'error', 'warning' or 'info'
+        :param texts: the text of the new records
+        """
+        if isinstance(texts, RecordList) and texts._logger is self and \
+                texts._severity == severity:  # pylint: disable=protected-access
+            # the list itself, for example after `logger.errors += [...]`, keeps the records as they are
+            return
+        self._records[severity] = [LogRecord(severity, text) for text in texts]
+
+    def _insert_record(self, index: int, record: LogRecord):
+        """
+        Method dedicated to inserting a record at an index, if it is accepted like a record added by add_record
+        :param index: the index to insert the record at
+        :param record: the record
+        """
+        if record.severity == 'info' or self._accept(record):
+            self._records[record.severity].insert(index, record)
+
+    def _accept(self, record: LogRecord) -> bool:
+        """
+        Method dedicated to deciding whether an error or warning is added to the report being made,
+        keeping track of duplicate and suppressed messages
+        :param record: the record of the error or warning
+        :return: True if the record should be added
+        """
+        check, variable = record.check, record.variable
+
+        if self.deduplicate:
+            key = record.key()
+            if key in self._occurrences:
+                self._occurrences[key] += 1
+                return False
+
+        if check is not None and self.max_messages_per_check is not None and \
+                self._check_counts[check] >= self.max_messages_per_check or \
+                variable is not None and self.max_messages_per_variable is not None and \
+                self._variable_counts[variable] >= self.max_messages_per_variable:
+            self._suppressed[(check, variable)] += 1
+            return False
+
+        if check is not None:
+            self._check_counts[check] += 1
+        if variable is not None:
+            self._variable_counts[variable] += 1
+        if self.deduplicate:
+            self._occurrences[record.key()] = 1
+        return True
+
+    def add_error(self, error: str, *args, check: Optional[str] = None, variable: Optional[str] = None,
+                  index: Optional[Tuple[int, ...]] = None):
         """
         Method dedicated to adding an error to the report being made
-        :param error: error to be added
+        :param error: error to be added, or its template with a `{}` field for each of the args
+        :param args: the values to format the template with when the error is rendered
+        :param check: the check which logged the error, used for the message caps. Defaults to None.
+        :param variable: the variable the error is about, used for the message caps. Defaults to None.
+        :param index: the index of the data point the error is about. Defaults to None.
         """
-        self.errors.append(error)
+        record = LogRecord('error', error, args, check, variable, index)
+        if self._accept(record):
+            self._records['error'].append(record)
 
-    def add_warning(self, warning: str):
+    def add_warning(self, warning: str, *args, check: Optional[str] = None, variable: Optional[str] = None,
+                    index: Optional[Tuple[int, ...]] = None):
         """
         Method dedicated to adding a warning to the report being made
-        :param warning: warning to be added
+        :param warning: warning to be added, or its template with a `{}` field for each of the args
+        :param args: the values to format the template with when the warning is rendered
+        :param check: the check which logged the warning, used for the message caps. Defaults to None.
+        :param variable: the variable the warning is about, used for the message caps. Defaults to None.
+        :param index: the index of the data point the warning is about. Defaults to None.
         """
-        self.warnings.append(warning)
+        record = LogRecord('warning', warning, args, check, variable, index)
+        if self._accept(record):
+            self._records['warning'].append(record)
 
-    def add_info(self, msg: str):
+    def add_info(self, msg: str, *args, check: Optional[str] = None, variable: Optional[str] = None):
         """
         Method dedicated to adding a message to the report being made
-        :param msg: message to be added
+        :param msg: message to be added, or its template with a `{}` field for each of the args
+        :param args: the values to format the template with when the message is rendered
+        :param check: the check which logged the message. Defaults to None.
+        :param variable: the variable the message is about. Defaults to None.
+        """
+        self._records['info'].append(LogRecord('info', msg, args, check, variable))
+
+    def add_record(self, record: LogRecord):
+        """
+        Method dedicated to adding an existing record, for example taken from another logger or a cache,
+        to the report being made. Errors and warnings are subject to the message caps and deduplication.
+        :param record: the record
         """
-        self.info.append(msg)
+        if record.severity == 'info' or self._accept(record):
+            self._records[record.severity].append(record)
 
-    def create_report(self):
+    def merge(self, other: 'LoggerQC'):
+        """
+        Method dedicated to adding all errors, warnings and info of another logger to the report being made
+        :param other: the logger to take the errors, warnings and info from
+        """
+        for severity in SEVERITIES:
+            self._records[severity].extend(other._records[severity])  # pylint: disable=protected-access
+
+    def buffer(self) -> 'LoggerQC':
+        """
+        Method dedicated to getting a logger which buffers messages to be merged into this logger later.
+        The buffer shares the message caps and deduplication with this logger, so they apply over
+        this logger and all of its buffers together.
+        :return: the buffer
+        """
+        buffer = LoggerQC(max_reports=0, max_messages_per_check=self.max_messages_per_check,
+                          max_messages_per_variable=self.max_messages_per_variable, deduplicate=self.deduplicate)
+        buffer._occurrences = self._occurrences  # pylint: disable=protected-access
+        buffer._check_counts = self._check_counts  # pylint: disable=protected-access
+        buffer._variable_counts = self._variable_counts  # pylint: disable=protected-access
+        buffer._suppressed = self._suppressed  # pylint: disable=protected-access
+        return buffer
+
+    def get_records(self, severity: Optional[str] = None, check: Optional[str] = None,
+                    variable: Optional[str] = None) -> list[LogRecord]:
+        """
+        Method dedicated to getting the records of the report being created
+        :param severity: only get the records of this severity ('error', 'warning' or 'info'). Defaults to None.
+        :param check: only get the records logged by this check. Defaults to None.
+        :param variable: only get the records about this variable. Defaults to None.
+        :return: the records, errors first, then warnings and info
+        """
+        severities = SEVERITIES if severity is None else (severity,)
+        return [record for sev in severities for record in self._records[sev]
+                if (check is None or record.check == check) and (variable is None or record.variable == variable)]
+
+    def _render(self, severity: str) -> list[str]:
+        """
+        Method dedicated to rendering the records of a severity for a report, adding the number of occurrences
+        to the deduplicated errors and warnings occurring more than once
+        :param severity: 'error', 'warning' or 'info'
+        :return: the text of the records
+        """
+        records = self._records[severity]
+        if not self.deduplicate or severity == 'info':
+            return [record.render() for record in records]
+
+        rendered = []
+        for record in records:
+            count = self._occurrences.get(record.key(), 1)
+            rendered.append(record.render() if count == 1 else f"{record.render()} ({count} occurrences)")
+        return rendered
+
+    @staticmethod
+    def _suppressed_warning(check: Optional[str], variable: Optional[str], count: int) -> str:
+        """
+        Method dedicated to getting the warning about the suppressed messages of a check and variable
+        :param check: the check which logged the messages, if any
+        :param variable: the variable the messages are about, if any
+        :param count: the number of suppressed messages
+        :return: the warning
+        """
+        if variable is None:
+            return f"{count} more messages of {check} were suppressed"
+        if check is None:
+            return f"{count} more messages for variable '{variable}' were suppressed"
+        return f"{count} more messages of {check} for variable '{variable}' were suppressed"
+
+    def create_report(self, extra: Optional[dict] = None):
         """
         Method dedicated to creating a report and adding it to the list of reports
+        :param extra: additional items of the report, for example timings. Defaults to None.
 
-        - the method creates a report in the form of a dictionary, adds it to the
+        - the method creates a report in the form of a dictionary with the text of the records, adds it to the
           list of reports, and resets the objects attributes
+        - a warning is added for each check and variable of which messages were suppressed
+        - the report is written to the sink, if there is one
         """
+        warnings = self._render('warning')
+        if self._suppressed:
+            warnings = warnings + [self._suppressed_warning(check, variable, count)
+                                   for (check, variable), count in self._suppressed.items()]
+
         report_dict = {
             'report_date': date.today().strftime("%d-%m-%Y"),
             'report_time': datetime.now().strftime("%H:%M:%S"),
-            'errors': self.errors,
-            'warnings': self.warnings,
-            'info': self.info
+            'errors': self._render('error'),
+            'warnings': warnings,
+            'info': self._render('info')
         }
+        if extra:
+            report_dict.update(extra)
         self.reports.append(report_dict)
-        self.errors = []
-        self.warnings = []
-        self.info = []
+        if self.sink is not None:
+            self.sink.write(report_dict)
+        self._records = {severity: [] for severity in SEVERITIES}
+
+        # cleared in place, as they are shared with the buffers of this logger
+        self._occurrences.clear()
+        self._check_counts.clear()
+        self._variable_counts.clear()
+        self._suppressed.clear()
 
     def get_latest_report(self) -> dict:
         """
@@ -84,7 +570,7 @@ class LoggerQC:
 
     def get_all_reports(self) -> list[dict]:
         """
-        Method dedicated to getting all reports made
+        Method dedicated to getting all reports made (at most max_reports)
         :return: all reports
         """
-        return self.reports
+        return list(self.reports)
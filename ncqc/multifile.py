@@ -0,0 +1,315 @@
+"""
+Module dedicated to checking an ordered set of netCDF files, for example a day of 10-minute files, as one
+logical dataset along their record dimension. The files are opened side by side and the records of every
+record variable are joined lazily: reading a slab only reads the records of the slab from the files holding
+them, so the files are never concatenated in memory. Checks which compare neighbouring records, such as
+consecutive_identical_values_check and adjacent_values_difference_check, then see runs and differences which
+cross the boundaries between the files, and report the indices of offending data points in the joined records.
+
+Variables without the record dimension and the global attributes are taken from the first file.
+
+ Classes:
+- MultiFileDimension: the record dimension joined over the files
+- MultiFileVariable: a record variable joined over the files
+- MultiFileDataset: an ordered set of netCDF files opened as one dataset
+"""
+
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+import netCDF4
+import numpy as np
+
+from ncqc.classic import ClassicDataset, is_classic
+
+
+class MultiFileDimension:
+    """
+    Class dedicated to the record dimension joined over the files
+
+     Attributes:
+    - name: name of the dimension
+    - size: the total number of records of all files
+
+     Methods:
+    - isunlimited: check whether the dimension is the record dimension, always True
+    """
+
+    def __init__(self, name: str, size: int):
+        """
+        Constructor for the MultiFileDimension objects
+        :param name: name of the dimension
+        :param size: the total number of records of all files
+        """
+        self.name = name
+        self.size = size
+
+    def __len__(self) -> int:
+        """
+        Method dedicated to getting the length of the dimension
+        :return: the total number of records
+        """
+        return self.size
+
+    @staticmethod
+    def isunlimited() -> bool:
+        """
+        Method dedicated to checking whether the dimension is the record dimension, which grows with the files
+        :return: True
+        """
+        return True
+
+
+class MultiFileVariable:
+    """
+    Class dedicated to a record variable joined over the files, reading only the records of a slab
+
+     Attributes:
+    - name: name of the variable
+    - dimensions: tuple with the names of the dimensions of the variable
+    - shape: shape of the variable, with the total number of records
+    - size: number of values of the variable
+    - ndim: number of dimensions of the variable
+    - dtype: data type of the variable
+
+     Methods:
+    - ncattrs: get the names of the attributes of the variable in the first file
+    - getncattr: get the value of an attribute of the variable in the first file
+    - chunking: get the chunking of the variable in the first file
+    - file_slabs: iterate over the records of every file as slabs of the variable
+    """
+
+    def __init__(self, parts: list, offsets: np.ndarray):
+        """
+        Constructor for the MultiFileVariable objects
+        :param parts: the variable in every file
+        :param offsets: the index of the first record of every file, followed by the total number of records
+        """
+        self._parts = parts
+        self._offsets = offsets
+        self.name = parts[0].name
+        self.dimensions = tuple(parts[0].dimensions)
+        self.shape = (int(offsets[-1]),) + tuple(parts[0].shape[1:])
+        self.size = int(np.prod(self.shape))
+        self.ndim = len(self.shape)
+        self.dtype = parts[0].dtype
+
+    def ncattrs(self) -> list[str]:
+        """
+        Method dedicated to getting the names of the attributes of the variable in the first file
+        :return: list with the names of the attributes
+        """
+        return self._parts[0].ncattrs()
+
+    def getncattr(self, name: str):
+        """
+        Method dedicated to getting the value of an attribute of the variable in the first file
+        :param name: name of the attribute
+        :return: the value of the attribute
+        """
+        return self._parts[0].getncattr(name)
+
+    def chunking(self):
+        """
+        Method dedicated to getting the chunking of the variable in the first file
+        :return: the chunking, see `netCDF4.Variable.chunking`
+        """
+        return self._parts[0].chunking()
+
+    def file_slabs(self, first: int = 0) -> Iterator[tuple[slice, ...]]:
+        """
+        Method dedicated to iterating over the records of every file as slabs of the variable, so the variable
+        is read one file at a time
+        :param first: the index of the first record, to skip the records before it. Defaults to 0.
+        :return: iterator over tuples of slices, one slice per dimension
+        """
+        others = tuple(slice(0, size) for size in self.shape[1:])
+        for start, stop in zip(self._offsets[:-1], self._offsets[1:]):
+            if max(start, first) < stop:
+                yield (slice(int(max(start, first)), int(stop)),) + others
+
+    def __getitem__(self, key) -> np.ma.MaskedArray:
+        """
+        Method dedicated to reading values of the variable, only reading the files holding the records of the slab
+        :param key: the index, a slice or a tuple with a slice for every dimension
+        :return: the masked values
+        """
+        if not isinstance(key, tuple):
+            key = (key,)
+        records, others = key[0], key[1:]
+        start, stop, step = records.indices(self.shape[0])
+        if step != 1:
+            return self[(slice(start, stop),) + others][::step]
+
+        values = []
+        for part, first, last in zip(self._parts, self._offsets[:-1], self._offsets[1:]):
+            if first < stop and start < last:
+                part_records = slice(max(start, first) - first, min(stop, last) - first)
+                values.append(part[(part_records,) + others])
+
+        if len(values) == 1:
+            return values[0]
+        if not values:
+            return self._parts[0][(slice(0, 0),) + others]
+        return np.ma.concatenate(values)
+
+
+class MultiFileDataset:
+    """
+    Class dedicated to an ordered set of netCDF files opened as one dataset, joined along their record dimension,
+    with the part of the interface of `netCDF4.Dataset` used by the quality control checks
+
+     Attributes:
+    - datasets: the opened files, in order
+    - record_dimension: name of the dimension along which the files are joined
+    - dimensions: dictionary with the dimensions, of which the record dimension is joined
+    - variables: dictionary with the variables, of which the record variables are joined
+
+     Methods:
+    - filepath: get the path of the first file
+    - filepaths: get the paths of all files
+    - ncattrs: get the names of the global attributes of the first file
+    - getncattr: get the value of a global attribute of the first file
+    - isopen: check whether the files are open
+    - close: close all files
+    """
+
+    def __init__(self, nc_file_paths: list[Union[str, Path]], record_dimension: Optional[str] = None,
+                 memory_map: bool = True):
+        """
+        Constructor for the MultiFileDataset objects, which opens all files
+        :param nc_file_paths: the paths to the files, in the order of their records
+        :param record_dimension: name of the dimension along which the files are joined. Defaults to None,
+                                 which uses the unlimited dimension of the first file.
+        :param memory_map: True to read NETCDF3 classic files from a memory map (see classic.py).
+                           Defaults to True.
+        :raises ValueError: if no files are given, if the first file has no unlimited dimension, or if the
+                            files do not have the same dimensions and record variables
+        :raises OSError: if a file cannot be opened, after closing the files opened before it
+        """
+        if not nc_file_paths:
+            raise ValueError("no netCDF files given")
+
+        self._paths = [str(nc_file_path) for nc_file_path in nc_file_paths]
+        self.datasets = []
+        try:
+            for nc_file_path in self._paths:
+                if memory_map and is_classic(nc_file_path):
+                    self.datasets.append(ClassicDataset(nc_file_path))
+                else:
+                    self.datasets.append(netCDF4.Dataset(nc_file_path))  # pylint: disable=no-member
+            self._join(record_dimension)
+        except (OSError, ValueError):
+            self.close()
+            raise
+
+    def _join(self, record_dimension: Optional[str]):
+        """
+        Method dedicated to joining the dimensions and variables of the files along the record dimension
+        :param record_dimension: name of the dimension along which the files are joined, None for the
+                                 unlimited dimension of the first file
+        :raises ValueError: if the files cannot be joined
+        """
+        first = self.datasets[0]
+        if record_dimension is None:
+            record_dimension = next((name for name, dimension in first.dimensions.items()
+                                     if dimension.isunlimited()), None)
+            if record_dimension is None:
+                raise ValueError(f"'{self._paths[0]}' has no unlimited dimension to join the files along")
+        self.record_dimension = record_dimension
+
+        lengths = []
+        for path, dataset in zip(self._paths, self.datasets):
+            if record_dimension not in dataset.dimensions:
+                raise ValueError(f"'{path}' has no dimension '{record_dimension}'")
+            fixed = {name: len(dimension) for name, dimension in dataset.dimensions.items()
+                     if name != record_dimension}
+            if fixed != {name: len(dimension) for name, dimension in first.dimensions.items()
+                         if name != record_dimension}:
+                raise ValueError(f"the dimensions of '{path}' differ from the dimensions of '{self._paths[0]}'")
+            lengths.append(len(dataset.dimensions[record_dimension]))
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+
+        self.dimensions = dict(first.dimensions)
+        self.dimensions[record_dimension] = MultiFileDimension(record_dimension, int(offsets[-1]))
+
+        self.variables = {}
+        for var_name, variable in first.variables.items():
+            if not variable.dimensions or variable.dimensions[0] != record_dimension:
+                self.variables[var_name] = variable
+                continue
+
+            parts = []
+            for path, dataset in zip(self._paths, self.datasets):
+                part = dataset.variables.get(var_name)
+                if part is None or tuple(part.dimensions) != tuple(variable.dimensions) or \
+                        part.dtype != variable.dtype:
+                    raise ValueError(f"variable '{var_name}' of '{path}' differs from '{self._paths[0]}'")
+                parts.append(part)
+            self.variables[var_name] = MultiFileVariable(parts, offsets)
+
+    def __getitem__(self, name: str):
+        """
+        Method dedicated to getting a variable of the dataset
+        :param name: name of the variable
+        :return: the variable
+        """
+        return self.variables[name]
+
+    def __enter__(self):
+        """
+        Method dedicated to using the dataset as a context manager
+        :return: the dataset
+        """
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Method dedicated to closing all files at the end of a with statement
+        :param exc_info: the exception raised in the with statement, if any
+        """
+        self.close()
+
+    def filepath(self) -> str:
+        """
+        Method dedicated to getting the path of the first file, which names the dataset
+        :return: the path of the first file
+        """
+        return self._paths[0]
+
+    def filepaths(self) -> list[str]:
+        """
+        Method dedicated to getting the paths of all files
+        :return: list with the paths of the files, in order
+        """
+        return list(self._paths)
+
+    def ncattrs(self) -> list[str]:
+        """
+        Method dedicated to getting the names of the global attributes of the first file
+        :return: list with the names of the global attributes
+        """
+        return self.datasets[0].ncattrs()
+
+    def getncattr(self, name: str):
+        """
+        Method dedicated to getting the value of a global attribute of the first file
+        :param name: name of the global attribute
+        :return: the value of the global attribute
+        """
+        return self.datasets[0].getncattr(name)
+
+    def isopen(self) -> bool:
+        """
+        Method dedicated to checking whether the files are open
+        :return: True if all files are open
+        """
+        return all(dataset.isopen() for dataset in self.datasets)
+
+    def close(self):
+        """
+        Method dedicated to closing all files
+        """
+        for dataset in self.datasets:
+            if dataset.isopen():
+                dataset.close()
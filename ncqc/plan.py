@@ -0,0 +1,121 @@
+"""
+Module dedicated to compiling the configuration of the quality control checks into an immutable plan.
+The plan is compiled once per configuration, so the checks do not have to go through the whole
+configuration every time they are performed.
+
+ Functions:
+- freeze: get an immutable copy of (a part of) a configuration
+
+ Classes:
+- CheckPlan: the compiled, immutable plan of which checks to perform on which fields
+"""
+
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Tuple
+
+# checks which are only performed on a field if they are set to True in the configuration
+BOOLEAN_CHECKS = ('existence_check', 'emptiness_check')
+
+
+def freeze(config):
+    """
+    Function to get an immutable copy of (a part of) a configuration,
+    dictionaries become read-only mappings and lists become tuples
+    :param config: the (part of the) configuration
+    :return: the immutable copy
+    """
+    if isinstance(config, Mapping):
+        return MappingProxyType({key: freeze(value) for key, value in config.items()})
+    if isinstance(config, (list, tuple)):
+        return tuple(freeze(value) for value in config)
+    return config
+
+
+def _fields_by_check(fields: dict) -> Mapping[str, Tuple[str, ...]]:
+    """
+    Function to get for each check the fields it has to be performed on, in the order of the configuration
+    :param fields: the configuration of the dimensions, variables or global attributes
+    :return: mapping from each check to the names of its fields
+    """
+    fields_by_check = {}
+
+    for field, checks in fields.items():
+        if not isinstance(checks, Mapping):
+            continue
+        for check, check_config in checks.items():
+            if check in BOOLEAN_CHECKS and check_config is not True:
+                continue
+            fields_by_check.setdefault(check, []).append(field)
+
+    return MappingProxyType({check: tuple(names) for check, names in fields_by_check.items()})
+
+
+class CheckPlan(NamedTuple):
+    """
+    Class dedicated to the compiled, immutable plan of which checks to perform on which dimensions,
+    variables and global attributes, compiled from the configuration of a QualityControl object.
+    Existence and emptiness checks are only planned for fields for which they are set to True,
+    fields of which the configuration is not a dictionary are ignored.
+
+     Attributes:
+    - dims_by_check: mapping from each check to the dimensions to perform it on
+    - vars_by_check: mapping from each check to the variables to perform it on
+    - gl_attrs_by_check: mapping from each check to the global attributes to perform it on
+    - var_data_checks: tuple with for each variable with data checks a tuple (name, data checks),
+      the data checks ordered as in data_checks
+    - file_size: the configuration of the file size check
+    - var_configs: mapping from each variable to the immutable configuration of its checks
+
+     Methods:
+    - compile: compile a configuration into a plan
+    - vars_for: get the variables to perform a check on
+    - check_config: get the immutable configuration of a check for a variable
+    """
+
+    dims_by_check: Mapping[str, Tuple[str, ...]]
+    vars_by_check: Mapping[str, Tuple[str, ...]]
+    gl_attrs_by_check: Mapping[str, Tuple[str, ...]]
+    var_data_checks: Tuple[Tuple[str, Tuple[str, ...]], ...]
+    file_size: Mapping
+    var_configs: Mapping[str, Mapping]
+
+    @classmethod
+    def compile(cls, dims: dict, variables: dict, gl_attrs: dict, file_size: dict,
+                data_checks: Tuple[str, ...]) -> 'CheckPlan':
+        """
+        Method dedicated to compiling a configuration into a plan
+        :param dims: the configuration of the dimensions
+        :param variables: the configuration of the variables
+        :param gl_attrs: the configuration of the global attributes
+        :param file_size: the configuration of the file size check
+        :param data_checks: the checks which need to read the data of a variable, in the order they are performed
+        :return: the compiled plan
+        """
+        var_configs = freeze({name: checks for name, checks in variables.items() if isinstance(checks, Mapping)})
+        var_data_checks = []
+
+        for name, checks in var_configs.items():
+            var_checks = tuple(check for check in data_checks if check in checks
+                               and (check not in BOOLEAN_CHECKS or checks[check] is True))
+            if var_checks:
+                var_data_checks.append((name, var_checks))
+
+        return cls(_fields_by_check(dims), _fields_by_check(variables), _fields_by_check(gl_attrs),
+                   tuple(var_data_checks), freeze(file_size), var_configs)
+
+    def vars_for(self, check: str) -> Tuple[str, ...]:
+        """
+        Method dedicated to getting the variables to perform a check on
+        :param check: name of the check
+        :return: the names of the variables, in the order of the configuration
+        """
+        return self.vars_by_check.get(check, ())
+
+    def check_config(self, var_name: str, check: str):
+        """
+        Method dedicated to getting the immutable configuration of a check for a variable
+        :param var_name: name of the variable
+        :param check: name of the check
+        :return: the configuration of the check
+        """
+        return self.var_configs[var_name][check]
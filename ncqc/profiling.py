@@ -0,0 +1,194 @@
+"""
+Module dedicated to the opt-in profiling of quality control checks. A profiler measures the wall time,
+CPU time, bytes and data points read from the netCDF file and (optionally) the peak memory of every check
+and variable, and aggregates the measurements into a timing table.
+
+ Functions:
+- profiled: decorator measuring a method of a QualityControl object as a check on all variables
+
+ Classes:
+- Measurement: a single measurement in progress
+- Profiler: measures checks and variables and keeps the timing table
+"""
+
+import functools
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Optional
+
+import numpy as np
+
+# context used instead of a measurement when profiling is turned off
+NO_PROFILING = nullcontext()
+
+
+class Measurement:
+    """
+    Class dedicated to a single measurement in progress
+
+     Attributes:
+    - bytes_read: number of bytes read from the netCDF file during the measurement
+    - data_points: number of data points read from the netCDF file during the measurement
+
+     Methods:
+    - add_data: count data read from the netCDF file
+    """
+
+    __slots__ = ('bytes_read', 'data_points', 'start_memory', 'peak_memory')
+
+    def __init__(self, start_memory: int = 0):
+        """
+        Constructor for the Measurement objects
+        :param start_memory: the traced memory at the start of the measurement. Defaults to 0.
+        """
+        self.bytes_read = 0
+        self.data_points = 0
+        self.start_memory = start_memory
+        self.peak_memory = start_memory
+
+    def add_data(self, values: np.ndarray):
+        """
+        Method dedicated to counting data read from the netCDF file
+        :param values: the (masked) values which were read
+        """
+        self.bytes_read += np.ma.getdata(values).nbytes
+        self.data_points += np.size(values)
+
+
+class Profiler:
+    """
+    Class dedicated to measuring checks and variables. Measurements of the same check and variable are added
+    up in a single row of the timing table, measurements can be nested (for example a variable within a check).
+
+     Attributes:
+    - trace_memory: True if the peak memory of every measurement is traced with tracemalloc
+
+     Methods:
+    - measure: context manager measuring a check on a variable
+    - table: get the timing table
+    - reset: clear the timing table
+    - close: stop tracing memory
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        """
+        Constructor for the Profiler objects
+        :param trace_memory: True to trace the peak memory of every measurement with tracemalloc, which slows
+                             down the checks considerably. Defaults to False.
+        """
+        self.trace_memory = trace_memory
+        self._rows = {}
+        self._stack = []
+        self._started_tracing = False
+
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    @contextmanager
+    def measure(self, check: str, variable: Optional[str] = None):
+        """
+        Context manager measuring a check on a variable
+        :param check: name of the check, or 'read' for reading a variable
+        :param variable: name of the variable. Defaults to None, for a check on all variables.
+        :return: the measurement in progress, to count the data read from the netCDF file
+        """
+        measurement = Measurement()
+
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # the peak of the enclosing measurement so far is kept before the peak is reset
+                self._stack[-1].peak_memory = max(self._stack[-1].peak_memory, peak)
+            tracemalloc.reset_peak()
+            measurement = Measurement(current)
+
+        self._stack.append(measurement)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield measurement
+        finally:
+            wall_time = time.perf_counter() - wall_start
+            cpu_time = time.process_time() - cpu_start
+            self._stack.pop()
+
+            peak_memory = None
+            if self.trace_memory:
+                measurement.peak_memory = max(measurement.peak_memory, tracemalloc.get_traced_memory()[1])
+                peak_memory = measurement.peak_memory - measurement.start_memory
+                if self._stack:
+                    self._stack[-1].peak_memory = max(self._stack[-1].peak_memory, measurement.peak_memory)
+
+            if self._stack:
+                self._stack[-1].bytes_read += measurement.bytes_read
+                self._stack[-1].data_points += measurement.data_points
+
+            self._add(check, variable, wall_time, cpu_time, measurement, peak_memory)
+
+    def _add(self, check: str, variable: Optional[str], wall_time: float, cpu_time: float,
+             measurement: Measurement, peak_memory: Optional[int]):
+        """
+        Method dedicated to adding a measurement to the row of its check and variable
+        :param check: name of the check
+        :param variable: name of the variable, if any
+        :param wall_time: the wall time in seconds
+        :param cpu_time: the CPU time in seconds
+        :param measurement: the finished measurement
+        :param peak_memory: the peak memory in bytes above the memory at the start, None if not traced
+        """
+        row = self._rows.get((check, variable))
+        if row is None:
+            row = self._rows[(check, variable)] = {
+                'check': check, 'variable': variable, 'calls': 0, 'wall_time': 0.0, 'cpu_time': 0.0,
+                'bytes_read': 0, 'data_points': 0, 'peak_memory': peak_memory
+            }
+
+        row['calls'] += 1
+        row['wall_time'] += wall_time
+        row['cpu_time'] += cpu_time
+        row['bytes_read'] += measurement.bytes_read
+        row['data_points'] += measurement.data_points
+        if peak_memory is not None:
+            row['peak_memory'] = max(row['peak_memory'], peak_memory)
+
+    def table(self) -> list[dict]:
+        """
+        Method dedicated to getting the timing table
+        :return: list with a row for every check and variable, in the order the measurements finished, with the
+                 number of calls, wall time and CPU time (in seconds), bytes and data points read and the
+                 peak memory (in bytes, None if not traced)
+        """
+        return [dict(row) for row in self._rows.values()]
+
+    def reset(self):
+        """
+        Method dedicated to clearing the timing table
+        """
+        self._rows = {}
+
+    def close(self):
+        """
+        Method dedicated to stopping tracing memory, if the profiler started it
+        """
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+def profiled(method):
+    """
+    Decorator measuring a method of a QualityControl object as a check on all variables, with the name
+    of the method as the name of the check. Nothing is measured when profiling is turned off.
+    :param method: the method
+    :return: the measured method
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.profiler is None:
+            return method(self, *args, **kwargs)
+        with self.profiler.measure(method.__name__):
+            return method(self, *args, **kwargs)
+
+    return wrapper
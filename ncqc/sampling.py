@@ -0,0 +1,138 @@
+"""
+Module dedicated to statistical sampling of the data of netCDF files, for a quick look at very large files.
+Instead of reading every chunk of a variable, only a sample of its chunks is read, chosen at random or
+stratified over the variable (one chunk at random from every stratum of consecutive chunks). The number of
+data points violating a check in the sample gives an estimate of the violation rate of the whole variable,
+with a Wilson score confidence interval.
+
+Data points within a chunk are often correlated (for example a stuck sensor), so the interval, which assumes
+independent data points, is optimistic when violations come in bursts.
+
+ Functions:
+- wilson_interval: get the Wilson score confidence interval of a proportion
+- sample_slabs: choose the slabs of a variable to read
+
+ Classes:
+- SampleEstimate: the estimated violation rate of a check on a variable
+"""
+
+import math
+from statistics import NormalDist
+from typing import Tuple
+
+import numpy as np
+
+# ways of choosing the sampled slabs, see sample_slabs
+SAMPLING_METHODS = ('random', 'stratified')
+# maximum number of bytes of a sampled slab of a variable which is not chunked
+SAMPLE_SLAB_BYTES = 1024 * 1024
+
+
+def wilson_interval(successes: int, trials: int, confidence: float = 0.95) -> Tuple[float, float]:
+    """
+    Function to get the Wilson score confidence interval of a proportion, which (unlike the normal
+    approximation) stays within [0, 1] and is meaningful when no or all trials are successes
+    :param successes: the number of successes, for example the number of violations in the sample
+    :param trials: the number of trials, for example the number of sampled data points
+    :param confidence: the confidence level of the interval. Defaults to 0.95.
+    :return: tuple with the lower and upper bound of the interval, (0, 1) if there are no trials
+    """
+    if trials == 0:
+        return 0.0, 1.0
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    proportion = successes / trials
+    denominator = 1 + z ** 2 / trials
+    centre = (proportion + z ** 2 / (2 * trials)) / denominator
+    margin = z * math.sqrt(proportion * (1 - proportion) / trials + z ** 2 / (4 * trials ** 2)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def sample_slabs(n_slabs: int, fraction: float, method: str, rng: np.random.Generator) -> list[int]:
+    """
+    Function to choose the slabs of a variable to read
+    :param n_slabs: the number of slabs of the variable
+    :param fraction: the fraction of the slabs to read, at least one slab is read
+    :param method: 'random' for a simple random sample of the slabs, or 'stratified' to divide the slabs into
+                   strata of consecutive slabs and choose one slab at random from every stratum
+    :param rng: the random generator
+    :return: the indices of the chosen slabs, in random order
+    """
+    n_sampled = min(n_slabs, max(1, math.ceil(fraction * n_slabs)))
+
+    if method == 'random':
+        return rng.choice(n_slabs, size=n_sampled, replace=False).tolist()
+
+    edges = np.linspace(0, n_slabs, n_sampled + 1).astype(np.int64)
+    chosen = rng.integers(edges[:-1], edges[1:])
+    # read in random order, so a sample cut short by a budget is still spread over the variable
+    return rng.permutation(chosen).tolist()
+
+
+class SampleEstimate:
+    """
+    Class dedicated to the estimated violation rate of a check on a variable, from the data points of a sample
+
+     Attributes:
+    - variable: name of the variable
+    - check: name of the check
+    - violations: the number of data points in the sample violating the check
+    - sampled: the number of data points in the sample
+    - total: the number of data points of the variable
+    - confidence: the confidence level of the interval
+
+     Methods:
+    - rate: get the estimated violation rate
+    - interval: get the confidence interval of the violation rate
+    - as_dict: get the estimate as a dictionary, for a report
+    """
+
+    def __init__(self, variable: str, check: str, violations: int, sampled: int, total: int,
+                 confidence: float = 0.95):
+        """
+        Constructor for the SampleEstimate objects
+        :param variable: name of the variable
+        :param check: name of the check
+        :param violations: the number of data points in the sample violating the check
+        :param sampled: the number of data points in the sample
+        :param total: the number of data points of the variable
+        :param confidence: the confidence level of the interval. Defaults to 0.95.
+        """
+        self.variable = variable
+        self.check = check
+        self.violations = violations
+        self.sampled = sampled
+        self.total = total
+        self.confidence = confidence
+
+    def rate(self) -> float:
+        """
+        Method dedicated to getting the estimated violation rate
+        :return: the fraction of the sampled data points violating the check, 0 for an empty sample
+        """
+        return self.violations / self.sampled if self.sampled else 0.0
+
+    def interval(self) -> Tuple[float, float]:
+        """
+        Method dedicated to getting the confidence interval of the violation rate, see wilson_interval
+        :return: tuple with the lower and upper bound of the interval
+        """
+        return wilson_interval(self.violations, self.sampled, self.confidence)
+
+    def as_dict(self) -> dict:
+        """
+        Method dedicated to getting the estimate as a dictionary, for a report
+        :return: the estimate as a dictionary
+        """
+        lower, upper = self.interval()
+        return {
+            'variable': self.variable,
+            'check': self.check,
+            'violations': self.violations,
+            'sampled_points': self.sampled,
+            'total_points': self.total,
+            'rate': self.rate(),
+            'lower': lower,
+            'upper': upper,
+            'confidence': self.confidence
+        }
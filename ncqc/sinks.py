@@ -0,0 +1,203 @@
+"""
+Module dedicated to report sinks, which write the reports of a logger to a file as soon as they are created.
+With a sink, reports do not have to be kept in memory, and the output of a long-running job can be followed
+while it is running. By default every report is written when it is created. With a buffer_size, reports are
+buffered and written in bulk every buffer_size reports, and at least every flush_interval seconds if one is set.
+
+ Classes:
+- ReportSink: the base class of all report sinks
+- JsonLinesSink: sink writing each report as a single line of JSON to a file
+- SQLiteSink: sink writing each report as a row to a table of a SQLite database
+"""
+
+import json
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional, Union
+
+REPORT_KEYS = ('report_date', 'report_time', 'errors', 'warnings', 'info')
+
+
+class ReportSink(ABC):
+    """
+    Class dedicated to the base of all report sinks. Reports are buffered and written in bulk by
+    the write_reports method of the subclasses.
+
+     Attributes:
+    - buffer_size: number of reports buffered before they are written, 1 to write every report when it is created
+    - flush_interval: maximum number of seconds a report is buffered before it is written with the next report,
+      None for no maximum
+
+     Methods:
+    - write: add a report to the buffer, writing the buffer when it is full or its oldest report is too old
+    - flush: write all buffered reports
+    - close: write all buffered reports and close the sink
+    - write_reports: write a list of reports, implemented by the subclasses
+    """
+
+    def __init__(self, buffer_size: int = 1, flush_interval: Optional[float] = None):
+        """
+        Constructor for the ReportSink objects
+        :param buffer_size: number of reports buffered before they are written. Defaults to 1, which writes
+                            every report when it is created.
+        :param flush_interval: maximum number of seconds a report is buffered, checked when the next report is
+                               written. Defaults to None, which only writes the buffer when it is full.
+        """
+        self.buffer_size = max(1, buffer_size)
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._buffered_since = None
+
+    def __enter__(self) -> 'ReportSink':
+        """
+        Method dedicated to using the sink as a context manager
+        :return: self
+        """
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Method dedicated to closing the sink at the end of a with statement
+        :param exc_info: information about an exception raised in the with statement, if any
+        """
+        self.close()
+
+    def write(self, report: dict):
+        """
+        Method dedicated to adding a report to the buffer, writing the buffer when it is full or when its
+        oldest report was buffered more than flush_interval seconds ago
+        :param report: the report
+        """
+        if not self._buffer:
+            self._buffered_since = time.monotonic()
+        self._buffer.append(report)
+        if len(self._buffer) >= self.buffer_size or self.flush_interval is not None and \
+                time.monotonic() - self._buffered_since >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Method dedicated to writing all buffered reports
+        """
+        if self._buffer:
+            self.write_reports(self._buffer)
+            self._buffer = []
+
+    def close(self):
+        """
+        Method dedicated to writing all buffered reports and closing the sink
+        """
+        self.flush()
+
+    @abstractmethod
+    def write_reports(self, reports: list[dict]):
+        """
+        Method dedicated to writing a list of reports
+        :param reports: the reports
+        """
+
+
+class JsonLinesSink(ReportSink):
+    """
+    Class dedicated to writing each report as a single line of JSON to a file. Reports are appended
+    to the file if it already exists.
+
+     Attributes:
+    - path: path to the JSON Lines file
+    - buffer_size: number of reports buffered before they are written
+    - flush_interval: maximum number of seconds a report is buffered before it is written with the next report
+
+     Methods:
+    - write_reports: append a list of reports to the file
+    - close: write all buffered reports and close the file
+    """
+
+    def __init__(self, path: Union[str, Path], buffer_size: int = 1, flush_interval: Optional[float] = None):
+        """
+        Constructor for the JsonLinesSink objects
+        :param path: path to the JSON Lines file
+        :param buffer_size: number of reports buffered before they are written. Defaults to 1, which writes
+                            every report when it is created.
+        :param flush_interval: maximum number of seconds a report is buffered, see ReportSink. Defaults to None.
+        """
+        super().__init__(buffer_size, flush_interval)
+        self.path = Path(path)
+        self._file = open(self.path, 'a', encoding='utf-8')  # pylint: disable=consider-using-with
+
+    def write_reports(self, reports: list[dict]):
+        """
+        Method dedicated to appending a list of reports to the file
+        :param reports: the reports
+        """
+        self._file.write(''.join(json.dumps(report, default=str) + '\n' for report in reports))
+        self._file.flush()
+
+    def close(self):
+        """
+        Method dedicated to writing all buffered reports and closing the file
+        """
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+class SQLiteSink(ReportSink):
+    """
+    Class dedicated to writing each report as a row to the table reports of a SQLite database.
+    The errors, warnings and info are stored as JSON, together with their numbers. Any other keys of
+    a report (such as the file of a batch run) are stored as JSON in the column extra.
+
+     Attributes:
+    - path: path to the SQLite database
+    - buffer_size: number of reports buffered before they are written
+    - flush_interval: maximum number of seconds a report is buffered before it is written with the next report
+
+     Methods:
+    - write_reports: insert a list of reports into the table in a single transaction
+    - close: write all buffered reports and close the database
+    """
+
+    def __init__(self, path: Union[str, Path], buffer_size: int = 1, flush_interval: Optional[float] = None):
+        """
+        Constructor for the SQLiteSink objects
+        :param path: path to the SQLite database, created if it does not exist
+        :param buffer_size: number of reports buffered before they are written. Defaults to 1, which writes
+                            every report when it is created.
+        :param flush_interval: maximum number of seconds a report is buffered, see ReportSink. Defaults to None.
+        """
+        super().__init__(buffer_size, flush_interval)
+        self.path = Path(path)
+        self._connection = sqlite3.connect(str(self.path))
+        with self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS reports (id INTEGER PRIMARY KEY AUTOINCREMENT, report_date TEXT, '
+                'report_time TEXT, error_count INTEGER, warning_count INTEGER, errors TEXT, warnings TEXT, '
+                'info TEXT, extra TEXT)')
+
+    def write_reports(self, reports: list[dict]):
+        """
+        Method dedicated to inserting a list of reports into the table in a single transaction
+        :param reports: the reports
+        """
+        rows = [(report.get('report_date'), report.get('report_time'),
+                 len(report.get('errors', [])), len(report.get('warnings', [])),
+                 json.dumps(report.get('errors', [])), json.dumps(report.get('warnings', [])),
+                 json.dumps(report.get('info', [])),
+                 json.dumps({key: value for key, value in report.items() if key not in REPORT_KEYS}, default=str))
+                for report in reports]
+
+        with self._connection:
+            self._connection.executemany(
+                'INSERT INTO reports (report_date, report_time, error_count, warning_count, errors, warnings, '
+                'info, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+    def close(self):
+        """
+        Method dedicated to writing all buffered reports and closing the database
+        """
+        if self._connection is not None:
+            self.flush()
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,611 @@
+"""
+Module dedicated to performing quality control checks on variables which do not fit in memory.
+Variables are read in slabs aligned to their on-disk chunking, each check keeps an accumulator
+which is updated with every slab, and the accumulated result equals the result for the whole variable.
+
+ Functions:
+- slab_shape: determine the shape of the slabs in which a variable is read
+- iter_slabs: iterate over the slabs of a variable
+- count_slabs: get the number of slabs of a variable
+- get_slab: get a single slab of a variable by its index
+- chunk_memory_budget: get the memory budget for reading a variable one chunk at a time
+
+Every accumulator can tell whether the slabs processed so far already make its check fail, so a check can be
+stopped at the first offending slab (see the fail_fast option of QualityControl).
+
+Accumulators whose state depends on the length of the first axis of a variable can be resized, so an accumulator
+restored from a checkpoint (see checkpoint.py) can continue with records appended to the first (unlimited) axis.
+
+ Classes:
+- BoundariesAccumulator: accumulates the values out of bounds over all slabs
+- EmptinessAccumulator: accumulates the number of empty and NaN data points over all slabs
+- PointsAmountAccumulator: accumulates the number of (valid) data points over all slabs
+- IdenticalRunsAccumulator: accumulates the runs of consecutive identical values over all slabs
+- AdjacentDifferencesAccumulator: accumulates the differences between adjacent values over all slabs
+"""
+
+import itertools
+import math
+from typing import Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from ncqc.kernels import (boundaries_violations, emptiness_counts, line_runs, absolute_difference,
+                          adjacent_exceedances, exceedances_summary)
+
+# bytes needed per data point next to the data itself: one byte for the mask and two for boolean temporaries
+_OVERHEAD_PER_POINT = 3
+
+
+def slab_shape(shape: Tuple[int, ...], chunking: Union[list, str, None],
+               itemsize: int, memory_budget: Optional[int]) -> Tuple[int, ...]:
+    """
+    Function to determine the shape of the slabs in which a variable is read.
+    The trailing dimensions are taken in full as long as the slab stays within the memory budget,
+    the first dimension that does not fit is split in a multiple of its chunk size (when possible)
+    and all leading dimensions are read one index at a time. Slabs are therefore visited in C order.
+    :param shape: the shape of the variable
+    :param chunking: the chunk sizes of the variable as returned by `Variable.chunking()`
+    :param itemsize: the number of bytes of a single data point
+    :param memory_budget: the maximum number of bytes for a slab, None to read the variable in one slab
+    :return: the shape of the slabs
+    """
+    if memory_budget is None:
+        return tuple(shape)
+
+    chunks = chunking if isinstance(chunking, (list, tuple)) else [1] * len(shape)
+    points_budget = max(1, memory_budget // (itemsize + _OVERHEAD_PER_POINT))
+
+    block = [1] * len(shape)
+    for axis in reversed(range(len(shape))):
+        inner_points = math.prod(block[axis + 1:])
+        if shape[axis] * inner_points <= points_budget:
+            block[axis] = shape[axis]
+            continue
+
+        fitting = points_budget // inner_points
+        if fitting >= chunks[axis]:
+            fitting -= fitting % chunks[axis]
+        block[axis] = max(1, fitting)
+        break
+
+    return tuple(block)
+
+
+def iter_slabs(shape: Tuple[int, ...], chunking: Union[list, str, None],
+               itemsize: int, memory_budget: Optional[int], first: int = 0) -> Iterator[Tuple[slice, ...]]:
+    """
+    Function to iterate over the slabs of a variable in C order (see slab_shape)
+    :param shape: the shape of the variable
+    :param chunking: the chunk sizes of the variable as returned by `Variable.chunking()`
+    :param itemsize: the number of bytes of a single data point
+    :param memory_budget: the maximum number of bytes for a slab, None to read the variable in one slab
+    :param first: the index along the first axis of the first slab, to skip the records before it. Defaults to 0.
+    :return: iterator over tuples of slices, one slice per dimension
+    """
+    block = slab_shape(shape, chunking, itemsize, memory_budget)
+    starts = [range(first if axis == 0 else 0, size, max(1, step))
+              for axis, (size, step) in enumerate(zip(shape, block))]
+
+    for start in itertools.product(*starts):
+        yield tuple(slice(i, min(i + step, size)) for i, step, size in zip(start, block, shape))
+
+
+def _slab_counts(shape: Tuple[int, ...], block: Tuple[int, ...]) -> Tuple[int, ...]:
+    """
+    Function to get the number of slabs along every axis of a variable
+    :param shape: the shape of the variable
+    :param block: the shape of the slabs, see slab_shape
+    :return: tuple with the number of slabs along every axis
+    """
+    return tuple(-(-size // max(1, step)) for size, step in zip(shape, block))
+
+
+def count_slabs(shape: Tuple[int, ...], chunking: Union[list, str, None],
+                itemsize: int, memory_budget: Optional[int]) -> int:
+    """
+    Function to get the number of slabs of a variable (see iter_slabs), without building the slabs
+    :param shape: the shape of the variable
+    :param chunking: the chunk sizes of the variable as returned by `Variable.chunking()`
+    :param itemsize: the number of bytes of a single data point
+    :param memory_budget: the maximum number of bytes for a slab, None to read the variable in one slab
+    :return: the number of slabs
+    """
+    return math.prod(_slab_counts(shape, slab_shape(shape, chunking, itemsize, memory_budget)))
+
+
+def get_slab(shape: Tuple[int, ...], chunking: Union[list, str, None], itemsize: int,
+             memory_budget: Optional[int], index: int) -> Tuple[slice, ...]:
+    """
+    Function to get a single slab of a variable by its index in the C order of iter_slabs,
+    without building the slabs before it
+    :param shape: the shape of the variable
+    :param chunking: the chunk sizes of the variable as returned by `Variable.chunking()`
+    :param itemsize: the number of bytes of a single data point
+    :param memory_budget: the maximum number of bytes for a slab, None to read the variable in one slab
+    :param index: the index of the slab, from 0 to the number of slabs (see count_slabs)
+    :return: tuple of slices, one slice per dimension
+    """
+    block = slab_shape(shape, chunking, itemsize, memory_budget)
+    counts = _slab_counts(shape, block)
+    if not 0 <= index < math.prod(counts):
+        raise IndexError(f"slab index {index} out of range for {math.prod(counts)} slabs")
+
+    start = []
+    for count, step in zip(reversed(counts), reversed(block)):
+        index, position = divmod(index, count)
+        start.append(position * max(1, step))
+    start.reverse()
+
+    return tuple(slice(i, min(i + step, size)) for i, step, size in zip(start, block, shape))
+
+
+def chunk_memory_budget(chunking: Union[list, str, None], itemsize: int) -> Optional[int]:
+    """
+    Function to get the memory budget for reading a variable one chunk at a time (see slab_shape)
+    :param chunking: the chunk sizes of the variable as returned by `Variable.chunking()`
+    :param itemsize: the number of bytes of a single data point
+    :return: the memory budget, None if the variable is not chunked
+    """
+    if not isinstance(chunking, (list, tuple)):
+        return None
+    return math.prod(chunking) * (itemsize + _OVERHEAD_PER_POINT)
+
+
+def _grow(array: np.ndarray, length: int, fill) -> np.ndarray:
+    """
+    Function to grow an array along its first axis
+    :param array: the array
+    :param length: the new length of the first axis, at least the current length
+    :param fill: the value of the new elements
+    :return: the grown array
+    """
+    if array.ndim == 0 or array.shape[0] >= length:
+        return array
+    grown = np.full((length,) + array.shape[1:], fill, dtype=array.dtype)
+    grown[:array.shape[0]] = array
+    return grown
+
+
+class BoundariesAccumulator:
+    """
+    Class dedicated to accumulating the values out of bounds of a variable over all of its slabs.
+    The result has the same form as the result of `kernels.boundaries_violations` for the whole variable.
+
+     Methods:
+    - update: process the next slab
+    - failed: check whether the slabs processed so far make the check fail
+    - result: get the accumulated result
+    """
+
+    def __init__(self, lower_bound, upper_bound, max_values: int):
+        """
+        Constructor for the BoundariesAccumulator objects
+        :param lower_bound: the lowest allowed value
+        :param upper_bound: the highest allowed value
+        :param max_values: the maximum number of offending values and indices to keep
+        """
+        self.lower_bound = lower_bound
+        self.upper_bound = upper_bound
+        self.max_values = max_values
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.values = []
+        self.indices = []
+
+    def update(self, values: np.ndarray, start: Tuple[int, ...]):
+        """
+        Method dedicated to processing the next slab
+        :param values: the values of the slab
+        :param start: the index of the first data point of the slab in the variable
+        """
+        slab_result = boundaries_violations(values, self.lower_bound, self.upper_bound,
+                                            max_values=self.max_values - len(self.values))
+        if slab_result['count'] == 0:
+            return
+
+        self.count += slab_result['count']
+        self.min = slab_result['min'] if self.min is None else min(self.min, slab_result['min'])
+        self.max = slab_result['max'] if self.max is None else max(self.max, slab_result['max'])
+        self.values.extend(slab_result['values'])
+        self.indices.extend(tuple(i + offset for i, offset in zip(index, start))
+                            for index in slab_result['indices'])
+
+    def failed(self) -> bool:
+        """
+        Method dedicated to checking whether the slabs processed so far make the check fail
+        :return: True if a value out of bounds was found
+        """
+        return self.count > 0
+
+    def result(self) -> dict:
+        """
+        Method dedicated to getting the accumulated result
+        :return: dictionary with the count, min, max, values and indices of the values out of bounds
+        """
+        return {'count': self.count, 'min': self.min, 'max': self.max,
+                'values': self.values, 'indices': self.indices}
+
+
+class EmptinessAccumulator:
+    """
+    Class dedicated to accumulating the number of empty (masked, i.e. equal to the fill value)
+    and NaN data points of a variable over all of its slabs. For multidimensional variables it also keeps
+    track of the indices along each axis at which all data points are empty or NaN.
+
+     Methods:
+    - update: process the next slab
+    - failed: check whether the slabs processed so far make the check fail
+    - result: get the accumulated result
+    - resize: grow the state to a variable with more records
+    """
+
+    def __init__(self, shape: Tuple[int, ...] = ()):
+        """
+        Constructor for the EmptinessAccumulator objects
+        :param shape: the shape of the variable
+        """
+        self.checked = 0
+        self.empty = 0
+        self.nan = 0
+        # an index along an axis stays completely empty as long as it is empty in every slab
+        self.empty_along = [np.ones(length, dtype=bool) for length in shape] if len(shape) >= 2 else []
+
+    def update(self, values: np.ndarray, start: Tuple[int, ...]):
+        """
+        Method dedicated to processing the next slab
+        :param values: the values of the slab
+        :param start: the index of the first data point of the slab in the variable
+        """
+        counts = emptiness_counts(values)
+
+        self.checked += counts['checked']
+        self.empty += counts['empty']
+        self.nan += counts['nan']
+
+        if counts['checked'] == 0:
+            return
+
+        for empty_along, slab_empty_along, axis_start in zip(self.empty_along, counts['empty_along'], start):
+            empty_along[axis_start:axis_start + slab_empty_along.size] &= slab_empty_along
+
+    def resize(self, shape: Tuple[int, ...]):
+        """
+        Method dedicated to growing the state of the accumulator to a variable with more records along its first axis
+        :param shape: the new shape of the variable
+        """
+        if self.empty_along:
+            self.empty_along[0] = _grow(self.empty_along[0], shape[0], True)
+
+    def failed(self) -> bool:
+        """
+        Method dedicated to checking whether the slabs processed so far make the check fail
+        :return: True if an empty or NaN data point was found
+        """
+        return self.empty > 0 or self.nan > 0
+
+    def result(self) -> dict:
+        """
+        Method dedicated to getting the accumulated result
+        :return: dictionary with the number of checked, empty and NaN data points, and the completely empty
+                 indices along each axis, see `kernels.emptiness_counts`
+        """
+        # indices along an axis of a variable without data points are not considered empty
+        empty_along = [empty_along.copy() for empty_along in self.empty_along] if self.checked else []
+        return {'checked': self.checked, 'empty': self.empty, 'nan': self.nan, 'empty_along': empty_along}
+
+
+class PointsAmountAccumulator:
+    """
+    Class dedicated to accumulating the number of data points of a variable and the number of valid
+    (not masked, i.e. not equal to the fill value) data points over all of its slabs.
+
+     Methods:
+    - update: process the next slab
+    - failed: check whether the slabs processed so far make the check fail
+    - result: get the accumulated result
+    """
+
+    def __init__(self):
+        """
+        Constructor for the PointsAmountAccumulator objects
+        """
+        self.size = 0
+        self.valid = 0
+
+    def update(self, values: np.ndarray, start: Tuple[int, ...]):  # pylint: disable=unused-argument
+        """
+        Method dedicated to processing the next slab
+        :param values: the values of the slab
+        :param start: the index of the first data point of the slab in the variable
+        """
+        self.size += values.size
+        self.valid += int(np.ma.count(values))
+
+    @staticmethod
+    def failed() -> bool:
+        """
+        Method dedicated to checking whether the slabs processed so far make the check fail, which is never
+        known before all slabs are processed
+        :return: False
+        """
+        return False
+
+    def result(self) -> dict:
+        """
+        Method dedicated to getting the accumulated result
+        :return: dictionary with the number of data points and the number of valid data points
+        """
+        return {'size': self.size, 'valid': self.valid}
+
+
+class IdenticalRunsAccumulator:
+    """
+    Class dedicated to accumulating the runs of consecutive identical values of a variable along one of its
+    axes, over all of its slabs. For every line along the axis the run at the end of a slab is carried over,
+    so runs spanning slabs are counted in full. Masked values never belong to a run.
+
+     Attributes:
+    - maximum: the maximum allowed number of consecutive identical values
+    - axis: the axis along which runs are counted
+    - count: the number of runs longer than the maximum found so far
+    - runs: the first max_runs runs longer than the maximum by start index, each with its start index, length
+      and value
+
+     Methods:
+    - update: process the next slab
+    - failed: check whether the slabs processed so far make the check fail
+    - result: get the accumulated result
+    - resize: grow the state to a variable with more records
+    """
+
+    def __init__(self, maximum: int, shape: Tuple[int, ...], axis: int = 0, max_runs: int = 100):
+        """
+        Constructor for the IdenticalRunsAccumulator objects
+        :param maximum: the maximum allowed number of consecutive identical values
+        :param shape: the shape of the variable
+        :param axis: the axis along which runs are counted. Defaults to 0.
+        :param max_runs: the maximum number of runs to keep. Defaults to 100.
+        """
+        self.maximum = maximum
+        self.axis = axis
+        self.max_runs = max_runs
+        self.count = 0
+        self.runs = []
+
+        # the run at the end of every line processed so far, the lines are all indices of the other axes
+        shape = tuple(shape) or (1,)
+        self._lines_shape = shape[:axis] + shape[axis + 1:]
+        self._carry_length = np.zeros(self._lines_shape, dtype=np.int64)
+        self._carry_start = np.zeros(self._lines_shape, dtype=np.int64)
+        self._carry_value = None
+
+    def _add_runs(self, lines_start: Tuple[int, ...], lines_shape: Tuple[int, ...],
+                  line: np.ndarray, start: np.ndarray, length: np.ndarray, value: np.ndarray):
+        """
+        Method dedicated to storing runs longer than the maximum
+        :param lines_start: the index of the first line of the slab in the lines of the variable
+        :param lines_shape: the shape of the lines of the slab
+        :param line: the line of each run within the slab
+        :param start: the index along the axis at which each run starts
+        :param length: the length of each run
+        :param value: the value of each run
+        """
+        self.count += len(line)
+        if self.max_runs <= 0 or len(line) == 0:
+            return
+
+        # runs end in another order than their start indices, so the first runs by index are kept
+        index = [line_index + offset for line_index, offset in
+                 zip(np.unravel_index(line, lines_shape), lines_start)] if lines_shape else []
+        index.insert(self.axis, start)
+        first = np.lexsort(index[::-1])[:self.max_runs]
+        runs = [{'start': tuple(int(axis_index[i]) for axis_index in index), 'length': int(length[i]),
+                 'value': value[i]} for i in first]
+        self.runs = sorted(self.runs + runs, key=lambda run: run['start'])[:self.max_runs]
+
+    def update(self, values: np.ndarray, start: Tuple[int, ...]):
+        """
+        Method dedicated to processing the next slab
+        :param values: the values of the slab
+        :param start: the index of the first data point of the slab in the variable
+        """
+        runs = line_runs(values, self.axis)
+        if len(runs['line']) == 0:
+            return
+
+        start = tuple(start) or (0,)
+        lines_start = start[:self.axis] + start[self.axis + 1:]
+        lines_shape = runs['lines_shape']
+        region = tuple(slice(i, i + n) for i, n in zip(lines_start, lines_shape))
+
+        if self._carry_value is None:
+            self._carry_value = np.zeros(self._lines_shape, dtype=runs['value'].dtype)
+
+        carry_length = self._carry_length[region].ravel()
+        carry_start = self._carry_start[region].ravel()
+        carry_value = self._carry_value[region].ravel()
+
+        length = runs['length'].copy()
+        run_start = runs['start'] + start[self.axis]
+        first = np.flatnonzero(runs['start'] == 0)
+        last = np.append(first[1:] - 1, len(length) - 1)
+
+        # the run carried over from the previous slab either continues in the first run of the line or ends
+        merge = (carry_length > 0) & ~runs['masked'][first] & (runs['value'][first] == carry_value)
+        length[first[merge]] += carry_length[merge]
+        run_start[first[merge]] = carry_start[merge]
+
+        ended = np.flatnonzero(~merge & (carry_length > self.maximum))
+        self._add_runs(lines_start, lines_shape, ended, carry_start[ended], carry_length[ended], carry_value[ended])
+
+        # all runs but the last one of every line are complete, the last ones are carried over to the next slab
+        complete = np.ones(len(length), dtype=bool)
+        complete[last] = False
+        long_runs = np.flatnonzero(complete & ~runs['masked'] & (length > self.maximum))
+        self._add_runs(lines_start, lines_shape, runs['line'][long_runs], run_start[long_runs],
+                       length[long_runs], runs['value'][long_runs])
+
+        self._carry_length[region] = np.where(runs['masked'][last], 0, length[last]).reshape(lines_shape)
+        self._carry_start[region] = run_start[last].reshape(lines_shape)
+        self._carry_value[region] = runs['value'][last].reshape(lines_shape)
+
+    def resize(self, shape: Tuple[int, ...]):
+        """
+        Method dedicated to growing the state of the accumulator to a variable with more records along its first axis.
+        Only the runs along the other axes have a line for every record.
+        :param shape: the new shape of the variable
+        """
+        if self.axis == 0 or not shape:
+            return
+        self._lines_shape = (shape[0],) + self._lines_shape[1:]
+        self._carry_length = _grow(self._carry_length, shape[0], 0)
+        self._carry_start = _grow(self._carry_start, shape[0], 0)
+        if self._carry_value is not None:
+            self._carry_value = _grow(self._carry_value, shape[0], 0)
+
+    def failed(self) -> bool:
+        """
+        Method dedicated to checking whether the slabs processed so far make the check fail
+        :return: True if a run longer than the maximum was found, including a run carried over to the next slab
+        """
+        return self.count > 0 or bool((self._carry_length > self.maximum).any())
+
+    def result(self) -> dict:
+        """
+        Method dedicated to getting the accumulated result, which ends the runs carried over
+        :return: dictionary with the number of runs longer than the maximum and the first max_runs of them,
+                 each with its start index, length and value
+        """
+        if self._carry_value is not None:
+            ended = np.flatnonzero(self._carry_length.ravel() > self.maximum)
+            self._add_runs((0,) * len(self._lines_shape), self._lines_shape, ended,
+                           self._carry_start.ravel()[ended], self._carry_length.ravel()[ended],
+                           self._carry_value.ravel()[ended])
+            self._carry_length[...] = 0
+
+        return {'count': self.count, 'runs': self.runs}
+
+
+class AdjacentDifferencesAccumulator:
+    """
+    Class dedicated to accumulating the differences between adjacent values along one of the axes
+    of a variable which are larger than a maximum, over all of its slabs. For every line along the axis
+    the last value of a slab is carried over, so the differences between slabs are checked as well.
+    The result has the same form as the result of `kernels.adjacent_exceedances` for the whole variable.
+
+     Methods:
+    - update: process the next slab
+    - failed: check whether the slabs processed so far make the check fail
+    - result: get the accumulated result
+    - resize: grow the state to a variable with more records
+    """
+
+    def __init__(self, maximum, shape: Tuple[int, ...], axis: int, max_values: int):
+        """
+        Constructor for the AdjacentDifferencesAccumulator objects
+        :param maximum: the maximum allowed absolute difference
+        :param shape: the shape of the variable
+        :param axis: the axis along which values are adjacent
+        :param max_values: the maximum number of offending differences and indices to keep
+        """
+        self.maximum = maximum
+        self.axis = axis
+        self.max_values = max_values
+        self.count = 0
+        self.max = None
+        self.values = []
+        self.indices = []
+
+        # the last value of every line processed so far, the lines are all indices of the other axes
+        self._lines_shape = tuple(shape[:axis]) + tuple(shape[axis + 1:])
+        self._previous = None
+        self._previous_mask = np.zeros(self._lines_shape, dtype=bool)
+        self._has_previous = np.zeros(self._lines_shape, dtype=bool)
+
+    def _add(self, result: dict, offset: Tuple[int, ...], axis_index: Optional[int] = None):
+        """
+        Method dedicated to adding the offending differences of (a part of) a slab
+        :param result: the offending differences, see `kernels.adjacent_exceedances`
+        :param offset: the index of the first data point of the part in the variable, without the axis
+                       if axis_index is given
+        :param axis_index: the index along the axis of all offending differences if the part has no such axis
+        """
+        if result['count'] == 0:
+            return
+
+        self.count += result['count']
+        self.max = result['max'] if self.max is None else max(self.max, result['max'])
+        self.values.extend(result['values'])
+
+        for index in result['indices']:
+            index = [i + start for i, start in zip(index, offset)]
+            if axis_index is not None:
+                index.insert(self.axis, axis_index)
+            self.indices.append(tuple(index))
+
+    def update(self, values: np.ndarray, start: Tuple[int, ...]):
+        """
+        Method dedicated to processing the next slab
+        :param values: the values of the slab
+        :param start: the index of the first data point of the slab in the variable
+        """
+        data = np.ma.getdata(values)
+        mask = np.ma.getmaskarray(values)
+        if data.size == 0:
+            return
+
+        lines_start = tuple(start[:self.axis]) + tuple(start[self.axis + 1:])
+        lines_shape = data.shape[:self.axis] + data.shape[self.axis + 1:]
+        region = tuple(slice(i, i + n) for i, n in zip(lines_start, lines_shape))
+        first = (slice(None),) * self.axis + (0,)
+        last = (slice(None),) * self.axis + (-1,)
+
+        if self._previous is None:
+            self._previous = np.zeros(self._lines_shape, dtype=data.dtype)
+
+        # the pairs formed by the last values of the previous slab and the first values of this slab
+        has_previous = self._has_previous[region]
+        if has_previous.any():
+            difference = absolute_difference(data[first], self._previous[region])
+            exceedances = np.greater(difference, self.maximum)
+            exceedances &= has_previous & ~mask[first] & ~self._previous_mask[region]
+            self._add(exceedances_summary(difference, exceedances, self.max_values - len(self.values)),
+                      lines_start, axis_index=start[self.axis] - 1)
+
+        # the pairs within this slab
+        self._add(adjacent_exceedances(values, self.axis, self.maximum, self.max_values - len(self.values)),
+                  tuple(start))
+
+        self._previous[region] = data[last]
+        self._previous_mask[region] = mask[last]
+        self._has_previous[region] = True
+
+    def resize(self, shape: Tuple[int, ...]):
+        """
+        Method dedicated to growing the state of the accumulator to a variable with more records along its first axis.
+        Only the differences along the other axes have a line for every record.
+        :param shape: the new shape of the variable
+        """
+        if self.axis == 0:
+            return
+        self._lines_shape = (shape[0],) + self._lines_shape[1:]
+        self._previous_mask = _grow(self._previous_mask, shape[0], False)
+        self._has_previous = _grow(self._has_previous, shape[0], False)
+        if self._previous is not None:
+            self._previous = _grow(self._previous, shape[0], 0)
+
+    def failed(self) -> bool:
+        """
+        Method dedicated to checking whether the slabs processed so far make the check fail
+        :return: True if a difference larger than the maximum was found
+        """
+        return self.count > 0
+
+    def result(self) -> dict:
+        """
+        Method dedicated to getting the accumulated result
+        :return: dictionary with the count, max, values and indices of the offending differences
+        """
+        return {'count': self.count, 'max': self.max, 'values': self.values, 'indices': self.indices}
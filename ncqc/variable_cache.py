@@ -0,0 +1,123 @@
+"""
+Module dedicated to caching the data of variables in memory, so checks performed one after the other
+(for example data_boundaries_check followed by emptiness_check) do not read the same variable from the
+netCDF file again. Values are cached per file, variable and slab, within a budget of bytes: when a new
+array does not fit, the least recently used arrays are evicted first.
+
+Cached arrays are shared by all checks reading them, so they are made read-only.
+
+ Classes:
+- VariableCache: the cache of the values of variables
+"""
+
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+import numpy as np
+
+
+class VariableCache:
+    """
+    Class dedicated to caching the (masked) values of variables, evicting the least recently used values
+    when the cache is full
+
+     Attributes:
+    - max_bytes: the maximum number of bytes of all cached values together
+    - nbytes: the number of bytes of all cached values
+    - hits: the number of values found in the cache
+    - misses: the number of values not found in the cache
+    - evictions: the number of values evicted to make room for other values
+
+     Methods:
+    - get: get the cached values of a key
+    - put: add the values of a key, evicting the least recently used values if needed
+    - clear: remove all values, keeping the counters
+    - stats: get the counters and the size of the cache
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Constructor for the VariableCache objects
+        :param max_bytes: the maximum number of bytes of all cached values together
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._values = OrderedDict()
+
+    def __len__(self) -> int:
+        """
+        Method dedicated to getting the number of cached values
+        :return: the number of cached values
+        """
+        return len(self._values)
+
+    @staticmethod
+    def _size(values: np.ndarray) -> int:
+        """
+        Method dedicated to getting the number of bytes of (masked) values, including their mask
+        :param values: the values
+        :return: the number of bytes
+        """
+        mask = np.ma.getmask(values)
+        return np.ma.getdata(values).nbytes + (mask.nbytes if mask is not np.ma.nomask else 0)
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        """
+        Method dedicated to getting the cached values of a key, marking them as recently used
+        :param key: the key, for example a tuple with the file, the variable and the slab
+        :return: the read-only values, None if the key is not in the cache
+        """
+        values = self._values.get(key)
+        if values is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._values.move_to_end(key)
+        return values
+
+    def put(self, key: Hashable, values: np.ndarray) -> np.ndarray:
+        """
+        Method dedicated to adding the values of a key, evicting the least recently used values until they fit.
+        Values larger than the budget are not cached.
+        :param key: the key
+        :param values: the values
+        :return: the values, made read-only if they are cached
+        """
+        size = self._size(values)
+        if size > self.max_bytes:
+            return values
+
+        if key in self._values:
+            self.nbytes -= self._size(self._values.pop(key))
+        while self.nbytes + size > self.max_bytes:
+            _, evicted = self._values.popitem(last=False)
+            self.nbytes -= self._size(evicted)
+            self.evictions += 1
+
+        np.ma.getdata(values).flags.writeable = False
+        if np.ma.getmask(values) is not np.ma.nomask:
+            np.ma.getmask(values).flags.writeable = False
+
+        self._values[key] = values
+        self.nbytes += size
+        return values
+
+    def clear(self):
+        """
+        Method dedicated to removing all values, keeping the counters
+        """
+        self._values.clear()
+        self.nbytes = 0
+
+    def stats(self) -> dict:
+        """
+        Method dedicated to getting the counters and the size of the cache, for tuning its budget
+        :return: dictionary with the number of hits, misses and evictions, the number of cached values,
+                 the number of cached bytes and the maximum number of bytes
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'values': len(self),
+                'nbytes': self.nbytes, 'max_bytes': self.max_bytes}
@@ -4,7 +4,9 @@ Module for testing the LoggerQC class from log.py
 import unittest
 from unittest.mock import patch, Mock
 
-from ncqc.log import LoggerQC
+import numpy as np
+
+from ncqc.log import LoggerQC, LogRecord
 
 
 class TestLoggerQC(unittest.TestCase):
@@ -17,12 +19,22 @@ class TestLoggerQC(unittest.TestCase):
     - test_add_error: Test for the add_error method
     - test_add_warning: Test for the add_warning method
     - test_add_info: Test for the add_info method
+    - test_merge: Test for the merge method
     - test_create_report: Test for the create_report method with a single report creation
     - test_create_report_mult_reports: Test for the create_report method with 2 report creations
     - test_get_latest_report_empty: Test for the get_latest_report method with no existing reports
     - test_get_latest_report: Test for the get_latest_report method with 2 existing reports
     - test_get_all_reports_empty: Test for the get_all_reports method with no existing reports
     - test_get_all_reports: Test for the get_all_reports method with 2 existing reports
+    - test_max_messages_per_check: Test for capping the number of messages per check
+    - test_max_messages_per_variable: Test for capping the number of messages per variable
+    - test_deduplicate: Test for logging identical messages once with their number of occurrences
+    - test_max_reports: Test for keeping only the latest reports
+    - test_buffer: Test for the buffer method sharing the message caps with the logger
+    - test_lazy_formatting: Test for formatting templates only when the messages are rendered
+    - test_get_records: Test for the get_records method
+    - test_record_as_dict: Test for the as_dict method of LogRecord
+    - test_record_lists: Test for changing the errors, warnings and info as lists, which changes the records
     """
 
     def test_constructor_not_none(self):
@@ -71,6 +83,23 @@ class TestLoggerQC(unittest.TestCase):
         logger_obj.add_info("example message 2")
         assert logger_obj.info == ['example message', 'example message 2']
 
+    def test_merge(self):
+        """
+        Test for the merge method
+        """
+        logger_obj = LoggerQC()
+        logger_obj.add_error("example error")
+
+        other_logger_obj = LoggerQC()
+        other_logger_obj.add_error("example error 2")
+        other_logger_obj.add_warning("example warning")
+        other_logger_obj.add_info("example message")
+
+        logger_obj.merge(other_logger_obj)
+        assert logger_obj.errors == ['example error', 'example error 2']
+        assert logger_obj.warnings == ['example warning']
+        assert logger_obj.info == ['example message']
+
     @patch('ncqc.log.date')
     @patch('ncqc.log.datetime')
     def test_create_report(self, mock_datetime, mock_date):
@@ -172,3 +201,187 @@ class TestLoggerQC(unittest.TestCase):
         logger_obj = LoggerQC()
         logger_obj.reports = [{'test_report_1': 1}, {'test_report_2': 2}]
         assert logger_obj.get_all_reports() == [{'test_report_1': 1}, {'test_report_2': 2}]
+
+    def test_max_messages_per_check(self):
+        """
+        Test for capping the number of messages per check
+        """
+        logger_obj = LoggerQC(max_messages_per_check=2)
+        for i in range(5):
+            logger_obj.add_error(f"error {i}", check='boundaries', variable='var_1')
+        logger_obj.add_warning("warning", check='boundaries', variable='var_2')
+        logger_obj.add_error("other error", check='emptiness', variable='var_1')
+        logger_obj.add_error("uncapped error")
+        assert logger_obj.errors == ['error 0', 'error 1', 'other error', 'uncapped error']
+        assert not logger_obj.warnings
+
+        logger_obj.create_report()
+        assert logger_obj.get_latest_report()['warnings'] == [
+            "3 more messages of boundaries for variable 'var_1' were suppressed",
+            "1 more messages of boundaries for variable 'var_2' were suppressed"
+        ]
+
+        # the caps start over for every report
+        logger_obj.add_error("error 5", check='boundaries', variable='var_1')
+        logger_obj.create_report()
+        assert logger_obj.get_latest_report()['errors'] == ['error 5']
+        assert not logger_obj.get_latest_report()['warnings']
+
+    def test_max_messages_per_variable(self):
+        """
+        Test for capping the number of messages per variable
+        """
+        logger_obj = LoggerQC(max_messages_per_variable=1)
+        logger_obj.add_error("error 1", check='boundaries', variable='var_1')
+        logger_obj.add_error("error 2", check='emptiness', variable='var_1')
+        logger_obj.add_error("error 3", variable='var_1')
+        logger_obj.add_error("error 4", check='emptiness', variable='var_2')
+        assert logger_obj.errors == ['error 1', 'error 4']
+
+        logger_obj.create_report()
+        assert logger_obj.get_latest_report()['warnings'] == [
+            "1 more messages of emptiness for variable 'var_1' were suppressed",
+            "1 more messages for variable 'var_1' were suppressed"
+        ]
+
+    def test_deduplicate(self):
+        """
+        Test for logging identical messages once with their number of occurrences
+        """
+        logger_obj = LoggerQC(deduplicate=True)
+        for _ in range(3):
+            logger_obj.add_error("example error")
+            logger_obj.add_warning("example error")
+        logger_obj.add_error("example error 2")
+        logger_obj.add_info("example message")
+        logger_obj.add_info("example message")
+        assert logger_obj.errors == ['example error', 'example error 2']
+        assert logger_obj.warnings == ['example error']
+
+        logger_obj.create_report()
+        report = logger_obj.get_latest_report()
+        assert report['errors'] == ['example error (3 occurrences)', 'example error 2']
+        assert report['warnings'] == ['example error (3 occurrences)']
+        assert report['info'] == ['example message', 'example message']
+
+    def test_max_reports(self):
+        """
+        Test for keeping only the latest reports
+        """
+        logger_obj = LoggerQC(max_reports=2)
+        for i in range(4):
+            logger_obj.add_error(f"error {i}")
+            logger_obj.create_report()
+        assert [report['errors'] for report in logger_obj.get_all_reports()] == [['error 2'], ['error 3']]
+        assert logger_obj.get_latest_report()['errors'] == ['error 3']
+
+        logger_obj.reports = [{'test_report_1': 1}, {'test_report_2': 2}, {'test_report_3': 3}]
+        assert logger_obj.get_all_reports() == [{'test_report_2': 2}, {'test_report_3': 3}]
+
+    def test_buffer(self):
+        """
+        Test for the buffer method sharing the message caps with the logger
+        """
+        logger_obj = LoggerQC(max_messages_per_variable=2, deduplicate=True)
+        buffer_1 = logger_obj.buffer()
+        buffer_2 = logger_obj.buffer()
+        buffer_1.add_error("error 1", variable='var_1')
+        buffer_2.add_error("error 1", variable='var_1')
+        buffer_2.add_error("error 2", variable='var_1')
+        buffer_1.add_error("error 3", variable='var_1')
+        logger_obj.merge(buffer_1)
+        logger_obj.merge(buffer_2)
+        assert logger_obj.errors == ['error 1', 'error 2']
+
+        logger_obj.create_report()
+        assert logger_obj.get_latest_report()['errors'] == ['error 1 (2 occurrences)', 'error 2']
+        assert logger_obj.get_latest_report()['warnings'] == ["1 more messages for variable 'var_1' were suppressed"]
+
+    def test_lazy_formatting(self):
+        """
+        Test for formatting templates only when the messages are rendered
+        """
+        value = Mock()
+        value.__format__ = Mock(return_value='42')
+
+        logger_obj = LoggerQC()
+        logger_obj.add_error("value '{}' out of bounds for variable '{}'", value, 'var_1')
+        logger_obj.add_warning("literal {braces} without values")
+        value.__format__.assert_not_called()
+
+        assert logger_obj.errors == ["value '42' out of bounds for variable 'var_1'"]
+        assert logger_obj.warnings == ['literal {braces} without values']
+
+        logger_obj.create_report()
+        assert logger_obj.get_latest_report()['errors'] == ["value '42' out of bounds for variable 'var_1'"]
+
+    def test_get_records(self):
+        """
+        Test for the get_records method
+        """
+        logger_obj = LoggerQC()
+        logger_obj.add_info("message", check='boundaries', variable='var_1')
+        logger_obj.add_error("error {}", 1, check='boundaries', variable='var_1', index=(0, 3))
+        logger_obj.add_error("error {}", 2, check='emptiness', variable='var_2')
+        logger_obj.add_warning("warning", variable='var_1')
+
+        records = logger_obj.get_records()
+        assert [(record.severity, record.render()) for record in records] == [
+            ('error', 'error 1'), ('error', 'error 2'), ('warning', 'warning'), ('info', 'message')]
+        assert [record.render() for record in logger_obj.get_records(variable='var_1')] == [
+            'error 1', 'warning', 'message']
+        assert [record.index for record in logger_obj.get_records(severity='error', check='boundaries')] == [(0, 3)]
+
+        logger_obj.create_report()
+        assert not logger_obj.get_records()
+
+    def test_record_as_dict(self):
+        """
+        Test for the as_dict method of LogRecord
+        """
+        record = LogRecord('error', "value '{}' out of bounds", (np.float32(1.5),), check='boundaries',
+                           variable='var_1', index=(np.int64(2), np.int64(0)))
+        assert record.as_dict() == {
+            'severity': 'error',
+            'check': 'boundaries',
+            'variable': 'var_1',
+            'message': "value '1.5' out of bounds",
+            'values': [1.5],
+            'index': [2, 0]
+        }
+        assert isinstance(record.as_dict()['values'][0], float)
+
+    def test_record_lists(self):
+        """
+        Test for changing the errors, warnings and info as lists, which changes the records of the logger,
+        and for formatting the text of a record only once
+        """
+        value = Mock()
+        value.__format__ = Mock(return_value='42')
+
+        logger_obj = LoggerQC(deduplicate=True)
+        logger_obj.add_error("value '{}' out of bounds", value, check='boundaries', variable='var_1')
+        logger_obj.errors.append('error 2')
+        logger_obj.errors.append('error 2')
+        logger_obj.errors += ['error 3']
+        logger_obj.warnings.extend(['warning 1', 'warning 2'])
+        logger_obj.info.insert(0, 'message')
+
+        assert logger_obj.errors == ["value '42' out of bounds", 'error 2', 'error 3']
+        assert 'error 3' in logger_obj.errors
+        assert logger_obj.errors[1:] == ['error 2', 'error 3']
+        assert logger_obj.get_records('error')[0].check == 'boundaries'
+        value.__format__.assert_called_once()
+
+        logger_obj.warnings[0] = 'warning 0'
+        del logger_obj.warnings[1]
+        logger_obj.info.remove('message')
+        assert logger_obj.warnings == ['warning 0']
+        assert logger_obj.warnings + logger_obj.info == ['warning 0']
+        assert not logger_obj.info
+
+        logger_obj.create_report()
+        assert logger_obj.get_latest_report()['errors'] == ["value '42' out of bounds",
+                                                             'error 2 (2 occurrences)', 'error 3']
+        assert logger_obj.get_latest_report()['warnings'] == ['warning 0']
+        assert logger_obj.errors == []
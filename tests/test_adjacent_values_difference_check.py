@@ -8,6 +8,8 @@ Module for testing the functionality of the value_change_rate_check method
   adjacent_values_difference_check succeeds.
 - test_adjacent_values_difference_check_fail: Test for when
   adjacent_values_difference_check fails.
+- test_adjacent_values_difference_check_message_cap: Test for
+  adjacent_values_difference_check when more differences exceed the maximum than errors may be logged.
 - test_adjacent_values_difference_check_var_not_in_file: Test
   adjacent_values_difference_check when variable is not in file.
 - test_adjacent_values_difference_check_dimensions_not_specified:
@@ -166,6 +168,32 @@ def test_adjacent_values_difference_check_fail():
         os.remove(nc_path)
 
 
+@pytest.mark.usefixtures("create_nc_adjacent_values_difference_check")
+def test_adjacent_values_difference_check_message_cap():
+    """
+    Test for adjacent_values_difference_check when more differences exceed the maximum than errors may be logged.
+    """
+    qc_obj = QualityControl(max_point_messages=5)
+
+    nc_path = data_dir / 'test_adjacent_values_difference_check.nc'
+    qc_obj.load_netcdf(nc_path)
+
+    dictionary = general_dict | adjacent_values_difference_check_dict_fail
+    qc_obj.add_qc_checks_dict(dictionary)
+
+    qc_obj.adjacent_values_difference_check()
+
+    assert qc_obj.logger.errors == ["difference of '5.0' exceeds the maximum difference of '1'"] * 5 + [
+        "19 differences between adjacent values along dimension '0' of variable 'test_fail' exceed the maximum "
+        "difference of '1' (largest: 5.0, first indices: "
+        "[(80,), (81,), (82,), (83,), (84,), (85,), (86,), (87,), (88,), (89,)])"]
+    assert qc_obj.logger.info == ["adjacent_values_difference_check for variable 'test_fail' and "
+                                  "dimension '0': FAIL"]
+
+    if os.path.exists(nc_path):
+        os.remove(nc_path)
+
+
 @pytest.mark.usefixtures("create_nc_adjacent_values_difference_check")
 def test_adjacent_values_difference_check_var_not_in_file():
     """
@@ -0,0 +1,218 @@
+"""
+Module for testing the functionality of aio.py, performing quality control from asyncio code
+
+ Functions:
+- test_async_quality_control: Test for the async methods, which give the same report as the QualityControl object
+- test_async_event_loop: Test for keeping the event loop responsive while the checks run
+- test_async_cancel: Test for cancelling the checks in progress
+- test_check_files: Test for checking files with bounded concurrency in threads and in processes
+- test_check_files_in_flight: Test for creating the tasks of the files lazily, with at most max_concurrency in flight
+"""
+
+import asyncio
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from ncqc.QCnetCDF import QualityControl
+from ncqc.aio import AsyncQualityControl, check_files
+
+data_dir = Path(__file__).parent.parent / 'sample_data'
+
+aio_dict = {
+    'dimensions': {'time': {'existence_check': True}},
+    'variables': {
+        'series': {
+            'emptiness_check': True,
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10},
+            'consecutive_identical_values_check': {'maximum': 5}
+        },
+        'spectrum': {
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10}
+        }
+    },
+    'global attributes': {},
+    'file size': {}
+}
+
+batch_dict = {
+    'dimensions': {},
+    'variables': {'temperature': {'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10}}},
+    'global attributes': {},
+    'file size': {}
+}
+
+
+def _report(report: dict) -> dict:
+    """
+    Function to get the messages of a report, without the time of the report
+    :param report: the report
+    :return: the errors, warnings and info of the report
+    """
+    return {key: report[key] for key in ('errors', 'warnings', 'info')}
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_async_quality_control():
+    """
+    Test for the async methods, which return the AsyncQualityControl object and give the same report
+    as the methods of the QualityControl object
+    """
+    qc_obj = QualityControl()
+    qc_obj.add_qc_checks_dict(aio_dict)
+    qc_obj.load_netcdf(data_dir / 'test_streaming.nc')
+    expected = _report(qc_obj.perform_all_checks().create_report())
+    qc_obj.nc.close()
+
+    async def check() -> dict:
+        async_qc = AsyncQualityControl()
+        async_qc.qc.add_qc_checks_dict(aio_dict)
+        assert await async_qc.load_netcdf(data_dir / 'test_streaming.nc') is async_qc
+        await async_qc.perform_all_checks()
+        await async_qc.close()
+        assert async_qc.qc.nc is None
+        return await async_qc.create_report()
+
+    assert _report(asyncio.run(check())) == expected
+
+    os.remove(data_dir / 'test_streaming.nc')
+
+
+def test_async_event_loop():
+    """
+    Test for keeping the event loop responsive while the checks run in the executor
+    """
+    def slow_checks(qc_obj):
+        time.sleep(0.3)
+        return qc_obj
+
+    async def check() -> int:
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.ensure_future(tick())
+        with patch.object(QualityControl, 'perform_all_checks', slow_checks):
+            await AsyncQualityControl().perform_all_checks()
+        ticker.cancel()
+        return ticks
+
+    assert asyncio.run(check()) >= 10
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_async_cancel():
+    """
+    Test for cancelling the checks in progress, which stop before their next read of data, after which the
+    object can be used again
+    """
+    read_var = QualityControl._read_var
+    reads = []
+
+    def slow_read_var(qc_obj, var_name, slab=None):
+        reads.append(var_name)
+        time.sleep(0.01)
+        return read_var(qc_obj, var_name, slab)
+
+    async def check() -> AsyncQualityControl:
+        async_qc = AsyncQualityControl(QualityControl(memory_budget=32))
+        async_qc.qc.add_qc_checks_dict(aio_dict)
+        await async_qc.load_netcdf(data_dir / 'test_streaming.nc')
+
+        task = asyncio.ensure_future(async_qc.perform_all_checks())
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # the checks stopped, so no more data is read
+        n_reads = len(reads)
+        await asyncio.sleep(0.05)
+        assert len(reads) == n_reads
+
+        await async_qc.data_boundaries_check()
+        await async_qc.close()
+        return async_qc
+
+    with patch.object(QualityControl, '_read_var', slow_read_var):
+        async_qc = asyncio.run(check())
+
+    assert not async_qc.qc.cancel_event.is_set()
+    assert "boundary check for variable 'spectrum': FAIL" in async_qc.qc.logger.info
+
+    os.remove(data_dir / 'test_streaming.nc')
+
+
+@pytest.mark.usefixtures("create_nc_batch")
+def test_check_files():
+    """
+    Test for checking files with bounded concurrency, in threads and in processes, of which a file which
+    cannot be loaded gets an error
+    """
+    batch_dir = data_dir / 'batch'
+
+    async def check(executor) -> dict:
+        files = list(batch_dir.rglob('*.nc')) + [batch_dir / 'notes.txt']
+        return {path.name: _report(report) async for path, report in
+                check_files(files, batch_dict, max_concurrency=2, executor=executor)}
+
+    reports = asyncio.run(check(None))
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert asyncio.run(check(executor)) == reports
+
+    assert set(reports) == {'file_0.nc', 'file_1.nc', 'file_2.nc', 'notes.txt'}
+    assert not reports['file_0.nc']['errors']
+    assert "boundary check for variable 'temperature': FAIL" in reports['file_2.nc']['info']
+    assert reports['notes.txt']['errors'][0].startswith("aio error: could not load nc file")
+
+    shutil.rmtree(batch_dir)
+
+
+def test_check_files_in_flight():
+    """
+    Test for creating the tasks of the files lazily, with at most max_concurrency files in progress,
+    and for cancelling the files in progress when the iteration stops early
+    """
+    in_progress = set()
+    started = []
+    max_in_progress = 0
+
+    async def fake_check_file(path, *args, **kwargs):
+        nonlocal max_in_progress
+        started.append(path)
+        in_progress.add(path)
+        max_in_progress = max(max_in_progress, len(in_progress))
+        try:
+            await asyncio.sleep(0.001 * (len(started) % 3))
+            return {'errors': [], 'warnings': [], 'info': [str(path)]}
+        finally:
+            in_progress.discard(path)
+
+    async def check(stop_after: int) -> list:
+        reports = []
+        async for path, report in check_files([f'file_{i}.nc' for i in range(1000)], batch_dict,
+                                              max_concurrency=3):
+            reports.append((path, report))
+            if len(reports) == stop_after:
+                break
+        return reports
+
+    with patch('ncqc.aio.check_file', fake_check_file):
+        reports = asyncio.run(check(stop_after=1000))
+        assert len(reports) == 1000
+        assert all(report['info'] == [str(path)] for path, report in reports)
+        assert max_in_progress == 3
+
+        started.clear()
+        assert len(asyncio.run(check(stop_after=5))) == 5
+        # only the tasks of the files in progress were created, which were cancelled
+        assert len(started) <= 5 + 3
+        assert not in_progress
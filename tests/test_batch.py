@@ -0,0 +1,99 @@
+"""
+Module for testing the functionality of batch.py
+
+ Functions:
+- test_resolve_paths: Test for getting the paths of the files to check from a directory, glob pattern or list
+- test_run_batch: Test for performing quality control on a directory of netCDF files in parallel
+- test_run_batch_header_only: Test for performing only the header checks on a list of netCDF files
+- test_run_batch_file_not_found: Test for a file which cannot be loaded in a batch
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from ncqc.batch import resolve_paths, run_batch
+
+batch_dir = Path(__file__).parent.parent / 'sample_data' / 'batch'
+
+batch_dict = {
+    'dimensions': {'time': {'existence_check': True}},
+    'variables': {
+        'temperature': {
+            'existence_check': True,
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10},
+            'data_points_amount_check': {'minimum': 10}
+        }
+    },
+    'global attributes': {},
+    'file size': {}
+}
+
+
+@pytest.mark.usefixtures("create_nc_batch")
+def test_resolve_paths():
+    """
+    Test for getting the paths of the files to check from a directory, glob pattern or list
+    """
+    all_files = [batch_dir / 'file_0.nc', batch_dir / 'file_1.nc', batch_dir / 'nested' / 'file_2.nc']
+
+    assert resolve_paths(batch_dir) == all_files
+    assert resolve_paths(str(batch_dir / '*.nc')) == all_files[:2]
+    assert resolve_paths(batch_dir / '**' / 'file_2.nc') == all_files[2:]
+    assert resolve_paths([str(all_files[1])]) == [all_files[1]]
+    assert resolve_paths(all_files[0]) == [all_files[0]]
+
+    shutil.rmtree(batch_dir)
+
+
+@pytest.mark.usefixtures("create_nc_batch")
+def test_run_batch():
+    """
+    Test for performing quality control on a directory of netCDF files in parallel
+    """
+    reports = dict(run_batch(batch_dict, batch_dir, workers=2))
+
+    assert sorted(reports) == resolve_paths(batch_dir)
+
+    for path, report in reports.items():
+        assert not report['warnings']
+        if path.name == 'file_2.nc':
+            assert len(report['errors']) == 20
+            assert "boundary check for variable 'temperature': FAIL" in report['info']
+        else:
+            assert not report['errors']
+            assert "boundary check for variable 'temperature': SUCCESS" in report['info']
+
+    shutil.rmtree(batch_dir)
+
+
+@pytest.mark.usefixtures("create_nc_batch")
+def test_run_batch_header_only():
+    """
+    Test for performing only the header checks on a list of netCDF files
+    """
+    paths = resolve_paths(batch_dir)
+
+    reports = dict(run_batch(batch_dict, paths, workers=1, header_only=True))
+
+    assert sorted(reports) == paths
+    for report in reports.values():
+        assert not report['errors']
+        assert report['info'][-1] == ("header checks: skipped data checks for variable 'temperature': "
+                                      "data_boundaries_check")
+
+    shutil.rmtree(batch_dir)
+
+
+def test_run_batch_file_not_found():
+    """
+    Test for a file which cannot be loaded in a batch, which should not stop the batch
+    """
+    nc_path = Path('does_not_exist.nc')
+
+    (path, report), = run_batch(batch_dict, [nc_path], workers=1)
+
+    assert path == nc_path
+    assert len(report['errors']) == 1
+    assert report['errors'][0].startswith("batch error: could not load nc file 'does_not_exist.nc'")
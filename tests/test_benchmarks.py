@@ -0,0 +1,97 @@
+"""
+Module for testing the benchmark suite in the benchmarks directory
+
+ Functions:
+- test_generate_nc: Test for generating a synthetic netCDF file
+- test_benchmark_scenario: Test for timing all checks on a small synthetic netCDF file
+- test_compare_to_baseline: Test for finding the checks which became slower compared to a baseline
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+from netCDF4 import Dataset
+
+from benchmarks.generate import generate_nc, benchmark_config
+from benchmarks.run_benchmarks import CHECKS, HEADER_CHECKS, benchmark_scenario, compare_to_baseline
+from ncqc.QCnetCDF import QualityControl
+
+data_dir = Path(__file__).parent.parent / 'sample_data'
+
+
+def test_generate_nc():
+    """
+    Test for generating a synthetic netCDF file, which fails the data checks of its benchmark configuration
+    """
+    nc_path = generate_nc(data_dir / 'test_bench.nc', records=3000, classes=4, dtype='i2', compression=True,
+                          variables=2)
+
+    with Dataset(nc_path) as nc_file:
+        assert sorted(nc_file.variables) == ['var_0', 'var_1']
+        assert nc_file['var_0'].shape == (3000, 4)
+        assert nc_file['var_0'].dtype == 'i2'
+        assert nc_file['var_0'].filters()['zlib']
+
+    qc_obj = QualityControl()
+    qc_obj.add_qc_checks_dict(benchmark_config(variables=2, classes=4))
+    qc_obj.load_netcdf(nc_path)
+    qc_obj.perform_all_checks()
+    qc_obj.nc.close()
+
+    assert "boundary check for variable 'var_0': FAIL" in qc_obj.logger.info
+    assert "consecutive_identical_values_check for variable 'var_1': FAIL" in qc_obj.logger.info
+    assert not qc_obj.logger.warnings
+
+    if os.path.exists(nc_path):
+        os.remove(nc_path)
+
+
+def test_benchmark_scenario():
+    """
+    Test for timing all checks on a small synthetic netCDF file, recording no throughput for the checks
+    which only read the header
+    """
+    parameters = {'records': 1000, 'classes': 0, 'dtype': 'f4', 'compression': False, 'variables': 1}
+    nc_path = generate_nc(data_dir / 'test_bench.nc', **parameters)
+
+    results = benchmark_scenario('tiny', nc_path, parameters, repeat=1, memory_budget=1024)
+
+    assert [result['check'] for result in results] == list(CHECKS)
+    for result in results:
+        assert result['scenario'] == 'tiny'
+        assert result['seconds'] > 0
+        if result['check'] in HEADER_CHECKS:
+            assert result['points_per_second'] is None and result['mb_per_second'] is None
+        else:
+            assert result['mb_per_second'] == pytest.approx(4 * result['points_per_second'] / 1e6)
+
+    if os.path.exists(nc_path):
+        os.remove(nc_path)
+
+
+def test_compare_to_baseline():
+    """
+    Test for finding the checks of which the throughput dropped more than the tolerance compared to a baseline,
+    of which checks which only became slower by less than the minimum time are no regressions
+    """
+    baseline = {'results': [
+        {'scenario': 'small', 'check': 'emptiness_check', 'seconds': 1.0, 'points_per_second': 100.0},
+        {'scenario': 'small', 'check': 'data_boundaries_check', 'seconds': 1.0, 'points_per_second': 100.0},
+        {'scenario': 'small', 'check': 'perform_header_checks', 'seconds': 0.1, 'points_per_second': None},
+        {'scenario': 'small', 'check': 'file_size_check', 'seconds': 1e-5, 'points_per_second': None}
+    ]}
+    benchmark = {'results': [
+        {'scenario': 'small', 'check': 'emptiness_check', 'seconds': 1.25, 'points_per_second': 80.0},
+        {'scenario': 'small', 'check': 'data_boundaries_check', 'seconds': 2.0, 'points_per_second': 50.0},
+        {'scenario': 'small', 'check': 'perform_header_checks', 'seconds': 0.2, 'points_per_second': None},
+        {'scenario': 'small', 'check': 'file_size_check', 'seconds': 1e-4, 'points_per_second': None},
+        {'scenario': 'large', 'check': 'data_boundaries_check', 'seconds': 1.0, 'points_per_second': 1.0}
+    ]}
+
+    assert compare_to_baseline(benchmark, baseline, tolerance=0.25) == [
+        "small/data_boundaries_check: 50 points/s, 50% of the baseline (100 points/s)",
+        "small/perform_header_checks: 200 ms, 50% of the throughput of the baseline (100 ms)"
+    ]
+    assert not compare_to_baseline(benchmark, baseline, tolerance=0.6)
+    assert not compare_to_baseline(benchmark, baseline, tolerance=0.25, min_seconds=2.0)
@@ -0,0 +1,240 @@
+"""
+Module for testing the functionality of cache.py and the cached checks of a QualityControl object
+
+ Functions:
+- test_file_fingerprint: Test for the fingerprint of a file by its size and modification time or its content
+- test_result_cache_records: Test for caching log records and results with the types of their values
+- test_result_cache_eviction: Test for evicting the least recently used entries
+- test_cached_perform_all_checks: Test for taking the results of all checks from the cache
+- test_cached_memory_budget: Test for checking the variables again when only the memory budget changed
+- test_cached_run_batch: Test for a batch run with a result cache
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ncqc.QCnetCDF import QualityControl
+from ncqc.batch import run_batch
+from ncqc.cache import ResultCache, file_fingerprint
+from ncqc.log import LogRecord
+
+data_dir = Path(__file__).parent.parent / 'sample_data'
+cache_path = data_dir / 'test_cache.sqlite'
+
+cache_dict = {
+    'dimensions': {'time': {'existence_check': True}},
+    'variables': {
+        'series': {
+            'existence_check': True,
+            'emptiness_check': True,
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10},
+            'consecutive_identical_values_check': {'maximum': 20}
+        },
+        'spectrum': {
+            'emptiness_check': True,
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10}
+        },
+        'missing': {
+            'existence_check': True
+        }
+    },
+    'global attributes': {},
+    'file size': {}
+}
+
+
+def _remove_cache():
+    """
+    Function to remove the database of the cache
+    """
+    if os.path.exists(cache_path):
+        os.remove(cache_path)
+
+
+def _check(config: dict, cache, memory_budget=None) -> QualityControl:
+    """
+    Function to perform all checks on the streaming test file with a new, profiled QualityControl object
+    :param config: the configuration of the checks
+    :param cache: the result cache, or None
+    :param memory_budget: the memory budget of the QualityControl object. Defaults to None.
+    :return: the QualityControl object
+    """
+    qc_obj = QualityControl(cache=cache, memory_budget=memory_budget)
+    qc_obj.add_qc_checks_dict(config)
+    qc_obj.load_netcdf(data_dir / 'test_streaming.nc')
+    qc_obj.enable_profiling()
+    qc_obj.perform_all_checks()
+    qc_obj.nc.close()
+    return qc_obj
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_file_fingerprint():
+    """
+    Test for the fingerprint of a file by its path, size and modification time, or by its content
+    """
+    nc_path = data_dir / 'test_streaming.nc'
+    copy_path = data_dir / 'test_streaming_copy.nc'
+    shutil.copyfile(nc_path, copy_path)
+
+    assert file_fingerprint(nc_path) != file_fingerprint(copy_path)
+    assert file_fingerprint(nc_path, content_hash=True) == file_fingerprint(copy_path, content_hash=True)
+
+    fingerprint = file_fingerprint(copy_path)
+    os.utime(copy_path, ns=(0, 0))
+    assert file_fingerprint(copy_path) != fingerprint
+
+    os.remove(copy_path)
+    os.remove(nc_path)
+
+
+def test_result_cache_records():
+    """
+    Test for caching log records and results, keeping the types of the values of the records
+    """
+    _remove_cache()
+    records = {'data_boundaries_check': [
+        LogRecord('error', "'{}' at {} is out of bounds", (np.float32(0.1), (3,)), 'data_boundaries_check',
+                  'series', (3,))
+    ]}
+
+    with ResultCache(cache_path) as cache:
+        key = cache.key('fingerprint', 'variable:series', {'lower_bound': 0})
+        assert cache.get(key) is None
+        cache.put(key, records, {'emptiness_check': True})
+
+    with ResultCache(cache_path) as cache:
+        cached_records, results = cache.get(key)
+        assert cache.get(cache.key('fingerprint', 'variable:series', {'lower_bound': 1})) is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    record = cached_records['data_boundaries_check'][0]
+    assert record.render() == records['data_boundaries_check'][0].render()
+    assert (record.check, record.variable, record.index) == ('data_boundaries_check', 'series', (3,))
+    assert isinstance(record.args[0], np.float32)
+    assert results == {'emptiness_check': True}
+
+    _remove_cache()
+
+
+def test_result_cache_eviction():
+    """
+    Test for evicting the least recently used entries when the cache has too many entries or bytes
+    """
+    _remove_cache()
+
+    with ResultCache(cache_path, max_entries=2) as cache:
+        cache.put('a', {})
+        cache.put('b', {})
+        cache.get('a')
+        cache.put('c', {})
+
+        assert len(cache) == 2
+        assert cache.get('b') is None
+        assert cache.get('a') is not None and cache.get('c') is not None
+
+        cache.clear()
+        assert len(cache) == 0
+
+    with ResultCache(cache_path, max_bytes=250) as cache:
+        for key in 'abc':
+            cache.put(key, {'check': [LogRecord('info', 'message')]})
+
+        assert len(cache) == 2
+        assert cache.get('a') is None
+
+    _remove_cache()
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_cached_perform_all_checks():
+    """
+    Test for taking the results of all checks from the cache, giving the same report as performing the checks,
+    and only checking the variables of which the configuration changed again
+    """
+    _remove_cache()
+    uncached_qc_obj = _check(cache_dict, None)
+
+    with ResultCache(cache_path) as cache:
+        first_qc_obj = _check(cache_dict, cache)
+        second_qc_obj = _check(cache_dict, cache)
+        assert (cache.hits, cache.misses) == (3, 3)
+
+        changed_dict = dict(cache_dict, variables=dict(
+            cache_dict['variables'], spectrum={'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 5}}))
+        changed_qc_obj = _check(changed_dict, cache)
+        uncached_changed_qc_obj = _check(changed_dict, None)
+
+    for qc_obj in (first_qc_obj, second_qc_obj):
+        assert qc_obj.logger.errors == uncached_qc_obj.logger.errors
+        assert qc_obj.logger.warnings == uncached_qc_obj.logger.warnings
+        assert qc_obj.logger.info == uncached_qc_obj.logger.info
+    assert changed_qc_obj.logger.errors == uncached_changed_qc_obj.logger.errors
+    assert changed_qc_obj.logger.info == uncached_changed_qc_obj.logger.info
+
+    def read_vars(qc_obj):
+        return {row['variable'] for row in qc_obj.get_timings() if row['check'] == 'read'}
+
+    assert read_vars(first_qc_obj) == {'series', 'spectrum'}
+    assert not read_vars(second_qc_obj)
+    assert read_vars(changed_qc_obj) == {'spectrum'}
+
+    _remove_cache()
+    os.remove(data_dir / 'test_streaming.nc')
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_cached_memory_budget():
+    """
+    Test for checking the variables again when only the memory budget changed, as the variables are then
+    read in other slabs, after which the results for the new memory budget are taken from the cache
+    """
+    _remove_cache()
+    uncached_qc_obj = _check(cache_dict, None, memory_budget=200)
+
+    with ResultCache(cache_path) as cache:
+        _check(cache_dict, cache)
+        first_qc_obj = _check(cache_dict, cache, memory_budget=200)
+        assert (cache.hits, cache.misses) == (1, 5)
+        second_qc_obj = _check(cache_dict, cache, memory_budget=200)
+        assert (cache.hits, cache.misses) == (4, 5)
+
+    for qc_obj in (first_qc_obj, second_qc_obj):
+        assert qc_obj.logger.errors == uncached_qc_obj.logger.errors
+        assert qc_obj.logger.info == uncached_qc_obj.logger.info
+    assert {row['variable'] for row in first_qc_obj.get_timings() if row['check'] == 'read'} == {'series', 'spectrum'}
+
+    _remove_cache()
+    os.remove(data_dir / 'test_streaming.nc')
+
+
+@pytest.mark.usefixtures("create_nc_batch")
+def test_cached_run_batch():
+    """
+    Test for a batch run with a result cache, of which a second run gives the same reports from the cache
+    """
+    _remove_cache()
+    batch_dir = data_dir / 'batch'
+    batch_dict = {
+        'dimensions': {},
+        'variables': {'temperature': {'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10}}},
+        'global attributes': {},
+        'file size': {}
+    }
+
+    first_reports = dict(run_batch(batch_dict, batch_dir, workers=2, cache_path=cache_path))
+    second_reports = dict(run_batch(batch_dict, batch_dir, workers=2, cache_path=cache_path))
+
+    for path, report in first_reports.items():
+        assert second_reports[path]['errors'] == report['errors']
+        assert second_reports[path]['info'] == report['info']
+    with ResultCache(cache_path) as cache:
+        # the checks without data and the data checks of the variable, for each of the 3 files
+        assert len(cache) == 3 * 2
+
+    _remove_cache()
+    shutil.rmtree(batch_dir)
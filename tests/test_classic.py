@@ -0,0 +1,176 @@
+"""
+Module for testing the functionality of classic.py, reading NETCDF3 classic files from a memory map
+
+ Functions:
+- test_is_classic: Test for recognizing NETCDF3 classic files by their magic number
+- test_classic_dataset: Test for reading a classic file like netCDF4
+- test_classic_views: Test for reading the values of unpacked variables as views on the memory map
+- test_classic_streaming: Test for computing the number of records of a streamed file from its size
+- test_classic_checks: Test for performing all checks on a classic file like on the file read by netCDF4
+- test_classic_memory: Test for loading a classic file from memory
+"""
+
+import os
+from pathlib import Path
+
+import netCDF4
+import numpy as np
+import pytest
+
+from ncqc.QCnetCDF import QualityControl
+from ncqc.classic import ClassicDataset, is_classic
+
+data_dir = Path(__file__).parent.parent / 'sample_data'
+
+classic_dict = {
+    'dimensions': {'time': {'existence_check': True}},
+    'variables': {
+        'series': {
+            'emptiness_check': True,
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10},
+            'consecutive_identical_values_check': {'maximum': 5},
+            'data_points_amount_check': {'minimum': 40}
+        },
+        'counts': {
+            'emptiness_check': True,
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 100},
+            'adjacent_values_difference_check': {'over_which_dimension': [0, 1], 'maximum_difference': [50, 90]}
+        },
+        'packed': {
+            'emptiness_check': True,
+            'data_boundaries_check': {'lower_bound': 10, 'upper_bound': 15}
+        },
+        'flags': {'emptiness_check': True},
+        'profile': {'adjacent_values_difference_check': {'over_which_dimension': [1], 'maximum_difference': [0.5]}}
+    },
+    'global attributes': {'title': {'emptiness_check': True}},
+    'file size': {'lower_bound': 0, 'upper_bound': 10 ** 6}
+}
+
+
+def _check(nc_file, memory_map: bool, **kwargs) -> dict:
+    """
+    Function to perform all checks with a new QualityControl object
+    :param nc_file: the path or the content of the netCDF file
+    :param memory_map: True to read the classic file from a memory map
+    :param kwargs: the arguments of the QualityControl object
+    :return: the report, without the time of the report
+    """
+    qc_obj = QualityControl(**kwargs)
+    qc_obj.add_qc_checks_dict(classic_dict)
+    qc_obj.load_netcdf(nc_file, memory_map=memory_map)
+    assert isinstance(qc_obj.nc, ClassicDataset) == memory_map
+    qc_obj.perform_all_checks()
+    qc_obj.nc.close()
+    report = qc_obj.create_report()
+    return {key: report[key] for key in ('errors', 'warnings', 'info')}
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_is_classic(create_nc_classic):
+    """
+    Test for recognizing NETCDF3 classic files by their magic number
+    :param create_nc_classic: path to the classic file
+    """
+    assert is_classic(create_nc_classic)
+    assert not is_classic(data_dir / 'test_streaming.nc')
+    assert not is_classic(data_dir / 'missing.nc')
+
+    os.remove(create_nc_classic)
+    os.remove(data_dir / 'test_streaming.nc')
+
+
+def test_classic_dataset(create_nc_classic):
+    """
+    Test for reading the header, attributes and masked (and unpacked) values of a classic file like netCDF4
+    :param create_nc_classic: path to the classic file
+    """
+    with netCDF4.Dataset(create_nc_classic) as expected, ClassicDataset(create_nc_classic) as dataset:
+        assert dataset.file_format == expected.file_format
+        assert dataset.filepath() == str(create_nc_classic)
+        assert dataset.ncattrs() == expected.ncattrs()
+        assert dataset.getncattr('title') == expected.getncattr('title')
+        assert np.array_equal(dataset.getncattr('levels'), expected.getncattr('levels'))
+        assert {name: (len(dim), dim.isunlimited()) for name, dim in dataset.dimensions.items()} == \
+               {name: (len(dim), dim.isunlimited()) for name, dim in expected.dimensions.items()}
+
+        for var_name, expected_var in expected.variables.items():
+            variable = dataset[var_name]
+            assert variable.dimensions == expected_var.dimensions
+            assert variable.shape == expected_var.shape
+            assert variable.dtype == expected_var.dtype
+            assert variable.chunking() == expected_var.chunking()
+            assert variable.ncattrs() == expected_var.ncattrs()
+
+            for key in (slice(None), (slice(3, 45),) + (slice(1, None),) * (variable.ndim - 1)):
+                if not variable.ndim:
+                    key = ()
+                values, expected_values = variable[key], expected_var[key]
+                assert np.array_equal(np.ma.getmaskarray(values), np.ma.getmaskarray(expected_values))
+                assert np.array_equal(values.compressed(), expected_values.compressed())
+
+    os.remove(create_nc_classic)
+
+
+def test_classic_views(create_nc_classic):
+    """
+    Test for reading the values of unpacked variables as views on the memory map, and of packed variables
+    as new values
+    :param create_nc_classic: path to the classic file
+    """
+    with ClassicDataset(create_nc_classic) as dataset:
+        assert isinstance(dataset.buffer, np.memmap)
+        assert np.shares_memory(dataset['series'][10:20].data, dataset.buffer)
+        assert np.shares_memory(dataset['counts'][:, 1].data, dataset.buffer)
+        assert not np.shares_memory(dataset['packed'][:].data, dataset.buffer)
+        assert not dataset['series'][:].data.flags.writeable
+        assert dataset['series'][:].dtype == dataset['series'].file_dtype
+        assert dataset['series'].file_dtype.byteorder == '>'
+
+    os.remove(create_nc_classic)
+
+
+def test_classic_streaming(create_nc_classic):
+    """
+    Test for computing the number of records of a streamed file from the size of the file,
+    with the number of records in the header set to the streaming value of the format (64 bits in CDF-5)
+    :param create_nc_classic: path to the classic file
+    """
+    content = bytearray(create_nc_classic.read_bytes())
+    numrecs_size = 8 if content[3] == 5 else 4
+    content[4:4 + numrecs_size] = b'\xff' * numrecs_size
+
+    with netCDF4.Dataset(create_nc_classic) as expected, ClassicDataset(content) as dataset:
+        assert len(dataset.dimensions['time']) == len(expected.dimensions['time'])
+        assert np.array_equal(dataset['series'][:], expected['series'][:])
+
+    os.remove(create_nc_classic)
+
+
+def test_classic_checks(create_nc_classic):
+    """
+    Test for performing all checks on a classic file read from a memory map, in full and in slabs,
+    which gives the same report as the file read by netCDF4
+    :param create_nc_classic: path to the classic file
+    """
+    report = _check(create_nc_classic, memory_map=False)
+    assert report['errors']
+
+    assert _check(create_nc_classic, memory_map=True) == report
+    assert _check(create_nc_classic, memory_map=True, memory_budget=64) == report
+
+    os.remove(create_nc_classic)
+
+
+def test_classic_memory(create_nc_classic):
+    """
+    Test for loading a classic file from memory, which reads views on the buffer
+    :param create_nc_classic: path to the classic file
+    """
+    content = create_nc_classic.read_bytes()
+    report = _check(create_nc_classic, memory_map=False)
+
+    assert _check(content, memory_map=True) == report
+    assert _check(content, memory_map=False) == report
+
+    os.remove(create_nc_classic)
@@ -12,6 +12,11 @@ Module for testing the functionality of the consecutive_identical_values_check m
 - test_consecutive_identical_values_check_max_not_specified: Test for when maximum is not specified.
 - test_consecutive_identical_values_check_fewer_values_than_maximum: Tests for when array of values
   is smaller or equal to allowed maximum (check then allways succeeds).
+- test_consecutive_identical_values_check_multidim: Test for counting consecutive values along a chosen
+  dimension of a multidimensional variable
+- test_consecutive_identical_values_check_no_such_dimension: Test for when the chosen dimension does not exist
+- test_consecutive_identical_values_check_message_cap: Test for when there are more runs of consecutive values
+  than the maximum number of logged data points
 """
 
 import os
@@ -200,3 +205,91 @@ def test_consecutive_identical_values_check_fewer_values_than_maximum():
 
     if os.path.exists(nc_path):
         os.remove(nc_path)
+
+
+@pytest.mark.usefixtures("create_nc_adjacent_values_difference_check_multidim")
+def test_consecutive_identical_values_check_multidim():
+    """
+    Test for counting consecutive values along a chosen dimension of a multidimensional variable
+    """
+    qc_obj = QualityControl()
+
+    nc_path = data_dir / 'test_adjacent_values_difference_check.nc'
+    qc_obj.load_netcdf(nc_path)
+
+    qc_obj.add_qc_checks_dict(general_dict | {
+        'variables': {
+            'var_2d': {
+                'consecutive_identical_values_check': {'maximum': 5, 'over_which_dimension': 1}
+            }
+        }
+    })
+
+    qc_obj.consecutive_identical_values_check()
+
+    assert qc_obj.logger.info == ["consecutive_identical_values_check for variable 'var_2d': FAIL"]
+    assert qc_obj.logger.errors == [
+        "var_2d has 10 consecutive identical values 1.0, which is higher than the threshold of 5"] * 10
+    assert not qc_obj.logger.warnings
+
+    if os.path.exists(nc_path):
+        os.remove(nc_path)
+
+
+@pytest.mark.usefixtures("create_nc_adjacent_values_difference_check_multidim")
+def test_consecutive_identical_values_check_no_such_dimension():
+    """
+    Test for when the chosen dimension does not exist
+    """
+    qc_obj = QualityControl()
+
+    nc_path = data_dir / 'test_adjacent_values_difference_check.nc'
+    qc_obj.load_netcdf(nc_path)
+
+    qc_obj.add_qc_checks_dict(general_dict | {
+        'variables': {
+            'var_2d': {
+                'consecutive_identical_values_check': {'maximum': 5, 'over_which_dimension': 2}
+            }
+        }
+    })
+
+    qc_obj.consecutive_identical_values_check()
+
+    assert not qc_obj.logger.info
+    assert not qc_obj.logger.errors
+    assert qc_obj.logger.warnings == ["variable var_2d doesn't have dimension 2"]
+
+    if os.path.exists(nc_path):
+        os.remove(nc_path)
+
+
+@pytest.mark.usefixtures("create_nc_adjacent_values_difference_check_multidim")
+def test_consecutive_identical_values_check_message_cap():
+    """
+    Test for when there are more runs of consecutive values than the maximum number of logged data points
+    """
+    qc_obj = QualityControl(max_point_messages=1)
+
+    nc_path = data_dir / 'test_adjacent_values_difference_check.nc'
+    qc_obj.load_netcdf(nc_path)
+
+    qc_obj.add_qc_checks_dict(general_dict | {
+        'variables': {
+            'var_2d': {
+                'consecutive_identical_values_check': {'maximum': 5, 'over_which_dimension': 0}
+            }
+        }
+    })
+
+    qc_obj.consecutive_identical_values_check()
+
+    assert qc_obj.logger.info == ["consecutive_identical_values_check for variable 'var_2d': FAIL"]
+    assert qc_obj.logger.errors == [
+        "var_2d has 10 consecutive identical values 1.0, which is higher than the threshold of 5",
+        "var_2d has 10 runs of more than 5 consecutive identical values (first starting at indices: "
+        "[(0, 0), (0, 1), (0, 2), (0, 3), (0, 4), (0, 5), (0, 6), (0, 7), (0, 8), (0, 9)])"
+    ]
+
+    if os.path.exists(nc_path):
+        os.remove(nc_path)
@@ -16,6 +16,9 @@ Module for testing the functionality of the boundaries check
   with expected success
 - test_data_boundaries_check_multidim_var_fail: Test for the boundaries check when a variable is multidimensional
   with expected failure
+- test_data_boundaries_check_message_cap: Test for the boundaries check when there are more values out of
+  bounds than the maximum number of logged data points
+- test_data_boundaries_check_records: Test for the structured records logged by the boundaries check
 """
 
 import os
@@ -357,3 +360,79 @@ def test_data_boundaries_check_multidim_var_fail():
 
     if os.path.exists(nc_path):
         os.remove(nc_path)
+
+
+@pytest.mark.usefixtures("create_nc_data_boundaries_check_multidim_var")
+def test_data_boundaries_check_message_cap():
+    """
+    Test for the boundaries check when there are more values out of bounds
+    than the maximum number of logged data points
+    """
+    qc_obj = QualityControl(max_point_messages=2)
+
+    nc_path = data_dir / 'test_boundary_multidim.nc'
+    qc_obj.load_netcdf(nc_path)
+
+    qc_obj.add_qc_checks_dict({
+        'dimensions': {},
+        'variables': {
+            'var_2d': {
+                'data_boundaries_check': {
+                    'lower_bound': 2,
+                    'upper_bound': 3
+                }
+            }
+        },
+        'global attributes': {},
+        'file size': {}
+    })
+
+    qc_obj.data_boundaries_check()
+
+    assert qc_obj.logger.info == ["boundary check for variable 'var_2d': FAIL"]
+    assert not qc_obj.logger.warnings
+    assert len(qc_obj.logger.errors) == 3
+    assert qc_obj.logger.errors[2].startswith("boundary check error: 200 values out of bounds for variable "
+                                              "'var_2d' with bounds [2,3] (lowest: ")
+    assert qc_obj.logger.errors[2].endswith("highest: 1.0099999904632568, first indices: [(0, 0), (0, 1), (0, 2), "
+                                            "(0, 3), (0, 4), (0, 5), (0, 6), (0, 7), (0, 8), (0, 9)])")
+
+    if os.path.exists(nc_path):
+        os.remove(nc_path)
+
+
+@pytest.mark.usefixtures("create_nc_data_boundaries_check_multidim_var")
+def test_data_boundaries_check_records():
+    """
+    Test for the structured records logged by the boundaries check
+    """
+    qc_obj = QualityControl(max_point_messages=2)
+
+    nc_path = data_dir / 'test_boundary_multidim.nc'
+    qc_obj.load_netcdf(nc_path)
+
+    qc_obj.add_qc_checks_dict({
+        'dimensions': {},
+        'variables': {
+            'var_2d': {
+                'data_boundaries_check': {
+                    'lower_bound': 2,
+                    'upper_bound': 3
+                }
+            }
+        },
+        'global attributes': {},
+        'file size': {}
+    })
+
+    qc_obj.data_boundaries_check()
+
+    records = qc_obj.logger.get_records(severity='error', check='data_boundaries_check', variable='var_2d')
+    assert len(records) == 3
+    assert [record.index for record in records] == [(0, 0), (0, 1), None]
+    assert records[0].args[1:] == ('var_2d', 2, 3)
+    assert records[0].render() == qc_obj.logger.errors[0]
+    assert not qc_obj.logger.get_records(variable='other_var')
+
+    if os.path.exists(nc_path):
+        os.remove(nc_path)
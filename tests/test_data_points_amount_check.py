@@ -4,6 +4,7 @@ Test module for the data_points_amount_check from QCnetCDF.py
 import os
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -28,6 +29,12 @@ class TestDataPointsAmountCheck(unittest.TestCase):
       QCnetCDF.py with an expected warning for the variable specified not existing
     - test_data_points_amount_check_no_nc: Testing the data_points_amount_check method from QCnetCDF.py
       with an expected error for a netCDF file not being loaded
+    - test_data_points_amount_check_no_read: Testing that the data_points_amount_check method from
+      QCnetCDF.py does not read any data when counting all data points
+    - test_data_points_amount_check_valid: Testing the data_points_amount_check method from QCnetCDF.py
+      when counting only the valid data points, with and without a memory budget
+    - test_data_points_amount_check_unknown_count: Testing the data_points_amount_check method from
+      QCnetCDF.py with an expected warning for an unknown count
     """
 
     @pytest.mark.usefixtures("create_nc_data_points_amount_check")
@@ -166,3 +173,80 @@ class TestDataPointsAmountCheck(unittest.TestCase):
         assert not qc_obj.logger.info
         assert not qc_obj.logger.warnings
         assert qc_obj.logger.errors == ['data_points_amount_check error: no nc file loaded']
+
+    @pytest.mark.usefixtures("create_nc_data_points_amount_check")
+    def test_data_points_amount_check_no_read(self):
+        """
+        Testing that the data_points_amount_check method from QCnetCDF.py does not read any data
+        when counting all data points
+        """
+        qc_obj = QualityControl()
+        qc_obj.load_netcdf(nc_path)
+        qc_obj.add_qc_checks_dict({
+            'dimensions': {},
+            'variables': {
+                'var_2d': {
+                    'data_points_amount_check': {'minimum': 200, 'count': 'all'}
+                }
+            },
+            'global attributes': {},
+            'file size': {}
+        })
+
+        with patch.object(QualityControl, '_read_var') as mock_read_var:
+            qc_obj.data_points_amount_check().perform_all_checks()
+
+        mock_read_var.assert_not_called()
+        assert qc_obj.logger.info[0] == "data points amount check for variable 'var_2d': SUCCESS"
+        if os.path.exists(nc_path):
+            os.remove(nc_path)
+
+    @pytest.mark.usefixtures("create_nc_data_points_amount_check")
+    def test_data_points_amount_check_valid(self):
+        """
+        Testing the data_points_amount_check method from QCnetCDF.py when counting only the valid
+        data points, with and without a memory budget
+        """
+        for memory_budget in (None, 256):
+            qc_obj = QualityControl(memory_budget=memory_budget)
+            qc_obj.load_netcdf(nc_path)
+            qc_obj.add_qc_checks_dict({
+                'dimensions': {},
+                'variables': {
+                    'var_2d': {
+                        'data_points_amount_check': {'minimum': 200, 'count': 'valid'}
+                    }
+                },
+                'global attributes': {},
+                'file size': {}
+            })
+            qc_obj.data_points_amount_check()
+            assert qc_obj.logger.info == ["data points amount check for variable 'var_2d': FAIL"]
+            assert qc_obj.logger.errors == ["data points amount check error: number of valid data points (195)"
+                                            " for variable 'var_2d' is below the specified minimum (200)"]
+        if os.path.exists(nc_path):
+            os.remove(nc_path)
+
+    @pytest.mark.usefixtures("create_nc_data_points_amount_check")
+    def test_data_points_amount_check_unknown_count(self):
+        """
+        Testing the data_points_amount_check method from QCnetCDF.py with an expected warning for an unknown count
+        """
+        qc_obj = QualityControl()
+        qc_obj.load_netcdf(nc_path)
+        qc_obj.add_qc_checks_dict({
+            'dimensions': {},
+            'variables': {
+                'var_1d': {
+                    'data_points_amount_check': {'minimum': 10, 'count': 'nonzero'}
+                }
+            },
+            'global attributes': {},
+            'file size': {}
+        })
+        qc_obj.data_points_amount_check()
+        assert qc_obj.logger.warnings == ["data_points_amount_check: unknown count 'nonzero' for variable 'var_1d', "
+                                          "counting all data points"]
+        assert qc_obj.logger.info == ["data points amount check for variable 'var_1d': SUCCESS"]
+        if os.path.exists(nc_path):
+            os.remove(nc_path)
@@ -5,6 +5,7 @@ Module for testing the functionality of the emptiness check.
 - test_emptiness_check_no_nc: Test for the emptiness check when no netCDF file is loaded.
 - test_emptiness_check_full: Test for the emptiness check when everything is fully populated.
 - test_emptiness_check_mixed: Test for the emptiness check with mixed emptiness.
+- test_emptiness_check_multidim: Test for the emptiness check on a multidimensional variable.
 - test_emptiness_check_empty: Test for the emptiness check when nothing is populated.
 - test_emptiness_check_all_false: Test for the emptiness check with nothing to be checked.
 """
@@ -119,6 +120,38 @@ def test_emptiness_check_mixed():
         os.remove(nc_path)
 
 
+@pytest.mark.usefixtures("create_nc_emptiness_check_mixed")
+def test_emptiness_check_multidim():
+    """
+    Test for the emptiness check on a multidimensional variable, with completely empty time steps
+    and a completely empty diameter class.
+    """
+    qc_obj = QualityControl()
+
+    nc_path = data_dir / 'test_emptiness_mixed.nc'
+    qc_obj.load_netcdf(nc_path)
+
+    qc_obj.qc_checks_vars = {'spectrum': {'emptiness_check': True}}
+    qc_obj.qc_checks_gl_attrs = {}
+
+    qc_obj.emptiness_check()
+
+    expected_errors = ['variable "spectrum" has 193/3200 empty data points',
+                       'variable "spectrum" has 31/3200 NaN data points',
+                       'variable "spectrum" has 4/100 completely empty indices along dimension "time" '
+                       '(first indices: [10, 11, 12, 20])',
+                       'variable "spectrum" has 1/32 completely empty indices along dimension "diameter_classes" '
+                       '(first indices: [5])']
+
+    assert qc_obj.logger.errors == expected_errors
+    assert not qc_obj.logger.warnings
+    assert qc_obj.logger.info == ['0/1 checked variables are fully populated',
+                                  'no global attributes were checked for emptiness']
+
+    if os.path.exists(nc_path):
+        os.remove(nc_path)
+
+
 @pytest.mark.usefixtures("create_nc_emptiness_check_empty")
 def test_emptiness_check_all_empty():
     """
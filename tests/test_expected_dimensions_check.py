@@ -0,0 +1,143 @@
+"""
+Module for testing the functionality of the expected_dimensions_check method
+
+ Functions:
+- test_expected_dimensions_check_no_nc: Test for expected_dimensions_check when no netCDF file is loaded.
+- test_expected_dimensions_check_success: Test for when expected_dimensions_check succeeds.
+- test_expected_dimensions_check_fail: Test for when expected_dimensions_check fails.
+- test_expected_dimensions_check_var_not_in_file: Test expected_dimensions_check when variable is not in file.
+- test_expected_dimensions_check_not_specified: Test expected_dimensions_check when the expected
+  dimensions are not specified.
+"""
+
+import os
+from pathlib import Path
+import pytest
+
+from ncqc.QCnetCDF import QualityControl
+
+data_dir = Path(__file__).parent.parent / 'sample_data'
+nc_path = data_dir / 'test_data_points_amount.nc'
+
+general_dict = {
+    'dimensions': {
+    },
+    'global attributes': {
+    },
+    'file size': {
+    }
+}
+
+
+def test_expected_dimensions_check_no_nc():
+    """
+    Test for expected_dimensions_check when no netCDF file is loaded.
+    """
+    qc_obj = QualityControl()
+    qc_obj.expected_dimensions_check()
+
+    assert not qc_obj.logger.info
+    assert qc_obj.logger.errors == ['expected_dimensions_check error: no nc file loaded']
+    assert not qc_obj.logger.warnings
+
+
+@pytest.mark.usefixtures("create_nc_data_points_amount_check")
+def test_expected_dimensions_check_success():
+    """
+    Test for when expected_dimensions_check succeeds.
+    """
+    qc_obj = QualityControl()
+    qc_obj.load_netcdf(nc_path)
+    qc_obj.add_qc_checks_dict(general_dict | {
+        'variables': {
+            'var_1d': {'expected_dimensions_check': {'expected_dimensions': ['dimension_1']}},
+            'var_2d': {'expected_dimensions_check': {'expected_dimensions': ['dimension_1', 'dimension_2']}}
+        }
+    })
+
+    qc_obj.expected_dimensions_check()
+
+    assert qc_obj.logger.info == ["expected dimensions check for variable 'var_1d': SUCCESS",
+                                  "expected dimensions check for variable 'var_2d': SUCCESS"]
+    assert not qc_obj.logger.errors
+    assert not qc_obj.logger.warnings
+
+    if os.path.exists(nc_path):
+        os.remove(nc_path)
+
+
+@pytest.mark.usefixtures("create_nc_data_points_amount_check")
+def test_expected_dimensions_check_fail():
+    """
+    Test for when expected_dimensions_check fails, because of a missing dimension or the wrong order.
+    """
+    qc_obj = QualityControl()
+    qc_obj.load_netcdf(nc_path)
+    qc_obj.add_qc_checks_dict(general_dict | {
+        'variables': {
+            'var_1d': {'expected_dimensions_check': {'expected_dimensions': ['dimension_1', 'dimension_2']}},
+            'var_2d': {'expected_dimensions_check': {'expected_dimensions': ['dimension_2', 'dimension_1']}}
+        }
+    })
+
+    qc_obj.expected_dimensions_check()
+
+    assert qc_obj.logger.errors == [
+        "expected dimensions check error: variable 'var_1d' has dimensions ['dimension_1'] instead of the "
+        "expected dimensions ['dimension_1', 'dimension_2']",
+        "expected dimensions check error: variable 'var_2d' has dimensions ['dimension_1', 'dimension_2'] "
+        "instead of the expected dimensions ['dimension_2', 'dimension_1']"
+    ]
+    assert qc_obj.logger.info == ["expected dimensions check for variable 'var_1d': FAIL",
+                                  "expected dimensions check for variable 'var_2d': FAIL"]
+    assert not qc_obj.logger.warnings
+
+    if os.path.exists(nc_path):
+        os.remove(nc_path)
+
+
+@pytest.mark.usefixtures("create_nc_data_points_amount_check")
+def test_expected_dimensions_check_var_not_in_file():
+    """
+    Test expected_dimensions_check when variable is not in file.
+    """
+    qc_obj = QualityControl()
+    qc_obj.load_netcdf(nc_path)
+    qc_obj.add_qc_checks_dict(general_dict | {
+        'variables': {
+            'var_3d': {'expected_dimensions_check': {'expected_dimensions': ['dimension_1']}}
+        }
+    })
+
+    qc_obj.expected_dimensions_check()
+
+    assert not qc_obj.logger.info
+    assert not qc_obj.logger.errors
+    assert qc_obj.logger.warnings == ["variable 'var_3d' not in nc file"]
+
+    if os.path.exists(nc_path):
+        os.remove(nc_path)
+
+
+@pytest.mark.usefixtures("create_nc_data_points_amount_check")
+def test_expected_dimensions_check_not_specified():
+    """
+    Test expected_dimensions_check when the expected dimensions are not specified.
+    """
+    qc_obj = QualityControl()
+    qc_obj.load_netcdf(nc_path)
+    qc_obj.add_qc_checks_dict(general_dict | {
+        'variables': {
+            'var_1d': {'expected_dimensions_check': {}}
+        }
+    })
+
+    qc_obj.expected_dimensions_check()
+
+    assert not qc_obj.logger.info
+    assert not qc_obj.logger.errors
+    assert qc_obj.logger.warnings == ["expected_dimensions_check: expected dimensions not specified "
+                                      "for variable 'var_1d'"]
+
+    if os.path.exists(nc_path):
+        os.remove(nc_path)
@@ -0,0 +1,148 @@
+"""
+Module for testing the execution modes of a QualityControl object which stop the checks early (fail_fast)
+
+ Functions:
+- test_fail_fast_unknown_mode: Test for setting up a QualityControl object with an unknown mode
+- test_fail_fast_check: Test for stopping every check at its first violation, marking its results as partial
+- test_fail_fast_variable: Test for stopping every variable at its first failing check
+- test_fail_fast_file: Test for stopping all checks at the first error in the file
+- test_fail_fast_header_error: Test for skipping the data checks after an error of the checks without data
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from ncqc.QCnetCDF import QualityControl
+
+data_dir = Path(__file__).parent.parent / 'sample_data'
+
+fail_fast_dict = {
+    'dimensions': {'time': {'existence_check': True}},
+    'variables': {
+        'series': {
+            'emptiness_check': True,
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10}
+        },
+        'spectrum': {
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10}
+        }
+    },
+    'global attributes': {},
+    'file size': {}
+}
+
+
+def _check(fail_fast: str, config: dict = None) -> QualityControl:
+    """
+    Function to perform all checks on the streaming test file with a new, profiled QualityControl object
+    :param fail_fast: the execution mode
+    :param config: the configuration of the checks. Defaults to None, which uses fail_fast_dict.
+    :return: the QualityControl object
+    """
+    qc_obj = QualityControl(fail_fast=fail_fast)
+    qc_obj.add_qc_checks_dict(config or fail_fast_dict)
+    qc_obj.load_netcdf(data_dir / 'test_streaming.nc')
+    qc_obj.enable_profiling()
+    qc_obj.perform_all_checks()
+    qc_obj.nc.close()
+    return qc_obj
+
+
+def _points_read(qc_obj: QualityControl) -> dict:
+    """
+    Function to get the number of data points read from each variable
+    :param qc_obj: the profiled QualityControl object
+    :return: dictionary with the number of data points read for every variable which was read
+    """
+    return {row['variable']: row['data_points'] for row in qc_obj.get_timings() if row['check'] == 'read'}
+
+
+def test_fail_fast_unknown_mode():
+    """
+    Test for setting up a QualityControl object with an unknown execution mode
+    """
+    with pytest.raises(ValueError):
+        QualityControl(fail_fast='everything')
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_fail_fast_check():
+    """
+    Test for stopping every check at its first violation. The series is read in chunks of 16 records,
+    the emptiness check fails in the chunk with the fill values at 60 and the boundary check
+    in the chunk with the value out of bounds at 120. The spectrum is read in chunks of 4 records,
+    up to the value out of bounds at record 70. The results of the stopped checks are marked as partial.
+    """
+    qc_obj = _check('check')
+
+    assert _points_read(qc_obj) == {'series': 128, 'spectrum': 72 * 8}
+    assert "boundary check for variable 'series': FAIL" in qc_obj.logger.info
+    assert 'variable "series" has 4/64 empty data points' in qc_obj.logger.errors
+    assert "boundary check for variable 'spectrum': FAIL" in qc_obj.logger.info
+
+    assert [message for message in qc_obj.logger.info if 'PARTIAL' in message] == [
+        "emptiness_check for variable 'series': PARTIAL (fail_fast='check'), the results only cover "
+        "64 of 200 data points",
+        "data_boundaries_check for variable 'series': PARTIAL (fail_fast='check'), the results only cover "
+        "128 of 200 data points",
+        "data_boundaries_check for variable 'spectrum': PARTIAL (fail_fast='check'), the results only cover "
+        "576 of 1600 data points"
+    ]
+    record = qc_obj.logger.get_records('info', check='data_boundaries_check', variable='spectrum')[-1]
+    assert record.as_dict()['values'] == ['data_boundaries_check', 'spectrum', 'check', 576, 1600]
+
+    # a check which does not fail reads the whole variable and is not partial
+    config = dict(fail_fast_dict, variables={'series': {'data_boundaries_check': {'lower_bound': -1000,
+                                                                                   'upper_bound': 1000}}})
+    assert not any('PARTIAL' in message for message in _check('check', config).logger.info)
+
+    os.remove(data_dir / 'test_streaming.nc')
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_fail_fast_variable():
+    """
+    Test for stopping every variable at its first failing check, after which the other checks of the variable
+    are not completed
+    """
+    qc_obj = _check('variable')
+
+    assert _points_read(qc_obj) == {'series': 64, 'spectrum': 72 * 8}
+    assert 'variable "series" has 4/64 empty data points' in qc_obj.logger.errors
+    assert "data_boundaries_check for variable 'series': NOT COMPLETED (fail_fast='variable')" in qc_obj.logger.info
+    assert "boundary check for variable 'series': FAIL" not in qc_obj.logger.info
+
+    os.remove(data_dir / 'test_streaming.nc')
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_fail_fast_file():
+    """
+    Test for stopping all checks at the first error in the file, skipping the variables after the first
+    variable with an error
+    """
+    qc_obj = _check('file')
+
+    assert _points_read(qc_obj) == {'series': 64}
+    assert 'variable "series" has 4/64 empty data points' in qc_obj.logger.errors
+    assert "fail fast: data checks of 1 variables skipped after the first error" in qc_obj.logger.info
+    assert not any("'spectrum'" in message for message in qc_obj.logger.info)
+
+    os.remove(data_dir / 'test_streaming.nc')
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_fail_fast_header_error():
+    """
+    Test for skipping the data checks after an error of the checks which do not read data
+    """
+    config = dict(fail_fast_dict, dimensions={'height': {'existence_check': True}})
+    qc_obj = _check('file', config)
+
+    assert not _points_read(qc_obj)
+    assert qc_obj.logger.errors
+    assert qc_obj.logger.info[-1] == "fail fast: data checks of all variables skipped after the first error"
+
+    os.remove(data_dir / 'test_streaming.nc')
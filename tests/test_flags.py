@@ -0,0 +1,179 @@
+"""
+Module for testing the functionality of flags.py and the write_flags method
+
+ Functions:
+- test_flag_attributes: Test for the CF attributes of a flag variable
+- test_identical_runs_flagger: Test for flagging runs of identical values over multiple slabs
+- test_adjacent_differences_flagger: Test for flagging differences between adjacent values over multiple slabs
+- test_variable_flagger: Test for combining the flags of multiple checks into a bitmask
+- test_write_flags: Test for writing the flags of a netCDF file to a companion netCDF file
+- test_write_flags_no_nc: Test for writing flags when no netCDF file is loaded
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+from netCDF4 import Dataset
+
+from ncqc.QCnetCDF import QualityControl
+from ncqc.flags import (flag_attributes, EmptinessFlagger, BoundariesFlagger, IdenticalRunsFlagger,
+                        AdjacentDifferencesFlagger, VariableFlagger)
+
+data_dir = Path(__file__).parent.parent / 'sample_data'
+
+flags_dict = {
+    'dimensions': {},
+    'variables': {
+        'series': {
+            'emptiness_check': True,
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10},
+            'data_points_amount_check': {'minimum': 100},
+            'consecutive_identical_values_check': {'maximum': 20}
+        },
+        'spectrum': {
+            'emptiness_check': False,
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10},
+            'adjacent_values_difference_check': {'over_which_dimension': [0, 1], 'maximum_difference': [20, 20]}
+        },
+        'station': {
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10}
+        },
+        'not_in_file': {
+            'emptiness_check': True
+        }
+    },
+    'global attributes': {},
+    'file size': {}
+}
+
+
+def test_flag_attributes():
+    """
+    Test for the CF attributes of a flag variable, ordered by the bits of the checks
+    """
+    attributes = flag_attributes(['adjacent_values_difference_check', 'emptiness_check'])
+
+    assert attributes['flag_masks'].tolist() == [1, 8]
+    assert attributes['flag_masks'].dtype == np.uint8
+    assert attributes['flag_meanings'] == 'empty adjacent_values_difference_too_large'
+
+
+def test_identical_runs_flagger():
+    """
+    Test for flagging runs of identical values over multiple slabs, flagging the values from the
+    (maximum + 1)th value of a run onwards and including runs interrupted by masked values
+    """
+    values = np.ma.masked_array([1, 1, 1, 2, 2, 2, 2, 2, 3, 3, 3, 3, 3, 4],
+                                mask=[False] * 11 + [True] + [False] * 2)
+
+    flagger = IdenticalRunsFlagger(maximum=2, shape=values.shape)
+    flags = np.concatenate([flagger.flags(values[start:start + 4], (start,)) for start in range(0, 14, 4)])
+
+    assert flags.tolist() == [False, False, True, False, False, True, True, True,
+                              False, False, True, False, False, False]
+
+    values = np.zeros((6, 3))
+    values[:, 0] = np.arange(6)
+
+    flagger = IdenticalRunsFlagger(maximum=3, shape=values.shape, axis=0)
+    flags = np.concatenate([flagger.flags(values[start:start + 2], (start, 0)) for start in range(0, 6, 2)])
+
+    assert np.flatnonzero(flags[:, 1]).tolist() == [3, 4, 5]
+    assert not flags[:, 0].any()
+
+
+def test_adjacent_differences_flagger():
+    """
+    Test for flagging differences between adjacent values over multiple slabs, flagging the value which differs
+    too much from the previous value and never flagging differences with masked values
+    """
+    values = np.ma.masked_array([[0, 0], [1, 10], [20, 11], [21, 12], [22, 30], [0, 31]],
+                                mask=[[False, False]] * 3 + [[True, False]] + [[False, False]] * 2)
+
+    flagger = AdjacentDifferencesFlagger(5, values.shape, 0)
+    flags = np.concatenate([flagger.flags(values[start:start + 2], (start, 0)) for start in range(0, 6, 2)])
+    assert [tuple(index) for index in np.argwhere(flags)] == [(1, 1), (2, 0), (4, 1), (5, 0)]
+
+    flagger = AdjacentDifferencesFlagger(5, values.shape, 1)
+    flags = np.concatenate([flagger.flags(values[start:start + 2], (start, 0)) for start in range(0, 6, 2)])
+    assert [tuple(index) for index in np.argwhere(flags)] == [(1, 1), (2, 1), (4, 1), (5, 1)]
+
+
+def test_variable_flagger():
+    """
+    Test for combining the flags of multiple checks into a bitmask
+    """
+    values = np.ma.masked_array([5, 20, 20, 20, -3, 5], mask=[False] * 5 + [True])
+
+    flagger = VariableFlagger([('consecutive_identical_values_check', IdenticalRunsFlagger(2, values.shape)),
+                               ('emptiness_check', EmptinessFlagger()),
+                               ('data_boundaries_check', BoundariesFlagger(0, 10))])
+
+    assert flagger.checks() == ['emptiness_check', 'data_boundaries_check', 'consecutive_identical_values_check']
+    assert flagger.flags(values, (0,)).tolist() == [0, 2, 2, 6, 2, 1]
+    assert flagger.flags(np.ma.masked_array(42), ()) == 2
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_write_flags():
+    """
+    Test for writing the flags of a netCDF file to a companion netCDF file, reading the variables in full
+    and in slabs
+    """
+    nc_path = data_dir / 'test_streaming.nc'
+    flags_path = data_dir / 'test_streaming_qc.nc'
+    slab_flags_path = data_dir / 'test_streaming_slabs_qc.nc'
+
+    qc_obj = QualityControl()
+    qc_obj.add_qc_checks_dict(flags_dict)
+    qc_obj.load_netcdf(nc_path)
+    qc_obj.write_flags()
+    qc_obj.nc.close()
+
+    assert qc_obj.logger.info == [f"flags of 3 variables written to '{flags_path}'"]
+
+    slab_qc_obj = QualityControl(memory_budget=256)
+    slab_qc_obj.add_qc_checks_dict(flags_dict)
+    slab_qc_obj.load_netcdf(nc_path)
+    slab_qc_obj.write_flags(slab_flags_path)
+    slab_qc_obj.nc.close()
+
+    with Dataset(flags_path) as flags_nc, Dataset(slab_flags_path) as slab_flags_nc:
+        assert sorted(flags_nc.variables) == ['series_qc', 'spectrum_qc', 'station_qc']
+        for var_name in flags_nc.variables:
+            assert np.array_equal(flags_nc[var_name][:], slab_flags_nc[var_name][:])
+
+        series_qc = flags_nc['series_qc']
+        assert series_qc.dimensions == ('time',)
+        assert series_qc.dtype == np.uint8
+        assert series_qc.flag_masks.tolist() == [1, 2, 4]
+        assert series_qc.flag_meanings == 'empty out_of_bounds too_many_consecutive_identical_values'
+
+        series_flags = series_qc[:]
+        assert np.flatnonzero(series_flags & 1).tolist() == [60, 61, 62, 63, 64, 90]
+        assert np.flatnonzero(series_flags & 2).tolist() == [120]
+        assert np.flatnonzero(series_flags & 4).tolist() == list(range(30, 40)) + list(range(170, 200))
+
+        spectrum_qc = flags_nc['spectrum_qc']
+        assert spectrum_qc.flag_meanings == 'out_of_bounds adjacent_values_difference_too_large'
+        assert [tuple(index) for index in np.argwhere(spectrum_qc[:] & 2)] == [(70, 3)]
+        assert not (spectrum_qc[:] & 8).any()
+
+        assert flags_nc['station_qc'][:] == 2
+
+    for path in [nc_path, flags_path, slab_flags_path]:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def test_write_flags_no_nc():
+    """
+    Test for writing flags when no netCDF file is loaded
+    """
+    qc_obj = QualityControl()
+    qc_obj.add_qc_checks_dict(flags_dict)
+    qc_obj.write_flags()
+
+    assert qc_obj.logger.errors == ["write_flags error: no nc file loaded"]
@@ -0,0 +1,133 @@
+"""
+Module for testing the quality control of netCDF files loaded from memory
+
+ Functions:
+- test_load_netcdf_memory: Test for checking a netCDF file loaded from bytes like a file loaded from its path
+- test_file_size_check_memory: Test for the file size check of a netCDF file loaded from memory
+- test_memory_without_path: Test for the methods writing next to the loaded file, which need a path in memory
+- test_cache_memory: Test for caching the results of a netCDF file loaded from memory by its content
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from ncqc.QCnetCDF import QualityControl
+from ncqc.cache import ResultCache, file_fingerprint
+
+data_dir = Path(__file__).parent.parent / 'sample_data'
+
+memory_dict = {
+    'dimensions': {'time': {'existence_check': True}},
+    'variables': {
+        'series': {
+            'emptiness_check': True,
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10},
+            'adjacent_values_difference_check': {'over_which_dimension': [0], 'maximum_difference': [5]}
+        },
+        'spectrum': {
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10}
+        }
+    },
+    'global attributes': {},
+    'file size': {'lower_bound': 0, 'upper_bound': 10 ** 9}
+}
+
+
+def _check(nc_file, **kwargs) -> dict:
+    """
+    Function to perform all checks with a new QualityControl object
+    :param nc_file: the path or the content of the netCDF file
+    :param kwargs: the arguments of the QualityControl object
+    :return: the report, without the time of the report
+    """
+    qc_obj = QualityControl(**kwargs)
+    qc_obj.add_qc_checks_dict(memory_dict)
+    qc_obj.load_netcdf(nc_file)
+    qc_obj.perform_all_checks()
+    qc_obj.nc.close()
+    report = qc_obj.create_report()
+    return {key: report[key] for key in ('errors', 'warnings', 'info')}
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_load_netcdf_memory():
+    """
+    Test for checking a netCDF file loaded from bytes, a bytearray or a memoryview, which gives the same report
+    as the file loaded from its path
+    """
+    nc_path = data_dir / 'test_streaming.nc'
+    content = nc_path.read_bytes()
+
+    report = _check(nc_path)
+    assert 'file size check: SUCCESS' in report['info']
+    assert _check(content) == report
+    assert _check(bytearray(content)) == report
+    assert _check(memoryview(content)) == report
+
+    os.remove(nc_path)
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_file_size_check_memory():
+    """
+    Test for the file size check of a netCDF file loaded from memory, which uses the length of the buffer
+    """
+    content = (data_dir / 'test_streaming.nc').read_bytes()
+
+    qc_obj = QualityControl()
+    qc_obj.add_qc_checks_dict(dict(memory_dict, **{'file size': {'lower_bound': 0, 'upper_bound': 100}}))
+    qc_obj.load_netcdf(content, name='streaming.nc')
+    qc_obj.file_size_check()
+    qc_obj.nc.close()
+
+    assert qc_obj.nc_buffer is content
+    assert qc_obj.logger.errors == [f'file size check error: size of loaded file ({len(content)} bytes)'
+                                    f'is out of bounds for bounds: [0,100]']
+
+    os.remove(data_dir / 'test_streaming.nc')
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_memory_without_path(tmp_path):
+    """
+    Test for writing flags and incremental checks of a netCDF file loaded from memory, which need the path
+    of the companion file and the checkpoint as there is no loaded file to write them next to
+    :param tmp_path: temporary directory
+    """
+    qc_obj = QualityControl()
+    qc_obj.add_qc_checks_dict(memory_dict)
+    qc_obj.load_netcdf((data_dir / 'test_streaming.nc').read_bytes())
+
+    qc_obj.write_flags().perform_incremental_checks()
+    assert qc_obj.logger.errors == [
+        "write_flags error: no flags path given for a netCDF file loaded from memory",
+        "perform_incremental_checks error: no checkpoint path given for a netCDF file loaded from memory"
+    ]
+
+    qc_obj.write_flags(tmp_path / 'flags.nc').perform_incremental_checks(tmp_path / 'checkpoint.json')
+    qc_obj.nc.close()
+    assert (tmp_path / 'flags.nc').exists()
+    assert (tmp_path / 'checkpoint.json').exists()
+
+    os.remove(data_dir / 'test_streaming.nc')
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_cache_memory(tmp_path):
+    """
+    Test for caching the results of a netCDF file loaded from memory, which is recognized by its content
+    like a file hashed with content_hash
+    :param tmp_path: temporary directory
+    """
+    nc_path = data_dir / 'test_streaming.nc'
+    content = nc_path.read_bytes()
+    assert file_fingerprint(content) == file_fingerprint(nc_path, content_hash=True)
+
+    with ResultCache(tmp_path / 'cache.sqlite') as cache:
+        report = _check(content, cache=cache)
+        assert _check(bytearray(content), cache=cache) == report
+        assert cache.hits == cache.misses == 3
+
+    os.remove(nc_path)
@@ -0,0 +1,266 @@
+"""
+Module for testing the incremental quality control of netCDF files to which records are appended,
+see checkpoint.py and the perform_incremental_checks method of QualityControl
+
+ Functions:
+- test_checkpoint_encoding: Test for saving and loading the state of accumulators in a checkpoint
+- test_incremental_checks: Test for checking appended records, which gives the same results as checking all records
+- test_incremental_checks_config_changed: Test for checking all records again after the configuration changed
+- test_incremental_checks_capped_runs: Test for checking appended records with more runs of identical values than
+  the maximum number of messages, which gives the same first runs as checking all records
+- test_incremental_checks_no_nc: Test for performing incremental checks without a loaded netCDF file
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+from netCDF4 import Dataset
+
+from ncqc.QCnetCDF import QualityControl
+from ncqc.checkpoint import Checkpoint, checkpoint_key
+from ncqc.streaming import IdenticalRunsAccumulator, AdjacentDifferencesAccumulator
+
+data_dir = Path(__file__).parent.parent / 'sample_data'
+nc_path = data_dir / 'test_incremental.nc'
+checkpoint_path = data_dir / 'test_incremental.nc.qc_checkpoint.json'
+
+incremental_dict = {
+    'dimensions': {'time': {'existence_check': True}},
+    'variables': {
+        'series': {
+            'existence_check': True,
+            'emptiness_check': True,
+            'data_points_amount_check': {'minimum': 100},
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10},
+            'consecutive_identical_values_check': {'maximum': 5},
+            'adjacent_values_difference_check': {'over_which_dimension': [0], 'maximum_difference': [9]}
+        },
+        'spectrum': {
+            'emptiness_check': True,
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10},
+            'consecutive_identical_values_check': {'maximum': 3},
+            'adjacent_values_difference_check': {'over_which_dimension': [0, 1], 'maximum_difference': [9, 9]}
+        },
+        'station': {
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10}
+        }
+    },
+    'global attributes': {},
+    'file size': {}
+}
+
+
+def _write_records(start: int, stop: int):
+    """
+    Function to write the records start up to stop to the netCDF file, creating it if start is 0
+    :param start: the first record
+    :param stop: the record after the last record
+    """
+    rng = np.random.default_rng(start)
+    series_values = rng.uniform(0, 10, size=max(stop, 200))
+    spectrum_values = rng.uniform(0, 10, size=(max(stop, 200), 8))
+    # runs of identical values and fill values crossing the record boundaries of the appends
+    series_values[40:70] = 5.0
+    series_values[95:105] = -999.0
+    series_values[130] = 12.0
+    spectrum_values[45:60, 2] = 4.0
+    spectrum_values[98:102, :] = -999.0
+    spectrum_values[101, :] = 6.0
+
+    if start == 0:
+        with Dataset(nc_path, 'w', format='NETCDF4') as nc_file:
+            nc_file.createDimension('time', None)
+            nc_file.createDimension('classes', 8)
+            nc_file.createVariable('series', 'f4', ('time',), fill_value=-999.0, chunksizes=(16,))
+            nc_file.createVariable('spectrum', 'f4', ('time', 'classes'), fill_value=-999.0, chunksizes=(4, 8))
+            nc_file.createVariable('station', 'i4', fill_value=-999).assignValue(42)
+
+    with Dataset(nc_path, 'a') as nc_file:
+        nc_file['series'][start:stop] = series_values[start:stop]
+        nc_file['spectrum'][start:stop] = spectrum_values[start:stop]
+
+
+def _remove_files():
+    """
+    Function to remove the netCDF file and its checkpoint
+    """
+    for path in (nc_path, checkpoint_path):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _run(memory_budget, incremental: bool) -> QualityControl:
+    """
+    Function to check the netCDF file with a new QualityControl object
+    :param memory_budget: the memory budget of the QualityControl object
+    :param incremental: True to perform the incremental checks, False to perform all checks
+    :return: the QualityControl object
+    """
+    qc_obj = QualityControl(memory_budget=memory_budget)
+    qc_obj.add_qc_checks_dict(incremental_dict)
+    qc_obj.load_netcdf(nc_path)
+    if incremental:
+        qc_obj.perform_incremental_checks()
+    else:
+        qc_obj.perform_all_checks()
+    qc_obj.nc.close()
+    return qc_obj
+
+
+def test_checkpoint_encoding():
+    """
+    Test for saving and loading the state of accumulators in a checkpoint, keeping the types of the state
+    """
+    path = data_dir / 'test_checkpoint.json'
+    values = np.ma.masked_array(np.array([[1, 1], [1, 3]], dtype=np.int16), mask=[[False, False], [False, True]])
+    accumulators = {
+        'consecutive_identical_values_check': [IdenticalRunsAccumulator(1, values.shape, axis=1)],
+        'adjacent_values_difference_check': [AdjacentDifferencesAccumulator(0, values.shape, 1, 10)]
+    }
+    for check_accumulators in accumulators.values():
+        check_accumulators[0].update(values, (0, 0))
+
+    checkpoint = Checkpoint(path, checkpoint_key(incremental_dict))
+    checkpoint.store('var', accumulators, values.shape, values.dtype)
+    checkpoint.save()
+
+    restored = {
+        'consecutive_identical_values_check': [IdenticalRunsAccumulator(1, (3, 2), axis=1)],
+        'adjacent_values_difference_check': [AdjacentDifferencesAccumulator(0, (3, 2), 1, 10)]
+    }
+    loaded = Checkpoint.load(path, checkpoint_key(incremental_dict))
+    assert loaded.restore('var', restored, (3, 2), values.dtype) == 2
+    assert Checkpoint.load(path, checkpoint_key({})).restore('var', restored, (3, 2), values.dtype) == 0
+    assert loaded.restore('var', restored, (1, 2), values.dtype) == 0
+    assert loaded.restore('var', restored, (3, 2), np.float32) == 0
+
+    for check, check_accumulators in accumulators.items():
+        state, restored_state = vars(check_accumulators[0]), vars(restored[check][0])
+        assert state.keys() == restored_state.keys()
+        for name, value in state.items():
+            if isinstance(value, np.ndarray):
+                assert restored_state[name].dtype == value.dtype
+                assert restored_state[name].shape[1:] == value.shape[1:]
+                assert np.array_equal(restored_state[name][:2], value)
+
+    if os.path.exists(path):
+        os.remove(path)
+
+
+@pytest.mark.parametrize("memory_budget", [None, 256])
+def test_incremental_checks(memory_budget):
+    """
+    Test for checking appended records, which gives the same results as checking all records
+    :param memory_budget: the memory budget of the QualityControl objects
+    """
+    _remove_files()
+
+    for start, stop in [(0, 50), (50, 100), (100, 100), (100, 200)]:
+        _write_records(start, stop)
+        incremental_qc_obj = _run(memory_budget, incremental=True)
+        full_qc_obj = _run(memory_budget, incremental=False)
+
+        assert checkpoint_path.exists()
+        assert incremental_qc_obj.logger.errors == full_qc_obj.logger.errors
+        assert incremental_qc_obj.logger.warnings == full_qc_obj.logger.warnings
+        assert incremental_qc_obj.logger.info == full_qc_obj.logger.info
+
+    assert "consecutive_identical_values_check for variable 'series': FAIL" in incremental_qc_obj.logger.info
+    assert "adjacent_values_difference_check for variable 'spectrum' and dimension '1': FAIL" \
+           in incremental_qc_obj.logger.info
+
+    # only the appended records are read
+    _write_records(200, 210)
+    qc_obj = QualityControl(memory_budget=memory_budget)
+    qc_obj.add_qc_checks_dict(incremental_dict)
+    qc_obj.load_netcdf(nc_path)
+    qc_obj.enable_profiling()
+    qc_obj.perform_incremental_checks()
+    rows = {(row['check'], row['variable']): row for row in qc_obj.get_timings()}
+    qc_obj.nc.close()
+
+    assert rows[('read', 'series')]['data_points'] == 10
+    assert rows[('read', 'spectrum')]['data_points'] == 10 * 8
+
+    _remove_files()
+
+
+def test_incremental_checks_config_changed():
+    """
+    Test for checking all records again after the configuration changed, ignoring the checkpoint
+    """
+    _remove_files()
+    _write_records(0, 100)
+    _run(None, incremental=True)
+
+    incremental_dict['variables']['series']['data_boundaries_check']['upper_bound'] = 4
+    try:
+        incremental_qc_obj = _run(None, incremental=True)
+        full_qc_obj = _run(None, incremental=False)
+    finally:
+        incremental_dict['variables']['series']['data_boundaries_check']['upper_bound'] = 10
+
+    assert "boundary check for variable 'series': FAIL" in incremental_qc_obj.logger.info
+    assert incremental_qc_obj.logger.errors == full_qc_obj.logger.errors
+
+    _remove_files()
+
+
+def test_incremental_checks_no_nc():
+    """
+    Test for performing incremental checks without a loaded netCDF file
+    """
+    qc_obj = QualityControl()
+    qc_obj.perform_incremental_checks()
+
+    assert qc_obj.logger.errors == ["perform_incremental_checks error: no nc file loaded"]
+
+
+@pytest.mark.parametrize("memory_budget", [None, 256])
+def test_incremental_checks_capped_runs(tmp_path, memory_budget):
+    """
+    Test for checking appended records of a multidimensional variable with more runs of identical values
+    than the maximum number of messages, which reports the same first runs by index as checking all records
+    :param tmp_path: temporary directory
+    :param memory_budget: the memory budget of the QualityControl objects
+    """
+    path = tmp_path / 'runs.nc'
+    runs_dict = {
+        'dimensions': {},
+        'variables': {'spectrum': {'consecutive_identical_values_check': {'maximum': 3}}},
+        'global attributes': {},
+        'file size': {}
+    }
+
+    # runs of identical values of other lengths in every line, of which some cross the records of the appends
+    values = np.arange(300 * 4, dtype='f4').reshape(300, 4)
+    for line in range(4):
+        for start in range(line * 2, 300, 61 - 15 * line):
+            values[start:start + 60 - 15 * line, line] = line
+
+    with Dataset(path, 'w', format='NETCDF4') as nc_file:
+        nc_file.createDimension('time', None)
+        nc_file.createDimension('classes', 4)
+        nc_file.createVariable('spectrum', 'f4', ('time', 'classes'), chunksizes=(8, 4))
+
+    for start, stop in [(0, 120), (120, 250), (250, 300)]:
+        with Dataset(path, 'a') as nc_file:
+            nc_file['spectrum'][start:stop] = values[start:stop]
+
+        qc_objs = []
+        for incremental in (True, False):
+            qc_obj = QualityControl(max_point_messages=3, memory_budget=memory_budget)
+            qc_obj.add_qc_checks_dict(runs_dict)
+            qc_obj.load_netcdf(path)
+            if incremental:
+                qc_obj.perform_incremental_checks(tmp_path / 'checkpoint.json')
+            else:
+                qc_obj.perform_all_checks()
+            qc_obj.nc.close()
+            qc_objs.append(qc_obj)
+
+        assert qc_objs[0].logger.errors == qc_objs[1].logger.errors
+
+    assert "first starting at indices: [(0, 0), (2, 1), (4, 2)" in qc_objs[0].logger.errors[-1]
@@ -0,0 +1,134 @@
+"""
+Module for testing the vectorized kernels from kernels.py
+
+ Functions:
+- test_first_true_indices: Test for getting the indices of the first True values of a mask
+- test_first_true_indices_none: Test for getting the indices of the first True values of an all False mask
+- test_boundaries_violations: Test for finding values out of bounds in a masked array
+- test_boundaries_violations_none: Test for finding values out of bounds when all values are within bounds
+- test_emptiness_counts: Test for counting the empty and NaN values of a masked array and finding
+  its completely empty indices along each axis
+- test_line_runs: Test for finding runs of identical values along an axis of a masked array
+- test_absolute_difference_unsigned: Test for the absolute difference of unsigned integers
+- test_adjacent_exceedances: Test for finding differences between adjacent values which exceed a maximum
+  along an axis of a masked array
+"""
+
+import numpy as np
+
+from ncqc.kernels import (first_true_indices, boundaries_violations, emptiness_counts, line_runs, absolute_difference,
+                          adjacent_exceedances)
+
+
+def test_first_true_indices():
+    """
+    Test for getting the indices of the first True values of a mask
+    """
+    mask = np.zeros((3, 4), dtype=bool)
+    mask[0, 3] = mask[2, 1] = mask[2, 2] = True
+
+    assert first_true_indices(mask, 2) == [(0, 3), (2, 1)]
+    assert first_true_indices(mask, 10) == [(0, 3), (2, 1), (2, 2)]
+
+
+def test_first_true_indices_none():
+    """
+    Test for getting the indices of the first True values of an all False mask
+    """
+    assert not first_true_indices(np.zeros(10, dtype=bool), 5)
+    assert not first_true_indices(np.ones(10, dtype=bool), 0)
+
+
+def test_boundaries_violations():
+    """
+    Test for finding values out of bounds in a masked array, where masked and NaN values are ignored
+    """
+    values = np.ma.masked_array([[0.5, 7.0, -3.0], [np.nan, 100.0, 2.0]],
+                                mask=[[False, False, False], [False, True, False]])
+
+    result = boundaries_violations(values, 0, 5, max_values=1)
+
+    assert result['count'] == 2
+    assert result['min'] == -3.0
+    assert result['max'] == 7.0
+    assert result['values'] == [7.0]
+    assert result['indices'] == [(0, 1)]
+
+
+def test_boundaries_violations_none():
+    """
+    Test for finding values out of bounds when all values are within bounds
+    """
+    result = boundaries_violations(np.arange(10), 0, 9, max_values=10)
+
+    assert result == {'count': 0, 'min': None, 'max': None, 'values': [], 'indices': []}
+
+
+def test_emptiness_counts():
+    """
+    Test for counting the empty and NaN values of a masked array and finding its completely empty
+    indices along each axis
+    """
+    values = np.ma.masked_array([[1.0, np.nan, 3.0], [np.nan, np.nan, 0.0], [7.0, np.nan, 9.0]],
+                                mask=[[False, False, False], [True, False, True], [False, True, False]])
+
+    counts = emptiness_counts(values)
+
+    assert counts['checked'] == 9
+    assert counts['empty'] == 3
+    assert counts['nan'] == 2
+    assert counts['empty_along'][0].tolist() == [False, True, False]
+    assert counts['empty_along'][1].tolist() == [False, True, False]
+
+    assert emptiness_counts(np.arange(3)) == {'checked': 3, 'empty': 0, 'nan': 0, 'empty_along': []}
+
+
+def test_line_runs():
+    """
+    Test for finding runs of identical values along an axis of a masked array
+    """
+    values = np.ma.masked_array([[1, 1, 2], [1, 5, 5], [1, 5, 5]],
+                                mask=[[False, False, False], [False, False, False], [True, False, False]])
+
+    runs = line_runs(values, axis=0)
+
+    assert runs['lines_shape'] == (3,)
+    assert runs['line'].tolist() == [0, 0, 1, 1, 2, 2]
+    assert runs['start'].tolist() == [0, 2, 0, 1, 0, 1]
+    assert runs['length'].tolist() == [2, 1, 1, 2, 1, 2]
+    assert runs['masked'].tolist() == [False, True, False, False, False, False]
+    assert runs['value'].tolist() == [1, 1, 1, 5, 2, 5]
+
+
+def test_absolute_difference_unsigned():
+    """
+    Test for the absolute difference of unsigned integers, which should not wrap around
+    """
+    upper = np.array([1, 200, 7], dtype=np.uint8)
+    lower = np.array([250, 100, 7], dtype=np.uint8)
+
+    difference = absolute_difference(upper, lower)
+
+    assert difference.dtype == np.uint8
+    assert difference.tolist() == [249, 100, 0]
+
+
+def test_adjacent_exceedances():
+    """
+    Test for finding differences between adjacent values which exceed a maximum along an axis of a masked array
+    """
+    values = np.ma.masked_array([[0, 5, 1], [9, 5, -8], [0, 6, 2]],
+                                mask=[[False, False, False], [False, False, False], [False, False, True]])
+
+    result = adjacent_exceedances(values, 0, 5, max_values=2)
+
+    assert result['count'] == 3
+    assert result['max'] == 9
+    assert result['values'] == [9, 9]
+    assert result['indices'] == [(0, 0), (0, 2)]
+
+    result = adjacent_exceedances(values, 1, 12, max_values=10)
+
+    assert result['count'] == 1
+    assert result['max'] == 13
+    assert result['indices'] == [(1, 1)]
@@ -0,0 +1,214 @@
+"""
+Module for testing the functionality of multifile.py, checking an ordered set of netCDF files as one dataset
+
+ Functions:
+- test_multifile_dataset: Test for reading the records of the files as the records of one dataset
+- test_multifile_errors: Test for opening files which cannot be joined or opened
+- test_multifile_checks: Test for checking the files like one file, with runs and differences across files
+- test_multifile_file_slabs: Test for reading the files one at a time without a memory budget
+- test_multifile_file_size: Test for the file size check of every file
+- test_multifile_incremental: Test for incremental checks of a growing set of files
+"""
+
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+import netCDF4
+import numpy as np
+import pytest
+
+from ncqc.QCnetCDF import QualityControl
+from ncqc.multifile import MultiFileDataset
+
+multifile_dir = Path(__file__).parent.parent / 'sample_data' / 'multifile'
+part_paths = [multifile_dir / f'part_{i}.nc' for i in range(4)]
+
+multifile_dict = {
+    'dimensions': {'time': {'existence_check': True}},
+    'variables': {
+        'series': {
+            'emptiness_check': True,
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10},
+            'consecutive_identical_values_check': {'maximum': 5},
+            'adjacent_values_difference_check': {'over_which_dimension': [0], 'maximum_difference': [2]}
+        },
+        'spectrum': {
+            'adjacent_values_difference_check': {'over_which_dimension': [0, 1], 'maximum_difference': [2, 5]}
+        },
+        'station': {'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 100}}
+    },
+    'global attributes': {'title': {'emptiness_check': True}},
+    'file size': {}
+}
+
+
+def _check(nc_file_paths: list, **kwargs) -> dict:
+    """
+    Function to perform all checks with a new QualityControl object
+    :param nc_file_paths: the paths to the netCDF files, a single file is loaded with load_netcdf
+    :param kwargs: the arguments of the QualityControl object
+    :return: the report, without the time of the report
+    """
+    qc_obj = QualityControl(**kwargs)
+    qc_obj.add_qc_checks_dict(multifile_dict)
+    if len(nc_file_paths) == 1:
+        qc_obj.load_netcdf(nc_file_paths[0])
+    else:
+        qc_obj.load_netcdf_files(nc_file_paths)
+    qc_obj.perform_all_checks()
+    qc_obj.nc.close()
+    report = qc_obj.create_report()
+    return {key: report[key] for key in ('errors', 'warnings', 'info')}
+
+
+@pytest.mark.usefixtures("create_nc_multifile")
+def test_multifile_dataset():
+    """
+    Test for reading the records of the files as the records of one dataset, only reading the files
+    holding the records of a slab
+    """
+    with MultiFileDataset(part_paths) as dataset, MultiFileDataset([multifile_dir / 'whole.nc']) as whole:
+        assert len(dataset.dimensions['time']) == 200
+        assert dataset.dimensions['time'].isunlimited()
+        assert dataset['series'].shape == (200,)
+        assert dataset['spectrum'].shape == (200, 4)
+        assert dataset['spectrum'].chunking() == [8, 4]
+        assert dataset.filepaths() == [str(path) for path in part_paths]
+        assert dataset.getncattr('title') == 'multi-file test dataset'
+
+        for key in (slice(None), slice(40, 60), slice(45, 155), slice(50, 100), slice(190, 250), slice(0, 200, 3)):
+            assert np.ma.allequal(dataset['series'][key], whole['series'][key])
+            assert np.array_equal(np.ma.getmaskarray(dataset['series'][key]),
+                                  np.ma.getmaskarray(whole['series'][key]))
+            assert np.ma.allequal(dataset['spectrum'][key, 1:3], whole['spectrum'][key, 1:3])
+        assert dataset['station'][:] == 42
+
+        assert list(dataset['spectrum'].file_slabs()) == [(slice(i, i + 50), slice(0, 4)) for i in range(0, 200, 50)]
+        assert list(dataset['series'].file_slabs(75)) == [(slice(75, 100),), (slice(100, 150),), (slice(150, 200),)]
+
+    shutil.rmtree(multifile_dir)
+
+
+@pytest.mark.usefixtures("create_nc_multifile", "create_nc_streaming", "create_nc_batch")
+def test_multifile_errors():
+    """
+    Test for opening files which cannot be joined: no files, files without the dimension to join along,
+    or files with other dimensions. Files without an unlimited dimension are joined along a given dimension.
+    The files opened before a file which cannot be opened are closed.
+    """
+    sample_dir = Path(__file__).parent.parent / 'sample_data'
+    batch_paths = [sample_dir / 'batch' / 'file_0.nc', sample_dir / 'batch' / 'file_1.nc']
+
+    with pytest.raises(ValueError):
+        MultiFileDataset([])
+    with pytest.raises(ValueError, match='unlimited'):
+        MultiFileDataset(batch_paths)
+    with pytest.raises(ValueError, match="no dimension 'classes'"):
+        MultiFileDataset([part_paths[0], batch_paths[0]], record_dimension='classes')
+    with pytest.raises(ValueError, match='dimensions'):
+        MultiFileDataset([part_paths[0], sample_dir / 'test_streaming.nc'])
+
+    with MultiFileDataset(batch_paths, record_dimension='time') as dataset:
+        assert dataset['temperature'].shape == (40,)
+
+    opened = []
+    dataset_class = netCDF4.Dataset  # pylint: disable=no-member
+
+    def open_dataset(path):
+        opened.append(dataset_class(path))
+        return opened[-1]
+
+    with patch('ncqc.multifile.netCDF4.Dataset', side_effect=open_dataset), pytest.raises(OSError):
+        MultiFileDataset(part_paths[:2] + [multifile_dir / 'missing.nc'])
+    assert len(opened) == 2
+    assert not any(dataset.isopen() for dataset in opened)
+
+    shutil.rmtree(multifile_dir)
+    shutil.rmtree(sample_dir / 'batch')
+    (sample_dir / 'test_streaming.nc').unlink()
+
+
+@pytest.mark.usefixtures("create_nc_multifile")
+def test_multifile_checks():
+    """
+    Test for checking the files like the single file with the same records, in full and in slabs, which finds
+    the run of identical values and the jumps between adjacent values crossing the boundaries between the files
+    """
+    report = _check([multifile_dir / 'whole.nc'])
+    assert "consecutive_identical_values_check for variable 'series': FAIL" in report['info']
+
+    assert _check(part_paths) == report
+    assert _check(part_paths, memory_budget=64) == report
+
+    # checked one by one, the parts do not have the run of identical values
+    for part_path in part_paths[:2]:
+        assert "consecutive_identical_values_check for variable 'series': SUCCESS" in _check([part_path])['info']
+
+    shutil.rmtree(multifile_dir)
+
+
+@pytest.mark.usefixtures("create_nc_multifile")
+def test_multifile_file_slabs():
+    """
+    Test for reading the record variables one file at a time without a memory budget, and the other variables
+    in full, which gives the same report as checking the single file
+    """
+    qc_obj = QualityControl()
+    qc_obj.add_qc_checks_dict(multifile_dict)
+    qc_obj.load_netcdf_files(part_paths)
+    qc_obj.enable_profiling()
+    qc_obj.perform_all_checks()
+    qc_obj.nc.close()
+    report = qc_obj.create_report()
+
+    reads = {row['variable']: row for row in report['timings'] if row['check'] == 'read'}
+    assert (reads['series']['calls'], reads['series']['data_points']) == (4, 200)
+    assert (reads['spectrum']['calls'], reads['spectrum']['data_points']) == (4, 200 * 4)
+    assert reads['station']['calls'] == 1
+    assert {key: report[key] for key in ('errors', 'warnings', 'info')} == _check([multifile_dir / 'whole.nc'])
+
+    shutil.rmtree(multifile_dir)
+
+
+@pytest.mark.usefixtures("create_nc_multifile")
+def test_multifile_file_size():
+    """
+    Test for the file size check of a multi-file dataset, which checks the size of every file
+    """
+    qc_obj = QualityControl()
+    qc_obj.add_qc_checks_dict(dict(multifile_dict, **{'file size': {'lower_bound': 0, 'upper_bound': 10}}))
+    qc_obj.load_netcdf_files(part_paths[:2])
+    qc_obj.file_size_check()
+    qc_obj.nc.close()
+
+    assert len(qc_obj.logger.errors) == 2
+    assert qc_obj.logger.errors[0].startswith(f"file size check error: size of file '{part_paths[0]}' (")
+    assert qc_obj.logger.info == ['file size check: FAIL']
+
+    shutil.rmtree(multifile_dir)
+
+
+@pytest.mark.usefixtures("create_nc_multifile")
+def test_multifile_incremental(tmp_path):
+    """
+    Test for incremental checks of a growing set of files, which only reads the records of the new files
+    and gives the same report as checking all files at once
+    :param tmp_path: temporary directory
+    """
+    report = _check(part_paths)
+
+    for n_files in (2, 4):
+        qc_obj = QualityControl()
+        qc_obj.add_qc_checks_dict(multifile_dict)
+        qc_obj.load_netcdf_files(part_paths[:n_files])
+        qc_obj.enable_profiling()
+        qc_obj.perform_incremental_checks(tmp_path / 'checkpoint.json')
+        qc_obj.nc.close()
+        incremental_report = qc_obj.create_report()
+
+    reads = {row['variable']: row['data_points'] for row in incremental_report['timings'] if row['check'] == 'read'}
+    assert reads['series'] == 100
+    assert {key: incremental_report[key] for key in ('errors', 'warnings', 'info')} == report
+
+    shutil.rmtree(multifile_dir)
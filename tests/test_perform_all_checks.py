@@ -23,6 +23,10 @@ class TestCheck(unittest.TestCase):
       file does not exist in the netCDF file
     - test_perform_all_checks_all_success: Test method for when all checks succeed
     - test_perform_all_checks_all_fail: Test method for when most checks fail
+    - test_perform_all_checks_single_read: Test method for whether each variable is read only once
+    - test_perform_header_checks: Test method for performing only the checks which need the header
+      of the netCDF file
+    - test_perform_header_checks_no_nc: Test method for the header checks when there is no netCDF file loaded
     """
 
     def test_perform_all_checks_no_nc(self):
@@ -181,3 +185,116 @@ class TestCheck(unittest.TestCase):
 
         if os.path.exists(nc_path):
             os.remove(nc_path)
+
+    @pytest.mark.usefixtures("create_nc_all_checks")
+    def test_perform_all_checks_single_read(self):
+        """
+        Test method for whether each variable is read only once, even when multiple data checks are configured
+        """
+        nc_path = data_dir / 'test_all_checks.nc'
+
+        qc_obj = QualityControl()
+        qc_obj.load_netcdf(nc_path)
+
+        qc_obj.add_qc_checks_dict({
+            'dimensions': {},
+            'variables': {
+                'var_1': {
+                    'existence_check': True,
+                    'emptiness_check': True,
+                    'data_boundaries_check': {'lower_bound': 1, 'upper_bound': 10},
+                    'data_points_amount_check': {'minimum': 40},
+                    'consecutive_identical_values_check': {'maximum': 40}
+                },
+                'var_2': {
+                    'existence_check': True
+                }
+            },
+            'global attributes': {},
+            'file size': {}
+        })
+
+        with patch.object(QualityControl, '_read_var', wraps=qc_obj._read_var) as mock_read_var:
+            qc_obj.perform_all_checks()
+
+        mock_read_var.assert_called_once_with('var_1')
+        assert not qc_obj.logger.errors
+        assert qc_obj.logger.info[-4:] == [
+            "no global attributes were checked for emptiness",
+            "data points amount check for variable 'var_1': SUCCESS",
+            "boundary check for variable 'var_1': SUCCESS",
+            "consecutive_identical_values_check for variable 'var_1': SUCCESS"
+        ]
+
+        if os.path.exists(nc_path):
+            os.remove(nc_path)
+
+    @pytest.mark.usefixtures("create_nc_data_points_amount_check")
+    def test_perform_header_checks(self):
+        """
+        Test method for performing only the checks which need the header of the netCDF file,
+        without reading any data and listing the skipped data checks
+        """
+        nc_path = data_dir / 'test_data_points_amount.nc'
+
+        qc_obj = QualityControl()
+        qc_obj.load_netcdf(nc_path)
+
+        qc_obj.add_qc_checks_dict({
+            'dimensions': {'dimension_1': {'existence_check': True}},
+            'variables': {
+                'var_1d': {
+                    'existence_check': True,
+                    'emptiness_check': True,
+                    'data_points_amount_check': {'minimum': 20},
+                    'expected_dimensions_check': {'expected_dimensions': ['dimension_1']}
+                },
+                'var_2d': {
+                    'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 100},
+                    'data_points_amount_check': {'minimum': 200, 'count': 'valid'},
+                    'expected_dimensions_check': {'expected_dimensions': ['dimension_1']}
+                },
+                'var_3d': {
+                    'existence_check': True
+                }
+            },
+            'global attributes': {},
+            'file size': {}
+        })
+
+        with patch.object(QualityControl, '_read_var') as mock_read_var:
+            qc_obj.perform_header_checks()
+
+        mock_read_var.assert_not_called()
+        assert qc_obj.logger.warnings == ["variable 'var_3d' not in nc file"]
+        assert qc_obj.logger.errors == [
+            'variable "var_3d" should exist but it does not',
+            "expected dimensions check error: variable 'var_2d' has dimensions ['dimension_1', 'dimension_2'] "
+            "instead of the expected dimensions ['dimension_1']",
+            "data points amount check error: number of data points (10) for variable 'var_1d' "
+            "is below the specified minimum (20)"
+        ]
+        assert qc_obj.logger.info == [
+            '1/1 checked dimensions exist',
+            '1/2 checked variables exist',
+            'no global attributes were checked',
+            "expected dimensions check for variable 'var_1d': SUCCESS",
+            "expected dimensions check for variable 'var_2d': FAIL",
+            "data points amount check for variable 'var_1d': FAIL",
+            "header checks: skipped data checks for variable 'var_1d': emptiness_check",
+            "header checks: skipped data checks for variable 'var_2d': data_points_amount_check, "
+            "data_boundaries_check"
+        ]
+
+        if os.path.exists(nc_path):
+            os.remove(nc_path)
+
+    def test_perform_header_checks_no_nc(self):
+        """
+        Test method for the header checks when there is no netCDF file loaded
+        """
+        qc_obj = QualityControl()
+        qc_obj.perform_header_checks()
+        assert not qc_obj.logger.info
+        assert not qc_obj.logger.warnings
+        assert qc_obj.logger.errors == ['perform_header_checks error: no nc file loaded']
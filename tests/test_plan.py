@@ -0,0 +1,126 @@
+"""
+Module for testing the functionality of plan.py
+
+ Functions:
+- test_check_plan: Test for compiling a configuration into a plan
+- test_check_plan_immutable: Test for whether a compiled plan cannot be changed
+- test_plan_recompiled: Test for whether the plan of a QualityControl object is compiled again
+  when its configuration changes
+- test_plan_changed_in_place: Test for whether a check uses the configuration after it was changed in place
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from ncqc.plan import CheckPlan, freeze
+from ncqc.QCnetCDF import QualityControl, DATA_CHECKS
+
+config = {
+    'dimensions': {
+        'time': {'existence_check': True},
+        'classes': {'existence_check': False}
+    },
+    'variables': {
+        'temperature': {
+            'existence_check': True,
+            'emptiness_check': False,
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10},
+            'adjacent_values_difference_check': {'over_which_dimension': [0], 'maximum_difference': [1]}
+        },
+        'wind_speed': {
+            'emptiness_check': True,
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 50}
+        },
+        'station': {'existence_check': True}
+    },
+    'global attributes': {'title': {'existence_check': True, 'emptiness_check': True}},
+    'file size': {'lower_bound': 0, 'upper_bound': 100}
+}
+
+
+def test_check_plan():
+    """
+    Test for compiling a configuration into a plan
+    """
+    plan = CheckPlan.compile(config['dimensions'], config['variables'], config['global attributes'], 
+                            config['file size'], DATA_CHECKS)
+
+    assert plan.dims_by_check == {'existence_check': ('time',)}
+    assert plan.vars_for('existence_check') == ('temperature', 'station')
+    assert plan.vars_for('emptiness_check') == ('wind_speed',)
+    assert plan.vars_for('data_boundaries_check') == ('temperature', 'wind_speed')
+    assert plan.vars_for('consecutive_identical_values_check') == ()
+    assert plan.gl_attrs_by_check == {'existence_check': ('title',), 'emptiness_check': ('title',)}
+    assert plan.var_data_checks == (
+        ('temperature', ('data_boundaries_check', 'adjacent_values_difference_check')),
+        ('wind_speed', ('emptiness_check', 'data_boundaries_check'))
+    )
+    assert plan.check_config('temperature', 'adjacent_values_difference_check') == {
+        'over_which_dimension': (0,), 'maximum_difference': (1,)}
+    assert plan.file_size == {'lower_bound': 0, 'upper_bound': 100}
+
+
+def test_check_plan_immutable():
+    """
+    Test for whether a compiled plan cannot be changed, also not through the configuration it was compiled from
+    """
+    variables = {'temperature': {'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10}}}
+    plan = CheckPlan.compile({}, variables, {}, {}, DATA_CHECKS)
+
+    variables['temperature']['data_boundaries_check']['upper_bound'] = 20
+    assert plan.check_config('temperature', 'data_boundaries_check')['upper_bound'] == 10
+
+    with pytest.raises(AttributeError):
+        plan.var_data_checks = ()
+    with pytest.raises(TypeError):
+        plan.check_config('temperature', 'data_boundaries_check')['upper_bound'] = 20
+    with pytest.raises(TypeError):
+        freeze({'a': [1]})['a'] = 2
+
+
+def test_plan_recompiled():
+    """
+    Test for whether the plan of a QualityControl object is compiled again when its configuration changes
+    """
+    qc_obj = QualityControl()
+    qc_obj.add_qc_checks_dict(config)
+    plan = qc_obj.plan
+
+    assert qc_obj.plan is plan
+
+    qc_obj.add_qc_checks_dict({'dimensions': {}, 'variables': {'humidity': {'emptiness_check': True}},
+                               'global attributes': {}, 'file size': {}})
+    assert qc_obj.plan is not plan
+    assert qc_obj.plan.vars_for('emptiness_check') == ('wind_speed', 'humidity')
+
+    qc_obj.qc_checks_vars = {'pressure': {'emptiness_check': True}}
+    assert qc_obj.plan.vars_for('emptiness_check') == ('pressure',)
+
+
+@pytest.mark.usefixtures("create_nc_data_boundaries_check_success")
+def test_plan_changed_in_place():
+    """
+    Test for whether a check uses the configuration after it was changed in place
+    """
+    qc_obj = QualityControl()
+    qc_obj.add_qc_checks_dict({'dimensions': {}, 'variables': {'kinetic_energy': {}}, 'global attributes': {},
+                               'file size': {}})
+    nc_path = Path(__file__).parent.parent / 'sample_data' / 'test_boundary_success.nc'
+    qc_obj.load_netcdf(nc_path)
+    plan = qc_obj.plan
+
+    qc_obj.qc_checks_vars['kinetic_energy']['data_boundaries_check'] = {'lower_bound': 0, 'upper_bound': 10}
+    assert qc_obj.plan is not plan
+    assert qc_obj.plan.vars_for('data_boundaries_check') == ('kinetic_energy',)
+
+    qc_obj.perform_all_checks()
+    assert not qc_obj.logger.errors
+
+    qc_obj.qc_checks_vars['kinetic_energy']['data_boundaries_check']['upper_bound'] = -1
+    qc_obj.perform_all_checks()
+    assert qc_obj.logger.errors
+
+    qc_obj.nc.close()
+    os.remove(nc_path)
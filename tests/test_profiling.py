@@ -0,0 +1,136 @@
+"""
+Module for testing the functionality of profiling.py and the profiling of a QualityControl object
+
+ Functions:
+- test_profiler_measure: Test for measuring nested checks and variables
+- test_profiler_trace_memory: Test for tracing the peak memory of measurements
+- test_profiling_off: Test for a QualityControl object with profiling turned off
+- test_profiling_perform_all_checks: Test for profiling all checks, reading the variables in full and in slabs
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ncqc.QCnetCDF import QualityControl
+from ncqc.profiling import Profiler
+
+data_dir = Path(__file__).parent.parent / 'sample_data'
+
+profiling_dict = {
+    'dimensions': {},
+    'variables': {
+        'series': {
+            'emptiness_check': True,
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10},
+            'data_points_amount_check': {'minimum': 100}
+        },
+        'spectrum': {
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10}
+        }
+    },
+    'global attributes': {},
+    'file size': {}
+}
+
+
+def test_profiler_measure():
+    """
+    Test for measuring nested checks and variables, adding up the measurements of the same check and variable
+    and counting the data read within a measurement for the enclosing measurements as well
+    """
+    profiler = Profiler()
+
+    with profiler.measure('boundaries'):
+        for _ in range(2):
+            with profiler.measure('read', 'var_1') as measurement:
+                measurement.add_data(np.ma.masked_array(np.zeros(10, dtype=np.float32)))
+
+    table = profiler.table()
+    assert [(row['check'], row['variable'], row['calls']) for row in table] == [('read', 'var_1', 2),
+                                                                               ('boundaries', None, 1)]
+    assert [(row['bytes_read'], row['data_points']) for row in table] == [(80, 20), (80, 20)]
+    assert table[1]['wall_time'] >= table[0]['wall_time'] >= 0
+    assert table[0]['peak_memory'] is None
+
+    profiler.reset()
+    assert not profiler.table()
+
+
+def test_profiler_trace_memory():
+    """
+    Test for tracing the peak memory of measurements, including the memory of nested measurements
+    """
+    profiler = Profiler(trace_memory=True)
+
+    with profiler.measure('boundaries'):
+        with profiler.measure('read', 'var_1'):
+            values = np.ones(1_000_000, dtype=np.uint8)
+            del values
+        values = np.ones(1000, dtype=np.uint8)
+
+    profiler.close()
+
+    read_row, check_row = profiler.table()
+    assert read_row['peak_memory'] >= 1_000_000
+    assert check_row['peak_memory'] >= read_row['peak_memory']
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_profiling_off():
+    """
+    Test for a QualityControl object with profiling turned off, which does not add timings to its reports
+    """
+    nc_path = data_dir / 'test_streaming.nc'
+
+    qc_obj = QualityControl()
+    qc_obj.add_qc_checks_dict(profiling_dict)
+    qc_obj.load_netcdf(nc_path)
+    qc_obj.perform_all_checks()
+
+    assert qc_obj.profiler is None
+    assert not qc_obj.get_timings()
+    assert 'timings' not in qc_obj.create_report()
+
+    if os.path.exists(nc_path):
+        os.remove(nc_path)
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+@pytest.mark.parametrize("memory_budget", [None, 256])
+def test_profiling_perform_all_checks(memory_budget):
+    """
+    Test for profiling all checks, reading the variables in full and in slabs
+    :param memory_budget: the memory budget of the QualityControl object
+    """
+    nc_path = data_dir / 'test_streaming.nc'
+
+    qc_obj = QualityControl(memory_budget=memory_budget)
+    qc_obj.add_qc_checks_dict(profiling_dict)
+    qc_obj.load_netcdf(nc_path)
+    qc_obj.enable_profiling()
+    qc_obj.perform_all_checks()
+
+    report = qc_obj.create_report()
+    rows = {(row['check'], row['variable']): row for row in report['timings']}
+
+    assert {('read', 'series'), ('read', 'spectrum'), ('emptiness_check', 'series'),
+            ('data_points_amount_check', 'series'), ('data_boundaries_check', 'series'),
+            ('data_boundaries_check', 'spectrum'), ('file_size_check', None), ('existence_check', None),
+            ('expected_dimensions_check', None), ('perform_all_checks', None)} == set(rows)
+    assert rows[('read', 'series')]['bytes_read'] == 200 * 4
+    assert rows[('read', 'spectrum')]['data_points'] == 200 * 8
+    assert rows[('perform_all_checks', None)]['bytes_read'] == 200 * 4 + 200 * 8 * 4
+    assert rows[('data_boundaries_check', 'series')]['bytes_read'] == 0
+    assert all(row['wall_time'] >= 0 and row['cpu_time'] >= 0 for row in report['timings'])
+
+    # the timing table starts over for every report
+    assert qc_obj.create_report()['timings'] == []
+
+    qc_obj.disable_profiling()
+    assert 'timings' not in qc_obj.create_report()
+
+    if os.path.exists(nc_path):
+        os.remove(nc_path)
@@ -0,0 +1,158 @@
+"""
+Module for testing the functionality of sampling.py and the sampled checks of a QualityControl object
+
+ Functions:
+- test_wilson_interval: Test for the Wilson score confidence interval of a proportion
+- test_sample_slabs: Test for choosing a random and a stratified sample of slabs
+- test_perform_sampled_checks_all_chunks: Test for sampling all chunks, which finds all violations
+- test_perform_sampled_checks_fraction: Test for sampling a fraction of the chunks, reproducible with a seed
+- test_perform_sampled_checks_budget: Test for sampling within a byte budget
+- test_perform_sampled_checks_errors: Test for sampling without a loaded file or with an unknown method
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ncqc.QCnetCDF import QualityControl
+from ncqc.sampling import wilson_interval, sample_slabs
+
+data_dir = Path(__file__).parent.parent / 'sample_data'
+
+sampling_dict = {
+    'dimensions': {},
+    'variables': {
+        'series': {
+            'emptiness_check': True,
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10},
+            'data_points_amount_check': {'minimum': 100, 'count': 'valid'}
+        },
+        'spectrum': {
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10}
+        }
+    },
+    'global attributes': {},
+    'file size': {}
+}
+
+
+def _sample(**kwargs) -> dict:
+    """
+    Function to perform the sampled checks on the streaming test file with a new, profiled QualityControl object
+    :param kwargs: the arguments of perform_sampled_checks
+    :return: the report
+    """
+    qc_obj = QualityControl()
+    qc_obj.add_qc_checks_dict(sampling_dict)
+    qc_obj.load_netcdf(data_dir / 'test_streaming.nc')
+    qc_obj.enable_profiling()
+    qc_obj.perform_sampled_checks(**kwargs)
+    qc_obj.nc.close()
+    return qc_obj.create_report()
+
+
+def test_wilson_interval():
+    """
+    Test for the Wilson score confidence interval of a proportion
+    """
+    assert wilson_interval(5, 10) == pytest.approx((0.2366, 0.7634), abs=1e-4)
+    assert wilson_interval(0, 10) == pytest.approx((0.0, 0.2775), abs=1e-4)
+    assert wilson_interval(10, 10) == pytest.approx((0.7225, 1.0), abs=1e-4)
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+    lower, upper = wilson_interval(5, 10, confidence=0.99)
+    assert lower < 0.2366 and upper > 0.7634
+
+
+def test_sample_slabs():
+    """
+    Test for choosing a random and a stratified sample of slabs, at least one slab and reproducible with a seed
+    """
+    random_sample = sample_slabs(100, 0.1, 'random', np.random.default_rng(0))
+    assert len(set(random_sample)) == 10
+    assert random_sample == sample_slabs(100, 0.1, 'random', np.random.default_rng(0))
+
+    stratified_sample = sorted(sample_slabs(100, 0.1, 'stratified', np.random.default_rng(0)))
+    assert [index // 10 for index in stratified_sample] == list(range(10))
+
+    assert len(sample_slabs(100, 0.0001, 'stratified', np.random.default_rng(0))) == 1
+    assert sorted(sample_slabs(7, 1.0, 'random', np.random.default_rng(0))) == list(range(7))
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_perform_sampled_checks_all_chunks():
+    """
+    Test for sampling all chunks, which finds all violations within the chunks
+    """
+    report = _sample(fraction=1.0)
+    estimates = {(estimate['variable'], estimate['check']): estimate for estimate in report['estimates']}
+
+    assert estimates[('series', 'data_boundaries_check')]['violations'] == 1
+    assert estimates[('series', 'data_boundaries_check')]['sampled_points'] == 200
+    assert estimates[('series', 'emptiness_check')]['violations'] == 6
+    assert estimates[('spectrum', 'data_boundaries_check')]['violations'] == 1
+    assert estimates[('spectrum', 'data_boundaries_check')]['rate'] == 1 / 1600
+    assert estimates[('series', 'data_points_amount_check')]['violations'] == 5
+
+    assert any(message.startswith("data points amount check for variable 'series': SUCCESS (estimated ")
+               for message in report['info'])
+    assert any(message.startswith("data_boundaries_check for variable 'spectrum': FAIL (sampled 1600 of 1600 ")
+               for message in report['info'])
+    assert any(message.startswith("data_boundaries_check error: estimated 0.500% of the data points of variable "
+                                  "'series'") for message in report['errors'])
+
+    os.remove(data_dir / 'test_streaming.nc')
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_perform_sampled_checks_fraction():
+    """
+    Test for sampling a fraction of the chunks, which reads only the sampled chunks and is reproducible with a seed
+    """
+    report = _sample(fraction=0.25, seed=3)
+    reads = {row['variable']: row['data_points'] for row in report['timings'] if row['check'] == 'read'}
+
+    # 4 of the 13 chunks of 16 records of the series, 13 of the 50 chunks of 4 records of the spectrum
+    assert reads['series'] <= 4 * 16
+    assert reads['spectrum'] == 13 * 4 * 8
+    for estimate in report['estimates']:
+        assert estimate['sampled_points'] == reads[estimate['variable']]
+        assert estimate['lower'] <= estimate['rate'] <= estimate['upper']
+
+    assert _sample(fraction=0.25, seed=3)['estimates'] == report['estimates']
+
+    os.remove(data_dir / 'test_streaming.nc')
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_perform_sampled_checks_budget():
+    """
+    Test for sampling within a byte budget, which is divided over the variables, of which at least one chunk
+    is read
+    """
+    report = _sample(fraction=1.0, max_bytes=256, seed=0)
+    reads = {row['variable']: row['bytes_read'] for row in report['timings'] if row['check'] == 'read'}
+
+    # 128 bytes for each variable: 2 chunks of the series and 1 chunk of the spectrum
+    assert reads == {'series': 2 * 16 * 4, 'spectrum': 4 * 8 * 4}
+
+    os.remove(data_dir / 'test_streaming.nc')
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_perform_sampled_checks_errors():
+    """
+    Test for sampling without a loaded file or with an unknown sampling method
+    """
+    qc_obj = QualityControl()
+    qc_obj.perform_sampled_checks()
+    assert qc_obj.logger.errors == ["perform_sampled_checks error: no nc file loaded"]
+
+    report = _sample(method='systematic')
+    assert report['errors'] == ["perform_sampled_checks error: unknown sampling method 'systematic', "
+                                "expected one of ('random', 'stratified')"]
+    assert 'estimates' not in report
+
+    os.remove(data_dir / 'test_streaming.nc')
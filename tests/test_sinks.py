@@ -0,0 +1,207 @@
+"""
+Module for testing the functionality of sinks.py
+
+ Functions:
+- test_json_lines_sink: Test for writing reports to a JSON Lines file in buffered bulk writes
+- test_sink_unbuffered: Test for writing every report when it is created by default, and after a flush interval
+- test_sqlite_sink: Test for writing reports to a SQLite database
+- test_logger_sink: Test for a logger writing every created report to its sink
+- test_logger_sink_bounded: Test for a logger with a sink keeping only the latest report in memory by default
+- test_run_batch_sink: Test for writing the reports of a batch run to a sink
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+
+from ncqc.QCnetCDF import QualityControl
+from ncqc.batch import run_batch
+from ncqc.log import LoggerQC
+from ncqc.sinks import JsonLinesSink, ReportSink, SQLiteSink
+
+data_dir = Path(__file__).parent.parent / 'sample_data'
+
+reports = [
+    {'report_date': '24-05-1914', 'report_time': '19:14:00', 'errors': ['error_1'], 'warnings': [], 'info': []},
+    {'report_date': '24-05-1914', 'report_time': '19:15:00', 'errors': [], 'warnings': ['warning_1'],
+     'info': ['info_1'], 'file': 'file_1.nc'},
+    {'report_date': '24-05-1914', 'report_time': '19:16:00', 'errors': [], 'warnings': [], 'info': []}
+]
+
+
+def read_json_lines(path: Path) -> list[dict]:
+    """
+    Function to read all reports from a JSON Lines file
+    :param path: path to the file
+    :return: the reports
+    """
+    with open(path, encoding='utf-8') as file:
+        return [json.loads(line) for line in file]
+
+
+def test_json_lines_sink():
+    """
+    Test for writing reports to a JSON Lines file in buffered bulk writes
+    """
+    path = data_dir / 'test_reports.jsonl'
+
+    sink = JsonLinesSink(path, buffer_size=2)
+    sink.write(reports[0])
+    assert not read_json_lines(path)
+    sink.write(reports[1])
+    assert read_json_lines(path) == reports[:2]
+    sink.write(reports[2])
+    sink.close()
+    assert read_json_lines(path) == reports
+
+    # reports are appended to an existing file
+    with JsonLinesSink(path) as sink:
+        sink.write(reports[0])
+    assert read_json_lines(path) == reports + reports[:1]
+
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def test_sink_unbuffered():
+    """
+    Test for writing every report when it is created by default, so the file can be followed while it is
+    written, for buffered reports being written after the flush interval, and for the base class being abstract
+    """
+    path = data_dir / 'test_reports.jsonl'
+
+    with JsonLinesSink(path) as sink:
+        logger = LoggerQC(sink=sink)
+        logger.add_error('error_1')
+        logger.create_report()
+        assert [report['errors'] for report in read_json_lines(path)] == [['error_1']]
+
+    os.remove(path)
+
+    with JsonLinesSink(path, buffer_size=100, flush_interval=0.05) as sink:
+        sink.write(reports[0])
+        assert not read_json_lines(path)
+        time.sleep(0.06)
+        sink.write(reports[1])
+        assert read_json_lines(path) == reports[:2]
+
+    with pytest.raises(TypeError):
+        ReportSink()  # pylint: disable=abstract-class-instantiated
+
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def test_sqlite_sink():
+    """
+    Test for writing reports to a SQLite database
+    """
+    path = data_dir / 'test_reports.sqlite'
+
+    with SQLiteSink(path, buffer_size=2) as sink:
+        for report in reports:
+            sink.write(report)
+
+    connection = sqlite3.connect(str(path))
+    rows = connection.execute('SELECT report_time, error_count, warning_count, errors, info, extra '
+                              'FROM reports ORDER BY id').fetchall()
+    connection.close()
+
+    assert rows == [
+        ('19:14:00', 1, 0, '["error_1"]', '[]', '{}'),
+        ('19:15:00', 0, 1, '[]', '["info_1"]', '{"file": "file_1.nc"}'),
+        ('19:16:00', 0, 0, '[]', '[]', '{}')
+    ]
+
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def test_logger_sink():
+    """
+    Test for a logger writing every created report to its sink, while keeping only the latest report in memory
+    """
+    path = data_dir / 'test_logger_reports.jsonl'
+
+    with JsonLinesSink(path, buffer_size=1) as sink:
+        qc_obj = QualityControl(logger=LoggerQC(max_reports=1), sink=sink)
+        qc_obj.logger.add_error('error_1')
+        qc_obj.create_report()
+        qc_obj.logger.add_info('info_1')
+        latest_report = qc_obj.create_report()
+
+        assert qc_obj.logger.get_all_reports() == [latest_report]
+        assert [report['errors'] for report in read_json_lines(path)] == [['error_1'], []]
+        assert read_json_lines(path)[1] == latest_report
+
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def test_logger_sink_bounded():
+    """
+    Test for a logger with a sink keeping only the latest report in memory by default, while all reports
+    are written to the sink, and for keeping all reports again when the sink is removed
+    """
+    path = data_dir / 'test_logger_reports.jsonl'
+
+    with JsonLinesSink(path, buffer_size=100) as sink:
+        qc_obj = QualityControl(sink=sink)
+        for i in range(1000):
+            qc_obj.logger.add_error(f'error_{i}')
+            latest_report = qc_obj.create_report()
+            assert len(qc_obj.logger.reports) == 1
+
+        assert qc_obj.logger.get_all_reports() == [latest_report]
+
+    assert [report['errors'] for report in read_json_lines(path)] == [[f'error_{i}'] for i in range(1000)]
+
+    with JsonLinesSink(path) as sink:
+        logger = LoggerQC(max_reports=3, sink=sink)
+        for _ in range(5):
+            logger.create_report()
+        assert len(logger.reports) == 3
+
+        logger = LoggerQC()
+        for _ in range(5):
+            logger.create_report()
+        logger.sink = sink
+        assert len(logger.reports) == 1
+        logger.sink = None
+        for _ in range(5):
+            logger.create_report()
+        assert len(logger.reports) == 6
+
+    if os.path.exists(path):
+        os.remove(path)
+
+
+@pytest.mark.usefixtures("create_nc_batch")
+def test_run_batch_sink():
+    """
+    Test for writing the reports of a batch run to a sink, with the path of each file
+    """
+    batch_dir = data_dir / 'batch'
+    path = data_dir / 'test_batch_reports.jsonl'
+    config = {
+        'dimensions': {},
+        'variables': {'temperature': {'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10}}},
+        'global attributes': {},
+        'file size': {}
+    }
+
+    with JsonLinesSink(path) as sink:
+        results = dict(run_batch(config, batch_dir, workers=1, sink=sink))
+        written = read_json_lines(path)
+
+    assert sorted(report.pop('file') for report in written) == sorted(str(nc_path) for nc_path in results)
+    assert sorted(len(report['errors']) for report in written) == [0, 0, 20]
+
+    shutil.rmtree(batch_dir)
+    if os.path.exists(path):
+        os.remove(path)
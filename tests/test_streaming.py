@@ -0,0 +1,322 @@
+"""
+Module for testing the functionality of streaming.py and of the data checks when a memory budget is set
+
+ Functions:
+- test_slab_shape_no_budget: Test for the slab shape when no memory budget is set
+- test_slab_shape_chunk_aligned: Test for the slab shape being aligned to the chunking of a variable
+- test_slab_shape_row_too_large: Test for the slab shape when a single row does not fit in the memory budget
+- test_iter_slabs: Test for iterating over all slabs of a variable
+- test_get_slab: Test for getting single slabs by their index without building all slabs
+- test_boundaries_accumulator: Test for accumulating values out of bounds over multiple slabs
+- test_identical_runs_accumulator: Test for accumulating runs of identical values over multiple slabs
+- test_identical_runs_accumulator_multidim: Test for accumulating runs of identical values along both axes
+  of a multidimensional variable over multiple slabs
+- test_streaming_equals_in_memory: Test for whether all data checks give the same results
+  when reading the variables in slabs
+- test_adjacent_differences_accumulator: Test for accumulating differences between adjacent values
+  over multiple slabs
+- test_streaming_adjacent_values_difference_check: Test for the adjacent values difference check
+  when a memory budget is set
+- test_streaming_identical_runs_capped: Test for reporting the first runs of identical values by index
+  when reading a multidimensional variable with more runs than the maximum number of messages in slabs
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+from netCDF4 import Dataset
+
+from ncqc.QCnetCDF import QualityControl
+from ncqc.streaming import (slab_shape, iter_slabs, count_slabs, get_slab, BoundariesAccumulator,
+                            IdenticalRunsAccumulator, AdjacentDifferencesAccumulator)
+
+data_dir = Path(__file__).parent.parent / 'sample_data'
+
+streaming_dict = {
+    'dimensions': {},
+    'variables': {
+        'series': {
+            'emptiness_check': True,
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10},
+            'data_points_amount_check': {'minimum': 100},
+            'consecutive_identical_values_check': {'maximum': 20}
+        },
+        'spectrum': {
+            'emptiness_check': True,
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10},
+            'data_points_amount_check': {'minimum': 2000}
+        },
+        'station': {
+            'emptiness_check': True,
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10}
+        }
+    },
+    'global attributes': {},
+    'file size': {}
+}
+
+
+def test_slab_shape_no_budget():
+    """
+    Test for the slab shape when no memory budget is set
+    """
+    assert slab_shape((100, 8), [4, 8], 4, None) == (100, 8)
+
+
+def test_slab_shape_chunk_aligned():
+    """
+    Test for the slab shape being aligned to the chunking of a variable
+    """
+    # 70 bytes fit 10 data points of 4 bytes (+3 bytes overhead), so 10 rows of 1 point, aligned down to 8 rows
+    assert slab_shape((100,), [8], 4, 70) == (8,)
+    # 7 * 8 * 10 bytes fit 10 rows of 8 points, aligned down to the chunk size of 4 rows
+    assert slab_shape((100, 8), [4, 8], 4, 7 * 8 * 10) == (8, 8)
+    assert slab_shape((100, 8), 'contiguous', 4, 7 * 8 * 10) == (10, 8)
+
+
+def test_slab_shape_row_too_large():
+    """
+    Test for the slab shape when a single row does not fit in the memory budget
+    """
+    assert slab_shape((100, 8, 50), [1, 8, 50], 4, 7 * 60) == (1, 1, 50)
+    assert slab_shape((100, 8), None, 4, 1) == (1, 1)
+
+
+def test_iter_slabs():
+    """
+    Test for iterating over all slabs of a variable
+    """
+    assert list(iter_slabs((5, 3), None, 1, 24)) == [
+        (slice(0, 2), slice(0, 3)),
+        (slice(2, 4), slice(0, 3)),
+        (slice(4, 5), slice(0, 3))
+    ]
+    assert list(iter_slabs((), 'contiguous', 4, 1)) == [()]
+    assert not list(iter_slabs((0, 3), [1, 3], 4, 100))
+
+
+def test_get_slab():
+    """
+    Test for getting single slabs by their index, in the same order as iter_slabs, without building all slabs
+    """
+    for args in [((5, 3), None, 1, 24), ((7, 4, 6), [2, 4, 3], 4, 7 * 12), ((9, 5), None, 4, 1),
+                 ((), 'contiguous', 4, 1), ((6, 3), None, 4, None)]:
+        slabs = list(iter_slabs(*args))
+        assert count_slabs(*args) == len(slabs)
+        assert [get_slab(*args, index) for index in range(len(slabs))] == slabs
+
+    assert count_slabs((0, 3), [1, 3], 4, 100) == 0
+    with pytest.raises(IndexError):
+        get_slab((5, 3), None, 1, 24, 3)
+
+
+def test_boundaries_accumulator():
+    """
+    Test for accumulating values out of bounds over multiple slabs
+    """
+    values = np.array([[1, 20, 3], [-4, 5, 6], [7, 30, 9]])
+
+    accumulator = BoundariesAccumulator(0, 10, max_values=2)
+    accumulator.update(values[:2], (0, 0))
+    accumulator.update(values[2:], (2, 0))
+
+    assert accumulator.result() == {'count': 3, 'min': -4, 'max': 30, 'values': [20, -4],
+                                    'indices': [(0, 1), (1, 0)]}
+
+
+def test_identical_runs_accumulator():
+    """
+    Test for accumulating runs of identical values over multiple slabs, including runs crossing
+    the border between slabs and runs interrupted by masked values
+    """
+    values = np.ma.masked_array([1, 1, 1, 2, 2, 2, 2, 2, 3, 3, 3, 3, 3, 4],
+                                mask=[False] * 11 + [True] + [False] * 2)
+
+    accumulator = IdenticalRunsAccumulator(maximum=2, shape=values.shape)
+    for start in range(0, values.size, 4):
+        accumulator.update(values[start:start + 4], (start,))
+
+    assert accumulator.result() == {'count': 3, 'runs': [{'start': (0,), 'length': 3, 'value': 1},
+                                                         {'start': (3,), 'length': 5, 'value': 2},
+                                                         {'start': (8,), 'length': 3, 'value': 3}]}
+
+
+def test_identical_runs_accumulator_multidim():
+    """
+    Test for accumulating runs of identical values along both axes of a multidimensional variable
+    over multiple slabs
+    """
+    values = np.zeros((6, 3))
+    values[:, 0] = np.arange(6)
+    values[3:, 2] = 1
+
+    accumulator = IdenticalRunsAccumulator(maximum=3, shape=values.shape, axis=0)
+    for start in range(0, 6, 2):
+        accumulator.update(values[start:start + 2], (start, 0))
+
+    assert accumulator.result() == {'count': 1, 'runs': [{'start': (0, 1), 'length': 6, 'value': 0.0}]}
+
+    accumulator = IdenticalRunsAccumulator(maximum=2, shape=values.shape, axis=1)
+    for start in range(0, 6, 2):
+        accumulator.update(values[start:start + 2], (start, 0))
+
+    assert accumulator.result() == {'count': 1, 'runs': [{'start': (0, 0), 'length': 3, 'value': 0.0}]}
+
+
+def test_adjacent_differences_accumulator():
+    """
+    Test for accumulating differences between adjacent values over multiple slabs, including differences
+    between the last values of a slab and the first values of the next slab and differences with masked values
+    """
+    values = np.ma.masked_array([[0, 0], [1, 10], [20, 11], [21, 12], [22, 30], [0, 31]],
+                                mask=[[False, False]] * 3 + [[True, False]] + [[False, False]] * 2)
+
+    accumulator = AdjacentDifferencesAccumulator(5, values.shape, 0, max_values=3)
+    for start in range(0, 6, 2):
+        accumulator.update(values[start:start + 2], (start, 0))
+
+    assert accumulator.result() == {'count': 4, 'max': 22, 'values': [10, 19, 18],
+                                    'indices': [(0, 1), (1, 0), (3, 1)]}
+
+    accumulator = AdjacentDifferencesAccumulator(5, values.shape, 1, max_values=10)
+    for start in range(0, 6, 2):
+        accumulator.update(values[start:start + 2], (start, 0))
+
+    assert accumulator.result() == {'count': 4, 'max': 31, 'values': [9, 9, 8, 31],
+                                    'indices': [(1, 0), (2, 0), (4, 0), (5, 0)]}
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_streaming_equals_in_memory():
+    """
+    Test for whether all data checks give the same results when reading the variables in slabs
+    """
+    nc_path = data_dir / 'test_streaming.nc'
+
+    in_memory_qc_obj = QualityControl()
+    in_memory_qc_obj.load_netcdf(nc_path)
+    in_memory_qc_obj.add_qc_checks_dict(streaming_dict)
+    in_memory_qc_obj.emptiness_check().data_boundaries_check().data_points_amount_check()
+
+    streaming_qc_obj = QualityControl(memory_budget=256)
+    streaming_qc_obj.load_netcdf(nc_path)
+    streaming_qc_obj.add_qc_checks_dict(streaming_dict)
+    streaming_qc_obj.emptiness_check().data_boundaries_check().data_points_amount_check()
+
+    assert streaming_qc_obj.logger.errors == in_memory_qc_obj.logger.errors
+    assert streaming_qc_obj.logger.info == in_memory_qc_obj.logger.info
+
+    streaming_qc_obj.logger.create_report()
+    streaming_qc_obj.perform_all_checks()
+
+    assert streaming_qc_obj.logger.errors == [
+        'variable "series" has 5/200 empty data points',
+        'variable "series" has 1/200 NaN data points',
+        'variable "spectrum" has 8/1600 empty data points',
+        'variable "spectrum" has 1/200 completely empty indices along dimension "time" (first indices: [50])',
+        "data points amount check error: number of data points (1600) for variable 'spectrum' "
+        "is below the specified minimum (2000)",
+        "boundary check error: '12.0' out of bounds for variable 'series' with bounds [0,10]",
+        "boundary check error: '11.0' out of bounds for variable 'spectrum' with bounds [0,10]",
+        "boundary check error: '42' out of bounds for variable 'station' with bounds [0,10]",
+        "series has 30 consecutive identical values 5.0, which is higher than the threshold of 20",
+        "series has 50 consecutive identical values 7.0, which is higher than the threshold of 20"
+    ]
+    assert not streaming_qc_obj.logger.warnings
+
+    if os.path.exists(nc_path):
+        os.remove(nc_path)
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_streaming_adjacent_values_difference_check():
+    """
+    Test for the adjacent values difference check when a memory budget is set,
+    including differences between values in different slabs
+    """
+    nc_path = data_dir / 'test_streaming.nc'
+    adjacent_dict = {
+        'dimensions': {},
+        'variables': {
+            'series': {
+                'adjacent_values_difference_check': {'over_which_dimension': [0], 'maximum_difference': [100]}
+            },
+            'spectrum': {
+                'adjacent_values_difference_check': {'over_which_dimension': [0, 1], 'maximum_difference': [5, 6]}
+            }
+        },
+        'global attributes': {},
+        'file size': {}
+    }
+
+    in_memory_qc_obj = QualityControl(max_point_messages=5)
+    in_memory_qc_obj.load_netcdf(nc_path)
+    in_memory_qc_obj.add_qc_checks_dict(adjacent_dict)
+    in_memory_qc_obj.adjacent_values_difference_check()
+
+    streaming_qc_obj = QualityControl(max_point_messages=5, memory_budget=256)
+    streaming_qc_obj.load_netcdf(nc_path)
+    streaming_qc_obj.add_qc_checks_dict(adjacent_dict)
+    streaming_qc_obj.adjacent_values_difference_check()
+
+    assert streaming_qc_obj.logger.warnings == []
+    assert streaming_qc_obj.logger.errors == in_memory_qc_obj.logger.errors
+    assert streaming_qc_obj.logger.info == in_memory_qc_obj.logger.info
+    assert streaming_qc_obj.logger.info == [
+        "adjacent_values_difference_check for variable 'series' and dimension '0': SUCCESS",
+        "adjacent_values_difference_check for variable 'spectrum' and dimension '0': FAIL",
+        "adjacent_values_difference_check for variable 'spectrum' and dimension '1': FAIL"
+    ]
+
+    if os.path.exists(nc_path):
+        os.remove(nc_path)
+
+
+def test_streaming_identical_runs_capped(tmp_path):
+    """
+    Test for the consecutive identical values check of a multidimensional variable with more runs than
+    the maximum number of messages, which reports the first runs by index when reading the variable in slabs,
+    although the runs end in another order
+    :param tmp_path: temporary directory
+    """
+    nc_path = tmp_path / 'runs.nc'
+    runs_dict = {
+        'dimensions': {},
+        'variables': {'spectrum': {'consecutive_identical_values_check': {'maximum': 3}}},
+        'global attributes': {},
+        'file size': {}
+    }
+
+    # the long runs of the first lines end after the short runs of the last lines which start later
+    values = np.arange(120 * 4, dtype='f4').reshape(120, 4)
+    for line in range(4):
+        length = 60 - 15 * line
+        for start in range(line * 2, 120, 61 - 15 * line):
+            values[start:start + length, line] = line
+    with Dataset(nc_path, 'w', format='NETCDF4') as nc_file:
+        nc_file.createDimension('time', None)
+        nc_file.createDimension('classes', 4)
+        nc_file.createVariable('spectrum', 'f4', ('time', 'classes'), chunksizes=(8, 4))[:] = values
+
+    in_memory_qc_obj = QualityControl(max_point_messages=3)
+    in_memory_qc_obj.load_netcdf(nc_path)
+    in_memory_qc_obj.add_qc_checks_dict(runs_dict)
+    in_memory_qc_obj.consecutive_identical_values_check()
+    in_memory_qc_obj.nc.close()
+
+    for memory_budget in (128, 512):
+        streaming_qc_obj = QualityControl(max_point_messages=3, memory_budget=memory_budget)
+        streaming_qc_obj.load_netcdf(nc_path)
+        streaming_qc_obj.add_qc_checks_dict(runs_dict)
+        streaming_qc_obj.consecutive_identical_values_check()
+        streaming_qc_obj.nc.close()
+
+        assert streaming_qc_obj.logger.errors == in_memory_qc_obj.logger.errors
+
+    assert in_memory_qc_obj.logger.errors[:3] == [
+        "spectrum has 60 consecutive identical values 0.0, which is higher than the threshold of 3",
+        "spectrum has 45 consecutive identical values 1.0, which is higher than the threshold of 3",
+        "spectrum has 30 consecutive identical values 2.0, which is higher than the threshold of 3"
+    ]
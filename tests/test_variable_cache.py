@@ -0,0 +1,147 @@
+"""
+Module for testing the functionality of variable_cache.py and the variable cache of a QualityControl object
+
+ Functions:
+- test_variable_cache_lru: Test for getting, adding and evicting values of the cache
+- test_variable_cache_checks: Test for reading every variable once for checks performed one after the other
+- test_variable_cache_streaming: Test for caching the slabs of variables streamed within a memory budget
+- test_variable_cache_load_netcdf: Test for emptying the cache when a netCDF file is loaded
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ncqc.QCnetCDF import QualityControl
+from ncqc.variable_cache import VariableCache
+
+data_dir = Path(__file__).parent.parent / 'sample_data'
+
+cache_dict = {
+    'dimensions': {},
+    'variables': {
+        'series': {
+            'emptiness_check': True,
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10},
+            'consecutive_identical_values_check': {'maximum': 5}
+        },
+        'spectrum': {
+            'data_boundaries_check': {'lower_bound': 0, 'upper_bound': 10}
+        }
+    },
+    'global attributes': {},
+    'file size': {}
+}
+
+
+def _check_one_by_one(qc_obj: QualityControl) -> dict:
+    """
+    Function to perform the data checks one after the other on the streaming test file
+    :param qc_obj: the profiled QualityControl object
+    :return: the report
+    """
+    qc_obj.add_qc_checks_dict(cache_dict)
+    qc_obj.load_netcdf(data_dir / 'test_streaming.nc')
+    qc_obj.enable_profiling()
+    qc_obj.data_boundaries_check().emptiness_check().consecutive_identical_values_check()
+    qc_obj.nc.close()
+    return qc_obj.create_report()
+
+
+def _reads(report: dict) -> dict:
+    """
+    Function to get the number of reads of every variable from the timing table of a report
+    :param report: the report
+    :return: dictionary with the number of reads for every variable which was read
+    """
+    return {row['variable']: row['calls'] for row in report['timings'] if row['check'] == 'read'}
+
+
+def test_variable_cache_lru():
+    """
+    Test for getting, adding and evicting the least recently used values of the cache
+    """
+    cache = VariableCache(max_bytes=2 * 80)
+    first = np.arange(10, dtype=np.float64)
+    second = np.ma.masked_less(np.arange(8, dtype=np.float64), 2)
+
+    assert cache.get('first') is None
+    cache.put('first', first)
+    cache.put('second', second)
+    assert cache.nbytes == 80 + 64 + 8
+    assert cache.get('first') is first
+    assert not first.flags.writeable
+    assert not np.ma.getmask(second).flags.writeable
+
+    # the second values are the least recently used
+    cache.put('third', np.zeros(2))
+    assert cache.get('second') is None
+    assert cache.get('first') is first
+    assert cache.evictions == 1
+
+    too_large = np.zeros(100)
+    assert cache.put('too large', too_large) is too_large
+    assert too_large.flags.writeable
+    assert cache.get('too large') is None
+
+    cache.clear()
+    assert cache.stats() == {'hits': 2, 'misses': 3, 'evictions': 1, 'values': 0, 'nbytes': 0, 'max_bytes': 160}
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_variable_cache_checks():
+    """
+    Test for reading every variable once for checks performed one after the other,
+    which log the same messages as without the cache
+    """
+    report = _check_one_by_one(QualityControl(variable_cache_bytes=1024 * 1024))
+    assert _reads(report) == {'series': 1, 'spectrum': 1}
+
+    report_uncached = _check_one_by_one(QualityControl())
+    assert _reads(report_uncached) == {'series': 3, 'spectrum': 1}
+    for key in ('errors', 'warnings', 'info'):
+        assert report[key] == report_uncached[key]
+
+    os.remove(data_dir / 'test_streaming.nc')
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_variable_cache_streaming():
+    """
+    Test for caching the slabs of variables streamed within a memory budget, and for not caching values
+    larger than the budget of the cache
+    """
+    qc_obj = QualityControl(memory_budget=256, variable_cache_bytes=1024 * 1024)
+    _check_one_by_one(qc_obj)
+    stats = qc_obj.variable_cache.stats()
+    # the 50 slabs of the spectrum are read by one check, the slabs of the series by three checks
+    assert stats['misses'] == stats['values'] > 50
+    assert stats['hits'] == 2 * (stats['values'] - 50)
+    assert stats['evictions'] == 0
+
+    # the 800 bytes of the series do not fit in the cache, which is read again for every check
+    qc_obj = QualityControl(variable_cache_bytes=512)
+    report = _check_one_by_one(qc_obj)
+    assert _reads(report) == {'series': 3, 'spectrum': 1}
+    assert qc_obj.variable_cache.stats()['values'] == 0
+
+    os.remove(data_dir / 'test_streaming.nc')
+
+
+@pytest.mark.usefixtures("create_nc_streaming")
+def test_variable_cache_load_netcdf():
+    """
+    Test for emptying the cache when a netCDF file is loaded, so the values of the previous file are not used
+    """
+    qc_obj = QualityControl(variable_cache_bytes=1024 * 1024)
+    _check_one_by_one(qc_obj)
+    assert len(qc_obj.variable_cache) == 2
+
+    qc_obj.load_netcdf(data_dir / 'test_streaming.nc')
+    assert len(qc_obj.variable_cache) == 0
+    assert qc_obj.variable_cache.hits == 2
+    qc_obj.nc.close()
+
+    os.remove(data_dir / 'test_streaming.nc')